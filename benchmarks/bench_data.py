@@ -0,0 +1,60 @@
+"""Benchmarks for data handling and surrogate creation."""
+import numpy as np
+from idtxl.data import Data
+from idtxl.multivariate_te import MultivariateTE
+from idtxl import stats
+
+
+class TimeGetRealisations():
+    """Time collection of realisations for a set of variables."""
+
+    params = [[1000, 10000], [1, 10, 50], [1, 10]]
+    param_names = ['n_samples', 'n_vars', 'n_replications']
+
+    def setup(self, n_samples, n_vars, n_replications):
+        self.data = Data(np.random.RandomState(0).randn(
+            n_vars, n_samples, n_replications), dim_order='psr',
+            normalise=False)
+        self.current_value = (0, 5)
+        self.idx_list = [(p, s) for p in range(n_vars) for s in range(5)]
+
+    def time_get_realisations(self, n_samples, n_vars, n_replications):
+        self.data.get_realisations(self.current_value, self.idx_list)
+
+    def time_get_realisations_shuffled(self, n_samples, n_vars,
+                                       n_replications):
+        self.data.get_realisations(self.current_value, self.idx_list,
+                                   shuffle=True)
+
+
+class TimeSurrogateTable():
+    """Time creation of surrogate tables for maximum statistics."""
+
+    params = [[500, 2000], [5, 20], [21, 200]]
+    param_names = ['n_samples', 'n_candidates', 'n_perm']
+    timeout = 1200
+
+    def setup(self, n_samples, n_candidates, n_perm):
+        data = Data()
+        data.generate_mute_data(n_samples, 5)
+        self.data = data
+        settings = {'cmi_estimator': 'JidtKraskovCMI',
+                    'max_lag_sources': n_candidates // 4 + 1,
+                    'min_lag_sources': 1,
+                    'permute_in_time': False,
+                    'verbose': False}
+        self.analysis = MultivariateTE()
+        try:
+            self.analysis._initialise(settings, data, sources=[1, 2, 3, 4],
+                                      target=0)
+        except ImportError as err:
+            raise NotImplementedError(err)
+        samples = range(self.analysis.current_value[1] - 1,
+                        self.analysis.current_value[1] -
+                        settings['max_lag_sources'] - 1, -1)
+        self.candidates = [(p, s) for s in samples
+                           for p in [1, 2, 3, 4]][:n_candidates]
+
+    def time_create_surrogate_table(self, n_samples, n_candidates, n_perm):
+        stats._create_surrogate_table(self.analysis, self.data,
+                                      self.candidates, n_perm)
@@ -0,0 +1,76 @@
+"""Benchmarks for IDTxl estimators.
+
+Time estimation of (conditional) mutual information by the JIDT, OpenCL,
+and PID estimators over sample sizes, variable dimensions, and numbers of
+chunks.
+"""
+import numpy as np
+from idtxl.estimator import find_estimator
+
+CMI_ESTIMATORS = ['JidtKraskovCMI', 'JidtDiscreteCMI', 'JidtGaussianCMI',
+                  'OpenCLKraskovCMI']
+
+
+def _get_estimator(name, settings):
+    """Return estimator instance, skip benchmark if it is not available."""
+    try:
+        return find_estimator(name)(settings)
+    except (ImportError, RuntimeError) as err:
+        # asv and run_benchmarks.py skip benchmarks raising
+        # NotImplementedError in setup.
+        raise NotImplementedError('{0} not available: {1}'.format(name, err))
+
+
+class TimeCMIEstimators():
+    """Time CMI estimation, single and in chunks."""
+
+    params = [CMI_ESTIMATORS, [1000, 10000], [1, 3], [1, 10]]
+    param_names = ['estimator', 'n_samples', 'dim', 'n_chunks']
+    timeout = 600
+
+    def setup(self, estimator, n_samples, dim, n_chunks):
+        self.est = _get_estimator(estimator, {'n_discrete_bins': 2})
+        rng = np.random.RandomState(0)
+        n = n_samples * n_chunks
+        self.var1 = rng.randn(n, dim)
+        self.var2 = rng.randn(n, dim) + self.var1
+        self.conditional = rng.randn(n, dim)
+        if estimator == 'JidtDiscreteCMI':
+            self.var1 = (self.var1 > 0).astype(int)
+            self.var2 = (self.var2 > 0).astype(int)
+            self.conditional = (self.conditional > 0).astype(int)
+
+    def time_estimate(self, estimator, n_samples, dim, n_chunks):
+        if n_chunks == 1:
+            self.est.estimate(var1=self.var1, var2=self.var2,
+                              conditional=self.conditional)
+        else:
+            self.est.estimate_parallel(n_chunks=n_chunks,
+                                       var1=self.var1, var2=self.var2,
+                                       conditional=self.conditional)
+
+
+class TimePIDEstimators():
+    """Time estimation of partial information decomposition."""
+
+    params = [['SydneyPID', 'TartuPID'], [1000, 10000]]
+    param_names = ['estimator', 'n_samples']
+    timeout = 600
+
+    def setup(self, estimator, n_samples):
+        settings = {'alph_s1': 2, 'alph_s2': 2, 'alph_t': 2,
+                    'max_unsuc_swaps_row_parm': 60, 'num_reps': 63,
+                    'max_iters': 1000, 'verbose': False}
+        if estimator == 'TartuPID':
+            try:
+                import ecos  # noqa: F401
+            except ImportError:
+                raise NotImplementedError('TartuPID requires ECOS.')
+        self.est = _get_estimator(estimator, settings)
+        rng = np.random.RandomState(0)
+        self.s1 = rng.randint(0, 2, n_samples)
+        self.s2 = rng.randint(0, 2, n_samples)
+        self.t = np.logical_xor(self.s1, self.s2).astype(int)
+
+    def time_estimate(self, estimator, n_samples):
+        self.est.estimate(self.s1, self.s2, self.t)
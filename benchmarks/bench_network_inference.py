@@ -0,0 +1,100 @@
+"""Benchmarks for end-to-end network inference and AIS estimation.
+
+Networks are simulated as vector autoregressive processes where each
+process is driven by its predecessor (see _get_var_data()). Large networks
+take hours to analyse, use 'run_benchmarks.py --quick' to run the smallest
+network only.
+"""
+import numpy as np
+from idtxl.data import Data
+from idtxl.multivariate_te import MultivariateTE
+from idtxl.bivariate_te import BivariateTE
+from idtxl.active_information_storage import ActiveInformationStorage
+
+ALGORITHMS = {
+    'MultivariateTE': MultivariateTE,
+    'BivariateTE': BivariateTE
+}
+SETTINGS = {
+    'cmi_estimator': 'JidtKraskovCMI',
+    'n_perm_max_stat': 21,
+    'n_perm_min_stat': 21,
+    'n_perm_omnibus': 21,
+    'n_perm_max_seq': 21,
+    'n_perm_mi': 21,
+    'max_lag_sources': 2,
+    'min_lag_sources': 1,
+    'max_lag': 2,
+    'verbose': False
+}
+
+
+def _get_var_data(n_nodes, n_samples, n_replications):
+    """Simulate a chain of VAR processes, 0 -> 1 -> ... -> n_nodes - 1."""
+    coefficient_matrices = np.zeros((1, n_nodes, n_nodes))
+    coefficient_matrices[0] = np.diag(np.ones(n_nodes) * 0.5)
+    coefficient_matrices[0, 1:, :-1] += np.diag(np.ones(n_nodes - 1) * 0.4)
+    np.random.seed(0)
+    data = Data()
+    data.generate_var_data(n_samples, n_replications, coefficient_matrices)
+    return data
+
+
+def _check_jpype():
+    try:
+        import jpype  # noqa: F401
+    except ImportError:
+        raise NotImplementedError('Network inference requires jpype.')
+
+
+class TimeNetworkInference():
+    """Time network inference on VAR data."""
+
+    params = [list(ALGORITHMS.keys()), [5, 20, 100]]
+    param_names = ['algorithm', 'n_nodes']
+    timeout = 24 * 3600
+    number = 1
+    repeat = 1
+
+    def setup(self, algorithm, n_nodes):
+        _check_jpype()
+        self.data = _get_var_data(n_nodes, 500, 3)
+
+    def time_analyse_network(self, algorithm, n_nodes):
+        ALGORITHMS[algorithm]().analyse_network(dict(SETTINGS), self.data)
+
+
+class TimeNetworkInferenceMute():
+    """Time network inference on data from the MuTE toolbox example."""
+
+    params = [list(ALGORITHMS.keys())]
+    param_names = ['algorithm']
+    timeout = 3600
+    number = 1
+    repeat = 1
+
+    def setup(self, algorithm):
+        _check_jpype()
+        np.random.seed(0)
+        self.data = Data()
+        self.data.generate_mute_data(500, 3)
+
+    def time_analyse_network(self, algorithm):
+        ALGORITHMS[algorithm]().analyse_network(dict(SETTINGS), self.data)
+
+
+class TimeActiveInformationStorage():
+    """Time AIS estimation on VAR data."""
+
+    params = [[5, 20, 100]]
+    param_names = ['n_nodes']
+    timeout = 24 * 3600
+    number = 1
+    repeat = 1
+
+    def setup(self, n_nodes):
+        _check_jpype()
+        self.data = _get_var_data(n_nodes, 500, 3)
+
+    def time_analyse_network(self, n_nodes):
+        ActiveInformationStorage().analyse_network(dict(SETTINGS), self.data)
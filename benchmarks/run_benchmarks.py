@@ -0,0 +1,212 @@
+"""Run IDTxl benchmarks and track results over time.
+
+Benchmarks are written in the style of airspeed velocity (asv,
+https://asv.readthedocs.io): each module bench_*.py contains classes with
+methods time_*, which are timed for all combinations of the class attribute
+'params'. setup() is called before timing, benchmarks raising
+NotImplementedError in setup() are skipped (e.g., if an optional dependency
+is missing). The suite can be run with asv (see asv.conf.json) or with this
+script, which does not require asv:
+
+    $ python benchmarks/run_benchmarks.py --quick
+    $ python benchmarks/run_benchmarks.py --bench TimeCMIEstimators
+
+The script appends one JSON object per benchmark and parameter combination
+to a history file (default: benchmarks/history.jsonl). Each result is
+compared to the last result for the same benchmark, parameters, and machine
+in the history. The script exits with status 1 if a benchmark got slower by
+more than the given factor.
+"""
+import os
+import sys
+import re
+import json
+import time
+import glob
+import argparse
+import platform
+import datetime
+import importlib
+import itertools as it
+import contextlib
+import subprocess
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+sys.path.insert(0, BENCHMARK_DIR)
+
+
+def find_benchmarks(pattern=None):
+    """Return benchmark classes and timing methods.
+
+    Args:
+        pattern : str [optional]
+            regular expression, return only benchmarks whose name
+            (module.class.method) matches the pattern (default=None)
+
+    Returns:
+        list of tuples
+            (name, class, method name) for each benchmark
+    """
+    benchmarks = []
+    for f in sorted(glob.glob(os.path.join(BENCHMARK_DIR, 'bench_*.py'))):
+        module_name = os.path.splitext(os.path.basename(f))[0]
+        module = importlib.import_module(module_name)
+        for class_name in sorted(dir(module)):
+            cls = getattr(module, class_name)
+            if not (isinstance(cls, type) and class_name.startswith('Time')):
+                continue
+            for method in sorted(dir(cls)):
+                if not method.startswith('time_'):
+                    continue
+                name = '{0}.{1}.{2}'.format(module_name, class_name, method)
+                if pattern is None or re.search(pattern, name):
+                    benchmarks.append((name, cls, method))
+    return benchmarks
+
+
+def get_param_combinations(cls, quick=False):
+    """Return all combinations of benchmark parameters.
+
+    Args:
+        cls : class
+            benchmark class
+        quick : bool [optional]
+            use only the first value of each parameter (default=False)
+
+    Returns:
+        list of dicts
+            parameter combinations, keys are parameter names
+    """
+    params = getattr(cls, 'params', [])
+    names = getattr(cls, 'param_names', [])
+    if params and not isinstance(params[0], list):
+        params = [params]
+    if quick:
+        params = [p[:1] for p in params]
+    return [dict(zip(names, c)) for c in it.product(*params)]
+
+
+def run_benchmark(cls, method, params, repeat=None):
+    """Time a single benchmark for one parameter combination.
+
+    Args:
+        cls : class
+            benchmark class
+        method : str
+            name of the timing method
+        params : dict
+            parameters passed to setup() and the timing method
+        repeat : int [optional]
+            number of repetitions, the minimum time is returned (default is
+            the class attribute 'repeat' or 3)
+
+    Returns:
+        float | None
+            minimum run time in seconds, None if the benchmark was skipped
+    """
+    if repeat is None:
+        repeat = getattr(cls, 'repeat', 3)
+    args = list(params.values())
+    bench = cls()
+    with open(os.devnull, 'w') as devnull:
+        with contextlib.redirect_stdout(devnull):
+            try:
+                if hasattr(bench, 'setup'):
+                    bench.setup(*args)
+            except NotImplementedError:
+                return None
+            times = []
+            for r in range(repeat):
+                start = time.perf_counter()
+                getattr(bench, method)(*args)
+                times.append(time.perf_counter() - start)
+            if hasattr(bench, 'teardown'):
+                bench.teardown(*args)
+    return min(times)
+
+
+def load_history(filename):
+    """Return list of results stored in the history file."""
+    if not os.path.isfile(filename):
+        return []
+    with open(filename) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def find_previous(history, result):
+    """Return last result for the same benchmark, parameters, and machine."""
+    for h in reversed(history):
+        if (h['benchmark'] == result['benchmark'] and
+                h['params'] == result['params'] and
+                h['machine'] == result['machine']):
+            return h
+    return None
+
+
+def _get_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], cwd=BENCHMARK_DIR,
+            stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run IDTxl benchmarks.')
+    parser.add_argument('--bench', default=None,
+                        help='regular expression selecting benchmarks')
+    parser.add_argument('--quick', action='store_true',
+                        help='use first value of each parameter only')
+    parser.add_argument('--repeat', type=int, default=None,
+                        help='number of repetitions per benchmark')
+    parser.add_argument('--history',
+                        default=os.path.join(BENCHMARK_DIR, 'history.jsonl'),
+                        help='history file, results are appended')
+    parser.add_argument('--threshold', type=float, default=1.5,
+                        help='report a regression if a benchmark is slower '
+                             'than the previous result by this factor')
+    args = parser.parse_args(argv)
+
+    history = load_history(args.history)
+    commit = _get_commit()
+    date = datetime.datetime.now().isoformat()
+    regressions = []
+    with open(args.history, 'a') as f:
+        for (name, cls, method) in find_benchmarks(args.bench):
+            for params in get_param_combinations(cls, args.quick):
+                duration = run_benchmark(cls, method, params, args.repeat)
+                if duration is None:
+                    print('{0} {1}: skipped'.format(name, params))
+                    continue
+                result = {
+                    'benchmark': name,
+                    'params': params,
+                    'time': duration,
+                    'commit': commit,
+                    'date': date,
+                    'machine': platform.node(),
+                    'python': platform.python_version()}
+                previous = find_previous(history, result)
+                line = '{0} {1}: {2:.4f} s'.format(name, params, duration)
+                if previous is not None:
+                    ratio = duration / previous['time']
+                    line += ' ({0:.2f}x previous)'.format(ratio)
+                    if ratio > args.threshold:
+                        regressions.append(line)
+                print(line)
+                f.write(json.dumps(result) + '\n')
+                f.flush()
+
+    if regressions:
+        print('\nRegressions (slower by more than {0}x):'.format(
+            args.threshold))
+        for r in regressions:
+            print('\t' + r)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -18,7 +18,67 @@ theory. IDTxl provides functionality to estimate the following measures:
 
 IDTxl implements estimators for discrete and continuous data with parallel
 computing engines for both GPU and CPU platforms. Written for Python3.4.3+.
+
+All modules log to child loggers of the 'idtxl' logger. By default, no output
+is written unless logging is configured by the application. Call
+log_to_console() to write messages of level INFO and above to stdout, e.g.,
+the output of analyses run with the setting 'verbose': True:
+
+    >>> import idtxl
+    >>> idtxl.log_to_console()
+
+Alternatively, configure the logging module, e.g.:
+
+    >>> import logging
+    >>> logging.basicConfig(level=logging.INFO)
 """
+import sys
+import logging
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """Write log messages to the current sys.stdout.
+
+    The stream is looked up for each message, such that output follows
+    redirections of sys.stdout (e.g., by contextlib.redirect_stdout).
+    """
+
+    def __init__(self):
+        logging.Handler.__init__(self)
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+
+def log_to_console(level=logging.INFO):
+    """Write log messages of IDTxl to stdout.
+
+    Adds a handler writing to stdout to the 'idtxl' logger, repeated calls
+    only change the level.
+
+    Args:
+        level : int [optional]
+            minimum level of messages written (default=logging.INFO)
+
+    Returns:
+        logging.Handler
+            handler added to the 'idtxl' logger
+    """
+    logger = logging.getLogger(__name__)
+    handler = None
+    for h in logger.handlers:
+        if isinstance(h, _StdoutHandler):
+            handler = h
+    if handler is None:
+        handler = _StdoutHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+    logger.setLevel(level)
+    return handler
+
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
 
 # __all__ = ["data", "stats", "utils"]
 
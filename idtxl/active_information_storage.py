@@ -6,13 +6,45 @@ network. The algorithm uses non-uniform embedding as described in Faes (2011).
 Note:
     Written for Python 3.4+
 """
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 from . import stats
 from .single_process_analysis import SingleProcessAnalysis
 from .estimator import find_estimator
 from .results import ResultsSingleProcessAnalysis
+from .profiling import Profiler
+from .resources import restore_thread_limits
+from .progress import Progress, report_surrogates
 from . import idtxl_exceptions as ex
 
+logger = logging.getLogger(__name__)
+
+# Data analysed by worker processes, see _init_worker().
+_worker_data = None
+
+
+def _init_worker(data):
+    """Keep data in worker process such that it is only transferred once."""
+    global _worker_data
+    _worker_data = data
+
+
+def _analyse_single_process(settings, process):
+    """Estimate AIS for a single process in a worker process."""
+    analysis = ActiveInformationStorage()
+    analysis._progress = Progress(None, 0)
+    # Return only entries added to the estimate cache by this worker.
+    estimate_cache = settings.get('estimate_cache')
+    if estimate_cache is not None:
+        estimate_cache.get_new_entries()  # start recording
+    results = analysis.analyse_single_process(settings, _worker_data, process)
+    if estimate_cache is not None:
+        estimate_cache = estimate_cache.get_new_entries()
+    return (results, settings.get('embedding_cache'), estimate_cache,
+            analysis._progress.surrogates_computed)
+
 
 class ActiveInformationStorage(SingleProcessAnalysis):
     """Estimate active information storage in individual processes.
@@ -58,7 +90,9 @@ class ActiveInformationStorage(SingleProcessAnalysis):
     def __init__(self):
         super().__init__()
 
-    def analyse_network(self, settings, data, processes='all'):
+    @restore_thread_limits
+    def analyse_network(self, settings, data, processes='all',
+                        progress_callback=None):
         """Estimate active information storage for multiple network processes.
 
         Estimate active information storage for all or a subset of processes in
@@ -91,11 +125,22 @@ class ActiveInformationStorage(SingleProcessAnalysis):
                 documentation of analyse_single_target() for details, settings
                 can further contain
 
-                - verbose : bool [optional] - toggle console output
+                - verbose : bool [optional] - log progress messages at
+                  level INFO, call idtxl.log_to_console() to print them
                   (default=True)
                 - fdr_correction : bool [optional] - correct results on the
                   network level, see documentation of stats.ais_fdr() for
                   details (default=True)
+                - n_workers : int [optional] - number of worker processes,
+                  processes in the network are analysed in parallel if
+                  n_workers > 1; workers are started using the 'spawn'
+                  method, i.e., scripts calling analyse_network() have to be
+                  protected by an if __name__ == '__main__' guard
+                  (default=1)
+                - n_cores : int [optional] - number of cores divided between
+                  workers, JIDT threads, and BLAS threads; the JVM heap size
+                  per worker can be set by 'jvm_heap_size', see documentation
+                  of idtxl.resources (default=all available cores)
 
             data : Data instance
                 raw data for analysis
@@ -104,6 +149,11 @@ class ActiveInformationStorage(SingleProcessAnalysis):
                 if 'all', AIS is estimated for all processes;
                 if list of int, AIS is estimated for processes specified in the
                 list.
+            progress_callback : callable [optional]
+                function called with a dict describing the progress of the
+                analysis each time a process was analysed or surrogates were
+                computed, see documentation of the progress module for
+                details (default=None)
 
         Returns:
             ResultsSingleProcessAnalysis instance
@@ -113,6 +163,8 @@ class ActiveInformationStorage(SingleProcessAnalysis):
         # Set defaults for AIS estimation.
         settings.setdefault('verbose', True)
         settings.setdefault('fdr_correction', True)
+        settings.setdefault('profile', False)
+        settings.setdefault('n_workers', 1)
 
         # Check provided processes for analysis.
         if processes == 'all':
@@ -128,12 +180,21 @@ class ActiveInformationStorage(SingleProcessAnalysis):
             n_nodes=data.n_processes,
             n_realisations=data.n_realisations(),
             normalised=data.normalise)
-        for t in range(len(processes)):
-            if settings['verbose']:
-                print('\n####### analysing process {0} of {1}'.format(
-                                                processes[t], processes))
-            res_single = self.analyse_single_process(
-                settings, data, processes[t])
+        self._progress = Progress(progress_callback, len(processes))
+        if settings['n_workers'] > 1:
+            results_single = self._analyse_processes_parallel(
+                settings, data, processes)
+        else:
+            results_single = []
+            for t in range(len(processes)):
+                if settings['verbose']:
+                    logger.info('####### analysing process {0} of {1}'.format(
+                                                    processes[t], processes))
+                results_single.append(self.analyse_single_process(
+                    settings, data, processes[t]))
+                self._progress.target_done(processes[t])
+        self._progress = None
+        for res_single in results_single:
             results.combine_results(res_single)
 
         # Get no. realisations actually used for estimation from single target
@@ -145,9 +206,43 @@ class ActiveInformationStorage(SingleProcessAnalysis):
         # results as an extra field. Network_fdr/combine_results internally
         # creates a deep copy of the results.
         if settings['fdr_correction']:
-            results = stats.ais_fdr(settings, results)
+            profiler = Profiler(enabled=settings['profile'])
+            with profiler.phase('fdr'):
+                results = stats.ais_fdr(settings, results)
+            results._profile = profiler.get_profile()
         return results
 
+    def _analyse_processes_parallel(self, settings, data, processes):
+        """Estimate AIS for multiple processes in worker processes.
+
+        Distribute processes over a pool of settings['n_workers'] worker
+        processes. Results are returned in the order of processes. Entries
+        added to an embedding or estimate cache by the workers are collected
+        in the caches passed in the settings.
+        """
+        if settings['verbose']:
+            logger.info('####### analysing processes {0} using {1} '
+                        'workers'.format(processes, settings['n_workers']))
+        with ProcessPoolExecutor(
+                max_workers=min(settings['n_workers'], len(processes)),
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(data,)) as pool:
+            futures = [pool.submit(_analyse_single_process, settings, p)
+                       for p in processes]
+            results_single = []
+            for (p, f) in zip(processes, futures):
+                [res, cache, estimate_cache, n_surrogates] = f.result()
+                if cache is not None:
+                    settings['embedding_cache'].update(cache)
+                if estimate_cache is not None:
+                    settings['estimate_cache'].update(estimate_cache)
+                results_single.append(res)
+                report_surrogates(self, n_surrogates)
+                self._progress.target_done(p)
+        return results_single
+
+    @restore_thread_limits
     def analyse_single_process(self, settings, data, process):
         """Estimate active information storage for a single process.
 
@@ -195,7 +290,29 @@ class ActiveInformationStorage(SingleProcessAnalysis):
                   by shuffling realisations in time instead of shuffling
                   replications; see documentation of Data.permute_samples() for
                   further settings (default=False)
-                - verbose : bool [optional] - toggle console output
+                - null_fit : str [optional] - 'gamma' or 'gpd' to derive
+                  p-values from a gamma or generalised Pareto (tail)
+                  distribution fitted to at most n_perm_null_fit surrogates
+                  instead of from n_perm_* surrogates; fit diagnostics are
+                  returned in the results, see documentation of
+                  stats._find_pvalue_fitted() (default=None)
+                - n_perm_null_fit : int [optional] - number of surrogates
+                  used to fit the null distribution (default=100)
+                - null_fit_tail : float [optional] - fraction of largest
+                  surrogate values used to fit the generalised Pareto
+                  distribution (default=0.25)
+                - embedding_cache : EmbeddingCache instance [optional] - cache
+                  for samples selected from the process's past, see
+                  documentation of EmbeddingCache (default=None)
+                - estimate_cache : EstimateCache instance [optional] - cache
+                  for estimates, estimates are re-used across statistical
+                  tests and analyses; see documentation of EstimateCache
+                  (default=None)
+                - profile : bool [optional] - record run time and estimator
+                  usage of each phase of the algorithm, see documentation of
+                  Results.get_profile() (default=False)
+                - verbose : bool [optional] - log progress messages at
+                  level INFO, call idtxl.log_to_console() to print them
                   (default=True)
 
             data : Data instance
@@ -212,16 +329,23 @@ class ActiveInformationStorage(SingleProcessAnalysis):
         self._initialise(settings, data, process)
 
         # Main algorithm.
-        print('\n---------------------------- (1) include candidates')
-        self._include_process_candidates(data)
-        print('\n---------------------------- (2) prune source candidates')
-        self._prune_candidates(data)
-        print('\n---------------------------- (3) final statistics')
-        self._test_final_conditional(data)
+        if self.settings['verbose']:
+            logger.info('---------------------------- (1) include candidates')
+        with self._profiler.phase('include_process_candidates'):
+            self._include_process_candidates(data)
+        if self.settings['verbose']:
+            logger.info('---------------------------- (2) prune source '
+                        'candidates')
+        with self._profiler.phase('prune_candidates'):
+            self._prune_candidates(data)
+        if self.settings['verbose']:
+            logger.info('---------------------------- (3) final statistics')
+        with self._profiler.phase('test_final_conditional'):
+            self._test_final_conditional(data)
 
         # Clean up and return results.
         if self.settings['verbose']:
-            print('final conditional samples: {0}'.format(
+            logger.info('final conditional samples: {0}'.format(
                     self._idx_to_lag(self.selected_vars_full)))
         results = ResultsSingleProcessAnalysis(
             n_nodes=data.n_processes,
@@ -235,19 +359,23 @@ class ActiveInformationStorage(SingleProcessAnalysis):
                 'selected_vars': self._idx_to_lag(self.selected_vars_full),
                 'ais': self.ais,
                 'ais_pval': self.pvalue,
-                'ais_sign': self.sign
+                'ais_sign': self.sign,
+                'profile': self._profiler.get_profile(),
+                'null_fit': self._get_null_fits()
             })
         self._reset()  # remove realisations and min_stats surrogate table
         return results
 
     def _initialise(self, settings, data, process):
         """Check input, set initial or default values for analysis settings."""
-        # Check analysis settings and set defaults.
+        # Check analysis settings and set defaults. The embedding cache is
+        # not kept in the settings, such that it is not added to results.
         self.settings = settings.copy()
         self.settings.setdefault('verbose', True)
         self.settings.setdefault('add_conditionals', None)
         self.settings.setdefault('tau', 1)
         self.settings.setdefault('local_values', False)
+        self._embedding_cache = self.settings.pop('embedding_cache', None)
 
         if type(self.settings['max_lag']) is not int or (
                 self.settings['max_lag'] < 0):
@@ -259,8 +387,9 @@ class ActiveInformationStorage(SingleProcessAnalysis):
                                '.'.format(self.settings['tau'],
                                           self.settings['max_lag']))
 
-        # Set CMI estimator.
+        # Set CMI estimator and profiler.
         self._set_cmi_estimator()
+        self._set_profiler()
 
         # Initialise class attributes.
         self._min_stats_surr_table = None
@@ -319,7 +448,29 @@ class ActiveInformationStorage(SingleProcessAnalysis):
                     self.current_value[1] - self.settings['max_lag'] - 1,
                     -self.settings['tau'])
         candidates = self._define_candidates(process, samples)
-        self._include_candidates(candidates, data)
+        if self._embedding_cache is None:
+            self._include_candidates(candidates, data)
+            return
+
+        # Take selected samples from the cache if available. Otherwise, run
+        # the inclusion and add newly selected samples to the cache.
+        key = self._embedding_cache.get_key(
+            data, self.current_value, self.settings['max_lag'],
+            self.settings['tau'], self.settings)
+        selected_vars = self._embedding_cache.get(key)
+        if selected_vars is None:
+            n_forced = len(self.selected_vars_full)
+            self._include_candidates(candidates, data)
+            self._embedding_cache.add(
+                key, self._idx_to_lag(self.selected_vars_full[n_forced:]))
+        else:
+            if self.settings['verbose']:
+                logger.info('taking selected samples from embedding cache: '
+                            '{0}'.format(selected_vars))
+            if selected_vars:
+                idx = self._lag_to_idx(selected_vars)
+                self._append_selected_vars(
+                    idx, data.get_realisations(self.current_value, idx)[0])
 
     def _include_candidates(self, candidate_set, data):
         """Include informative candidates into the conditioning set.
@@ -344,7 +495,7 @@ class ActiveInformationStorage(SingleProcessAnalysis):
         """
         success = False
         if self.settings['verbose']:
-                print('testing candidate set: {0}'.format(
+                logger.info('testing candidate set: {0}'.format(
                                     self._idx_to_lag(candidate_set)))
         while candidate_set:
             # Get realisations for all candidates.
@@ -364,9 +515,9 @@ class ActiveInformationStorage(SingleProcessAnalysis):
                 # The algorithm cannot continue here, so
                 #  we'll terminate the search for more candidates,
                 #  though those identified already remain valid
-                print('AlgorithmExhaustedError encountered in '
+                logger.warning('AlgorithmExhaustedError encountered in '
                     'estimations: ' + aee.message)
-                print('Halting current estimation set.')
+                logger.warning('Halting current estimation set.')
                 # For now we don't need a stack trace:
                 # traceback.print_tb(aee.__traceback__)
                 break
@@ -375,8 +526,8 @@ class ActiveInformationStorage(SingleProcessAnalysis):
             te_max_candidate = max(temp_te)
             max_candidate = candidate_set[np.argmax(temp_te)]
             if self.settings['verbose']:
-                print('testing candidate {0} '.format(
-                                self._idx_to_lag([max_candidate])[0]), end='')
+                logger.info('testing candidate {0}'.format(
+                                self._idx_to_lag([max_candidate])[0]))
             significant = False
             try:
                 significant = stats.max_statistic(self, data, candidate_set,
@@ -385,9 +536,10 @@ class ActiveInformationStorage(SingleProcessAnalysis):
                 # The algorithm cannot continue here, so
                 #  we'll terminate the check on the max stats and not let the
                 #  source pass
-                print('AlgorithmExhaustedError encountered in '
+                logger.warning('AlgorithmExhaustedError encountered in '
                     'estimations: ' + aee.message)
-                print('Halting max stats and further selection for target.')
+                logger.warning('Halting max stats and further selection for '
+                               'target.')
                 # For now we don't need a stack trace:
                 # traceback.print_tb(aee.__traceback__)
                 break
@@ -408,7 +560,7 @@ class ActiveInformationStorage(SingleProcessAnalysis):
                                               [max_candidate])[0])
             else:
                 if self.settings['verbose']:
-                    print(' -- not significant')
+                    logger.info(' -- not significant')
                 break
 
         return success
@@ -428,10 +580,10 @@ class ActiveInformationStorage(SingleProcessAnalysis):
         # FOR LATER we don't need to test the last included in the first round
         if self.settings['verbose']:
             if self.selected_vars_sources:
-                print('testing candidate set: {0}'.format(
-                        self._idx_to_lag(self.selected_vars_sources)), end='')
+                logger.info('testing candidate set: {0}'.format(
+                        self._idx_to_lag(self.selected_vars_sources)))
             else:
-                print('no sources selected, nothing to prune ...')
+                logger.info('no sources selected, nothing to prune ...')
         while self.selected_vars_sources:
             # Find the candidate with the minimum TE into the target.
             cond_dim = len(self.selected_vars_sources) - 1
@@ -472,10 +624,10 @@ class ActiveInformationStorage(SingleProcessAnalysis):
                     # The algorithm cannot continue here, so
                     #  we'll terminate the pruning check,
                     #  assuming that we need not prune any more
-                    print('AlgorithmExhaustedError encountered in '
+                    logger.warning('AlgorithmExhaustedError encountered in '
                         'estimations: ' + aee.message)
-                    print('Halting current pruning and allowing others to'
-                        ' remain.')
+                    logger.warning('Halting current pruning and allowing '
+                                   'others to remain.')
                     # For now we don't need a stack trace:
                     # traceback.print_tb(aee.__traceback__)
                     break
@@ -484,7 +636,7 @@ class ActiveInformationStorage(SingleProcessAnalysis):
             te_min_candidate = min(temp_te)
             min_candidate = self.selected_vars_sources[np.argmin(temp_te)]
             if self.settings['verbose']:
-                print('{0}'.format(self._idx_to_lag([min_candidate])[0]))
+                logger.info('{0}'.format(self._idx_to_lag([min_candidate])[0]))
             try:
                 [significant, p, surr_table] = stats.min_statistic(
                                               self, data,
@@ -494,9 +646,9 @@ class ActiveInformationStorage(SingleProcessAnalysis):
                 # The algorithm cannot continue here, so
                 #  we'll terminate the min statistics
                 #  assuming that we need not prune any more
-                print('AlgorithmExhaustedError encountered in '
+                logger.warning('AlgorithmExhaustedError encountered in '
                     'estimations: ' + aee.message)
-                print('Halting current pruning and allowing others to'
+                logger.warning('Halting current pruning and allowing others to'
                     ' remain.')
                 # For now we don't need a stack trace:
                 # traceback.print_tb(aee.__traceback__)
@@ -511,7 +663,7 @@ class ActiveInformationStorage(SingleProcessAnalysis):
                 self._remove_selected_var(min_candidate)
             else:
                 if self.settings['verbose']:
-                    print(' -- significant')
+                    logger.info(' -- significant')
                 self._min_stats_surr_table = surr_table
                 break
 
@@ -519,16 +671,17 @@ class ActiveInformationStorage(SingleProcessAnalysis):
         """Perform statistical test on AIS using the final conditional set."""
         if self._selected_vars_full:
             if self.settings['verbose']:
-                print('selected sources: {0}'.format(
+                logger.info('selected sources: {0}'.format(
                     self._idx_to_lag(self.selected_vars_full)))
             try:
                 [ais, s, p] = stats.mi_against_surrogates(self, data)
             except ex.AlgorithmExhaustedError as aee:
                 # The algorithm cannot continue here, so
                 #  we'll set the results to zero
-                print('AlgorithmExhaustedError encountered in '
+                logger.warning('AlgorithmExhaustedError encountered in '
                     'estimations: ' + aee.message)
-                print('Halting AIS final conditional test and setting to not significant.')
+                logger.warning('Halting AIS final conditional test and '
+                               'setting to not significant.')
                 # For now we don't need a stack trace:
                 # traceback.print_tb(aee.__traceback__)
                 ais = 0
@@ -552,10 +705,11 @@ class ActiveInformationStorage(SingleProcessAnalysis):
                 except ex.AlgorithmExhaustedError as aee:
                     # The algorithm cannot continue here, so
                     #  we'll set the results to zero
-                    print('AlgorithmExhaustedError encountered in '
+                    logger.warning('AlgorithmExhaustedError encountered in '
                         'final local AIS estimations: ' + aee.message)
-                    print('Setting all local results to zero (but leaving'
-                        ' surrogate statistical test results)')
+                    logger.warning('Setting all local results to zero (but '
+                                   'leaving surrogate statistical test '
+                                   'results)')
                     # For now we don't need a stack trace:
                     # traceback.print_tb(aee.__traceback__)
                     # Return local AIS values of all zeros:
@@ -572,7 +726,7 @@ class ActiveInformationStorage(SingleProcessAnalysis):
             self.pvalue = p
         else:
             if self.settings['verbose']:
-                print('no sources selected')
+                logger.info('no sources selected')
             self.ais = np.nan
             self.sign = False
             self.pvalue = 1.0
@@ -581,8 +735,8 @@ class ActiveInformationStorage(SingleProcessAnalysis):
         """Enforce a given conditioning set."""
         if type(cond) is tuple:  # easily add single variable
             cond = [cond]
-        print('Adding the following variables to the conditioning set: {0}.'.
-              format(cond))
+        logger.debug('Adding the following variables to the conditioning '
+                     'set: {0}.'.format(cond))
         cond_idx = self._lag_to_idx(cond)
         self._append_selected_vars(
             cond_idx, data.get_realisations(self.current_value, cond_idx)[0])
@@ -590,8 +744,10 @@ class ActiveInformationStorage(SingleProcessAnalysis):
     def _reset(self):
         """Reset instance after analysis."""
         self.__init__()
+        del self._embedding_cache
         del self.pvalue
         del self.sign
         del self.ais
         del self.settings
         del self._cmi_estimator
+        del self._profiler
@@ -1,7 +1,12 @@
 """Provide data structures for IDTxl analysis."""
+import logging
+import hashlib
 import numpy as np
+from scipy import sparse
 from . import idtxl_utils as utils
 
+logger = logging.getLogger(__name__)
+
 VERBOSE = False
 
 
@@ -106,6 +111,84 @@ class Data():
         """Number of realisations over replications."""
         return self.n_replications
 
+    def discretise(self, n_bins, method='max_ent'):
+        """Return discretised data as new Data object.
+
+        Discretise each process once, using all samples and replications of
+        the process to define bins. Discrete estimators can then be used
+        with the setting discretise_method='none', such that realisations
+        are not discretised again in each call to the estimator (e.g., for
+        each surrogate). Note that this also changes the binning: when
+        discretising in the estimator, bins are defined for each set of
+        realisations passed to the estimator.
+
+        Args:
+            n_bins : int
+                number of bins, i.e., alphabet size of the discretised data
+            method : str [optional]
+                'max_ent' for maximum entropy binning or 'equal' for bins of
+                equal size (default='max_ent')
+
+        Returns:
+            Data instance
+                discretised data with integer values in [0, n_bins - 1]
+        """
+        if method == 'max_ent':
+            discretise = utils.discretise_max_ent
+        elif method == 'equal':
+            discretise = utils.discretise
+        else:
+            raise RuntimeError('Unknown discretisation method {0}, use '
+                               '\'max_ent\' or \'equal\'.'.format(method))
+        d = np.empty(self.data.shape, dtype=np.int_)
+        for process in range(self.n_processes):
+            d[process, :, :] = discretise(
+                self.data[process, :, :].ravel(), n_bins).reshape(
+                    self.n_samples, self.n_replications)
+        return Data(d, dim_order='psr', normalise=False)
+
+    def get_window(self, start, stop):
+        """Return a window of samples as new Data object.
+
+        The returned object holds a view on the data array of the current
+        object, i.e., the data are not copied. Data are not normalised again,
+        if the current object holds normalised data, the window holds the
+        same, normalised data.
+
+        Args:
+            start : int
+                index of the first sample in the window
+            stop : int
+                index of the sample after the last sample in the window
+
+        Returns:
+            Data instance
+                data in the window, with the same processes and replications
+        """
+        if not 0 <= start < stop <= self.n_samples:
+            raise RuntimeError('Invalid window [{0}, {1}) for data with {2} '
+                               'samples.'.format(start, stop, self.n_samples))
+        window = Data(normalise=False)
+        window.set_data(self.data[:, start:stop, :], 'psr')
+        window.normalise = self.normalise
+        return window
+
+    def get_fingerprint(self):
+        """Return fingerprint of the data.
+
+        Return a hash over the data array, its shape, and data type. The
+        fingerprint can be used as a key when caching results calculated from
+        the data.
+
+        Returns:
+            str
+                hexadecimal SHA-1 digest
+        """
+        h = hashlib.sha1()
+        h.update(str((self.data.shape, self.data.dtype.str)).encode())
+        h.update(np.ascontiguousarray(self.data))
+        return h.hexdigest()
+
     @property
     def data(self):
         """Return data array."""
@@ -121,7 +204,7 @@ class Data():
 
     @data.deleter
     def data(self):
-        print('overwriting existing data')
+        logger.debug('overwriting existing data')
         del(self._data)
 
     def set_data(self, data, dim_order):
@@ -147,9 +230,9 @@ class Data():
         # set data.
         data_ordered = self._reorder_data(data, dim_order)
         self._set_data_size(data_ordered)
-        print('Adding data with properties: {0} processes, {1} samples, {2} '
-              'replications'.format(self.n_processes, self.n_samples,
-                                    self.n_replications))
+        logger.info('Adding data with properties: {0} processes, {1} samples, '
+                    '{2} replications'.format(self.n_processes, self.n_samples,
+                                              self.n_replications))
         try:
             delattr(self, 'data')
         except AttributeError:
@@ -196,7 +279,8 @@ class Data():
         self.n_samples = data.shape[1]
         self.n_replications = data.shape[2]
 
-    def get_realisations(self, current_value, idx_list, shuffle=False):
+    def get_realisations(self, current_value, idx_list, shuffle=False,
+                         rng=None):
         """Return realisations for a list of indices.
 
         Return realisations for indices in list. Optionally, realisations can
@@ -227,6 +311,9 @@ class Data():
                 samples for a process are returned
             shuffle: bool
                 if true permute blocks of replications over trials
+            rng : numpy RandomState instance [optional]
+                random number generator used for shuffling (default=global
+                random state of numpy)
 
         Returns:
             numpy array
@@ -244,8 +331,8 @@ class Data():
             return None, None
         # Check if requested indices are smaller than the current_value.
         if not all(np.array([x[1] for x in idx_list]) <= current_value[1]):
-            print('Index list: {0}\ncurrent value: {1}'.format(idx_list,
-                                                               current_value))
+            logger.error('Index list: {0}, current value: {1}'.format(
+                idx_list, current_value))
             raise RuntimeError('All indices for which data is retrieved must '
                                ' be smaller than the current value.')
 
@@ -259,7 +346,9 @@ class Data():
         # data by permuting replications while keeping the order of samples
         # intact.
         if shuffle:
-            replications_order = np.random.permutation(self.n_replications)
+            if rng is None:
+                rng = np.random
+            replications_order = rng.permutation(self.n_replications)
         else:
             replications_order = np.arange(self.n_replications)
 
@@ -342,8 +431,9 @@ class Data():
         """
         # Check if requested indices are smaller than the current_value.
         if not offset_samples <= self.n_samples:
-            print('Offset {0} must be smaller than number of samples in the '
-                  ' data ({1})'.format(offset_samples, self.n_samples))
+            logger.error('Offset {0} must be smaller than number of samples '
+                         'in the data ({1})'.format(offset_samples,
+                                                    self.n_samples))
             raise RuntimeError('Offset must be smaller than no. samples.')
 
         # Shuffle the replication order if requested. This creates surrogate
@@ -480,7 +570,7 @@ class Data():
             data_slice_perm[:, r] = data_slice[perm, r]
         return data_slice_perm, perm
 
-    def permute_replications(self, current_value, idx_list):
+    def permute_replications(self, current_value, idx_list, rng=None):
         """Return realisations with permuted replications (time stays intact).
 
         Create surrogate data by permuting realisations over replications while
@@ -509,6 +599,9 @@ class Data():
                 index of the current_value in the data
             idx_list : list of tuples
                 indices of variables
+            rng : numpy RandomState instance [optional]
+                random number generator used for shuffling (default=global
+                random state of numpy)
 
         Returns:
             numpy array
@@ -522,9 +615,11 @@ class Data():
         """
         if type(idx_list) is not list:
             raise TypeError('idx needs to be a list of tuples.')
-        return self.get_realisations(current_value, idx_list, shuffle=True)
+        return self.get_realisations(current_value, idx_list, shuffle=True,
+                                     rng=rng)
 
-    def permute_samples(self, current_value, idx_list, perm_settings):
+    def permute_samples(self, current_value, idx_list, perm_settings,
+                        rng=None):
         """Return realisations with permuted samples (repl. stays intact).
 
         Create surrogate data by permuting realisations over samples (time)
@@ -619,6 +714,9 @@ class Data():
                       'perm_range' : int
                         range in samples over which realisations can be
                         permuted (e.g., number of samples / 10)
+            rng : numpy RandomState instance [optional]
+                random number generator used for shuffling (default=global
+                random state of numpy)
 
         Returns:
             numpy array
@@ -639,7 +737,7 @@ class Data():
         [realisations, replication_idx] = self.get_realisations(current_value,
                                                                 idx_list)
         n_samples = sum(replication_idx == 0)
-        perm = self._get_permutation_samples(n_samples, perm_settings)
+        perm = self._get_permutation_samples(n_samples, perm_settings, rng)
         # Apply the permutation to data from each replication.
         realisations_perm = np.empty(realisations.shape).astype(self.data_type)
         perm_idx = np.empty(realisations_perm.shape[0])
@@ -650,7 +748,7 @@ class Data():
             perm_idx[mask] = perm
         return realisations_perm, perm_idx
 
-    def _get_permutation_samples(self, n_samples, perm_settings):
+    def _get_permutation_samples(self, n_samples, perm_settings, rng=None):
         """Generate permutation of n samples.
 
         Generate a permutation of n samples under various, possible
@@ -666,6 +764,9 @@ class Data():
             perm_settings : dict
                 settings specifying the allowed permutations, see documentation
                 of permute_samples()
+            rng : numpy RandomState instance [optional]
+                random number generator used for shuffling (default=global
+                random state of numpy)
 
         Returns:
             numpy array
@@ -674,17 +775,19 @@ class Data():
                 permuted indices of samples
         """
         perm_type = perm_settings['perm_type']
+        if rng is None:
+            rng = np.random
 
         # Get the permutaion 'mask' for one replication (the same mask is then
         # applied to each replication).
         if perm_type == 'random':
-            perm = np.random.permutation(n_samples)
+            perm = rng.permutation(n_samples)
 
         elif perm_type == 'circular':
             max_shift = perm_settings['max_shift']
             if type(max_shift) is not int or max_shift < 1:
                 raise TypeError(' ''max_shift'' has to be an int > 0.')
-            perm = self._circular_shift(n_samples, max_shift)[0]
+            perm = self._circular_shift(n_samples, max_shift, rng)[0]
 
         elif perm_type == 'block':
             block_size = perm_settings['block_size']
@@ -693,20 +796,20 @@ class Data():
                 raise TypeError(' ''block_size'' has to be an int > 0.')
             if type(perm_range) is not int or perm_range < 1:
                 raise TypeError(' ''perm_range'' has to be an int > 0.')
-            perm = self._swap_blocks(n_samples, block_size, perm_range)
+            perm = self._swap_blocks(n_samples, block_size, perm_range, rng)
 
         elif perm_type == 'local':
             perm_range = perm_settings['perm_range']
             if type(perm_range) is not int or perm_range < 1:
                 raise TypeError(' ''perm_range'' has to be an int > 0.')
-            perm = self._swap_local(n_samples, perm_range)
+            perm = self._swap_local(n_samples, perm_range, rng)
 
         else:
             raise ValueError('Unknown permutation type ({0}).'.format(
                                                                     perm_type))
         return perm
 
-    def _swap_local(self, n, perm_range):
+    def _swap_local(self, n, perm_range, rng=None):
         """Permute n samples within blocks of length 'perm_range'.
 
         Args:
@@ -714,6 +817,9 @@ class Data():
                 number of samples
             perm_range : int
                 range over which realisations are permuted
+            rng : numpy RandomState instance [optional]
+                random number generator used for shuffling (default=global
+                random state of numpy)
 
         Returns:
             numpy array
@@ -726,20 +832,22 @@ class Data():
                                    '"perm_range" of {1}.' .format(n,
                                                                   perm_range))
 
+        if rng is None:
+            rng = np.random
         if perm_range == n:  # permute all n samples randomly
-            perm = np.random.permutation(n)
+            perm = rng.permutation(n)
         else:  # build a permutation that permutes only within the perm_range
             perm = np.empty(n, dtype=int)
             remainder = n % perm_range
             i = 0
             for p in range(n // perm_range):
-                perm[i:i + perm_range] = np.random.permutation(perm_range) + i
+                perm[i:i + perm_range] = rng.permutation(perm_range) + i
                 i += perm_range
             if remainder > 0:
-                perm[-remainder:] = np.random.permutation(remainder) + i
+                perm[-remainder:] = rng.permutation(remainder) + i
         return perm
 
-    def _swap_blocks(self, n, block_size, perm_range):
+    def _swap_blocks(self, n, block_size, perm_range, rng=None):
         """Permute blocks of samples in a time series within a given range.
 
         Permute n samples by swapping blocks of samples within a given range.
@@ -751,6 +859,9 @@ class Data():
                 number of samples in a block
             perm_range : int
                 range over which blocks can be swapped
+            rng : numpy RandomState instance [optional]
+                random number generator used for shuffling (default=global
+                random state of numpy)
 
         Returns:
             numpy array
@@ -763,18 +874,20 @@ class Data():
             rem_samples = block_size
 
         # First permute block(!) indices.
+        if rng is None:
+            rng = np.random
         if perm_range == n_blocks:  # permute all blocks randomly
-            perm_blocks = np.random.permutation(n_blocks)
+            perm_blocks = rng.permutation(n_blocks)
         else:  # build a permutation that permutes only within the perm_range
             perm_blocks = np.empty(n_blocks, dtype=int)
 
             i = 0
             for p in range(n_blocks // perm_range):
-                perm_blocks[i:i + perm_range] = np.random.permutation(
+                perm_blocks[i:i + perm_range] = rng.permutation(
                                                                 perm_range) + i
                 i += perm_range
             if rem_blocks > 0:
-                perm_blocks[-rem_blocks:] = np.random.permutation(
+                perm_blocks[-rem_blocks:] = rng.permutation(
                                                                 rem_blocks) + i
 
         # Get the block index for each sample index, take into account that the
@@ -794,7 +907,7 @@ class Data():
 
         return perm
 
-    def _circular_shift(self, n, max_shift):
+    def _circular_shift(self, n, max_shift, rng=None):
         """Permute samples through shifting by a random number of samples.
 
         A time series is shifted circularly by a random number of samples. A
@@ -807,6 +920,9 @@ class Data():
                 number of samples
             max_shift: int
                 maximum possible shift (default=n)
+            rng : numpy RandomState instance [optional]
+                random number generator used for shuffling (default=global
+                random state of numpy)
 
         Returns:
             numpy array
@@ -817,9 +933,12 @@ class Data():
         assert (max_shift <= n), ('Max_shift ({0}) has to be equal to or '
                                   'smaller than the number of samples in the '
                                   'time series ({1}).'.format(max_shift, n))
-        shift = np.random.randint(low=1, high=max_shift + 1)
+        if rng is None:
+            rng = np.random
+        shift = rng.randint(low=1, high=max_shift + 1)
         if VERBOSE:
-            print("replications are shifted by {0} samples".format(shift))
+            logger.info('replications are shifted by {0} samples'.format(
+                shift))
         return np.hstack((np.arange(n - shift, n),
                           np.arange(n - shift))), shift
 
@@ -865,19 +984,18 @@ class Data():
         term_1 = 0.95 * np.sqrt(2)
         term_2 = 0.25 * np.sqrt(2)
         term_3 = -0.25 * np.sqrt(2)
-        for r in range(n_replications):
-            for n in range(3, n_samples + 3):
-                x[0, n, r] = (term_1 * x[0, n - 1, r] -
-                              0.9025 * x[0, n - 2, r] + np.random.normal())
-                x[1, n, r] = 0.5 * x[0, n - 2, r] ** 2 + np.random.normal()
-                x[2, n, r] = -0.4 * x[0, n - 3, r] + np.random.normal()
-                x[3, n, r] = (-0.5 * x[0, n - 2, r] ** 2 +
-                              term_2 * x[3, n - 1, r] +
-                              term_2 * x[4, n - 1, r] +
-                              np.random.normal())
-                x[4, n, r] = (term_3 * x[3, n - 1, r] +
-                              term_2 * x[4, n - 1, r] +
-                              np.random.normal())
+        # Advance all replications at once, draw noise for all time steps
+        # beforehand.
+        noise = np.random.normal(size=x.shape)
+        for n in range(3, n_samples + 3):
+            x[0, n] = (term_1 * x[0, n - 1] - 0.9025 * x[0, n - 2] +
+                       noise[0, n])
+            x[1, n] = 0.5 * x[0, n - 2] ** 2 + noise[1, n]
+            x[2, n] = -0.4 * x[0, n - 3] + noise[2, n]
+            x[3, n] = (-0.5 * x[0, n - 2] ** 2 + term_2 * x[3, n - 1] +
+                       term_2 * x[4, n - 1] + noise[3, n])
+            x[4, n] = (term_3 * x[3, n - 1] + term_2 * x[4, n - 1] +
+                       noise[4, n])
         self.set_data(x[:, 3:, :], 'psr')
 
     def generate_var_data(
@@ -885,11 +1003,16 @@ class Data():
         n_samples=1000,
         n_replications=10,
         coefficient_matrices=np.array([[[0.5, 0], [0.4, 0.5]]]),
-        noise_std=0.1
+        noise_std=0.1,
+        memmap_file=None
     ):
         """Generate discrete-time VAR (vector autoregressive) time series.
 
-        Generate data and overwrite the instance's current data.
+        Generate data and overwrite the instance's current data. All
+        replications are simulated at once. Data are generated in chunks of
+        samples, which may be written to a memory-mapped file to generate
+        data sets that do not fit into memory (set normalise=False for the
+        Data instance, normalisation creates a copy of the data in memory).
 
         Args:
             n_samples : int [optional]
@@ -906,6 +1029,9 @@ class Data():
             noise_std : float [optional]
                 standard deviation of uncorrelated Gaussian noise
                 (default = 0.1)
+            memmap_file : str [optional]
+                if provided, data are written to a .npy-file and the
+                instance's data are memory-mapped to this file (default=None)
         """
         order = np.shape(coefficient_matrices)[0]
         n_processes = np.shape(coefficient_matrices)[1]
@@ -931,51 +1057,23 @@ class Data():
         if not is_stable:
             RuntimeError('VAR process is not stable and may be nonstationary.')
 
-        # Initialise time series matrix. The 3 dimensions represent
-        # (processes, samples, replications). Only the last n_samples will be
-        # kept, in order to discard transient effects.
-        x = np.zeros((
-            n_processes,
-            order + samples_transient + n_samples,
-            n_replications
-        ))
-
-        # Generate (different) initial conditions for each replication:
-        # Uniformly sample from the [0,1] interval and tile as many times as
-        # the VAR process order along the second dimension.
-        x[:, 0:order, :] = np.tile(
-            np.random.rand(n_processes, 1, n_replications),
-            (1, order, 1)
-        )
-
-        # Compute time series
-        for i_repl in range(0, n_replications):
-            for i_sample in range(order, order + samples_transient + n_samples):
-                for i_delay in range(1, order + 1):
-                    x[:, i_sample, i_repl] += np.dot(
-                        coefficient_matrices[i_delay - 1, :, :],
-                        x[:, i_sample - i_delay, i_repl]
-                    )
-                # Add uncorrelated Gaussian noise vector
-                x[:, i_sample, i_repl] += np.random.normal(
-                    0,  # mean
-                    noise_std,
-                    x[:, i_sample, i_repl].shape
-                )
-
-        # Discard transient effects (only take end of time series)
-        self.set_data(x[:, -(n_samples + 1):-1, :], 'psr')
+        x = _simulate_ar(coefficient_matrices, n_samples, n_replications,
+                         noise_std, samples_transient, memmap_file=memmap_file)
+        self.set_data(x, 'psr')
 
     def generate_logistic_maps_data(
         self,
         n_samples=1000,
         n_replications=10,
         coefficient_matrices=np.array([[[0.5, 0], [0.4, 0.5]]]),
-        noise_std=0.1
+        noise_std=0.1,
+        memmap_file=None
     ):
         """Generate discrete-time coupled-logistic-maps time series.
 
-        Generate data and overwrite the instance's current data.
+        Generate data and overwrite the instance's current data. All
+        replications are simulated at once, data may be written to a
+        memory-mapped file, see generate_var_data().
 
         The implemented logistic map function is f(x) = 4 * x * (1 - x).
 
@@ -994,8 +1092,10 @@ class Data():
             noise_std : float [optional]
                 standard deviation of uncorrelated Gaussian noise
                 (default = 0.1)
+            memmap_file : str [optional]
+                if provided, data are written to a .npy-file and the
+                instance's data are memory-mapped to this file (default=None)
         """
-        order = np.shape(coefficient_matrices)[0]
         n_processes = np.shape(coefficient_matrices)[1]
         samples_transient = n_processes * 10
 
@@ -1003,41 +1103,167 @@ class Data():
         def f(x):
             return 4 * x * (1 - x)
 
-        # Initialise time series matrix. The 3 dimensions represent
-        # (processes, samples, replications). Only the last n_samples will be
-        # kept, in order to discard transient effects.
-        x = np.zeros((
-            n_processes,
-            order + samples_transient + n_samples,
-            n_replications
-        ))
+        x = _simulate_ar(coefficient_matrices, n_samples, n_replications,
+                         noise_std, samples_transient, activation=f,
+                         modulo=True, memmap_file=memmap_file)
+        self.set_data(x, 'psr')
+
+    def generate_sparse_var_data(self, n_processes, n_samples=1000,
+                                 n_replications=1, n_parents=2, max_lag=3,
+                                 noise_std=0.1, memmap_file=None):
+        """Generate VAR time series for a random sparse network.
+
+        Generate a random network, where each process receives links from
+        n_parents randomly chosen other processes, with random lags between
+        1 and max_lag. Each process further depends on its own past at lag 1.
+        Simulate a VAR process on the network and overwrite the instance's
+        current data.
+
+        Coefficients are drawn uniformly from [0.1, 0.5] with random sign and
+        are scaled such that the absolute coefficients of all inputs to a
+        process sum up to 0.9, which guarantees a stable VAR process. The
+        coupling is stored as sparse matrices, such that networks with many
+        processes can be simulated efficiently, see generate_var_data() for
+        memory-mapping of the generated data.
 
-        # Generate (different) initial conditions for each replication:
-        # Uniformly sample from the [0,1] interval and tile as many times as
-        # the stochastic process order along the second dimension.
-        x[:, 0:order, :] = np.tile(
-            np.random.rand(n_processes, 1, n_replications),
-            (1, order, 1)
-        )
+        Args:
+            n_processes : int
+                number of processes in the network
+            n_samples : int [optional]
+                number of samples simulated for each process and replication
+                (default=1000)
+            n_replications : int [optional]
+                number of replications (default=1)
+            n_parents : int [optional]
+                number of sources per process (default=2)
+            max_lag : int [optional]
+                maximum lag of a coupling (default=3)
+            noise_std : float [optional]
+                standard deviation of uncorrelated Gaussian noise
+                (default=0.1)
+            memmap_file : str [optional]
+                if provided, data are written to a .npy-file and the
+                instance's data are memory-mapped to this file (default=None)
+
+        Returns:
+            numpy array
+                ground truth, 2D array with dimensions (source, target),
+                where each entry is the lag of the coupling from source to
+                target or 0 if there is no coupling
+        """
+        if n_parents >= n_processes:
+            raise RuntimeError('The number of parents ({0}) has to be smaller '
+                               'than the number of processes ({1}).'.format(
+                                   n_parents, n_processes))
+        targets = np.repeat(np.arange(n_processes), n_parents)
+        sources = np.empty(targets.shape, dtype=int)
+        for t in range(n_processes):
+            # Draw parents from all other processes.
+            parents = np.random.choice(n_processes - 1, n_parents,
+                                       replace=False)
+            parents[parents >= t] += 1
+            sources[t * n_parents:(t + 1) * n_parents] = parents
+        lags = np.random.randint(1, max_lag + 1, size=targets.shape)
+        weights = (np.random.uniform(0.1, 0.5, size=targets.shape) *
+                   np.random.choice([-1, 1], size=targets.shape))
+
+        # Add self-coupling at lag 1 and scale all inputs to a process.
+        targets = np.hstack((targets, np.arange(n_processes)))
+        sources = np.hstack((sources, np.arange(n_processes)))
+        lags = np.hstack((lags, np.ones(n_processes, dtype=int)))
+        weights = np.hstack((weights, np.full(n_processes, 0.5)))
+        weights *= 0.9 / np.bincount(targets, weights=np.abs(weights))[targets]
+
+        coefficient_matrices = [
+            sparse.csr_matrix(
+                (weights[lags == lag],
+                 (targets[lags == lag], sources[lags == lag])),
+                shape=(n_processes, n_processes))
+            for lag in range(1, max_lag + 1)]
+        x = _simulate_ar(coefficient_matrices, n_samples, n_replications,
+                         noise_std, n_processes * 10, memmap_file=memmap_file)
+        self.set_data(x, 'psr')
+
+        ground_truth = np.zeros((n_processes, n_processes), dtype=int)
+        n_links = n_processes * n_parents
+        ground_truth[sources[:n_links], targets[:n_links]] = lags[:n_links]
+        return ground_truth
+
+
+def _simulate_ar(coefficient_matrices, n_samples, n_replications, noise_std,
+                 samples_transient, activation=None, modulo=False,
+                 memmap_file=None, chunk_size=10000):
+    """Simulate an autoregressive process for all replications at once.
+
+    For each time step, the weighted sum over past values of all processes
+    is computed for all replications at once, passed through an optional
+    activation function, and Gaussian noise is added. Samples are simulated
+    in chunks, noise is drawn once per chunk. Only chunks and the samples
+    needed to compute the next step are held in memory, such that samples
+    can be written to a memory-mapped file.
 
-        # Compute time series
-        for i_repl in range(0, n_replications):
-            for i_sample in range(order, order + samples_transient + n_samples):
-                for i_delay in range(1, order + 1):
-                    x[:, i_sample, i_repl] += np.dot(
-                        coefficient_matrices[i_delay - 1, :, :],
-                        x[:, i_sample - i_delay, i_repl]
-                    )
-                # Compute activation function
-                x[:, i_sample, i_repl] = f(x[:, i_sample, i_repl])
-                # Add uncorrelated Gaussian noise vector
-                x[:, i_sample, i_repl] += np.random.normal(
-                    0,  # mean
-                    noise_std,
-                    x[:, i_sample, i_repl].shape
-                )
-                # ensure values are in the [0, 1] range
-                x[:, i_sample, i_repl] = x[:, i_sample, i_repl] % 1
-
-        # Discard transient effects (only take end of time series)
-        self.set_data(x[:, -(n_samples + 1):-1, :], 'psr')
+    Args:
+        coefficient_matrices : numpy array | list of scipy sparse matrices
+            coefficient matrices for each lag, each matrix has dimensions
+            (target process, source process)
+        n_samples : int
+            number of samples returned for each process and replication
+        n_replications : int
+            number of replications
+        noise_std : float
+            standard deviation of uncorrelated Gaussian noise
+        samples_transient : int
+            number of samples simulated and discarded before the first
+            returned sample
+        activation : callable [optional]
+            function applied to the weighted sum (default=None)
+        modulo : bool [optional]
+            map values to the [0, 1) range after adding noise (default=False)
+        memmap_file : str [optional]
+            write data to a memory-mapped .npy-file (default=None)
+        chunk_size : int [optional]
+            number of samples simulated per chunk (default=10000)
+
+    Returns:
+        numpy array | numpy memmap
+            simulated data with dimensions (processes, samples, replications)
+    """
+    order = len(coefficient_matrices)
+    n_processes = coefficient_matrices[0].shape[0]
+    shape = (n_processes, n_samples, n_replications)
+    if memmap_file is None:
+        x = np.empty(shape)
+    else:
+        x = np.lib.format.open_memmap(memmap_file, mode='w+', shape=shape)
+
+    # Generate (different) initial conditions for each replication:
+    # Uniformly sample from the [0,1] interval and repeat as many times as
+    # the process order along the second dimension.
+    chunk = np.empty((n_processes, order + chunk_size, n_replications))
+    chunk[:, :order, :] = np.random.rand(n_processes, 1, n_replications)
+    n_total = samples_transient + n_samples
+    t = 0
+    while t < n_total:
+        n = min(chunk_size, n_total - t)
+        chunk[:, order:order + n, :] = np.random.normal(
+            0, noise_std, (n_processes, n, n_replications))
+        for i in range(order, order + n):
+            s = coefficient_matrices[0] @ chunk[:, i - 1, :]
+            for lag in range(2, order + 1):
+                s = s + coefficient_matrices[lag - 1] @ chunk[:, i - lag, :]
+            if activation is not None:
+                s = activation(s)
+            chunk[:, i, :] += s
+            # Wrap each sample before it is fed back into the next step,
+            # e.g., logistic maps diverge for values outside [0, 1].
+            if modulo:
+                chunk[:, i, :] %= 1
+
+        # Write samples after the transient to output.
+        first = max(samples_transient - t, 0)
+        if first < n:
+            x[:, t + first - samples_transient:t + n - samples_transient,
+              :] = chunk[:, order + first:order + n, :]
+        chunk[:, :order, :] = chunk[:, n:n + order, :]
+        t += n
+    return x
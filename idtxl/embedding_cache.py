@@ -0,0 +1,168 @@
+"""Cache for variables selected from the past of individual processes.
+
+Active information storage (AIS) estimation and transfer entropy (TE) network
+inference both select informative variables from a process's own past using
+the same greedy, non-uniform embedding (see the class docstring of
+ActiveInformationStorage for references). The cache stores the result of
+this selection such that it has to be run only once per process.
+"""
+import os
+import pickle
+import hashlib
+
+
+class EmbeddingCache():
+    """Store variables selected from the past of individual processes.
+
+    Store the variables selected from a process's past by the inclusion step
+    of the non-uniform embedding, i.e., before pruning. The cache is shared
+    between analyses by passing the same instance via the setting
+    'embedding_cache'. The cache is used by
+
+    - ActiveInformationStorage when selecting samples from a process's past,
+    - MultivariateTE and BivariateTE when selecting samples from the target's
+      past.
+
+    Entries are keyed by a fingerprint of the data, the process and the
+    current value, the maximum lag and spacing of candidates, and all
+    settings that affect the selection (e.g., estimator settings and
+    settings for maximum statistics). To re-use an AIS embedding in TE
+    estimation, 'max_lag_target' and 'tau_target' have to be equal to the
+    AIS settings 'max_lag' and 'tau', and 'max_lag_sources' must not be larger
+    than 'max_lag_target' (such that the same current value is used).
+
+    Example:
+
+        >>> cache = EmbeddingCache()
+        >>> settings_ais = {'cmi_estimator': 'JidtKraskovCMI',
+        >>>                 'max_lag': 5,
+        >>>                 'embedding_cache': cache}
+        >>> results_ais = ActiveInformationStorage().analyse_network(
+        >>>     settings_ais, data)
+        >>> settings_te = {'cmi_estimator': 'JidtKraskovCMI',
+        >>>                'max_lag_sources': 5,
+        >>>                'min_lag_sources': 1,
+        >>>                'max_lag_target': 5,
+        >>>                'embedding_cache': cache}
+        >>> results_te = MultivariateTE().analyse_network(settings_te, data)
+        >>> print(cache.n_hits)
+
+    Args:
+        path : str [optional]
+            directory to store cache entries on disk, entries are loaded from
+            this directory if they are not found in memory; if None, the
+            cache is held in memory only (default=None)
+
+    Attributes:
+        n_hits : int
+            number of successful look-ups
+        n_misses : int
+            number of unsuccessful look-ups
+    """
+
+    # Settings that do not affect the selection of variables from a process's
+    # past. These are ignored when creating cache keys.
+    IGNORED_SETTINGS = [
+        'verbose', 'fdr_correction', 'local_values', 'n_workers',
+        'worker_type', 'n_cores', 'num_threads', 'blas_threads',
+        'jvm_heap_size', 'jvm_assertions', 'jvm_options', 'jvm_warm_up',
+        'thread_budget', 'profile', 'prescreen', 'prescreen_n_keep',
+        'prescreen_threshold', 'prescreen_n_realisations', 'lag_search',
+        'lag_search_step', 'lag_search_radius',
+        'max_lag', 'tau', 'max_lag_sources', 'min_lag_sources', 'tau_sources',
+        'max_lag_target', 'tau_target',
+        'n_perm_min_stat', 'alpha_min_stat', 'n_perm_omnibus',
+        'alpha_omnibus', 'n_perm_max_seq', 'alpha_max_seq', 'n_perm_mi',
+        'alpha_mi', 'alpha_fdr', 'fdr_constant', 'fdr_correct_by_target',
+        'correct_by_target']
+
+    def __init__(self, path=None):
+        self.path = path
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+        self._entries = {}
+        self.n_hits = 0
+        self.n_misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_key(self, data, current_value, max_lag, tau, settings):
+        """Return key for the embedding of a single process.
+
+        Args:
+            data : Data instance
+                raw data for analysis
+            current_value : tuple
+                index of the current value, (idx process, idx sample)
+            max_lag : int
+                maximum lag of candidates in the process's past
+            tau : int
+                spacing between candidates in the process's past
+            settings : dict
+                analysis settings
+
+        Returns:
+            str
+                cache key
+        """
+        key_settings = {k: v for (k, v) in settings.items()
+                        if k not in self.IGNORED_SETTINGS}
+        # Add defaults used by stats.max_statistic() to get the same key,
+        # independent of whether defaults were set explicitly.
+        key_settings.setdefault('n_perm_max_stat', 200)
+        key_settings.setdefault('alpha_max_stat', 0.05)
+        key_settings.setdefault('permute_in_time', False)
+        key = str((data.get_fingerprint(), current_value, max_lag, tau,
+                   sorted([(k, str(v)) for (k, v) in key_settings.items()])))
+        return hashlib.sha1(key.encode()).hexdigest()
+
+    def get(self, key):
+        """Return selected variables for a key.
+
+        Args:
+            key : str
+                cache key, see get_key()
+
+        Returns:
+            list of tuples | None
+                selected variables, where each variable is described as (idx
+                process, lag wrt to current value); None if key is not in
+                the cache
+        """
+        selected_vars = self._entries.get(key)
+        if selected_vars is None and self.path is not None:
+            filename = self._get_filename(key)
+            if os.path.isfile(filename):
+                with open(filename, 'rb') as f:
+                    selected_vars = pickle.load(f)
+                self._entries[key] = selected_vars
+        if selected_vars is None:
+            self.n_misses += 1
+        else:
+            self.n_hits += 1
+        return selected_vars
+
+    def add(self, key, selected_vars):
+        """Add selected variables for a key.
+
+        Args:
+            key : str
+                cache key, see get_key()
+            selected_vars : list of tuples
+                selected variables, where each variable is described as (idx
+                process, lag wrt to current value)
+        """
+        self._entries[key] = list(selected_vars)
+        if self.path is not None:
+            with open(self._get_filename(key), 'wb') as f:
+                pickle.dump(self._entries[key], f)
+
+    def update(self, cache):
+        """Add all entries from another cache instance."""
+        for key in cache._entries:
+            if key not in self._entries:
+                self.add(key, cache._entries[key])
+
+    def _get_filename(self, key):
+        return os.path.join(self.path, key + '.p')
@@ -0,0 +1,406 @@
+"""Cache for estimates of information-theoretic measures.
+
+Network inference and AIS estimation repeatedly estimate the same measure
+from the same realisations. For example, the conditional TE of each selected
+source is estimated when pruning candidates and again when testing the final
+conditional set with sequential maximum statistics, and re-running an
+analysis with different critical alpha levels repeats all estimates. The
+cache stores estimates keyed by a fingerprint of the realisations passed to
+the estimator and the estimator settings, such that each estimate has to be
+computed only once.
+"""
+import os
+import pickle
+import hashlib
+import inspect
+import logging
+import threading
+from collections import OrderedDict
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class EstimateCache():
+    """Store estimates returned by an estimator for given realisations.
+
+    The cache is shared between analyses by passing the same instance via the
+    setting 'estimate_cache'. Calls to the CMI estimator of an analysis are
+    then looked up in the cache (see wrap_estimator()). Calls to
+    estimate_parallel() are cached per chunk, such that estimates are re-used
+    if the same chunk of realisations is passed in a different call.
+
+    Entries are keyed by a fingerprint of the realisations of each variable,
+    the estimator class, and all estimator settings that affect the estimate.
+    The fingerprint is a hash over the individual dimensions (columns) of a
+    variable, where the order of dimensions is ignored because the estimated
+    measures do not depend on it. Surrogate data are cached as well, such
+    that surrogates created from the same random seed are not re-estimated
+    when re-running an analysis, e.g., with different critical alpha levels.
+
+    Example:
+
+        >>> cache = EstimateCache(filename='estimates.p')
+        >>> settings = {'cmi_estimator': 'JidtKraskovCMI',
+        >>>             'max_lag_sources': 5,
+        >>>             'min_lag_sources': 1,
+        >>>             'alpha_max_seq': 0.05,
+        >>>             'estimate_cache': cache}
+        >>> np.random.seed(0)
+        >>> results = MultivariateTE().analyse_network(settings, data)
+        >>> settings['alpha_max_seq'] = 0.01
+        >>> np.random.seed(0)
+        >>> results = MultivariateTE().analyse_network(settings, data)
+        >>> print(cache.get_statistics())
+        >>> cache.save()
+
+    Worker threads share the cache. Worker processes use a copy of the cache
+    and return the entries they added (see get_new_entries()), which are
+    collected in the cache passed in the settings. Hits and misses in worker
+    processes are not counted.
+
+    Args:
+        max_size : int [optional]
+            maximum number of entries held in memory, the least recently used
+            entries are removed first (default=100000)
+        filename : str [optional]
+            file to store entries on disk, entries are loaded from the file
+            if it exists and are written to the file by save(); if None, the
+            cache is held in memory only (default=None)
+
+    Attributes:
+        n_hits : int
+            number of successful look-ups
+        n_misses : int
+            number of unsuccessful look-ups
+        n_evicted : int
+            number of entries removed because the cache was full
+    """
+
+    # Analysis settings that do not affect estimates. These are ignored when
+    # creating cache keys.
+    IGNORED_SETTINGS = [
+        'verbose', 'fdr_correction', 'n_workers', 'worker_type', 'n_cores',
+        'num_threads', 'blas_threads', 'jvm_heap_size', 'jvm_assertions',
+        'jvm_options', 'jvm_warm_up', 'thread_budget', 'profile',
+        'add_conditionals', 'permute_in_time', 'analytical_surrogates',
+        'fdr_constant', 'fdr_correct_by_target', 'correct_by_target',
+        'max_lag', 'tau', 'max_lag_sources', 'min_lag_sources',
+        'tau_sources', 'max_lag_target', 'tau_target']
+    IGNORED_PREFIXES = ['alpha_', 'n_perm_', 'perm_', 'prescreen',
+                        'lag_search', 'null_fit']
+
+    def __init__(self, max_size=100000, filename=None):
+        if type(max_size) is not int or max_size < 1:
+            raise RuntimeError('max_size has to be an integer > 0.')
+        self.max_size = max_size
+        self.filename = filename
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.n_hits = 0
+        self.n_misses = 0
+        self.n_evicted = 0
+        self._new_keys = None
+        if filename is not None and os.path.isfile(filename):
+            with open(filename, 'rb') as f:
+                for (key, estimate) in pickle.load(f).items():
+                    self.add(key, estimate)
+            logger.debug('Loaded {0} estimates from {1}.'.format(
+                len(self), filename))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        state['_new_keys'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def get_key(self, estimator, data, method='estimate'):
+        """Return key for an estimate.
+
+        Args:
+            estimator : Estimator instance
+                estimator called
+            data : dict
+                realisations (numpy arrays) and further arguments passed to
+                the estimator (int, float, bool, or str), entries that are
+                None are ignored
+            method : str [optional]
+                estimator method called (default='estimate')
+
+        Returns:
+            str | None
+                cache key, None if an argument can not be used in a key
+        """
+        settings = getattr(estimator, 'settings', {})
+        key_settings = sorted([
+            (k, str(v)) for (k, v) in settings.items()
+            if k not in self.IGNORED_SETTINGS and
+            not any([k.startswith(p) for p in self.IGNORED_PREFIXES])])
+        key_data = []
+        for name in sorted(data):
+            if data[name] is None:
+                continue
+            fingerprint = _get_fingerprint(data[name])
+            if fingerprint is None:
+                return None
+            key_data.append((name, fingerprint))
+        key = str((type(estimator).__name__, method, key_settings, key_data))
+        return hashlib.sha1(key.encode()).hexdigest()
+
+    def get(self, key):
+        """Return estimate for a key.
+
+        Args:
+            key : str
+                cache key, see get_key()
+
+        Returns:
+            float | numpy array | None
+                estimate; None if key is not in the cache
+        """
+        with self._lock:
+            estimate = self._entries.get(key)
+            if estimate is None:
+                self.n_misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.n_hits += 1
+        if isinstance(estimate, np.ndarray):
+            return estimate.copy()
+        return estimate
+
+    def add(self, key, estimate):
+        """Add estimate for a key.
+
+        Args:
+            key : str
+                cache key, see get_key()
+            estimate : float | numpy array
+                estimate
+        """
+        if isinstance(estimate, np.ndarray):
+            estimate = estimate.copy()
+        elif isinstance(estimate, float):
+            # Store Python floats, JIDT estimators may return Java doubles,
+            # which can not be unpickled without a running JVM.
+            estimate = float(estimate)
+        with self._lock:
+            self._entries[key] = estimate
+            self._entries.move_to_end(key)
+            if self._new_keys is not None:
+                self._new_keys.append(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.n_evicted += 1
+
+    def update(self, cache):
+        """Add all entries from another cache instance or a dict of entries.
+
+        Args:
+            cache : EstimateCache instance | dict
+                cache or entries, e.g., returned by get_new_entries()
+        """
+        if isinstance(cache, EstimateCache):
+            cache = cache._entries
+        for key in list(cache):
+            if key not in self._entries:
+                self.add(key, cache[key])
+
+    def get_new_entries(self):
+        """Return entries added since the last call.
+
+        The first call starts recording of added entries and returns an empty
+        dict. Worker processes use this to return only the entries they
+        added instead of a copy of the whole cache.
+
+        Returns:
+            dict
+                entries added since the last call that are still held in the
+                cache
+        """
+        with self._lock:
+            keys = self._new_keys or []
+            self._new_keys = []
+            return {k: self._entries[k] for k in keys if k in self._entries}
+
+    def save(self, filename=None):
+        """Write entries to disk.
+
+        Args:
+            filename : str [optional]
+                output file (default=file passed on creation)
+        """
+        if filename is None:
+            filename = self.filename
+        if filename is None:
+            raise RuntimeError('No file name provided for saving the cache.')
+        with self._lock:
+            entries = dict(self._entries)
+        with open(filename, 'wb') as f:
+            pickle.dump(entries, f)
+
+    def get_statistics(self):
+        """Return number of entries, hits, misses, and evicted entries.
+
+        Returns:
+            dict
+                cache statistics with entries n_entries, n_hits, n_misses,
+                n_evicted, and hit_rate (fraction of successful look-ups)
+        """
+        n_lookups = self.n_hits + self.n_misses
+        return {'n_entries': len(self),
+                'n_hits': self.n_hits,
+                'n_misses': self.n_misses,
+                'n_evicted': self.n_evicted,
+                'hit_rate': self.n_hits / n_lookups if n_lookups else 0.0}
+
+    def wrap_estimator(self, estimator):
+        """Return estimator whose estimates are looked up in the cache."""
+        return CachedEstimator(estimator, self)
+
+
+class CachedEstimator():
+    """Wrap an estimator and look up its estimates in a cache.
+
+    All attributes and methods of the wrapped estimator are accessible
+    through the wrapper. Calls to estimate(), estimate_parallel(), and
+    estimate_surrogates_analytic() are looked up in the cache and passed on
+    to the wrapped estimator if they are not found.
+
+    Args:
+        estimator : Estimator instance
+            estimator to be wrapped
+        cache : EstimateCache instance
+            cache holding estimates
+    """
+
+    def __init__(self, estimator, cache):
+        self._estimator = estimator
+        self._cache = cache
+
+    def __getattr__(self, name):
+        if name in ['_estimator', '_cache']:
+            raise AttributeError(name)
+        return getattr(self._estimator, name)
+
+    def estimate(self, *args, **kwargs):
+        """Return cached estimate or estimate, see wrapped estimator."""
+        if kwargs.get('return_calc', False):
+            return self._estimator.estimate(*args, **kwargs)
+        # Key positional arguments by their names, such that positional and
+        # keyword calls share entries.
+        try:
+            data = inspect.signature(self._estimator.estimate).bind(
+                *args, **kwargs).arguments
+        except TypeError:
+            return self._estimator.estimate(*args, **kwargs)
+        key = self._cache.get_key(self._estimator, dict(data))
+        return self._call(key, self._estimator.estimate, args, kwargs)
+
+    def estimate_parallel(self, n_chunks=1, re_use=None, **data):
+        """Return cached estimates or estimate for each chunk.
+
+        Estimates are looked up for each chunk individually, chunks that are
+        not found are estimated in a single call to the wrapped estimator.
+        See the wrapped estimator for arguments.
+        """
+        if re_use is None:
+            re_use = []
+        slice_vars = [v for v in data
+                      if v not in re_use and data[v] is not None]
+        if not slice_vars:
+            key = self._cache.get_key(self._estimator, data,
+                                      method='estimate_parallel')
+            return self._call(key, self._estimator.estimate_parallel, (),
+                              dict(data, n_chunks=n_chunks, re_use=re_use))
+
+        # Look up chunks, chunks are keyed as calls to estimate().
+        chunk_size = data[slice_vars[0]].shape[0] // n_chunks
+        chunks = []
+        keys = []
+        for i in range(n_chunks):
+            chunk = {}
+            for v in data:
+                if v in slice_vars:
+                    chunk[v] = data[v][i * chunk_size:(i + 1) * chunk_size]
+                else:
+                    chunk[v] = data[v]
+            chunks.append(chunk)
+            keys.append(self._cache.get_key(self._estimator, chunk))
+        if None in keys:
+            return self._estimator.estimate_parallel(
+                n_chunks=n_chunks, re_use=re_use, **data)
+        estimates = np.empty(n_chunks)
+        missing = []
+        for (i, key) in enumerate(keys):
+            estimate = self._cache.get(key)
+            if estimate is None:
+                missing.append(i)
+            else:
+                estimates[i] = estimate
+        if not missing:
+            return estimates
+
+        # Estimate missing chunks in a single call.
+        if len(missing) == n_chunks:
+            missing_data = data
+        else:
+            missing_data = dict(data)
+            for v in slice_vars:
+                missing_data[v] = np.concatenate(
+                    [chunks[i][v] for i in missing], axis=0)
+        estimates[missing] = self._estimator.estimate_parallel(
+            n_chunks=len(missing), re_use=list(re_use), **missing_data)
+        for i in missing:
+            self._cache.add(keys[i], estimates[i])
+        return estimates
+
+    def estimate_surrogates_analytic(self, n_perm=200, **data):
+        """Return cached or estimate analytic surrogates."""
+        key = self._cache.get_key(self._estimator, dict(data, n_perm=n_perm),
+                                  method='estimate_surrogates_analytic')
+        return self._call(key, self._estimator.estimate_surrogates_analytic,
+                          (), dict(data, n_perm=n_perm))
+
+    def _call(self, key, method, args, kwargs):
+        if key is None:
+            return method(*args, **kwargs)
+        estimate = self._cache.get(key)
+        if estimate is None:
+            estimate = method(*args, **kwargs)
+            self._cache.add(key, estimate)
+        return estimate
+
+
+def _get_fingerprint(value):
+    """Return fingerprint of an estimator argument.
+
+    Arrays are hashed per dimension (column), the order of dimensions is
+    ignored. Return None for arguments that can not be fingerprinted.
+    """
+    if isinstance(value, np.ndarray):
+        if value.ndim > 2:
+            return None
+        columns = np.ascontiguousarray(value.reshape(value.shape[0], -1).T)
+        digests = []
+        for c in columns:
+            h = hashlib.sha1()
+            h.update(str((c.shape, c.dtype.str)).encode())
+            h.update(c)
+            digests.append(h.hexdigest())
+        return str(sorted(digests))
+    if isinstance(value, (bool, int, float, str, np.integer, np.floating)):
+        return repr(value)
+    if isinstance(value, (list, tuple)):
+        fingerprints = [_get_fingerprint(v) for v in value]
+        if None in fingerprints:
+            return None
+        return str(fingerprints)
+    return None
@@ -1,6 +1,15 @@
-"""Provide estimator base class for information theoretic measures."""
-import imp
-import os
+"""Provide estimator base class for information theoretic measures.
+
+Estimators are looked up by name in a static registry, which maps each
+estimator implemented in IDTxl to the module implementing it. Modules are
+imported only when an estimator is requested, such that optional
+dependencies of other estimators (e.g., JPype, PyOpenCL, ECOS) are not
+imported. Third-party packages may provide additional estimators through the
+entry point group 'idtxl.estimators', e.g., in setup.py:
+
+    >>> entry_points={
+    >>>     'idtxl.estimators': ['MyEstimator = mypackage.module:MyEstimator']}
+"""
 import importlib
 import inspect
 from pprint import pprint
@@ -8,29 +17,66 @@ from abc import ABCMeta, abstractmethod
 import numpy as np
 from . import idtxl_exceptions as ex
 
-MODULE_EXTENSIONS = ('.py')  # ('.py', '.pyc', '.pyo')
-ESTIMATOR_PREFIX = ('estimators_')
-
-
-def _package_contents():
-    # Return list of IDTxl modules containing estimators.
-    file, pathname, description = imp.find_module(__package__)
-    if file:
-        raise ImportError('Not a package: %r', __package__)
-    return [os.path.splitext(module)[0]
-            for module in os.listdir(pathname)
-            if (module.endswith(MODULE_EXTENSIONS) and
-                module.startswith(ESTIMATOR_PREFIX))]
+# Map estimator names to modules in the IDTxl package.
+ESTIMATOR_REGISTRY = {
+    'JidtKraskovCMI': 'estimators_jidt',
+    'JidtKraskovMI': 'estimators_jidt',
+    'JidtKraskovAIS': 'estimators_jidt',
+    'JidtKraskovTE': 'estimators_jidt',
+    'JidtDiscreteCMI': 'estimators_jidt',
+    'JidtDiscreteMI': 'estimators_jidt',
+    'JidtDiscreteAIS': 'estimators_jidt',
+    'JidtDiscreteTE': 'estimators_jidt',
+    'JidtGaussianCMI': 'estimators_jidt',
+    'JidtGaussianMI': 'estimators_jidt',
+    'JidtGaussianAIS': 'estimators_jidt',
+    'JidtGaussianTE': 'estimators_jidt',
+    'OpenCLKraskovMI': 'estimators_opencl',
+    'OpenCLKraskovCMI': 'estimators_opencl',
+    'PythonDiscreteCMI': 'estimators_python',
+    'SydneyPID': 'estimators_pid',
+    'TartuPID': 'estimators_pid',
+}
+ENTRY_POINT_GROUP = 'idtxl.estimators'
+_entry_points = None
+
+
+def _get_entry_points():
+    """Return estimators registered by other packages as entry points.
+
+    Entry points are read once and cached.
+
+    Returns:
+        dict
+            entry points, keys are estimator names
+    """
+    global _entry_points
+    if _entry_points is None:
+        try:
+            from importlib import metadata
+        except ImportError:  # Python < 3.8
+            _entry_points = {}
+            return _entry_points
+        try:
+            eps = metadata.entry_points(group=ENTRY_POINT_GROUP)
+        except TypeError:  # Python < 3.10
+            eps = metadata.entry_points().get(ENTRY_POINT_GROUP, [])
+        _entry_points = {ep.name: ep for ep in eps}
+    return _entry_points
 
 
 def list_estimators():
-    """List all estimators available in IDTxl."""
-    module_list = _package_contents()
-    for m in module_list:
-        module = importlib.import_module('.' + m, __package__)
-        class_list = inspect.getmembers(module, inspect.isclass)
-        if class_list:
-            pprint(class_list)
+    """List all estimators available in IDTxl.
+
+    List estimator names and the modules implementing them, including
+    estimators registered by other packages. Modules are not imported.
+    """
+    estimators = [(name, '{0}.{1}'.format(__package__, module))
+                  for (name, module) in ESTIMATOR_REGISTRY.items()]
+    estimators += [(name, ep.value)
+                   for (name, ep) in _get_entry_points().items()
+                   if name not in ESTIMATOR_REGISTRY]
+    pprint(sorted(estimators))
 
 
 def find_estimator(est):
@@ -39,12 +85,13 @@ def find_estimator(est):
     Return an estimator class. If input is a class, check if it implements
     methods 'estimate' and 'is_parallel' necessary for network analysis
     (see abstract class 'Estimator' for documentation). If input is a string,
-    search for class with that name in IDTxl and return it.
+    import the class with that name from the module listed in the estimator
+    registry or from the entry point registered by another package.
 
     Args:
         est : str | Class
-            name of an estimator class implemented in IDTxl or custom estimator
-            class
+            name of an estimator class implemented in IDTxl or registered as
+            entry point, or custom estimator class
 
     Returns
         Class
@@ -53,21 +100,19 @@ def find_estimator(est):
     if inspect.isclass(est):
         # Test if provided class implements the Estimator class. This
         # constraint may be relaxed in the future.
-        if not np.issubclass_(est, Estimator):
+        if not issubclass(est, Estimator):
             raise RuntimeError('Provided class should implement abstract class'
                                ' Estimator.')
         return est
     elif type(est) is str:
-        module_list = _package_contents()
-        estimator = None
-        for m in module_list:
-            try:
-                module = importlib.import_module('.' + m, __package__)
-                return getattr(module, est)
-            except AttributeError:
-                pass
-        if not estimator:
-            raise RuntimeError('Estimator {0} not found.'.format(est))
+        if est in ESTIMATOR_REGISTRY:
+            module = importlib.import_module(
+                '.' + ESTIMATOR_REGISTRY[est], __package__)
+            return getattr(module, est)
+        entry_points = _get_entry_points()
+        if est in entry_points:
+            return find_estimator(entry_points[est].load())
+        raise RuntimeError('Estimator {0} not found.'.format(est))
     else:
         raise TypeError('Please provide an estimator class or the name of an '
                         'estimator as string.')
@@ -1,4 +1,9 @@
 """Provide JIDT estimators."""
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
 from pkg_resources import resource_filename
 import numpy as np
 from abc import abstractmethod
@@ -12,6 +17,177 @@ except ImportError as err:
                             ' from https://pypi.python.org/pypi/JPype1 to use '
                             'JAVA/JIDT-powered CMI estimation.')
 
+logger = logging.getLogger(__name__)
+
+# Maximum number of JIDT calculators kept for reuse in each thread.
+CALC_POOL_SIZE = 8
+_calc_pool = threading.local()
+
+
+def _get_calculator(CalcClass, args=(), properties=None):
+    """Return a JIDT calculator, reusing calculators created before.
+
+    Calculators are kept in a pool for reuse across estimate calls and
+    estimator instances, such that JAVA objects (e.g., the dense count arrays
+    of discrete calculators) are not allocated anew for each estimate. A
+    calculator is reused if it was created from the same class with the same
+    constructor arguments and properties. Callers have to (re-)initialise the
+    calculator before adding observations. Pools are kept per thread; if a
+    pool holds more than CALC_POOL_SIZE calculators, the least recently used
+    calculator is evicted.
+
+    Args:
+        CalcClass : JAVA class
+            JAVA class returned by jpype.JPackage
+        args : tuple [optional]
+            arguments passed to the class constructor
+        properties : dict [optional]
+            properties set on the calculator after creation, keys and values
+            have to be str
+
+    Returns:
+        Java object
+            JIDT calculator
+    """
+    try:
+        pool = _calc_pool.calculators
+    except AttributeError:
+        pool = _calc_pool.calculators = OrderedDict()
+    if properties is None:
+        properties = {}
+    key = (str(CalcClass), tuple(args), tuple(sorted(properties.items())))
+    try:
+        pool.move_to_end(key)
+        return pool[key]
+    except KeyError:
+        pass
+    try:
+        calc = CalcClass(*args)
+    except jp.JavaException:
+        # Release pooled calculators before trying again, the JAVA heap may
+        # be filled by calculators that are no longer used.
+        clear_calculator_pool()
+        pool = _calc_pool.calculators = OrderedDict()
+        calc = CalcClass(*args)
+    for (k, v) in properties.items():
+        calc.setProperty(k, v)
+    pool[key] = calc
+    while len(pool) > CALC_POOL_SIZE:
+        pool.popitem(last=False)
+    return calc
+
+
+def clear_calculator_pool():
+    """Remove all JIDT calculators kept for reuse by the current thread."""
+    try:
+        del _calc_pool.calculators
+    except AttributeError:
+        pass
+
+
+# Options, start-up time, and warm-up time of the JVM started by IDTxl in the
+# current process.
+_jvm_info = {'options': None, 'startup_time': None, 'warm_up_time': None}
+
+
+def start_jvm(heap_size=None, assertions=False, options=None):
+    """Start JAVA virtual machine with JIDT on the class path.
+
+    JIDT estimators start the JVM on instantiation if it is not running,
+    using JVM options from the estimator settings. Call this function to
+    start the JVM explicitly.
+
+    Args:
+        heap_size : str [optional]
+            maximum heap size, e.g., '4g' (default=None, use the JVM's
+            default)
+        assertions : bool [optional]
+            enable JAVA assertions ('-ea'), which slows down JIDT
+            (default=False)
+        options : list of str [optional]
+            further options passed to the JVM (default=None)
+    """
+    if jp.isJVMStarted():
+        raise RuntimeError('The JVM is already running, JVM options can only '
+                           'be set once per process.')
+    jar_location = resource_filename(__name__, 'infodynamics.jar')
+    jvm_options = ['-Djava.class.path=' + jar_location]
+    if assertions:
+        jvm_options.append('-ea')
+    if heap_size is not None:
+        jvm_options.append('-Xmx{0}'.format(heap_size))
+    if options is not None:
+        jvm_options += list(options)
+    start = time.time()
+    jp.startJVM(jp.getDefaultJVMPath(), *jvm_options)
+    _jvm_info['startup_time'] = time.time() - start
+    _jvm_info['options'] = jvm_options
+    logger.debug('Started JVM with options {0} in {1:.2f} s.'.format(
+        jvm_options, _jvm_info['startup_time']))
+
+
+def warm_up_jvm(n_samples=1000, n_repeats=3, num_threads='USE_ALL'):
+    """Run JIDT estimators on random data to warm up the JVM.
+
+    The first estimates in a JVM are slow, because JIDT classes are loaded
+    and compiled just-in-time. Run KSG, discrete, and Gaussian estimators on
+    small random data, such that subsequent estimates, e.g., in worker
+    processes, run at full speed. Estimators for CMI, MI, and TE are used,
+    with the JIDT settings used for network inference.
+
+    Args:
+        n_samples : int [optional]
+            number of samples of the random data (default=1000)
+        n_repeats : int [optional]
+            number of times each estimator is called (default=3)
+        num_threads : int | str [optional]
+            number of threads used by KSG estimators, should match the
+            analysis, because JIDT uses different code for single- and
+            multi-threaded estimation (default='USE_ALL')
+
+    Returns:
+        float
+            warm-up time in seconds
+    """
+    start = time.time()
+    rng = np.random.default_rng(0)
+    var1 = rng.standard_normal((n_samples, 2))
+    var2 = rng.standard_normal((n_samples, 1))
+    cond = rng.standard_normal((n_samples, 2))
+    var1_d = rng.integers(0, 2, size=(n_samples, 2))
+    var2_d = rng.integers(0, 2, size=(n_samples, 1))
+    cond_d = rng.integers(0, 2, size=(n_samples, 2))
+    for _ in range(n_repeats):
+        JidtKraskovCMI({'num_threads': num_threads}).estimate(
+            var1, var2, cond)
+        JidtKraskovMI({'num_threads': num_threads}).estimate(var1, var2)
+        JidtKraskovTE({'num_threads': num_threads,
+                       'history_target': 1}).estimate(var1[:, 0], var2[:, 0])
+        JidtDiscreteCMI({}).estimate(var1_d, var2_d, cond_d)
+        JidtDiscreteMI({}).estimate(var1_d, var2_d)
+        JidtGaussianCMI({}).estimate(var1, var2, cond)
+        JidtGaussianMI({}).estimate(var1, var2)
+    _jvm_info['warm_up_time'] = time.time() - start
+    logger.debug('Warmed up JVM in {0:.2f} s.'.format(
+        _jvm_info['warm_up_time']))
+    return _jvm_info['warm_up_time']
+
+
+def get_jvm_info():
+    """Return options, start-up time, and warm-up time of the JVM.
+
+    Returns:
+        dict | None
+            JVM options, start-up time, and warm-up time in seconds, and
+            process id; entries are None if the JVM was not started or
+            warmed up by IDTxl; None if neither happened in the current
+            process
+    """
+    if (_jvm_info['startup_time'] is None and
+            _jvm_info['warm_up_time'] is None):
+        return None
+    return dict(_jvm_info, pid=os.getpid())
+
 
 class JidtEstimator(Estimator):
     """Abstract class for implementation of JIDT estimators.
@@ -46,6 +222,19 @@ class JidtEstimator(Estimator):
               JIDT (default=False)
             - local_values : bool [optional] - return local TE instead of
               average TE (default=False)
+            - jvm_heap_size : str [optional] - maximum heap size of the JAVA
+              virtual machine, e.g., '4g', only used if the JVM is not yet
+              running (default=None, use the JVM's default)
+            - jvm_assertions : bool [optional] - enable JAVA assertions
+              ('-ea'), which slows down JIDT, only used if the JVM is not yet
+              running (default=False)
+            - jvm_options : list of str [optional] - further options passed
+              to the JVM, e.g., ['-XX:+UseParallelGC'], only used if the JVM
+              is not yet running (default=[])
+            - jvm_warm_up : bool [optional] - run warm_up_jvm() once per
+              process after starting the JVM, such that class loading and
+              just-in-time compilation do not slow down the first estimates
+              (default=False)
     """
 
     def __init__(self, settings=None):
@@ -54,12 +243,22 @@ class JidtEstimator(Estimator):
         settings.setdefault('debug', False)
         self.settings = settings.copy()
 
-    def _start_jvm(self):
-        """Start JAVA virtual machine if it is not running."""
-        jar_location = resource_filename(__name__, 'infodynamics.jar')
+    def _start_jvm(self, settings=None):
+        """Start JAVA virtual machine if it is not running.
+
+        JVM options are read from the settings, see class documentation. JVM
+        options are only used when the JVM is started, i.e., by the first JIDT
+        estimator created in a process.
+        """
+        if settings is None:
+            settings = {}
         if not jp.isJVMStarted():
-            jp.startJVM(jp.getDefaultJVMPath(), '-ea', ('-Djava.class.path=' +
-                                                        jar_location))
+            start_jvm(heap_size=settings.get('jvm_heap_size', None),
+                      assertions=settings.get('jvm_assertions', False),
+                      options=settings.get('jvm_options', None))
+        if (settings.get('jvm_warm_up', False) and
+                _jvm_info['warm_up_time'] is None):
+            warm_up_jvm(num_threads=settings.get('num_threads', 'USE_ALL'))
 
     def _set_te_defaults(self, settings):
         """Set defaults for transfer entropy estimation."""
@@ -148,16 +347,15 @@ class JidtKraskov(JidtEstimator):
             'Algorithm number must be 1 or 2')
         super().__init__(settings)
 
-        # Set properties of JIDT's estimator object.
-        self.calc = CalcClass()
-        self.calc.setProperty('ALG_NUM', str(self.settings['algorithm_num']))
-        self.calc.setProperty('NORMALISE',
-                              str(self.settings['normalise']).lower())
-        self.calc.setProperty('k', str(self.settings['kraskov_k']))
-        self.calc.setProperty('DYN_CORR_EXCL', str(self.settings['theiler_t']))
-        self.calc.setProperty('NOISE_LEVEL_TO_ADD',
-                              str(self.settings['noise_level']))
-        self.calc.setProperty('NUM_THREADS', str(self.settings['num_threads']))
+        # Get JIDT's estimator object with the requested properties. Objects
+        # are reused across estimator instances.
+        self.calc = _get_calculator(CalcClass, properties={
+            'ALG_NUM': str(self.settings['algorithm_num']),
+            'NORMALISE': str(self.settings['normalise']).lower(),
+            'k': str(self.settings['kraskov_k']),
+            'DYN_CORR_EXCL': str(self.settings['theiler_t']),
+            'NOISE_LEVEL_TO_ADD': str(self.settings['noise_level']),
+            'NUM_THREADS': str(self.settings['num_threads'])})
         self.calc.setDebug(self.settings['debug'])
 
     def is_analytic_null_estimator(self):
@@ -194,6 +392,13 @@ class JidtDiscrete(JidtEstimator):
         the JAVA class is added to the object instance, while for Kraskov/
         Gaussian estimators an instance of that class is added (because for the
         latter, objects can be instantiated independent of data properties).
+        Instances are taken from a pool of calculators, such that calculators
+        for equal alphabet sizes are reused across estimate calls.
+
+        Data are discretised in each call to the estimator if
+        discretise_method is 'max_ent' or 'equal'. To discretise the data
+        only once before the analysis, use Data.discretise() and set
+        discretise_method to 'none'.
     """
 
     def __init__(self, settings):
@@ -407,7 +612,7 @@ class JidtKraskovCMI(JidtKraskov):
     def __init__(self, settings=None):
         settings = self._check_settings(settings)
         # Start JAVA virtual machine and create JAVA object.
-        self._start_jvm()
+        self._start_jvm(settings)
         settings.setdefault('algorithm_num', 1)
         assert type(settings['algorithm_num']) is int, (
             'Algorithm number must be an integer.')
@@ -420,6 +625,7 @@ class JidtKraskovCMI(JidtKraskov):
             CalcClass = (jp.JPackage('infodynamics.measures.continuous.kraskov').
                      ConditionalMutualInfoCalculatorMultiVariateKraskov2)
         super().__init__(CalcClass, settings)
+        self._mi_estimator = None
 
     def estimate(self, var1, var2, conditional=None):
         """Estimate conditional mutual information.
@@ -440,10 +646,12 @@ class JidtKraskovCMI(JidtKraskov):
                 average CMI over all samples or local CMI for individual
                 samples if 'local_values'=True
         """
-        # Return MI if no conditional was provided.
+        # Return MI if no conditional was provided. The MI estimator is
+        # created once and reused in subsequent calls.
         if conditional is None:
-            est_mi = JidtKraskovMI(self.settings)
-            return est_mi.estimate(var1, var2)
+            if self._mi_estimator is None:
+                self._mi_estimator = JidtKraskovMI(self.settings)
+            return self._mi_estimator.estimate(var1, var2)
         else:
             assert(conditional.size != 0), 'Conditional Array is empty.'
 
@@ -521,9 +729,10 @@ class JidtDiscreteCMI(JidtDiscrete):
         # Start JAVA virtual machine and create JAVA object. Add JAVA object to
         # instance, the discrete estimator requires the variable dimensions
         # upon instantiation.
-        self._start_jvm()
+        self._start_jvm(settings)
         self.CalcClass = (jp.JPackage('infodynamics.measures.discrete').
                           ConditionalMutualInformationCalculatorDiscrete)
+        self._mi_estimator = None
 
     def estimate(self, var1, var2, conditional=None, return_calc=False):
         """Estimate conditional mutual information.
@@ -556,12 +765,14 @@ class JidtDiscreteCMI(JidtDiscrete):
                 Raised when JIDT object cannot be instantiated due to mem error
 
         """
-        # Calculate an MI if no conditional was provided
+        # Calculate an MI if no conditional was provided. The MI estimator is
+        # created once and reused in subsequent calls.
         if (conditional is None) or (self.settings['alphc'] == 0):
-            est = JidtDiscreteMI(self.settings)
+            if self._mi_estimator is None:
+                self._mi_estimator = JidtDiscreteMI(self.settings)
             # Return value will be just the estimate if return_calc is False,
             #  or estimate plus the JIDT MI calculator if return_calc is True:
-            return est.estimate(var1, var2, return_calc)
+            return self._mi_estimator.estimate(var1, var2, return_calc)
         else:
             assert(conditional.size != 0), 'Conditional Array is empty.'
 
@@ -590,7 +801,8 @@ class JidtDiscreteCMI(JidtDiscrete):
         alph2_base = int(np.power(self.settings['alph2'], var2_dim))
         cond_base = int(np.power(self.settings['alphc'], cond_dim))
         try:
-            calc = self.CalcClass(alph1_base, alph2_base, cond_base)
+            calc = _get_calculator(self.CalcClass,
+                                   (alph1_base, alph2_base, cond_base))
         except jp.JavaException:
             # Only possible exception that can be raised here
             #  (if all bases >= 2) is a Java OutOfMemoryException:
@@ -600,7 +812,8 @@ class JidtDiscreteCMI(JidtDiscrete):
             raise ex.JidtOutOfMemoryError('Cannot instantiate JIDT CMI '
                 'discrete estimator with alph1_base = ' + str(alph1_base) +
                 ', alph2_base = ' + str(alph2_base) + ', cond_base = ' +
-                str(cond_base) + '. Try re-running increasing Java heap size')
+                str(cond_base) + '. Try re-running increasing Java heap size '
+                'or use PythonDiscreteCMI')
         calc.setDebug(self.settings['debug'])
         calc.initialise()
         # Unfortunately no faster way to pass numpy arrays in than this list
@@ -698,7 +911,7 @@ class JidtDiscreteMI(JidtDiscrete):
         # Start JAVA virtual machine and create JAVA object. Add JAVA object to
         # instance, the discrete estimator requires the variable dimensions
         # upon instantiation.
-        self._start_jvm()
+        self._start_jvm(settings)
         self.CalcClass = (jp.JPackage('infodynamics.measures.discrete').
                           MutualInformationCalculatorDiscrete)
 
@@ -747,8 +960,8 @@ class JidtDiscreteMI(JidtDiscrete):
         base_for_var1 = int(np.power(self.settings['alph1'], var1_dim))
         base_for_var2 = int(np.power(self.settings['alph2'], var2_dim))
         try:
-            calc = self.CalcClass(base_for_var1, base_for_var2,
-                                    self.settings['lag_mi'])
+            calc = _get_calculator(self.CalcClass, (
+                base_for_var1, base_for_var2, self.settings['lag_mi']))
         except jp.JavaException:
             # Only possible exception that can be raised here
             #  (if base_for_var* >= 2) is a Java OutOfMemoryException:
@@ -841,7 +1054,7 @@ class JidtKraskovMI(JidtKraskov):
     def __init__(self, settings=None):
         settings = self._check_settings(settings)
         # Start JAVA virtual machine and create JAVA object.
-        self._start_jvm()
+        self._start_jvm(settings)
         settings.setdefault('algorithm_num', 1)
         assert type(settings['algorithm_num']) is int, (
             'Algorithm number must be an integer.')
@@ -954,7 +1167,7 @@ class JidtKraskovAIS(JidtKraskov):
         assert type(settings['tau']) is int, ('Tau has to be an integer.')
 
         # Start JAVA virtual machine and create JAVA object.
-        self._start_jvm()
+        self._start_jvm(settings)
         CalcClass = (jp.JPackage('infodynamics.measures.continuous.kraskov').
                      ActiveInfoStorageCalculatorKraskov)
         super().__init__(CalcClass, settings)
@@ -1033,7 +1246,7 @@ class JidtDiscreteAIS(JidtDiscrete):
         assert settings['alph'] >= 2, 'Number of bins must be >= 2'
 
         # Start JAVA virtual machine and create JAVA object.
-        self._start_jvm()
+        self._start_jvm(settings)
         self.CalcClass = (jp.JPackage('infodynamics.measures.discrete').
                           ActiveInformationCalculatorDiscrete)
         super().__init__(settings)
@@ -1086,7 +1299,8 @@ class JidtDiscreteAIS(JidtDiscrete):
 
         # And finally make the AIS calculation:
         try:
-            calc = self.CalcClass(self.settings['alph'], self.settings['history'])
+            calc = _get_calculator(self.CalcClass, (
+                self.settings['alph'], self.settings['history']))
         except jp.JavaException:
             # Only possible exception that can be raised here
             #  (if self.settings['alph'] >= 2) is a Java OutOfMemoryException:
@@ -1180,7 +1394,7 @@ class JidtGaussianAIS(JidtGaussian):
         assert type(settings['tau']) is int, ('Tau has to be an integer.')
 
         # Start JAVA virtual machine and create JAVA object.
-        self._start_jvm()
+        self._start_jvm(settings)
         CalcClass = (jp.JPackage('infodynamics.measures.continuous.gaussian').
                      ActiveInfoStorageCalculatorGaussian)
         super().__init__(CalcClass, settings)
@@ -1237,7 +1451,7 @@ class JidtGaussianMI(JidtGaussian):
     def __init__(self, settings=None):
         settings = self._check_settings(settings)
         # Start JAVA virtual machine and create JAVA object.
-        self._start_jvm()
+        self._start_jvm(settings)
         CalcClass = (jp.JPackage('infodynamics.measures.continuous.gaussian').
                      MutualInfoCalculatorMultiVariateGaussian)
         super().__init__(CalcClass, settings)
@@ -1313,7 +1527,7 @@ class JidtGaussianCMI(JidtGaussian):
     def __init__(self, settings=None):
         settings = self._check_settings(settings)
         # Start JAVA virtual machine and create JAVA object.
-        self._start_jvm()
+        self._start_jvm(settings)
         CalcClass = (jp.JPackage('infodynamics.measures.continuous.gaussian').
                      ConditionalMutualInfoCalculatorMultiVariateGaussian)
         super().__init__(CalcClass, settings)
@@ -1443,7 +1657,7 @@ class JidtKraskovTE(JidtKraskov):
     def __init__(self, settings):
         settings = self._check_settings(settings)
         # Start JAVA virtual machine.
-        self._start_jvm()
+        self._start_jvm(settings)
         CalcClass = (jp.JPackage('infodynamics.measures.continuous.kraskov').
                      TransferEntropyCalculatorKraskov)
         # Get embedding and delay parameters.
@@ -1553,7 +1767,7 @@ class JidtDiscreteTE(JidtDiscrete):
         super().__init__(settings)
 
         # Start JAVA virtual machine and create JAVA object.
-        self._start_jvm()
+        self._start_jvm(settings)
         self.CalcClass = (jp.JPackage('infodynamics.measures.discrete').
                           TransferEntropyCalculatorDiscrete)
 
@@ -1594,12 +1808,13 @@ class JidtDiscreteTE(JidtDiscrete):
         # And finally make the TE calculation:
         max_base = max(self.settings['alph1'], self.settings['alph2'])
         try:
-            calc = self.CalcClass(max_base,
-                              self.settings['history_target'],
-                              self.settings['tau_target'],
-                              self.settings['history_source'],
-                              self.settings['tau_source'],
-                              self.settings['source_target_delay'])
+            calc = _get_calculator(self.CalcClass, (
+                max_base,
+                self.settings['history_target'],
+                self.settings['tau_target'],
+                self.settings['history_source'],
+                self.settings['tau_source'],
+                self.settings['source_target_delay']))
         except jp.JavaException:
             # Only possible exception that can be raised here
             #  (if max_base >= 2) is a Java OutOfMemoryException:
@@ -1697,7 +1912,7 @@ class JidtGaussianTE(JidtGaussian):
     def __init__(self, settings):
         settings = self._check_settings(settings)
         # Start JAVA virtual machine and create JAVA object.
-        self._start_jvm()
+        self._start_jvm(settings)
         CalcClass = (jp.JPackage('infodynamics.measures.continuous.gaussian').
                      TransferEntropyCalculatorGaussian)
         # Get embedding and delay parameters.
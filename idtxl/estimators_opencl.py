@@ -1,3 +1,4 @@
+import logging
 from pkg_resources import resource_filename
 from scipy.special import digamma
 import numpy as np
@@ -10,6 +11,8 @@ except ImportError as err:
                             ' it using pip or the package manager to use '
                             'OpenCL-powered CMI estimation.')
 
+logger = logging.getLogger(__name__)
+
 
 class OpenCLKraskov(Estimator):
     """Abstract class for implementation of OpenCL estimators.
@@ -109,7 +112,8 @@ class OpenCLKraskov(Estimator):
                     gpuid, np.arange(len(my_gpu_devices))))
         queue = cl.CommandQueue(context, my_gpu_devices[gpuid])
         if self.settings['debug']:
-            print("Selected Device: ", my_gpu_devices[gpuid].name)
+            logger.debug('Selected Device: {0}'.format(
+                my_gpu_devices[gpuid].name))
         return my_gpu_devices, context, queue
 
     def _get_kernels(self):
@@ -223,10 +227,10 @@ class OpenCLKraskovMI(OpenCLKraskov):
         chunks_per_run = min(max_chunks_per_run, n_chunks)
 
         if self.settings['debug']:
-            print('Memory per chunk: {0:.5f} MB, GPU global memory: {1} MB, '
-                  'chunks per run: {2}.'.format(mem_chunk / 1024 / 1024,
-                                                max_mem / 1024 / 1024,
-                                                chunks_per_run))
+            logger.debug('Memory per chunk: {0:.5f} MB, GPU global memory: '
+                         '{1} MB, chunks per run: {2}.'.format(
+                             mem_chunk / 1024 / 1024, max_mem / 1024 / 1024,
+                             chunks_per_run))
 
         if mem_chunk > max_mem:
             raise RuntimeError('Size of single chunk exceeds GPU global '
@@ -285,8 +289,8 @@ class OpenCLKraskovMI(OpenCLKraskov):
         # Prepare data and add noise: check if variable realisations are passed
         # as 1D or 2D arrays and have equal no. observations.
         if self.settings['debug']:
-            print('var1 shape: {0}, {1}, n_chunks: {2}'.format(
-                             var1.shape[0], var1.shape[1], n_chunks))
+            logger.debug('var1 shape: {0}, {1}, n_chunks: {2}'.format(
+                var1.shape[0], var1.shape[1], n_chunks))
         var1 = self._ensure_two_dim_input(var1)
         var2 = self._ensure_two_dim_input(var2)
         assert var1.shape[0] == var2.shape[0]
@@ -322,8 +326,8 @@ class OpenCLKraskovMI(OpenCLKraskov):
                         self.settings['kraskov_k'])
             mem_ncnt = 2 * self.sizeof_int * signallength_padded
             mem_total = mem_data_pad + mem_dist + mem_ncnt
-            print('Memory req. after padding: {0:.5f} MB.'.format(
-                      mem_total / 1024 / 1024))
+            logger.debug('Memory req. after padding: {0:.5f} MB.'.format(
+                mem_total / 1024 / 1024))
 
         # Set OpenCL kernel launch parameters
         if chunklength < self.devices[
@@ -513,10 +517,10 @@ class OpenCLKraskovCMI(OpenCLKraskov):
         chunks_per_run = min(max_chunks_per_run, n_chunks)
 
         if self.settings['debug']:
-            print('Memory per chunk: {0:.5f} MB, GPU global memory: {1} MB, '
-                  'chunks per run: {2}.'.format(mem_chunk / 1024 / 1024,
-                                                max_mem / 1024 / 1024,
-                                                chunks_per_run))
+            logger.debug('Memory per chunk: {0:.5f} MB, GPU global memory: '
+                         '{1} MB, chunks per run: {2}.'.format(
+                             mem_chunk / 1024 / 1024, max_mem / 1024 / 1024,
+                             chunks_per_run))
         if mem_chunk > max_mem:
             raise RuntimeError('Size of single chunk exceeds GPU global '
                                'memory.')
@@ -626,8 +630,8 @@ class OpenCLKraskovCMI(OpenCLKraskov):
                         self.settings['kraskov_k'])
             mem_ncnt = 2 * self.sizeof_int * signallength_padded
             mem_total = mem_data_pad + mem_dist + mem_ncnt
-            print('Memory req. after padding: {0:.5f} MB.'.format(
-                      mem_total / 1024 / 1024))
+            logger.debug('Memory req. after padding: {0:.5f} MB.'.format(
+                mem_total / 1024 / 1024))
 
         # Set OpenCL kernel launch parameters
         if chunklength < self.devices[
@@ -6,10 +6,12 @@ as proposed in
 Bertschinger, N., Rauh, J., Olbrich, E., Jost, J., & Ay, N. (2014). Quantifying
 Unique Information. Entropy, 16(4), 2161–2183. http://doi.org/10.3390/e16042161
 """
+import logging
 import numpy as np
-from . import synergy_tartu
 from .estimator import Estimator
 
+logger = logging.getLogger(__name__)
+
 # TODO add support for multivariate estimation for Tartu and Sydney estimator
 
 
@@ -75,28 +77,28 @@ class SydneyPID(Estimator):
         try:
             settings['alph_s1']
         except KeyError:
-            print('"alph_s1" is missing from the settings dictionary.')
+            logger.error('"alph_s1" is missing from the settings dictionary.')
             raise
         try:
             settings['alph_s2']
         except KeyError:
-            print('"alph_s2" is missing from the settings dictionary.')
+            logger.error('"alph_s2" is missing from the settings dictionary.')
             raise
         try:
             settings['alph_t']
         except KeyError:
-            print('"alph_t" is missing from the settings dictionary.')
+            logger.error('"alph_t" is missing from the settings dictionary.')
             raise
         try:
             settings['max_unsuc_swaps_row_parm']
         except KeyError:
-            print('"max_unsuc_swaps_row_parm" is missing from the settings '
-                  'dictionary.')
+            logger.error('"max_unsuc_swaps_row_parm" is missing from the '
+                         'settings dictionary.')
             raise
         try:
             settings['num_reps']
         except KeyError:
-            print('"num_reps" is missing from the settings dictionary.')
+            logger.error('"num_reps" is missing from the settings dictionary.')
             raise
         if settings['num_reps'] > 63:
             raise ValueError('Number of reps must be 63 or less to prevent '
@@ -104,7 +106,8 @@ class SydneyPID(Estimator):
         try:
             settings['max_iters']
         except KeyError:
-            print('"max_iters" is missing from the settings dictionary.')
+            logger.error('"max_iters" is missing from the settings '
+                         'dictionary.')
             raise
         self.settings = settings.copy()
         self.settings.setdefault('verbose', False)
@@ -230,7 +233,7 @@ class SydneyPID(Estimator):
                              ''.format(jointmi_s1s2_t, cond_mut_info1))
         else:
             if self.settings['verbose']:
-                print('Passed sanity check on jMI and cMI')
+                logger.info('Passed sanity check on jMI and cMI')
 
         # Declare reps array of repeated doubling to half the prob_inc
         # WARNING: num_reps greater than 63 results in integer overflow
@@ -246,7 +249,7 @@ class SydneyPID(Estimator):
         # smaller than 2
     #    num_reps = num_reps + np.int32(np.floor(np.log(max_joint_nonzero_count)/np.log(2)))
         if self.settings['verbose']:
-            print('num_reps: {0}'.format(self.settings['num_reps']))
+            logger.info('num_reps: {0}'.format(self.settings['num_reps']))
         reps = np.array(np.power(2, range(0, self.settings['num_reps'])))
 
         # Replication loop
@@ -352,7 +355,7 @@ class SydneyPID(Estimator):
         jointmi_s1s2_target = self._joint_mi(s1, s2, t, alph_s1, alph_s2,
                                              alph_t)
         if self.settings['verbose']:
-            print('jointmi_s1s2_target: {0}'.format(jointmi_s1s2_target))
+            logger.info('jointmi_s1s2_target: {0}'.format(jointmi_s1s2_target))
 
         # PID terms
         unq_s1 = cond_mut_info1
@@ -520,6 +523,8 @@ class TartuPID(Estimator):
             dict
                 estimated decomposition, solver used, numerical error
         """
+        # Import the cone programming solver only when it is needed.
+        from . import synergy_tartu
         s1, s2, t, self.settings = _check_input(s1, s2, t, self.settings)
         pdf = _get_pdf_dict(s1, s2, t)
 
@@ -0,0 +1,149 @@
+"""Provide estimators implemented in Python."""
+import logging
+import numpy as np
+from .estimator import Estimator
+from . import idtxl_utils as utils
+
+logger = logging.getLogger(__name__)
+
+
+class PythonDiscreteCMI(Estimator):
+    """Calculate CMI for discrete variables from observed joint states.
+
+    Calculate the conditional mutual information (CMI) between two variables
+    given a third using plug-in estimates of the joint probabilities. If no
+    conditional is provided, the mutual information (MI) is returned.
+    Estimates are in bits.
+
+    As opposed to JidtDiscreteCMI, which allocates counts for all joint states
+    of the embedded alphabets (alph ** dim states per variable), only joint
+    states that occur in the data are counted. Memory requirements thus scale
+    with the number of samples and not with the size of the alphabet, such
+    that the estimator can be used with large conditioning sets, for which
+    JidtDiscreteCMI raises a JidtOutOfMemoryError. Estimates are identical to
+    those of JidtDiscreteCMI.
+
+    Args:
+        settings : dict [optional]
+            sets estimation parameters:
+
+            - local_values : bool [optional] - return local CMI instead of
+              average CMI (default=False)
+            - discretise_method : str [optional] - if and how to discretise
+              incoming continuous data, can be 'max_ent' for maximum entropy
+              binning, 'equal' for equal size bins, and 'none' if no binning is
+              required (default='none')
+            - n_discrete_bins : int [optional] - number of discrete bins/
+              levels or the base of each dimension of the discrete variables
+              (default=2). If set, this parameter overwrites/sets alph1, alph2
+              and alphc
+            - alph1 : int [optional] - number of discrete bins/levels for var1
+              (default=2, or the value set for n_discrete_bins)
+            - alph2 : int [optional] - number of discrete bins/levels for var2
+              (default=2, or the value set for n_discrete_bins)
+            - alphc : int [optional] - number of discrete bins/levels for
+              conditional (default=2, or the value set for n_discrete_bins)
+    """
+
+    def __init__(self, settings=None):
+        settings = self._check_settings(settings).copy()
+        try:
+            n_discrete_bins = int(settings['n_discrete_bins'])
+            settings['alph1'] = n_discrete_bins
+            settings['alph2'] = n_discrete_bins
+            settings['alphc'] = n_discrete_bins
+        except KeyError:
+            pass  # Do nothing and use the default for alph_* set below
+        settings.setdefault('alph1', int(2))
+        settings.setdefault('alph2', int(2))
+        settings.setdefault('alphc', int(2))
+        settings.setdefault('local_values', False)
+        settings.setdefault('discretise_method', 'none')
+        self.settings = settings
+
+    def is_parallel(self):
+        return False
+
+    def is_analytic_null_estimator(self):
+        return False
+
+    def estimate(self, var1, var2, conditional=None):
+        """Estimate conditional mutual information.
+
+        Args:
+            var1 : numpy array
+                realisations of first variable, either a 2D numpy array where
+                array dimensions represent [realisations x variable dimension]
+                or a 1D array representing [realisations], array type can be
+                float (requires discretisation) or int
+            var2 : numpy array
+                realisations of the second variable (similar to var1)
+            conditional : numpy array [optional]
+                realisations of the conditioning variable (similar to var), if
+                no conditional is provided, return MI between var1 and var2
+
+        Returns:
+            float | numpy array
+                average CMI over all samples or local CMI for individual
+                samples if 'local_values'=True
+        """
+        if conditional is not None and conditional.size == 0:
+            conditional = None
+        var1 = self._discretise(var1, self.settings['alph1'], 'var1')
+        var2 = self._discretise(var2, self.settings['alph2'], 'var2')
+        if conditional is not None:
+            conditional = self._discretise(conditional,
+                                           self.settings['alphc'],
+                                           'conditional')
+        assert var1.shape[0] == var2.shape[0], (
+            'Unequal number of observations for var1 and var2.')
+
+        # Index observed joint states of each variable, then of combinations
+        # of variables. Combined indices are smaller than the squared number
+        # of samples and do not overflow.
+        x, n_x = utils.encode_joint_states(var1, self.settings['alph1'])
+        y, n_y = utils.encode_joint_states(var2, self.settings['alph2'])
+        if conditional is None:
+            z, n_z = np.zeros(x.shape[0], dtype=np.int64), 1
+        else:
+            z, n_z = utils.encode_joint_states(conditional,
+                                               self.settings['alphc'])
+        xz, n_xz = utils.encode_joint_states(x * n_z + z)
+        yz = y * n_z + z
+        xyz = xz * n_y + y
+
+        # Local CMI from counts of the joint state of each sample:
+        # log2(p(x,y,z) p(z) / (p(x,z) p(y,z))).
+        local = np.log2(_counts(xyz) * _counts(z) /
+                        (_counts(xz) * _counts(yz)))
+        if self.settings['local_values']:
+            return local
+        return np.mean(local)
+
+    def _discretise(self, var, alph, name):
+        """Discretise variable or check discrete data."""
+        var = np.asarray(var)
+        if var.ndim == 1:
+            var = var.reshape(-1, 1)
+        if self.settings['discretise_method'] == 'equal':
+            return utils.discretise(var, alph)
+        elif self.settings['discretise_method'] == 'max_ent':
+            return utils.discretise_max_ent(var, alph)
+        elif self.settings['discretise_method'] == 'none':
+            assert issubclass(var.dtype.type, np.integer), (
+                '{0} is not an integer numpy array. Discretise data to use '
+                'this estimator.'.format(name))
+            assert np.min(var) >= 0, (
+                'Minimum of {0} is smaller than 0.'.format(name))
+            assert np.max(var) < alph, (
+                'Maximum of {0} is larger than the alphabet size.'.format(
+                    name))
+            return var
+        else:
+            raise ValueError('Unknown discretisation method.')
+
+
+def _counts(index):
+    """Return the number of occurrences of each sample's state."""
+    index = np.unique(index, return_inverse=True)[1].reshape(-1)
+    return np.bincount(index)[index].astype(float)
@@ -1,12 +1,14 @@
 """Provide error handling and warnings."""
+import logging
 import traceback
 
+logger = logging.getLogger(__name__)
+
 
 def package_missing(err, message):
     """Report a missing optional package upon import."""
-    print(message)
-    traceback.print_tb(err.__traceback__)
-    print()
+    logger.warning(message)
+    logger.debug(''.join(traceback.format_tb(err.__traceback__)))
     # warnings.simplefilter('always', ImportWarning)
     # warnings.warn(message, ImportWarning, stacklevel=2)
 
@@ -3,8 +3,11 @@
 Provide functions to load and save IDTxl data, provide import functions (e.g.,
 mat-files, FieldTrip) and export functions (e.g., networkx, BrainNet Viewer).
 """
-# import json
+import os
+import json
+import logging
 import pickle
+from collections.abc import MutableMapping
 import h5py
 import networkx as nx
 import numpy as np
@@ -12,6 +15,8 @@ import copy as cp
 import itertools as it
 from scipy.io import loadmat
 from .data import Data
+from . import results as res
+from . import idtxl_utils as utils
 from . import idtxl_exceptions as ex
 try:
     import networkx as nx
@@ -22,6 +27,8 @@ except ImportError as err:
          'https://pypi.python.org/pypi/networkx/2.0 to export and plot IDTxl '
          'results in this format.'))
 
+logger = logging.getLogger(__name__)
+
 VERBOSE = False
 
 
@@ -88,7 +95,8 @@ def _remove_numpy(data):
     data_json = cp.copy(data)
     for k in data_json.keys():
         if VERBOSE:
-            print('{0}, type: {1}'.format(data_json[k], type(data_json[k])))
+            logger.info('{0}, type: {1}'.format(data_json[k],
+                                              type(data_json[k])))
         if type(data_json[k]) is np.ndarray:
             data_json[k] = data_json[k].tolist()
     return data_json
@@ -163,7 +171,242 @@ def load_pickle(name):
         return pickle.load(f)
 
 
-def import_fieldtrip(file_name, ft_struct_name, file_version, normalise=True):
+# Attributes holding results for single targets or processes, for each
+# results class that can be saved in the HDF5 format.
+HDF5_RESULTS_GROUPS = {
+    'ResultsNetworkInference': ['_single_target', '_single_target_fdr'],
+    'ResultsSingleProcessAnalysis': ['_single_process',
+                                     '_single_process_fdr'],
+    'ResultsPartialInformationDecomposition': ['_single_target'],
+}
+
+
+def save_hdf5(results, file_name):
+    """Save results of network analysis in HDF5 format.
+
+    Save results in a columnar format, where results for each target
+    (process) are stored in a separate HDF5 group and each entry of the
+    results (e.g., selected variables, p-values) is stored as a dataset.
+    Lists of variables, e.g., selected_vars_sources, are stored as integer
+    arrays with one row per variable. Results can thus be read without
+    unpickling, e.g., by other HDF5 readers:
+
+        >>> with h5py.File('results.h5', 'r') as f:
+        >>>     f['_single_target/1/selected_vars_sources'][()]
+
+    Settings that can not be stored as numbers, strings, or arrays (e.g.,
+    custom estimator classes) are saved as strings. Dictionaries with keys
+    that are not strings (e.g., targets) are saved as a group holding a
+    dataset 'keys' and a group 'values' with one entry per key.
+
+    Args:
+        results : ResultsNetworkInference | ResultsSingleProcessAnalysis |
+            ResultsPartialInformationDecomposition
+            results to be saved
+        file_name : str
+            file name including the file path
+    """
+    results_class = type(results).__name__
+    if results_class not in HDF5_RESULTS_GROUPS:
+        raise RuntimeError(
+            'Saving {0} in HDF5 format is not supported.'.format(
+                results_class))
+    with h5py.File(file_name, 'w') as f:
+        f.attrs['results_class'] = results_class
+        _write_hdf5_value(f, 'settings', dict(results.settings))
+        _write_hdf5_value(f, 'data_properties',
+                          dict(results.data_properties))
+        _write_hdf5_value(f, 'profile', getattr(results, '_profile', None))
+        for name in HDF5_RESULTS_GROUPS[results_class]:
+            single_results = getattr(results, name)
+            group = f.create_group(name)
+            group.attrs['keys'] = np.array(list(single_results.keys()),
+                                           dtype=int)
+            for (key, value) in single_results.items():
+                _write_hdf5_value(group, str(key), dict(value))
+
+
+def load_hdf5(file_name):
+    """Load results of network analysis saved in HDF5 format.
+
+    Load results saved by save_hdf5(). Settings and data properties are read
+    immediately, while results for individual targets (processes) are read
+    from the file when they are first accessed, e.g., by get_single_target().
+    The file thus has to remain available while the results are used.
+
+    Args:
+        file_name : str
+            file name including the file path
+
+    Returns:
+        ResultsNetworkInference | ResultsSingleProcessAnalysis |
+        ResultsPartialInformationDecomposition
+            results
+    """
+    with h5py.File(file_name, 'r') as f:
+        results_class = f.attrs['results_class']
+        if results_class not in HDF5_RESULTS_GROUPS:
+            raise RuntimeError('Unknown results class {0}.'.format(
+                results_class))
+        data_properties = _read_hdf5_value(f['data_properties'])
+        results = getattr(res, results_class)(
+            n_nodes=data_properties['n_nodes'],
+            n_realisations=data_properties['n_realisations'],
+            normalised=data_properties['normalised'])
+        results.data_properties.update(data_properties)
+        results.settings.update(_read_hdf5_value(f['settings']))
+        results._profile = _read_hdf5_value(f['profile'])
+        for name in HDF5_RESULTS_GROUPS[results_class]:
+            setattr(results, name, _HDF5Results(
+                file_name, name, f[name].attrs['keys'].tolist()))
+    try:
+        results.targets_analysed = list(results._single_target.keys())
+    except AttributeError:
+        results.processes_analysed = list(results._single_process.keys())
+    return results
+
+
+def convert_pickle_to_hdf5(pickle_name, file_name):
+    """Convert results saved with save_pickle() to the HDF5 format.
+
+    Args:
+        pickle_name : str
+            name of the pickle file without the extension '.pkl' (see
+            load_pickle())
+        file_name : str
+            name of the HDF5 file including the file path
+    """
+    save_hdf5(load_pickle(pickle_name), file_name)
+
+
+class _HDF5Results(MutableMapping):
+    """Results for single targets or processes, read from file on access."""
+
+    def __init__(self, file_name, group, keys):
+        self._file_name = file_name
+        self._group = group
+        self._keys = list(keys)
+        self._loaded = {}
+
+    def __getitem__(self, key):
+        if key not in self._loaded:
+            if key not in self._keys:
+                raise KeyError(key)
+            with h5py.File(self._file_name, 'r') as f:
+                self._loaded[key] = res.DotDict(_read_hdf5_value(
+                    f[self._group][str(key)]))
+        return self._loaded[key]
+
+    def __setitem__(self, key, value):
+        if key not in self._keys:
+            self._keys.append(key)
+        self._loaded[key] = value
+
+    def __delitem__(self, key):
+        self._keys.remove(key)
+        self._loaded.pop(key, None)
+
+    def __iter__(self):
+        return iter(list(self._keys))
+
+    def __len__(self):
+        return len(self._keys)
+
+
+def _write_hdf5_value(group, key, value):
+    """Write value to HDF5 group, the type is stored as attribute."""
+    if isinstance(value, dict) and all([type(k) is str for k in value]):
+        subgroup = group.create_group(key)
+        subgroup.attrs['type'] = 'dict'
+        for (k, v) in value.items():
+            _write_hdf5_value(subgroup, k, v)
+        return
+    if isinstance(value, dict):
+        # Store keys that are not strings, e.g., targets, as a separate
+        # dataset to restore their type when the dictionary is read.
+        subgroup = group.create_group(key)
+        subgroup.attrs['type'] = 'dict_items'
+        _write_hdf5_value(subgroup, 'keys', list(value.keys()))
+        values = subgroup.create_group('values')
+        for (i, v) in enumerate(value.values()):
+            _write_hdf5_value(values, str(i), v)
+        return
+    if value is None:
+        dset = group.create_dataset(key, data=h5py.Empty('f'))
+        dset.attrs['type'] = 'none'
+        return
+    if isinstance(value, str):
+        dset = group.create_dataset(key, data=value)
+        dset.attrs['type'] = 'str'
+        return
+    if isinstance(value, (list, tuple)):
+        if len(value) > 0 and all([type(v) is tuple for v in value]):
+            value_type = 'tuples'
+        else:
+            value_type = type(value).__name__
+        try:
+            array = (np.array(value) if len(value) > 0 else
+                     np.zeros(0, dtype=int))
+        except ValueError:  # lists of varying length
+            array = np.array(None, dtype=object)
+    elif isinstance(value, np.ndarray):
+        value_type = 'array'
+        array = value
+    else:
+        value_type = 'scalar'
+        try:
+            array = np.array(float(value) if not isinstance(
+                value, (bool, int, np.bool_, np.integer)) else value)
+        except (TypeError, ValueError):
+            array = np.array(None, dtype=object)
+    if array.dtype.kind not in 'biuf':
+        # Store values that are not numeric as JSON string.
+        dset = group.create_dataset(key, data=json.dumps(
+            value, default=_json_default))
+        dset.attrs['type'] = 'json'
+        return
+    dset = group.create_dataset(key, data=array)
+    dset.attrs['type'] = value_type
+
+
+def _read_hdf5_value(node):
+    """Read value written by _write_hdf5_value()."""
+    value_type = node.attrs['type']
+    if value_type == 'dict':
+        return {k: _read_hdf5_value(node[k]) for k in node.keys()}
+    elif value_type == 'dict_items':
+        return {k: _read_hdf5_value(node['values'][str(i)])
+                for (i, k) in enumerate(_read_hdf5_value(node['keys']))}
+    elif value_type == 'none':
+        return None
+    elif value_type == 'str':
+        return node.asstr()[()]
+    elif value_type == 'json':
+        return json.loads(node.asstr()[()])
+    value = node[()]
+    if value_type == 'array':
+        return value
+    elif value_type == 'scalar':
+        return value.item()
+    elif value_type == 'tuples':
+        return [tuple(v) for v in value.tolist()]
+    elif value_type == 'tuple':
+        return tuple(value.tolist())
+    else:
+        return value.tolist()
+
+
+def _json_default(obj):
+    """Convert objects that are not JSON serializable."""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return str(obj)
+
+
+def import_fieldtrip(file_name, ft_struct_name, file_version, normalise=True,
+                     memmap_file=None):
     """Convert FieldTrip-style MATLAB-file into an IDTxl Data object.
 
     Import a MATLAB structure with fields  "trial" (data), "label" (channel
@@ -186,6 +429,14 @@ def import_fieldtrip(file_name, ft_struct_name, file_version, normalise=True):
             version of the file, e.g. 'v7.3' for MATLAB's 7.3 format
         normalise : bool [optional]
             normalise data after import (default=True)
+        memmap_file : str [optional]
+            if provided, trials are read one at a time and written to a
+            memory-mapped .npy-file, which backs the returned Data object,
+            such that the data are never held in memory as a whole. Data are
+            normalised in place. If the file exists, data are read from the
+            file instead of the MATLAB file, such that repeated analyses can
+            reuse the file (the file has to be created from the same data
+            with the same value for normalise) (default=None)
 
     Returns:
         Data() instance
@@ -205,20 +456,25 @@ def import_fieldtrip(file_name, ft_struct_name, file_version, normalise=True):
                            'your m-file in that version.')
         # TODO we could write a fallback option using numpy's loadmat?
 
-    print('Creating Python dictionary from FT data structure: {0}'
-          .format(ft_struct_name))
-    trial_data = _ft_import_trial(file_name, ft_struct_name)
+    logger.info('Creating Python dictionary from FT data structure: {0}'
+                .format(ft_struct_name))
     label = _ft_import_label(file_name, ft_struct_name)
     fsample = _ft_fsample_2_float(file_name, ft_struct_name)
     timestamps = _ft_import_time(file_name, ft_struct_name)
-
-    data = Data(data=trial_data, dim_order='spr', normalise=normalise)
+    if memmap_file is not None and os.path.isfile(memmap_file):
+        logger.info('Loading data from file {0}.'.format(memmap_file))
+        return (_create_data(np.load(memmap_file, mmap_mode='r'), 'psr',
+                             normalise),
+                label, timestamps, fsample)
+
+    trial_data = _ft_import_trial(file_name, ft_struct_name, memmap_file)
+    data = _create_data(trial_data, 'psr', normalise)
     return data, label, timestamps, fsample
 
 
-def _ft_import_trial(file_name, ft_struct_name):
+def _ft_import_trial(file_name, ft_struct_name, memmap_file=None):
     """Import FieldTrip trial data into Python."""
-    ft_file = h5py.File(file_name)
+    ft_file = h5py.File(file_name, 'r')
     ft_struct = ft_file[ft_struct_name]  # TODO: ft_struct_name = automagic...
 
     # Get the trial cells that contain the references (pointers) to the data
@@ -226,28 +482,48 @@ def _ft_import_trial(file_name, ft_struct_name):
     # array in the original FieldTrip structure.
     trial = ft_struct['trial']
 
-    # Get the trial cells that contain the references (pointers) to the data
-    # we need. Then get the data from matrices in cells of a 1 x numtrials cell
-    # array in the original FieldTrip structure.
-    trial = ft_struct['trial']
-
     # Allocate memory to hold actual data, read shape of first trial to know
-    # the data size.
-    trial_data_tmp = np.array(ft_file[trial[0][0]])  # get data from 1st trial
-    print('Found data with first dimension: {0}, and second: {1}'
-          .format(trial_data_tmp.shape[0], trial_data_tmp.shape[1]))
-    geometry = trial_data_tmp.shape + (trial.shape[0],)
-    trial_data = np.empty(geometry)
-
-    # Get actual data from h5py structure.
+    # the data size. Trials are stored as samples x channels.
+    shape = ft_file[trial[0][0]].shape
+    logger.info('Found data with first dimension: {0}, and second: {1}'
+                .format(shape[0], shape[1]))
+    geometry = (shape[1], shape[0], trial.shape[0])
+    if memmap_file is None:
+        trial_data = np.empty(geometry)
+    else:
+        trial_data = np.lib.format.open_memmap(memmap_file, mode='w+',
+                                               shape=geometry)
+
+    # Get actual data from h5py structure, read one trial at a time.
     for tt in range(0, trial.shape[0]):
         trialref = trial[tt][0]  # get trial reference
-        trial_data[:, :, tt] = np.array(ft_file[trialref])  # get data
+        trial_data[:, :, tt] = np.array(ft_file[trialref]).T  # get data
 
     ft_file.close()
     return trial_data
 
 
+def _create_data(data_array, dim_order, normalise):
+    """Create Data object, normalise memory-mapped data in place.
+
+    Memory-mapped data opened for writing are normalised in place, one
+    process at a time, to avoid copying the data into memory. Data opened
+    read-only are assumed to be normalised already if normalise is True.
+    """
+    if not isinstance(data_array, np.memmap):
+        return Data(data_array, dim_order=dim_order, normalise=normalise)
+
+    data = Data(data_array, dim_order=dim_order, normalise=False)
+    if normalise and data_array.mode != 'r':
+        for p in range(data.n_processes):
+            data.data[p, :, :] = utils.standardise(
+                data.data[p, :, :].reshape(1, data.n_realisations()),
+                dimension=1).reshape(data.n_samples, data.n_replications)
+        data_array.flush()
+    data.normalise = normalise
+    return data
+
+
 def _ft_import_label(file_name, ft_struct_name):
     """Import FieldTrip labels into Python."""
     # for details of the data handling see comments in _ft_import_trial
@@ -256,7 +532,7 @@ def _ft_import_label(file_name, ft_struct_name):
     ft_label = ft_struct['label']
 
     if VERBOSE:
-        print('Converting FT labels to python list of strings')
+        logger.info('Converting FT labels to python list of strings')
 
     label = []
     for ll in range(0, ft_label.shape[0]):
@@ -266,7 +542,7 @@ def _ft_import_label(file_name, ft_struct_name):
         # makes it into a real Python string.
         labelref = ft_label[ll]
         labeltmp = ft_file[labelref[0]]
-        strlabeltmp = "".join(map(chr, labeltmp[0:]))
+        strlabeltmp = "".join(map(chr, labeltmp[()].ravel()))
         label.append(strlabeltmp)
 
     ft_file.close()
@@ -280,7 +556,7 @@ def _ft_import_time(file_name, ft_struct_name):
     ft_struct = ft_file[ft_struct_name]
     ft_time = ft_struct['time']
     if VERBOSE:
-        print('Converting FT time cell array to numpy array')
+        logger.info('Converting FT time cell array to numpy array')
 
     np_timeaxis_tmp = np.array(ft_file[ft_time[0][0]])
     geometry = np_timeaxis_tmp.shape + (ft_time.shape[0],)
@@ -298,12 +574,13 @@ def _ft_fsample_2_float(file_name, ft_struct_name):
     FTfsample = ft_struct['fsample']
     fsample = int(FTfsample[0])
     if VERBOSE:
-        print('Converting FT fsample array (1x1) to numpy array (1x1)')
+        logger.info('Converting FT fsample array (1x1) to numpy array '
+                    '(1x1)')
     return fsample
 
 
 def import_matarray(file_name, array_name, file_version, dim_order,
-                    normalise=True):
+                    normalise=True, memmap_file=None):
     """Read Matlab hdf5 file into IDTxl.
 
     reads a matlab hdf5 file ("-v7.3' or higher, .mat) or non-hdf5 files with a
@@ -331,14 +608,28 @@ def import_matarray(file_name, array_name, file_version, dim_order,
             two-dimensional array of data from several processes over time
         normalise : bool [optional]
             normalise data after import (default=True)
+        memmap_file : str [optional]
+            if provided, the array is read in blocks and written to a
+            memory-mapped .npy-file, which backs the returned Data object. If
+            the file exists, data are read from the file instead, see
+            import_fieldtrip(). Requires file version 'v7.3' (default=None)
 
     Returns:
         Data() instance
             instance of IDTxl Data object, containing data from the 'trial'
             field
     """
+    if memmap_file is not None:
+        if file_version != 'v7.3':
+            raise RuntimeError('Memory-mapping requires mat-files in format '
+                               '7.3.')
+        if os.path.isfile(memmap_file):
+            logger.info('Loading data from file {0}.'.format(memmap_file))
+            return _create_data(np.load(memmap_file, mmap_mode='r'),
+                                dim_order, normalise)
+
     if file_version == 'v7.3':
-        mat_file = h5py.File(file_name)
+        mat_file = h5py.File(file_name, 'r')
         # Assert that at least one of the keys found at the top level of the
         # HDF file  matches the name of the array we wanted
         if array_name not in mat_file.keys():
@@ -347,7 +638,11 @@ def import_matarray(file_name, array_name, file_version, dim_order,
 
         # 2. Create an object for the matlab array (from the hdf5 hierachy),
         # the trailing [()] ensures everything is read
-        mat_data = np.squeeze(np.asarray(mat_file[array_name][()]))
+        if memmap_file is None:
+            mat_data = np.squeeze(np.asarray(mat_file[array_name][()]))
+        else:
+            mat_data = _read_hdf5_blocks(mat_file[array_name], memmap_file)
+        mat_file.close()
 
     elif file_version in ['v4', 'v6', 'v7']:
         try:
@@ -362,9 +657,31 @@ def import_matarray(file_name, array_name, file_version, dim_order,
 
     # Create output: IDTxl data object, list of labels, sampling info in unit
     # time steps (sampling rate of 1).
-    print('Creating Data object from matlab array: {0}.'.format(array_name))
-    data = Data(mat_data, dim_order=dim_order, normalise=normalise)
-    return data
+    logger.info('Creating Data object from matlab array: {0}.'.format(
+        array_name))
+    return _create_data(mat_data, dim_order, normalise)
+
+
+def _read_hdf5_blocks(dataset, memmap_file, block_size=2**23):
+    """Copy HDF5 dataset into memory-mapped file, removing singletons.
+
+    The dataset is read in blocks of about block_size elements along its
+    longest dimension.
+    """
+    mat_data = np.lib.format.open_memmap(
+        memmap_file, mode='w+', dtype=np.float64,
+        shape=tuple([n for n in dataset.shape if n > 1]))
+    # Reshaping to the original shape only adds singletons and returns a
+    # view of the memory-mapped array.
+    out = mat_data.reshape(dataset.shape)
+    axis = int(np.argmax(dataset.shape))
+    step = max(1, block_size * dataset.shape[axis] // max(dataset.size, 1))
+    for start in range(0, dataset.shape[axis], step):
+        block = [slice(None)] * dataset.ndim
+        block[axis] = slice(start, start + step)
+        out[tuple(block)] = dataset[tuple(block)]
+    mat_data.flush()
+    return mat_data
 
 
 def export_networkx_graph(adjacency_matrix, weights):
@@ -547,9 +864,8 @@ def export_brain_net_viewer(adjacency_matrix, mni_coord, file_name, **kwargs):
             print('{0}'.format(labels_stripped[n]), file=text_file)
 
     # Write edge file.
+    edge_matrix = adjacency_matrix._edge_matrix
     with open('{0}.edge'.format(file_name), 'w') as text_file:
         for i in range(n_nodes):
-            for j in range(n_nodes):
-                print('{0}\t'.format(adjacency_matrix._edge_matrix[i, j]),
-                      file=text_file, end='')
-            print('', file=text_file)
+            print(''.join(['{0}\t'.format(e) for e in edge_matrix[i, :]]),
+                  file=text_file)
@@ -1,7 +1,10 @@
 """Provide IDTxl utility functions."""
+import logging
 import pprint
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
 
 def swap_chars(s, i_1, i_2):
     """Swap to characters in a string.
@@ -123,36 +126,14 @@ def discretise(a, numBins):
         numpy array
             discretised data
     """
-    num_samples = a.shape[0]
-    if (len(a.shape) == 1):
-        # It's a unidimensional array
-        discretised_values = np.zeros(num_samples, dtype=np.int_)
-        theMin = a.min()
-        theMax = a.max()
-        binInterval = (theMax - theMin) / numBins
-        for t in range(num_samples):
-            discretised_values[t] = int((a[t] - theMin) / binInterval)
-            if (discretised_values[t] == numBins):
-                # This occurs for the maximum value; put it in the largest
-                # bin (base - 1).
-                discretised_values[t] = discretised_values[t] - 1
-        return discretised_values
-
-    # Else, multivariate array
-    num_dimensions = a.shape[1]
-    discretised_values = np.zeros([num_samples, num_dimensions], dtype=np.int_)
-    for v in range(a.shape[1]):
-        # Bin dimension v:
-        theMin = a[:, v].min()
-        theMax = a[:, v].max()
-        binInterval = (theMax - theMin) / numBins
-        for t in range(num_samples):
-            discretised_values[t, v] = int((a[t, v] - theMin) / binInterval)
-            if (discretised_values[t, v] == numBins):
-                # This occurs for the maximum value; put it in the largest bin
-                # (base - 1)
-                discretised_values[t, v] = discretised_values[t, v] - 1
-    return discretised_values
+    theMin = a.min(axis=0)
+    binInterval = (a.max(axis=0) - theMin) / numBins
+    # Constant variables are put into a single bin.
+    binInterval = np.where(binInterval > 0, binInterval, 1)
+    discretised_values = np.floor((a - theMin) / binInterval).astype(np.int_)
+    # The maximum value falls onto the upper edge of the largest bin, put it
+    # into the largest bin (base - 1).
+    return np.minimum(discretised_values, numBins - 1)
 
 
 def discretise_max_ent(a, numBins):
@@ -174,40 +155,32 @@ def discretise_max_ent(a, numBins):
         numpy array
             discretised data
     """
-    num_samples = a.shape[0]
     if (len(a.shape) == 1):
-        # It's a unidimensional array
-        discretised_values = np.zeros(num_samples, dtype=np.int_)
-        cuttoff_values = np.zeros(numBins)
-        sorted_copy = np.sort(a)
-        for bin in range(numBins):
-            compartmentSize = int((bin + 1) * (num_samples) / numBins) - 1
-            cuttoff_values[bin] = sorted_copy[compartmentSize]
-        for t in range(num_samples):
-            for m in range(numBins):
-                if (a[t] <= cuttoff_values[m]):
-                    discretised_values[t] = m
-                    break
-        return discretised_values
-
-    # Else, multivariate array
-    num_dimensions = a.shape[1]
-    discretised_values = np.zeros([num_samples, num_dimensions], dtype=np.int_)
-    for v in range(num_dimensions):
-        # Bin dimension v:
-        cuttoff_values = np.zeros(numBins)
-        sorted_copy = np.sort(a[:, v])
-        for bin in range(numBins):
-            compartmentSize = int((bin + 1) * (num_samples) / numBins) - 1
-            cuttoff_values[bin] = sorted_copy[compartmentSize]
-        for t in range(num_samples):
-            for m in range(numBins):
-                if (a[t, v] <= cuttoff_values[m]):
-                    discretised_values[t, v] = m
-                    break
+        return _discretise_max_ent_1d(a, numBins)
+    discretised_values = np.empty(a.shape, dtype=np.int_)
+    for v in range(a.shape[1]):
+        discretised_values[:, v] = _discretise_max_ent_1d(a[:, v], numBins)
     return discretised_values
 
 
+def _discretise_max_ent_1d(a, numBins):
+    """Discretise a 1D array using maximum entropy partitioning."""
+    # The upper edge of each bin is the sample at the end of each of numBins
+    # equally sized compartments of the sorted data. Only these order
+    # statistics are needed, hence, partition instead of sorting the data.
+    num_samples = a.shape[0]
+    compartments = (np.arange(1, numBins + 1) * num_samples // numBins) - 1
+    # For less samples than bins, index -1 refers to the last sample (as in
+    # the JIDT implementation).
+    compartments = compartments % num_samples
+    cutoff_values = np.partition(a, compartments)[compartments]
+    # Assign each value to the first bin with an upper edge larger or equal
+    # to the value. The first edge larger or equal to a value is also the
+    # first such edge in the running maximum of the edges, which is sorted.
+    return np.searchsorted(np.maximum.accumulate(cutoff_values), a,
+                           side='left').astype(np.int_)
+
+
 def separate_arrays(idx_all, idx_single, a):
     """Separate a single column from all other columns in a 2D-array.
 
@@ -265,23 +238,51 @@ def combine_discrete_dimensions(a, numBins):
         # It's already a unidimensional array
         return a
 
-    # Else, 2D array assumed
-    num_samples = a.shape[0]
+    # Else, 2D array assumed, the last dimension has the smallest weight.
     dimensions = a.shape[1]
-    combined_values = np.zeros(num_samples, dtype=np.int_)
-    for t in range(num_samples):
-        combined_value = 0
-        multiplier = 1
-        for c in range(dimensions - 1, -1, -1):
-            combined_value = combined_value + a[t][c] * multiplier
-            multiplier = multiplier * numBins
-            if multiplier <= 0:
-                # Multiplier has overflown
-                raise ArithmeticError(
-                    'Combination of numBins and number of dimensions of a '
-                    'leads to overflow in making unidimensional array')
-        combined_values[t] = int(combined_value)
-    return combined_values
+    if dimensions * np.log2(numBins) >= 63:
+        raise ArithmeticError(
+            'Combination of numBins and number of dimensions of a '
+            'leads to overflow in making unidimensional array')
+    multipliers = np.power(numBins, np.arange(dimensions - 1, -1, -1),
+                           dtype=np.int64)
+    return np.dot(a.astype(np.int64), multipliers)
+
+
+def encode_joint_states(a, numBins=None):
+    """Return an index of the joint state for each sample.
+
+    Assign an integer index to each observed joint state of a
+    multi-dimensional discrete variable. Indices are consecutive, from 0 to
+    the number of observed states minus one, such that their range depends on
+    the number of samples and not on the size of the joint alphabet. Joint
+    states are encoded as mixed-radix numbers (see
+    combine_discrete_dimensions()) if numBins is provided and codes do not
+    overflow, otherwise unique rows of a are found directly.
+
+    Args:
+        a : numpy array
+            discrete data, dimensions are realisations (samples) x variable
+            dimension
+        numBins : int [optional]
+            number of discrete levels or bins for each variable dimension
+            (default=None)
+
+    Returns:
+        numpy array
+            index of the joint state for each sample
+        int
+            number of observed joint states
+    """
+    if a.ndim == 1:
+        a = a.reshape(-1, 1)
+    if (numBins is not None and
+            a.shape[1] * np.log2(max(numBins, 2)) < 63):
+        codes = combine_discrete_dimensions(a, numBins)
+        states, index = np.unique(codes, return_inverse=True)
+    else:
+        states, index = np.unique(a, axis=0, return_inverse=True)
+    return index.reshape(-1), len(states)
 
 
 def equal_dicts(dict_1, dict_2):
@@ -306,8 +307,8 @@ def conflicting_entries(dict_1, dict_2):
     intersect_keys = set(d1_keys).intersection(set(d2_keys))
     for k in intersect_keys:
         if np.array(dict_1[k] != dict_2[k]).any():
-            print('Unequal entries for key ''{0}'': dict_1: ''{1}'', dict_2:'
-                  ' ''{2}''.'.format(k, dict_1[k], dict_2[k]))
+            logger.info('Unequal entries for key ''{0}'': dict_1: ''{1}'', '
+                        'dict_2: ''{2}''.'.format(k, dict_1[k], dict_2[k]))
             return True
     return False
 
@@ -7,9 +7,15 @@ greedy approach with maximum statistics to generate a non-uniform embedding
 Note:
     Written for Python 3.4+
 """
+import logging
 from .stats import network_fdr
 from .network_inference import NetworkInferenceMI, NetworkInferenceMultivariate
+from .progress import Progress
 from .results import ResultsNetworkInference
+from .profiling import Profiler
+from .resources import restore_thread_limits
+
+logger = logging.getLogger(__name__)
 
 
 class MultivariateMI(NetworkInferenceMI, NetworkInferenceMultivariate):
@@ -61,7 +67,9 @@ class MultivariateMI(NetworkInferenceMI, NetworkInferenceMultivariate):
     def __init__(self):
         super().__init__()
 
-    def analyse_network(self, settings, data, targets='all', sources='all'):
+    @restore_thread_limits
+    def analyse_network(self, settings, data, targets='all', sources='all',
+                        progress_callback=None):
         """Find multivariate mutual information between nodes in the network.
 
         Estimate multivariate mutual information (MI) between all nodes in the
@@ -97,7 +105,8 @@ class MultivariateMI(NetworkInferenceMI, NetworkInferenceMultivariate):
                 documentation of analyse_single_target() for details, settings
                 can further contain
 
-                - verbose : bool [optional] - toggle console output
+                - verbose : bool [optional] - log progress messages at
+                  level INFO, call idtxl.log_to_console() to print them
                   (default=True)
                 - fdr_correction : bool [optional] - correct results on the
                   network level, see documentation of stats.network_fdr() for
@@ -116,6 +125,11 @@ class MultivariateMI(NetworkInferenceMI, NetworkInferenceMultivariate):
                 single target;
                 if list of list, sources specified in each inner list are
                 tested for the target with the same index
+            progress_callback : callable [optional]
+                function called with a dict describing the progress of the
+                analysis each time a target was analysed or surrogates were
+                computed, see documentation of the progress module for
+                details (default=None)
 
         Returns:
             dict
@@ -126,6 +140,7 @@ class MultivariateMI(NetworkInferenceMI, NetworkInferenceMultivariate):
         # Set defaults for network inference.
         settings.setdefault('verbose', True)
         settings.setdefault('fdr_correction', True)
+        settings.setdefault('profile', False)
 
         # Check which targets and sources are requested for analysis.
         if targets == 'all':
@@ -147,13 +162,16 @@ class MultivariateMI(NetworkInferenceMI, NetworkInferenceMultivariate):
         results = ResultsNetworkInference(n_nodes=data.n_processes,
                                           n_realisations=data.n_realisations(),
                                           normalised=data.normalise)
+        self._progress = Progress(progress_callback, len(targets))
         for t in range(len(targets)):
             if settings['verbose']:
-                print('\n####### analysing target with index {0} from list {1}'
-                      .format(t, targets))
+                logger.info('####### analysing target with index {0} from '
+                            'list {1}'.format(t, targets))
             res_single = self.analyse_single_target(
                     settings, data, targets[t], sources[t])
             results.combine_results(res_single)
+            self._progress.target_done(targets[t])
+        self._progress = None
 
         # Get no. realisations actually used for estimation from single target
         # analysis.
@@ -164,9 +182,13 @@ class MultivariateMI(NetworkInferenceMI, NetworkInferenceMultivariate):
         # results as an extra field. Network_fdr/combine_results internally
         # creates a deep copy of the results.
         if settings['fdr_correction']:
-            results = network_fdr(settings, results)
+            profiler = Profiler(enabled=settings['profile'])
+            with profiler.phase('fdr'):
+                results = network_fdr(settings, results)
+            results._profile = profiler.get_profile()
         return results
 
+    @restore_thread_limits
     def analyse_single_target(self, settings, data, target, sources='all'):
         """Find multivariate mutual information between sources and a target.
 
@@ -243,7 +265,41 @@ class MultivariateMI(NetworkInferenceMI, NetworkInferenceMultivariate):
                   creation by shuffling realisations in time instead of
                   shuffling replications; see documentation of
                   Data.permute_samples() for further settings (default=False)
-                - verbose : bool [optional] - toggle console output
+                - null_fit : str [optional] - 'gamma' or 'gpd' to derive
+                  p-values from a gamma or generalised Pareto (tail)
+                  distribution fitted to at most n_perm_null_fit surrogates
+                  instead of from n_perm_* surrogates; fit diagnostics are
+                  returned in the results, see documentation of
+                  stats._find_pvalue_fitted() (default=None)
+                - n_perm_null_fit : int [optional] - number of surrogates
+                  used to fit the null distribution (default=100)
+                - null_fit_tail : float [optional] - fraction of largest
+                  surrogate values used to fit the generalised Pareto
+                  distribution (default=0.25)
+                - lag_search : str [optional] - 'full' to test all source
+                  samples or 'coarse_to_fine' to test a coarse grid of samples
+                  first and refine around selected variables, see
+                  documentation of NetworkInference._define_source_samples()
+                  (default='full')
+                - prescreen : str [optional] - rank source candidates by a
+                  fast proxy before inclusion and test only the best
+                  candidates, 'gaussian' or 'subsample'; requires
+                  'prescreen_n_keep' and/or 'prescreen_threshold', see
+                  documentation of NetworkInference._prescreen_candidates()
+                  (default=None)
+                - warm_start : ResultsNetworkInference instance [optional] -
+                  results of a previous analysis, variables selected for the
+                  target in the previous analysis are tested first, see
+                  documentation of TimeResolvedNetworkInference (default=None)
+                - estimate_cache : EstimateCache instance [optional] - cache
+                  for estimates, estimates are re-used across statistical
+                  tests and analyses; see documentation of EstimateCache
+                  (default=None)
+                - profile : bool [optional] - record run time and estimator
+                  usage of each phase of the algorithm, see documentation of
+                  Results.get_profile() (default=False)
+                - verbose : bool [optional] - log progress messages at
+                  level INFO, call idtxl.log_to_console() to print them
                   (default=True)
 
             data : Data instance
@@ -269,16 +325,24 @@ class MultivariateMI(NetworkInferenceMI, NetworkInferenceMultivariate):
         self._initialise(settings, data, sources, target)
 
         # Main algorithm.
-        print('\n---------------------------- (1) include source candidates')
-        self._include_source_candidates(data)
-        print('\n---------------------------- (2) prune source candidate')
-        self._prune_candidates(data)
-        print('\n---------------------------- (3) final statistics')
-        self._test_final_conditional(data)
+        if self.settings['verbose']:
+            logger.info('---------------------------- (1) include source '
+                        'candidates')
+        with self._profiler.phase('include_source_candidates'):
+            self._include_source_candidates(data)
+        if self.settings['verbose']:
+            logger.info('---------------------------- (2) prune source '
+                        'candidate')
+        with self._profiler.phase('prune_candidates'):
+            self._prune_candidates(data)
+        if self.settings['verbose']:
+            logger.info('---------------------------- (3) final statistics')
+        with self._profiler.phase('test_final_conditional'):
+            self._test_final_conditional(data)
 
         # Clean up and return results.
         if self.settings['verbose']:
-            print('final source samples: {0}'.format(
+            logger.info('final source samples: {0}'.format(
                     self._idx_to_lag(self.selected_vars_sources)))
         results = ResultsNetworkInference(
             n_nodes=data.n_processes,
@@ -299,7 +363,12 @@ class MultivariateMI(NetworkInferenceMI, NetworkInferenceMultivariate):
                 'omnibus_mi': self.statistic_omnibus,
                 'omnibus_pval': self.pvalue_omnibus,
                 'omnibus_sign': self.sign_omnibus,
-                'mi': self.statistic_single_link
+                'mi': self.statistic_single_link,
+                'prescreening': self._prescreening,
+                'source_lags_evaluated': self._idx_to_lag(
+                    self._source_candidates_evaluated),
+                'profile': self._profiler.get_profile(),
+                'null_fit': self._get_null_fits()
             })
         self._reset()  # remove attributes
         return results
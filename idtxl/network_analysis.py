@@ -1,10 +1,16 @@
 """Parent class for network inference and network comparison.
 """
+import sys
+import logging
 import copy as cp
 import itertools as it
 import numpy as np
 from .estimator import find_estimator
+from .profiling import Profiler
 from . import idtxl_utils as utils
+from . import resources
+
+logger = logging.getLogger(__name__)
 
 
 class NetworkAnalysis():
@@ -22,6 +28,9 @@ class NetworkAnalysis():
         self._current_value_realisations = None
         self._selected_vars_realisations = None
         self._min_stats_surr_table = None
+        self._estimate_cache = None
+        self._null_fits = []
+        self._rng = None
 
     @property
     def current_value(self):
@@ -39,7 +48,7 @@ class NetworkAnalysis():
     def _current_value_realisations(self):
         """Get realisations of the current_value."""
         if self.__current_value_realisations is None:
-            print('Attribute has not been set yet.')
+            logger.debug('Attribute has not been set yet.')
         if type(self.__current_value_realisations) is tuple:
             raise TypeError('something went wrong')
         return self.__current_value_realisations
@@ -56,7 +65,7 @@ class NetworkAnalysis():
     def selected_vars_full(self):
         """List of indices of the full conditional set."""
         if self._selected_vars_full is None:
-            print('Attribute has not been set yet.')
+            logger.debug('Attribute has not been set yet.')
         return self._selected_vars_full
 
     @selected_vars_full.setter
@@ -70,7 +79,7 @@ class NetworkAnalysis():
     def selected_vars_target(self):
         """List of indices of target samples in the conditional set."""
         if self._selected_vars_target is None:
-            print('Attribute has not been set yet.')
+            logger.debug('Attribute has not been set yet.')
         return self._selected_vars_target
 
     @selected_vars_target.setter
@@ -84,7 +93,7 @@ class NetworkAnalysis():
     def selected_vars_sources(self):
         """List of indices of source samples in the conditional set."""
         if self._selected_vars_sources is None:
-            print('Attribute has not been set yet.')
+            logger.debug('Attribute has not been set yet.')
         return self._selected_vars_sources
 
     @selected_vars_sources.setter
@@ -196,6 +205,13 @@ class NetworkAnalysis():
         # average estimator. Internally, the average estimator is used for
         # building the non-uniform embedding, etc. The local estimator is used
         # to estimate single-link MI/TE or single-process AIS in the end.
+        # Divide cores between workers, JIDT, and BLAS before creating the
+        # estimators, which read the number of JIDT threads from the settings.
+        resources.apply_thread_budget(self.settings)
+        # Keep the estimate cache out of the settings, which are copied into
+        # the results. Worker copies of the analysis keep the cache.
+        if 'estimate_cache' in self.settings:
+            self._estimate_cache = self.settings.pop('estimate_cache')
         try:
             EstimatorClass = find_estimator(self.settings['cmi_estimator'])
         except KeyError:
@@ -207,6 +223,49 @@ class NetworkAnalysis():
             self._cmi_estimator_local = EstimatorClass(self.settings)
         else:
             self._cmi_estimator = EstimatorClass(self.settings)
+        if self._estimate_cache is not None:
+            self._cmi_estimator = self._estimate_cache.wrap_estimator(
+                self._cmi_estimator)
+            if self.settings['local_values']:
+                self._cmi_estimator_local = (
+                    self._estimate_cache.wrap_estimator(
+                        self._cmi_estimator_local))
+
+    def _set_profiler(self, profiler=None):
+        """Set profiler and let it record calls to the CMI estimators.
+
+        Args:
+            profiler : Profiler instance [optional]
+                profiler to use, e.g., a worker profiler (default=new
+                profiler)
+        """
+        self.settings.setdefault('profile', False)
+        if profiler is None:
+            profiler = Profiler(enabled=self.settings['profile'])
+        self._profiler = profiler
+        # Record JVM start-up and warm-up if JIDT estimators are in use. The
+        # module is not imported here, which would import jpype.
+        estimators_jidt = sys.modules.get('idtxl.estimators_jidt')
+        if estimators_jidt is not None:
+            self._profiler.add_jvm_info(estimators_jidt.get_jvm_info())
+        self._cmi_estimator = self._profiler.wrap_estimator(
+            self._cmi_estimator)
+        if self.settings['local_values']:
+            self._cmi_estimator_local = self._profiler.wrap_estimator(
+                self._cmi_estimator_local)
+
+    def _get_null_fits(self):
+        """Return diagnostics of fitted null distributions.
+
+        Returns:
+            list of dicts | None
+                diagnostics of each statistical test, see
+                stats._find_pvalue_fitted(); None if no null distributions
+                were fitted (settings['null_fit'] is None)
+        """
+        if self.settings.get('null_fit', None) is None:
+            return None
+        return list(self._null_fits)
 
     def _separate_realisations(self, idx_full, idx_single):
         """Separate single index realisations from a set of realisations.
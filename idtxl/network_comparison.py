@@ -1,13 +1,32 @@
 """Perform inference statistics on groups of data."""
-import copy as cp
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 from scipy.special import binom
 from .estimator import find_estimator
 from . import stats
-from . import idtxl_utils as utils
+from . import resources
 from .network_analysis import NetworkAnalysis
 from .results import ResultsNetworkComparison, DotDict
 
+logger = logging.getLogger(__name__)
+
+# Estimator instance used by worker processes, see _init_worker().
+_worker_estimator = None
+
+
+def _init_worker(settings):
+    """Create CMI estimator once per worker process."""
+    global _worker_estimator
+    _worker_estimator = find_estimator(settings['cmi_estimator'])(settings)
+
+
+def _estimate_block(n_chunks, data):
+    """Estimate CMI for a block of chunks in a worker process."""
+    return np.asarray(_worker_estimator.estimate_parallel(n_chunks=n_chunks,
+                                                          **data))
+
 
 class NetworkComparison(NetworkAnalysis):
     """Set up network comparison between two experimental conditions.
@@ -37,11 +56,19 @@ class NetworkComparison(NetworkAnalysis):
     Note that for network inference methods that use an embedding, i.e., a
     collection of variables in the source, the joint information in all
     variables about the target is used as a test statistic.
+
+    Link CMI estimates for individual data sets are cached in the class
+    instance, keyed by the data fingerprint, the link definition in the union
+    network, and the estimator settings. Repeated comparisons with one
+    instance (e.g., using different alpha levels, tails, or subsets of
+    subjects) re-use previous estimates. Call clear_cache() to free memory.
     """
 
     def __init__(self):
         super().__init__()
+        self._cmi_cache = {}
 
+    @resources.restore_thread_limits
     def compare_links_within(self, settings, link_a, link_b, network, data):
         """Compare two links within the same network.
 
@@ -70,7 +97,8 @@ class NetworkComparison(NetworkAnalysis):
                   surrogates by shuffling data over time. See
                   Data.permute_samples() for settings for further options for
                   surrogate creation
-                - verbose : bool [optional] - toggle console output
+                - verbose : bool [optional] - log progress messages at
+                  level INFO, call idtxl.log_to_console() to print them
                   (default=True)
 
             link_a : array type
@@ -138,6 +166,7 @@ class NetworkComparison(NetworkAnalysis):
         self._reset()  # remove attributes
         return results
 
+    @resources.restore_thread_limits
     def compare_within(self, settings, network_a, network_b, data_a, data_b):
         """Compare networks inferred under two conditions within one subject.
 
@@ -164,7 +193,17 @@ class NetworkComparison(NetworkAnalysis):
                   surrogates by shuffling data over time. See
                   Data.permute_samples() for settings for further options for
                   surrogate creation
-                - verbose : bool [optional] - toggle console output
+                - n_workers : int [optional] - number of worker processes
+                  used to estimate surrogate CMI if the estimator does not
+                  support parallel estimation; workers are started using the
+                  'spawn' method, i.e., scripts calling compare_within() have
+                  to be protected by an if __name__ == '__main__' guard
+                  (default=1, no worker processes)
+                - n_cores : int [optional] - number of cores divided between
+                  workers, JIDT threads, and BLAS threads, see documentation
+                  of idtxl.resources (default=all available cores)
+                - verbose : bool [optional] - log progress messages at
+                  level INFO, call idtxl.log_to_console() to print them
                   (default=True)
 
             network_a : dict
@@ -187,14 +226,20 @@ class NetworkComparison(NetworkAnalysis):
         self._check_equal_realisations(data_a, data_b)
 
         # Main comparison.
-        print('\n-------------------------- (1) create union of networks')
+        if self.settings['verbose']:
+            logger.info('-------------------------- (1) create union of '
+                        'networks')
         self._create_union(network_a, network_b)
-        print('\n-------------------------- (2) calculate differences in TE '
-              'values')
+        if self.settings['verbose']:
+            logger.info('-------------------------- (2) calculate differences '
+                        'in TE values')
         self._calculate_cmi_diff_within(data_a, data_b)
-        print('\n-------------------------- (3) create surrogate distribution')
+        if self.settings['verbose']:
+            logger.info('-------------------------- (3) create surrogate '
+                        'distribution')
         self._create_surrogate_distribution_within(data_a, data_b)
-        print('\n-------------------------- (4) determine p-value')
+        if self.settings['verbose']:
+            logger.info('-------------------------- (4) determine p-value')
         self._p_value_union()
 
         self._union_indices_to_lags()
@@ -218,6 +263,7 @@ class NetworkComparison(NetworkAnalysis):
         self._reset()  # remove attributes
         return results
 
+    @resources.restore_thread_limits
     def compare_between(self, settings, network_set_a, network_set_b,
                         data_set_a, data_set_b):
         """Compare networks inferred under two conditions between subjects.
@@ -255,14 +301,20 @@ class NetworkComparison(NetworkAnalysis):
         network_all = np.hstack((network_set_a, network_set_b))
 
         # Main comparison.
-        print('\n-------------------------- (1) create union of networks')
+        if self.settings['verbose']:
+            logger.info('-------------------------- (1) create union of '
+                        'networks')
         self._create_union(*network_all)
-        print('\n-------------------------- (2) calculate differences in TE '
-              'values')
+        if self.settings['verbose']:
+            logger.info('-------------------------- (2) calculate differences '
+                        'in TE values')
         self._calculate_cmi_diff_between(data_set_a, data_set_b)
-        print('\n-------------------------- (3) create surrogate distribution')
+        if self.settings['verbose']:
+            logger.info('-------------------------- (3) create surrogate '
+                        'distribution')
         self._create_surrogate_distribution_between()
-        print('\n-------------------------- (4) determine p-value')
+        if self.settings['verbose']:
+            logger.info('-------------------------- (4) determine p-value')
         self._p_value_union()
 
         self._union_indices_to_lags()
@@ -453,8 +505,8 @@ class NetworkComparison(NetworkAnalysis):
                 raw data recorded in condition B
         """
         # Re-calculate CMI for both data objects using the union network mask.
-        cmi_a = self._calculate_cmi_all_links(data_a)
-        cmi_b = self._calculate_cmi_all_links(data_b)
+        cmi_a = self._calculate_cmi_all_links_cached(data_a)
+        cmi_b = self._calculate_cmi_all_links_cached(data_b)
         self.cmi_diff = self._calculate_diff(cmi_a, cmi_b)
         # Compare raw TE values between conditions.
         self.cmi_comp = self._compare_union_cmi_within(cmi_a, cmi_b)
@@ -471,13 +523,15 @@ class NetworkComparison(NetworkAnalysis):
             numpy array
                 CMI differences
         """
-        # Re-alculate CMI for each data object using the union network mask.
+        # Re-calculate CMI for each data object using the union network mask.
+        # Estimates for data objects seen in previous comparisons are taken
+        # from the cache.
         cmi_set_a = []
         for d in data_set_a:
-            cmi_set_a.append(self._calculate_cmi_all_links(d))
+            cmi_set_a.append(self._calculate_cmi_all_links_cached(d))
         cmi_set_b = []
         for d in data_set_b:
-            cmi_set_b.append(self._calculate_cmi_all_links(d))
+            cmi_set_b.append(self._calculate_cmi_all_links_cached(d))
         self.cmi_diff = self._calculate_diff_of_mean(cmi_set_a, cmi_set_b)
         # Compare raw TE values between conditions.
         self.cmi_comp = self._compare_union_cmi_between(cmi_set_a, cmi_set_b)
@@ -537,6 +591,50 @@ class NetworkComparison(NetworkAnalysis):
             cmi[t] = self.calculate_link_te(data=data, target=t)
         return cmi
 
+    def _calculate_cmi_all_links_cached(self, data):
+        """Calculate CMI for each link in the union network, use cache.
+
+        Return cached CMI estimates for each source > target combination in
+        the union network if the link has been estimated from the same data
+        with the same settings before. Otherwise, estimate CMI and add the
+        estimate to the cache.
+        """
+        data_fingerprint = data.get_fingerprint()
+        estimator_settings = self._get_estimator_fingerprint()
+        cmi = {}
+        for t in self.union.targets_analysed:
+            key = (data_fingerprint,
+                   estimator_settings,
+                   self.union['max_lag'],
+                   t,
+                   tuple(self.union._single_target[t]['selected_vars_target']),
+                   tuple(self.union._single_target[t][
+                       'selected_vars_sources']))
+            try:
+                cmi[t] = self._cmi_cache[key]
+            except KeyError:
+                cmi[t] = self.calculate_link_te(data=data, target=t)
+                self._cmi_cache[key] = cmi[t]
+        return cmi
+
+    def _get_estimator_fingerprint(self):
+        """Return hashable representation of settings used for estimation.
+
+        Settings that only affect the statistical comparison are ignored, such
+        that cached estimates can be re-used for comparisons that differ only
+        in these settings.
+        """
+        comparison_settings = ['stats_type', 'n_perm_comp', 'alpha_comp',
+                               'tail_comp', 'verbose', 'n_workers',
+                               'n_subjects']
+        return str(sorted(
+            [(k, str(v)) for (k, v) in self.settings.items()
+             if k not in comparison_settings]))
+
+    def clear_cache(self):
+        """Remove all cached CMI estimates."""
+        self._cmi_cache = {}
+
     def _compare_union_cmi_between(self, cmi_set_a, cmi_set_b):
         """Compare mean TE between conditions to get direction of effect."""
         cmi_comp = {}
@@ -560,63 +658,104 @@ class NetworkComparison(NetworkAnalysis):
             cmi_diff_abs[t] = np.abs(cmi_diff[t])
         return cmi_diff_abs
 
-    def _calculate_cmi_all_links_permuted(self, data_a, data_b):
-        """Calculate surrogate CMI for union network.
+    def _calculate_cmi_all_links_permuted(self, data_a, data_b, target):
+        """Calculate surrogate CMI for all links into a target.
 
         Calculate conditional mutual information (CMI) for each source > target
-        combination in the union network after permuting realisations of
-        sources between the two data sets (coming from two conditions).
-        Results can be used in a surrogate permutation test of the original CMI
-        in the two data sets.
-        """
-        cmi_a = {}
-        cmi_b = {}
-        for t in self.union.targets_analysed:
-            cmi_temp_a = []
-            cmi_temp_b = []
-            # If there are no sources for current target, continue  to the next
-            if not self.union._single_target[t]['selected_vars_sources']:
-                cmi_a[t] = np.array(cmi_temp_a)
-                cmi_b[t] = np.array(cmi_temp_b)
-                continue
+        link in the union network after permuting realisations of sources
+        between the two data sets (coming from two conditions). Results can be
+        used in a surrogate permutation test of the original CMI in the two
+        data sets.
 
-            # Get full conditioning set for current target.
-            idx_cond_full = (
-                self.union._single_target[t]['selected_vars_target'] +
-                self.union._single_target[t]['selected_vars_sources'])
-            # Get realisations, where realisations are permuted/swapped
-            # replication-wise between two data sets (e.g., from different
-            # conditions)
-            [cond_full_perm_a,
-             cur_val_perm_a,
-             cond_full_perm_b,
-             cur_val_perm_b] = self._get_permuted_replications(
-                 data_a, data_b, t)
-            # Calculate CMI from each source to current target t from permuted
-            # data
-            n_sources = len(
-                self.union._single_target[t]['selected_vars_sources'])
-            cmi_temp_a = np.zeros(n_sources)
-            cmi_temp_b = np.zeros(n_sources)
-            for (i, idx_source) in enumerate(
-                        self.union._single_target[t]['selected_vars_sources']):
-                # Get realisations of current source from the set of all
-                # surrogate conditionals and calculate the CMI. Do this for
-                # both conditions.
-                [temp_cond_real_a, source_real_a] = utils.separate_arrays(
-                    idx_cond_full, idx_source, cond_full_perm_a)
-                cmi_temp_a[i] = self._cmi_estimator.estimate(
-                    cur_val_perm_a, source_real_a, temp_cond_real_a)
-                [temp_cond_real_b, source_real_b] = utils.separate_arrays(
-                    idx_cond_full, idx_source, cond_full_perm_b)
-                cmi_temp_b[i] = self._cmi_estimator.estimate(
-                    cur_val_perm_b, source_real_b, temp_cond_real_b)
-
-            cmi_a[t] = cmi_temp_a
-            cmi_b[t] = cmi_temp_b
+        All n_perm_comp permuted data sets are created up front and are passed
+        to the estimator as chunks in a single call to estimate_parallel() per
+        link and condition. For estimators that do not support parallel
+        estimation, chunks are distributed over a pool of n_workers processes
+        (see _estimate_chunks()).
 
+        Args:
+            data_a : Data instance
+                raw data, condition A
+            data_b : Data instance
+                raw data, condition B
+            target : int
+                index of the target in the union network
+
+        Returns:
+            numpy array, numpy array
+                surrogate CMI for condition A and B, arrays have size
+                [n_sources x n_perm_comp], where the order of sources
+                corresponds to self.union._single_target[target].sources
+        """
+        n_perm = self.settings['n_perm_comp']
+        sources = self.union._single_target[target].sources
+        cmi_a = np.zeros((len(sources), n_perm))
+        cmi_b = np.zeros((len(sources), n_perm))
+        # If there are no sources for current target, return empty arrays.
+        if not self.union._single_target[target]['selected_vars_sources']:
+            return cmi_a, cmi_b
+
+        # Get full conditioning set for current target, the realisations of
+        # both conditions, and indices of realisations for all permuted data
+        # sets. Realisations for permuted data sets are only copied when
+        # needed for estimation.
+        idx_cond_full = (
+            self.union._single_target[target]['selected_vars_target'] +
+            self.union._single_target[target]['selected_vars_sources'])
+        [cond_all,
+         cur_val_all,
+         idx_a,
+         idx_b] = self._get_permuted_replications_batch(
+             data_a, data_b, target, n_perm)
+        idx_a = idx_a.ravel()
+        idx_b = idx_b.ravel()
+
+        # Calculate the CMI for each link, i.e., the joint information all
+        # variables in the source have about the target, conditional on all
+        # remaining variables.
+        for (i, s) in enumerate(sources):
+            idx_link = [j for (j, v) in enumerate(idx_cond_full) if v[0] == s]
+            idx_cond = [j for (j, v) in enumerate(idx_cond_full) if v[0] != s]
+            for (idx_perm, cmi) in zip([idx_a, idx_b], [cmi_a, cmi_b]):
+                if idx_cond:
+                    conditional = np.take(cond_all[:, idx_cond], idx_perm,
+                                          axis=0)
+                else:
+                    conditional = None
+                cmi[i, :] = self._estimate_chunks(
+                    n_chunks=n_perm,
+                    var1=np.take(cur_val_all, idx_perm, axis=0),
+                    var2=np.take(cond_all[:, idx_link], idx_perm, axis=0),
+                    conditional=conditional)
         return cmi_a, cmi_b
 
+    def _estimate_chunks(self, n_chunks, **data):
+        """Estimate CMI for multiple chunks of data.
+
+        Pass all chunks to the estimator's estimate_parallel() method if the
+        estimator supports parallel estimation or if no worker processes are
+        available. Otherwise, split chunks into contiguous blocks and estimate
+        blocks in the process pool opened in
+        _create_surrogate_distribution_within().
+        """
+        pool = getattr(self, '_pool', None)
+        if (pool is None or self._cmi_estimator.is_parallel() or
+                n_chunks < 2):
+            return np.asarray(self._cmi_estimator.estimate_parallel(
+                n_chunks=n_chunks, **data))
+        chunk_size = data['var1'].shape[0] // n_chunks
+        blocks = np.array_split(np.arange(n_chunks),
+                                min(self.settings['n_workers'], n_chunks))
+        futures = []
+        for b in blocks:
+            i_0 = b[0] * chunk_size
+            i_1 = (b[-1] + 1) * chunk_size
+            block_data = {}
+            for k, v in data.items():
+                block_data[k] = v[i_0:i_1, :] if v is not None else None
+            futures.append(pool.submit(_estimate_block, len(b), block_data))
+        return np.hstack([f.result() for f in futures])
+
     def _calculate_mean(self, cmi_set):
         """Calculate the mean CMI over multiple data sets for all targets."""
         if type(cmi_set) is dict:
@@ -681,6 +820,10 @@ class NetworkComparison(NetworkAnalysis):
         A_5    B_5        ->        B_1    A_2
         ...                         ...
 
+        All permuted data sets for a target are generated up front and the CMI
+        is estimated for all permutations in a single call to the estimator
+        (see _calculate_cmi_all_links_permuted()).
+
         Args:
             data_a : Data instance
                 first set of raw data
@@ -688,14 +831,22 @@ class NetworkComparison(NetworkAnalysis):
                 second set of raw data
         """
         self.cmi_surr = {}
-        for t in self.union.targets_analysed:
-            surrogates_a = self._get_surrogates_target(data_a, t)
-            surrogates_b = self._get_surrogates_target(data_b, t)
-            self.cmi_surr[t] = np.zeros((  # save surrogates as 2D-array
-                len(self.union._single_target[t].sources),
-                self.settings['n_perm_comp']))
-            for (i, s) in enumerate(self.union._single_target[t].sources):
-                self.cmi_surr[t][i, :] = surrogates_a[s] - surrogates_b[s]
+        if (self.settings['n_workers'] > 1 and
+                not self._cmi_estimator.is_parallel()):
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.settings['n_workers'],
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(self.settings,))
+        try:
+            for t in self.union.targets_analysed:
+                [cmi_surr_a, cmi_surr_b] = (
+                    self._calculate_cmi_all_links_permuted(data_a, data_b, t))
+                self.cmi_surr[t] = cmi_surr_a - cmi_surr_b
+        finally:
+            if getattr(self, '_pool', None) is not None:
+                self._pool.shutdown()
+                del self._pool
 
     def _get_surrogates_target(self, data, target, sources='all'):
         # Get lists of source and target variables, and the list of significant
@@ -782,16 +933,21 @@ class NetworkComparison(NetworkAnalysis):
         A_5    B_5        ->        B_1    A_2
         ...                         ...
         """
+        # Draw all random partitions of data sets into conditions A and B at
+        # once and calculate the difference of means over all partitions.
+        n_perm = self.settings['n_perm_comp']
+        cmi_set_all = list(self.cmi_set_a) + list(self.cmi_set_b)
+        n_a = len(self.cmi_set_a)
+        partitions = np.argsort(np.random.rand(n_perm, len(cmi_set_all)),
+                                axis=1)
         self.cmi_surr = {}
         for t in self.union.targets_analysed:
             n_sources = len(self.union._single_target[t].sources)
-            self.cmi_surr[t] = np.zeros(
-                (n_sources, self.settings['n_perm_comp']))
-        for p in range(self.settings['n_perm_comp']):
-            surrogate = self._calculate_diff_of_mean(
-                self.cmi_set_a, self.cmi_set_b, permute=True)
-            for t in self.union.targets_analysed:
-                self.cmi_surr[t][:, p] = surrogate[t]
+            cmi_all = np.array([c[t] for c in cmi_set_all]).reshape(
+                len(cmi_set_all), n_sources)
+            self.cmi_surr[t] = (
+                cmi_all[partitions[:, :n_a]].mean(axis=1) -
+                cmi_all[partitions[:, n_a:]].mean(axis=1)).T
 
     def _p_value_union(self):
         """Calculate the p-value for the CMI between each source and target."""
@@ -829,9 +985,8 @@ class NetworkComparison(NetworkAnalysis):
     def _get_permuted_replications(self, data_a, data_b, target):
         """Return realisations with replications permuted betw. two data sets.
 
-        Return surrogate data for a given target for the conditioning and the
-
-        where original data
+        Return surrogate data for a given target for the conditioning set and
+        the current value.
 
         Create surrogate data by permuting realisations of the conditioning set
         over replications. All realisations in one replication get swapped
@@ -849,6 +1004,53 @@ class NetworkComparison(NetworkAnalysis):
             cond_a_perm, cur_val_a_perm, cond_b_perm, cur_val_b_perm
 
         """
+        [cond_all,
+         cur_val_all,
+         idx_a,
+         idx_b] = self._get_permuted_replications_batch(
+             data_a, data_b, target, n_perm=1)
+        return (np.take(cond_all, idx_a[0], axis=0),
+                np.take(cur_val_all, idx_a[0], axis=0),
+                np.take(cond_all, idx_b[0], axis=0),
+                np.take(cur_val_all, idx_b[0], axis=0))
+
+    def _get_permuted_replications_batch(self, data_a, data_b, target,
+                                         n_perm):
+        """Return indices of realisations for multiple permuted data sets.
+
+        Return realisations of the conditioning set and the current value for
+        both data sets, concatenated into a single block [A; B], and index
+        arrays into this block for n_perm data sets with replications
+        permuted between conditions (see _get_permuted_replications()). Use
+
+        >>> np.take(cond_all, idx_a[p], axis=0)
+
+        to get realisations of the p-th permutation for condition A.
+
+        Args:
+            data_a : Data instance
+                raw data, condition A
+            data_b : Data instance
+                raw data, condition B
+            target : int
+                index of the target in the union network
+            n_perm : int
+                number of permutations
+
+        Returns:
+            numpy array
+                realisations of the full conditioning set, concatenated over
+                conditions A and B [(2 * n_realisations) x n_variables]
+            numpy array
+                realisations of the current value, concatenated over
+                conditions A and B [(2 * n_realisations) x 1]
+            numpy array
+                indices of realisations in permuted data sets for condition A
+                [n_perm x n_realisations]
+            numpy array
+                indices of realisations in permuted data sets for condition B
+                [n_perm x n_realisations]
+        """
         # Get indices of current value and full conditioning set in the
         # union network.
         current_val = (target, self.union['max_lag'])
@@ -861,8 +1063,7 @@ class NetworkComparison(NetworkAnalysis):
                             'Unequal no. replications in the two data sets.')
         [cur_val_a_real, repl_idx_a] = data_a.get_realisations(current_val,
                                                                [current_val])
-        [cur_val_b_real, repl_idx_b] = data_b.get_realisations(current_val,
-                                                               [current_val])
+        cur_val_b_real = data_b.get_realisations(current_val, [current_val])[0]
         cond_a_real = data_a.get_realisations(current_val, idx_cond_full)[0]
         cond_b_real = data_b.get_realisations(current_val, idx_cond_full)[0]
 
@@ -870,66 +1071,58 @@ class NetworkComparison(NetworkAnalysis):
         n_repl = max(repl_idx_a) + 1
         n_per_repl = sum(repl_idx_a == 0)
 
-        # Make copies such that arrays in the caller scope are not overwritten.
-        cond_a_perm = cp.copy(cond_a_real)
-        cond_b_perm = cp.copy(cond_b_real)
-        cur_val_a_perm = cp.copy(cur_val_a_real)
-        cur_val_b_perm = cp.copy(cur_val_b_real)
+        [idx_a, idx_b] = self._get_permutation_indices(n_repl, n_per_repl,
+                                                       n_perm)
+        return (np.vstack((cond_a_real, cond_b_real)),
+                np.vstack((cur_val_a_real, cur_val_b_real)),
+                idx_a, idx_b)
 
-        # Swap or permute realisations of the conditioning set depending on the
-        # stats type.
-        if self.settings['stats_type'] == 'dependent':
-            swap = np.repeat(np.random.randint(2, size=n_repl).astype(bool),
-                             n_per_repl)
-            cond_a_perm[swap, :] = cond_b_real[swap, :]
-            cond_b_perm[swap, :] = cond_a_real[swap, :]
-            cur_val_a_perm[swap, :] = cur_val_b_real[swap, :]
-            cur_val_b_perm[swap, :] = cur_val_a_real[swap, :]
+    def _get_permutation_indices(self, n_repl, n_per_repl, n_perm):
+        """Return indices of realisations for permuted replications.
+
+        Realisations of conditions A and B are assumed to be concatenated
+        into a single block, where each replication occupies n_per_repl
+        consecutive rows. Replication r of the pooled replications (r < n_repl
+        for condition A, r >= n_repl for condition B) thus starts at row
+        r * n_per_repl. Replications are swapped or permuted depending on the
+        stats type.
+
+        Args:
+            n_repl : int
+                number of replications per condition
+            n_per_repl : int
+                number of realisations per replication
+            n_perm : int
+                number of permutations
 
+        Returns:
+            numpy array, numpy array
+                indices of realisations in permuted data sets for condition A
+                and B [n_perm x (n_repl * n_per_repl)]
+        """
+        offsets = np.arange(2 * n_repl) * n_per_repl
+        if self.settings['stats_type'] == 'dependent':
+            # Swap replications between conditions without changing their
+            # rank in the data set.
+            swap = np.random.randint(2, size=(n_perm, n_repl))
+            resample_a = np.arange(n_repl) + swap * n_repl
+            resample_b = np.arange(n_repl) + (1 - swap) * n_repl
         elif self.settings['stats_type'] == 'independent':
             # Pool replications from both data sets and draw two samples of
             # size n_repl.
-            resample_a = np.random.choice(2 * n_repl, n_repl, replace=False)
-            resample_b = np.setdiff1d(np.arange(2 * n_repl), resample_a)
-
-            # Get resampled realisations for group A.
-            i_0 = 0
-            i_1 = n_per_repl
-            for r in resample_a:
-                if r >= n_repl:     # take realisation from cond B
-                    r_perm = r - n_repl
-                    cond_a_perm[i_0:i_1, ] = cond_b_real[repl_idx_b ==
-                                                         r_perm, :]
-                    cur_val_a_perm[i_0:i_1, ] = cur_val_b_real[repl_idx_b ==
-                                                               r_perm, :]
-                else:               # take realisation from cond A otherwise
-                    cond_a_perm[i_0:i_1, ] = cond_a_real[repl_idx_a == r, :]
-                    cur_val_a_perm[i_0:i_1, ] = cur_val_a_real[repl_idx_a == r,
-                                                               :]
-                i_0 = i_1
-                i_1 = i_0 + n_per_repl
-
-            # Get resampled realisations for group B.
-            i_0 = 0
-            i_1 = n_per_repl
-            for r in resample_b:
-                if r >= n_repl:     # take realisation from cond B
-                    r_perm = r - n_repl
-                    cond_b_perm[i_0:i_1, ] = cond_b_real[repl_idx_b ==
-                                                         r_perm, :]
-                    cur_val_b_perm[i_0:i_1, ] = cur_val_b_real[repl_idx_b ==
-                                                               r_perm, :]
-                else:               # take realisation from cond A otherwise
-                    cond_b_perm[i_0:i_1, ] = cond_a_real[repl_idx_a == r, :]
-                    cur_val_b_perm[i_0:i_1, ] = cur_val_a_real[repl_idx_a == r,
-                                                               :]
-                i_0 = i_1
-                i_1 = i_0 + n_per_repl
+            resample = np.argsort(np.random.rand(n_perm, 2 * n_repl), axis=1)
+            resample_a = resample[:, :n_repl]
+            resample_b = np.sort(resample[:, n_repl:], axis=1)
         else:
             raise ValueError('Unkown "stats_type": {0}, should be "dependent" '
                              'or "independent".'.format(
                                                 self.settings['stats_type']))
-        return cond_a_perm, cur_val_a_perm, cond_b_perm, cur_val_b_perm
+        # Expand replication indices to indices of individual realisations.
+        idx_a = (offsets[resample_a][:, :, np.newaxis] +
+                 np.arange(n_per_repl)).reshape(n_perm, -1)
+        idx_b = (offsets[resample_b][:, :, np.newaxis] +
+                 np.arange(n_per_repl)).reshape(n_perm, -1)
+        return idx_a, idx_b
 
     def _initialise(self, settings):
         """Check input and set analysis settings to initial values."""
@@ -940,7 +1133,11 @@ class NetworkComparison(NetworkAnalysis):
             raise KeyError('You have to provide a "stats_type": "dependent" '
                            'or "independent".')
 
-        # Add CMI estimator to class.
+        # Add CMI estimator to class. Divide cores between workers, JIDT, and
+        # BLAS before creating the estimator.
+        settings = settings.copy()
+        settings.setdefault('n_workers', 1)
+        resources.apply_thread_budget(settings)
         try:
             EstimatorClass = find_estimator(settings['cmi_estimator'])
         except KeyError:
@@ -958,12 +1155,15 @@ class NetworkComparison(NetworkAnalysis):
         self.settings.setdefault('alpha_comp', 0.05)
         self.settings.setdefault('tail_comp', 'two')
         self.settings.setdefault('permute_in_time', False)
+        self.settings.setdefault('n_workers', 1)
         stats.check_n_perm(self.settings['n_perm_comp'],
                            self.settings['alpha_comp'])
 
     def _reset(self):
-        """Reset instance after analysis."""
+        """Reset instance after analysis, keep cached CMI estimates."""
+        cmi_cache = self._cmi_cache
         self.__init__()
+        self._cmi_cache = cmi_cache
         del self.settings
         del self.union
         del self.cmi_diff
@@ -1,8 +1,18 @@
 """Parent class for all network inference."""
+import sys
+import logging
+import copy as cp
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import numpy as np
 from .network_analysis import NetworkAnalysis
+from .estimator import find_estimator
 from . import stats
 from . import idtxl_exceptions as ex
+from .progress import Progress, report_surrogates
+
+logger = logging.getLogger(__name__)
 
 
 class NetworkInference(NetworkAnalysis):
@@ -74,7 +84,7 @@ class NetworkInference(NetworkAnalysis):
 
         self.source_set = sources
         if self.settings['verbose']:
-            print('\nTarget: {0} - testing sources {1}'.format(
+            logger.info('Target: {0} - testing sources {1}'.format(
                 self.target, self.source_set))
 
     def _include_candidates(self, candidate_set, data):
@@ -100,7 +110,7 @@ class NetworkInference(NetworkAnalysis):
         """
         success = False
         if self.settings['verbose']:
-                print('candidate set: {0}'.format(
+                logger.info('candidate set: {0}'.format(
                     self._idx_to_lag(candidate_set)))
         while candidate_set:
             # Get realisations for all candidates.
@@ -122,9 +132,9 @@ class NetworkInference(NetworkAnalysis):
                 # The algorithm cannot continue here, so
                 #  we'll terminate the search for more candidates,
                 #  though those identified already remain valid
-                print('AlgorithmExhaustedError encountered in '
+                logger.warning('AlgorithmExhaustedError encountered in '
                     'estimations: ' + aee.message)
-                print('Halting current estimation set.')
+                logger.warning('Halting current estimation set.')
                 # For now we don't need a stack trace:
                 # traceback.print_tb(aee.__traceback__)
                 break
@@ -133,8 +143,8 @@ class NetworkInference(NetworkAnalysis):
             te_max_candidate = max(temp_te)
             max_candidate = candidate_set[np.argmax(temp_te)]
             if self.settings['verbose']:
-                print('testing candidate: {0} '.format(
-                    self._idx_to_lag([max_candidate])[0]), end='')
+                logger.info('testing candidate: {0}'.format(
+                    self._idx_to_lag([max_candidate])[0]))
             try:
                 significant = stats.max_statistic(self, data, candidate_set,
                                               te_max_candidate)[0]
@@ -142,9 +152,9 @@ class NetworkInference(NetworkAnalysis):
                 # The algorithm cannot continue here, so
                 #  we'll terminate the check of significance for this candidate,
                 #  though those identified already remain valid
-                print('AlgorithmExhaustedError encountered in '
+                logger.warning('AlgorithmExhaustedError encountered in '
                     'estimations: ' + aee.message)
-                print('Halting candidate max stats test')
+                logger.warning('Halting candidate max stats test')
                 # For now we don't need a stack trace:
                 # traceback.print_tb(aee.__traceback__)
                 break
@@ -163,7 +173,7 @@ class NetworkInference(NetworkAnalysis):
                                               [max_candidate])[0])
             else:
                 if self.settings['verbose']:
-                    print(' -- not significant')
+                    logger.info(' -- not significant')
                 break
         return success
 
@@ -184,13 +194,239 @@ class NetworkInference(NetworkAnalysis):
             # lags to absolute sample indices and add variables.
             if type(cond) is tuple:  # easily add single variable
                 cond = [cond]
-            print('Adding the following variables to the conditioning set: '
-                  '{0}.'.format(cond))
+            logger.debug('Adding the following variables to the conditioning '
+                         'set: {0}.'.format(cond))
             cond_idx = self._lag_to_idx(cond)
             self._append_selected_vars(
                         cond_idx,
                         data.get_realisations(self.current_value, cond_idx)[0])
 
+    def _prescreen_candidates(self, candidate_set, data, conditional):
+        """Rank candidates by a fast proxy and keep the most informative ones.
+
+        Estimate the (C)MI between each candidate and the current value,
+        conditional on the given realisations, using a proxy that is cheaper
+        than the CMI estimator of the analysis. Only candidates passing the
+        pre-screening are tested in the inclusion step. The pre-screening is
+        controlled by the settings
+
+        - prescreen : str | None - proxy used for pre-screening: 'gaussian'
+          (linear Gaussian CMI, JidtGaussianCMI estimator), 'subsample' (the
+          analysis' CMI estimator applied to a random subsample of
+          realisations), or None to test all candidates (default=None)
+        - prescreen_n_keep : int [optional] - keep the prescreen_n_keep
+          candidates with the highest proxy values
+        - prescreen_threshold : float [optional] - keep candidates with a
+          proxy value of at least prescreen_threshold
+        - prescreen_n_realisations : int [optional] - number of realisations
+          used by the 'subsample' proxy (default=1000)
+
+        At least one of prescreen_n_keep and prescreen_threshold has to be
+        set. If both are set, candidates have to pass both criteria. The
+        number of candidates screened out is returned in the 'prescreening'
+        entry of the results for each target.
+
+        Args:
+            candidate_set : list of tuples
+                candidates to be screened, where each entry is a tuple
+                (process index, sample index)
+            data : Data instance
+                raw data
+            conditional : numpy array | None
+                realisations of the conditioning set
+
+        Returns:
+            list of tuples
+                candidates passing the pre-screening, in the order of the
+                candidate set
+        """
+        self.settings.setdefault('prescreen', None)
+        self._prescreening = None
+        if self.settings['prescreen'] is None or not candidate_set:
+            return candidate_set
+        n_keep = self.settings.get('prescreen_n_keep', None)
+        threshold = self.settings.get('prescreen_threshold', None)
+        if n_keep is None and threshold is None:
+            raise RuntimeError('Pre-screening requires the setting '
+                               '\'prescreen_n_keep\' or '
+                               '\'prescreen_threshold\'.')
+
+        cand_real = data.get_realisations(self.current_value,
+                                          candidate_set)[0]
+        current_value_realisations = self._current_value_realisations
+        if self.settings['prescreen'] == 'gaussian':
+            estimator = self._profiler.wrap_estimator(
+                find_estimator('JidtGaussianCMI')(
+                    dict(self.settings, local_values=False)))
+        elif self.settings['prescreen'] == 'subsample':
+            self.settings.setdefault('prescreen_n_realisations', 1000)
+            estimator = self._cmi_estimator
+            n_realisations = cand_real.shape[0]
+            if self.settings['prescreen_n_realisations'] < n_realisations:
+                idx = np.sort(np.random.choice(
+                    n_realisations, self.settings['prescreen_n_realisations'],
+                    replace=False))
+                cand_real = cand_real[idx, :]
+                current_value_realisations = current_value_realisations[idx]
+                if conditional is not None:
+                    conditional = conditional[idx, :]
+        else:
+            raise RuntimeError('Unknown pre-screening method {0}, use '
+                               '\'gaussian\' or \'subsample\'.'.format(
+                                    self.settings['prescreen']))
+
+        # Estimate the proxy for all candidates at once, where realisations
+        # for a single candidate are treated as one chunk.
+        with self._profiler.phase('prescreen_candidates'):
+            proxy = np.asarray(estimator.estimate_parallel(
+                n_chunks=len(candidate_set),
+                re_use=['var2', 'conditional'],
+                var1=cand_real.T.reshape(cand_real.size, 1),
+                var2=current_value_realisations,
+                conditional=conditional))
+
+        keep = np.ones(len(candidate_set), dtype=bool)
+        if threshold is not None:
+            keep[proxy < threshold] = False
+        if n_keep is not None and np.sum(keep) > n_keep:
+            # Rank remaining candidates by proxy value, stable w.r.t. ties.
+            rank = np.argsort(-np.where(keep, proxy, -np.inf), kind='stable')
+            keep[rank[n_keep:]] = False
+        selected = [c for (c, k) in zip(candidate_set, keep) if k]
+        screened_out = [c for (c, k) in zip(candidate_set, keep) if not k]
+        self._prescreening = {
+            'method': self.settings['prescreen'],
+            'n_candidates': len(candidate_set),
+            'n_screened_out': len(screened_out),
+            'screened_out': self._idx_to_lag(screened_out)}
+        if self.settings['verbose']:
+            logger.info('pre-screening ({0}): {1} of {2} candidates screened '
+                        'out'.format(self.settings['prescreen'],
+                                     len(screened_out), len(candidate_set)))
+        return selected
+
+    def _get_warm_start_vars(self, results_key, candidate_set):
+        """Return variables selected for the current target in a warm start.
+
+        If settings['warm_start'] holds results of a previous analysis (e.g.,
+        of the preceding window in a time-resolved analysis, see
+        TimeResolvedNetworkInference), return the variables selected for the
+        current target in the previous analysis. These are tested before all
+        other candidates.
+
+        Args:
+            results_key : str
+                'selected_vars_sources' or 'selected_vars_target'
+            candidate_set : list of tuples
+                all candidates that may be tested, previously selected
+                variables that are not in the candidate set are ignored
+
+        Returns:
+            list of tuples
+                previously selected variables in the order of selection,
+                where each entry is a tuple (process index, sample index)
+        """
+        if self._warm_start is None:
+            return []
+        try:
+            previous = self._warm_start.get_single_target(
+                self.target, fdr=False)[results_key]
+        except RuntimeError:  # target not analysed previously
+            return []
+        warm_vars = [v for v in self._lag_to_idx(previous)
+                     if v in candidate_set and
+                     v not in self.selected_vars_full]
+        if self.settings['verbose'] and warm_vars:
+            logger.info('warm start, testing previously selected variables '
+                        'first: {0}'.format(self._idx_to_lag(warm_vars)))
+        return warm_vars
+
+    def _define_source_samples(self):
+        """Return samples in the sources' past that are tested as candidates.
+
+        By default, all samples between min_lag_sources and max_lag_sources
+        are tested, spaced by tau_sources. Alternatively, samples may be
+        searched coarse-to-fine, controlled by the settings
+
+        - lag_search : str - 'full' to test all samples or 'coarse_to_fine'
+          to test a coarse grid of samples first and subsequently test
+          samples around selected variables, see _refine_lag_candidates()
+          (default='full')
+        - lag_search_step : int [optional] - spacing of the coarse grid in
+          multiples of tau_sources (default=square root of the number of
+          samples, rounded)
+        - lag_search_radius : int [optional] - samples up to
+          lag_search_radius grid positions around a selected variable are
+          tested in the refinement (default=lag_search_step - 1)
+
+        The lags tested per target are returned in the
+        'source_lags_evaluated' entry of the results.
+
+        Returns:
+            numpy array
+                all samples that may be tested
+            numpy array
+                samples tested initially, i.e., all samples or the coarse grid
+        """
+        self.settings.setdefault('lag_search', 'full')
+        if self.settings['max_lag_sources'] == 0:
+            samples = np.zeros(1).astype(int)
+        else:
+            samples = np.arange(
+                self.current_value[1] - self.settings['min_lag_sources'],
+                self.current_value[1] - self.settings['max_lag_sources'] - 1,
+                -self.settings['tau_sources'])
+        if self.settings['lag_search'] == 'full':
+            return samples, samples
+        elif self.settings['lag_search'] != 'coarse_to_fine':
+            raise RuntimeError('Unknown lag search {0}, use \'full\' or '
+                               '\'coarse_to_fine\'.'.format(
+                                    self.settings['lag_search']))
+        self.settings.setdefault(
+            'lag_search_step', max(1, int(round(np.sqrt(len(samples))))))
+        self.settings.setdefault('lag_search_radius',
+                                 self.settings['lag_search_step'] - 1)
+        if (type(self.settings['lag_search_step']) is not int or
+                self.settings['lag_search_step'] < 1):
+            raise RuntimeError('lag_search_step has to be an integer >= 1.')
+        if (type(self.settings['lag_search_radius']) is not int or
+                self.settings['lag_search_radius'] < 0):
+            raise RuntimeError('lag_search_radius has to be an integer >= 0.')
+        return samples, samples[::self.settings['lag_search_step']]
+
+    def _refine_lag_candidates(self, selected_vars, samples, evaluated):
+        """Return candidates around variables selected from the coarse grid.
+
+        For each selected source variable, return all samples of the same
+        process within settings['lag_search_radius'] positions on the full
+        grid of samples that have not been tested yet.
+
+        Args:
+            selected_vars : list of tuples
+                variables selected from the coarse grid, where each entry is
+                a tuple (process index, sample index)
+            samples : numpy array
+                all samples that may be tested, see _define_source_samples()
+            evaluated : list of tuples
+                candidates tested so far
+
+        Returns:
+            list of tuples
+                candidates to be tested, ordered by process and sample
+        """
+        radius = self.settings['lag_search_radius']
+        samples = list(samples)
+        refined = set()
+        for (process, sample) in selected_vars:
+            if sample not in samples:  # e.g., forced conditionals
+                continue
+            i = samples.index(sample)
+            for s in samples[max(0, i - radius):i + radius + 1]:
+                refined.add((process, int(s)))
+        refined -= set(evaluated)
+        refined -= set(self.selected_vars_full)
+        return sorted(refined, key=lambda c: (c[0], -c[1]))
+
     def _remove_non_significant(self, s, p, stat):
         # Remove non-significant sources from the candidate set. Loop
         # backwards over the candidates to remove them iteratively.
@@ -217,6 +453,7 @@ class NetworkInferenceMI(NetworkInference):
         self.settings.setdefault('add_conditionals', None)
         self.settings.setdefault('tau_sources', 1)
         self.settings.setdefault('local_values', False)
+        self._warm_start = self.settings.pop('warm_start', None)
 
         # Check lags and taus for multivariate embedding.
         if 'max_lag_sources' not in self.settings:
@@ -250,8 +487,9 @@ class NetworkInferenceMI(NetworkInference):
                                    self.settings['tau_sources'],
                                    self.settings['max_lag_sources']))
 
-        # Set CMI estimator.
+        # Set CMI estimator and profiler.
         self._set_cmi_estimator()
+        self._set_profiler()
 
         # Check the provided target and sources.
         self._check_target(target, data.n_processes)
@@ -307,6 +545,10 @@ class NetworkInferenceMI(NetworkInference):
         del self.pvalue_omnibus
         del self.sign_omnibus
         del self._cmi_estimator
+        del self._profiler
+        del self._prescreening
+        del self._source_candidates_evaluated
+        del self._warm_start
 
 
 class NetworkInferenceTE(NetworkInference):
@@ -325,6 +567,8 @@ class NetworkInferenceTE(NetworkInference):
         self.settings.setdefault('tau_target', 1)
         self.settings.setdefault('tau_sources', 1)
         self.settings.setdefault('local_values', False)
+        self._embedding_cache = self.settings.pop('embedding_cache', None)
+        self._warm_start = self.settings.pop('warm_start', None)
 
         # Check lags and taus for multivariate embedding.
         if 'max_lag_sources' not in self.settings:
@@ -366,8 +610,9 @@ class NetworkInferenceTE(NetworkInference):
                                    self.settings['tau_target'],
                                    self.settings['max_lag_target']))
 
-        # Set CMI estimator.
+        # Set CMI estimator and profiler.
         self._set_cmi_estimator()
+        self._set_profiler()
 
         # Check the provided target and sources.
         self._check_target(target, data.n_processes)
@@ -424,21 +669,70 @@ class NetworkInferenceTE(NetworkInference):
                 self.current_value[1] - self.settings['max_lag_target'] - 1,
                 -self.settings['tau_target']).tolist()
         candidates = self._define_candidates(procs, samples)
-        sources_found = self._include_candidates(candidates, data)
+        sources_found = self._include_target_candidates_cached(candidates,
+                                                               data)
 
         # If no candidates were found in the target's past, add at least one
         # sample so we are still calculating a proper TE.
         if not sources_found:
-            print('\nNo informative sources in the target\'s past - '
-                  'adding target sample with lag 1.')
+            logger.debug('No informative sources in the target\'s past - '
+                         'adding target sample with lag 1.')
             idx = (self.current_value[0], self.current_value[1] - 1)
             realisations = data.get_realisations(self.current_value, [idx])[0]
             self._append_selected_vars([idx], realisations)
 
+    def _include_target_candidates_cached(self, candidates, data):
+        """Include target candidates, use embedding cache if available.
+
+        Take samples selected from the target's past from the embedding cache
+        (e.g., filled by a previous AIS analysis) if available. Otherwise,
+        test candidates and add selected samples to the cache.
+
+        Returns:
+            bool
+                True if a significant variable was found in the target's past
+        """
+        if self._embedding_cache is None:
+            return self._include_target_candidates_warm_start(candidates, data)
+
+        key = self._embedding_cache.get_key(
+            data, self.current_value, self.settings['max_lag_target'],
+            self.settings['tau_target'], self.settings)
+        selected_vars = self._embedding_cache.get(key)
+        if selected_vars is None:
+            n_forced = len(self.selected_vars_full)
+            sources_found = self._include_target_candidates_warm_start(
+                candidates, data)
+            self._embedding_cache.add(
+                key, self._idx_to_lag(self.selected_vars_full[n_forced:]))
+            return sources_found
+
+        if self.settings['verbose']:
+            logger.info('taking selected samples from embedding cache: '
+                        '{0}'.format(selected_vars))
+        if not selected_vars:
+            return False
+        idx = self._lag_to_idx(selected_vars)
+        self._append_selected_vars(
+            idx, data.get_realisations(self.current_value, idx)[0])
+        return True
+
+    def _include_target_candidates_warm_start(self, candidates, data):
+        """Include target candidates, test warm-start variables first."""
+        warm_vars = self._get_warm_start_vars('selected_vars_target',
+                                              candidates)
+        success = False
+        if warm_vars:
+            success = self._include_candidates(warm_vars, data)
+        candidates = [c for c in candidates
+                      if c not in self.selected_vars_full]
+        return self._include_candidates(candidates, data) or success
+
     def _reset(self):
         """Reset instance after analysis."""
         self.__init__()
         del self.settings
+        del self._embedding_cache
         del self.source_set
         del self.pvalues_sign_sources
         del self.statistic_sign_sources
@@ -446,6 +740,10 @@ class NetworkInferenceTE(NetworkInference):
         del self.pvalue_omnibus
         del self.sign_omnibus
         del self._cmi_estimator
+        del self._profiler
+        del self._prescreening
+        del self._source_candidates_evaluated
+        del self._warm_start
 
 
 class NetworkInferenceBivariate(NetworkInference):
@@ -464,113 +762,205 @@ class NetworkInferenceBivariate(NetworkInference):
         significant using maximum statistics, add the current candidate to the
         conditional set.
 
+        Sources are tested independently of each other. If
+        settings['n_workers'] > 1, sources are tested in parallel, see
+        _map_sources(). Selected variables are added to the conditioning set
+        in the order of the source set, independent of the number of workers.
+
         Args:
             data : Data instance
                 raw data
         """
         # Define samples for candidate sets.
-        if self.settings['max_lag_sources'] == 0:
-            samples = np.zeros(1).astype(int)
-        else:
-            samples = np.arange(
-                self.current_value[1] - self.settings['min_lag_sources'],
-                self.current_value[1] - self.settings['max_lag_sources'] - 1,
-                -self.settings['tau_sources'])
+        [samples, coarse_samples] = self._define_source_samples()
 
-        # Check if target variables were selected to distinguish between TE
-        # and MI analysis.
+        # Pre-screen candidates of all sources, conditional on the target's
+        # past only. Sources without remaining candidates are not tested.
         if len(self._selected_vars_target) == 0:
-            conditional_realisations_target = None
+            conditional_realisations = None
         else:
-            conditional_realisations_target = (
-                self._selected_vars_target_realisations)
+            conditional_realisations = self._selected_vars_target_realisations
+        candidates = self._prescreen_candidates(
+            self._define_candidates(self.source_set, coarse_samples), data,
+            conditional_realisations)
+        # Variables selected by a previous analysis are tested first.
+        warm_vars = self._get_warm_start_vars(
+            'selected_vars_sources',
+            self._define_candidates(self.source_set, samples))
+        sources = [s for s in self.source_set
+                   if s in [c[0] for c in candidates + warm_vars]]
 
         # Iterate over all potential sources in the analysis. This way, the
         # conditioning uses past variables from the current source only
         # (opposed to past variables from all sources as in multivariate
         # network inference).
+        results = self._map_sources(
+            '_include_single_source', sources, data, candidates, samples,
+            warm_vars)
+        self._source_candidates_evaluated = [
+            c for (source_vars, evaluated) in results for c in evaluated]
         success = False
-        for source in self.source_set:
-            candidate_set = self._define_candidates([source], samples)
+        for (source_vars, evaluated) in results:
+            if source_vars:
+                success = True
+                self._append_selected_vars(
+                    source_vars,
+                    data.get_realisations(self.current_value, source_vars)[0])
+        return success
+
+    def _include_single_source(self, source, data, candidates, samples,
+                               warm_vars):
+        """Find informative candidates in the past of a single source.
+
+        Variables of the current source selected in a previous analysis (see
+        _get_warm_start_vars()) are tested first. If settings['lag_search']
+        is 'coarse_to_fine', candidates around the selected variables are
+        tested subsequently, conditional on all variables selected from the
+        coarse grid, see _refine_lag_candidates().
+
+        Args:
+            source : int
+                index of source process
+            data : Data instance
+                raw data
+            candidates : list of tuples
+                candidates of all sources, candidates of the current source
+                are tested
+            samples : numpy array
+                all samples in the sources' past that may be tested as
+                candidates
+            warm_vars : list of tuples
+                variables of all sources selected in a previous analysis
+
+        Returns:
+            list of tuples
+                selected variables in the order of selection, where each
+                variable is described as (idx process, idx sample)
+            list of tuples
+                all candidates tested for the current source
+        """
+        candidate_set = [c for c in candidates if c[0] == source]
+        if self.settings['verbose']:
+            logger.info('candidate set current source: {0}'.format(
+                    self._idx_to_lag(candidate_set)))
+
+        # Initialise conditional realisations with the target's past (TE
+        # analysis) or no conditional (MI analysis). This gets updated if
+        # sources are selected in the iterative conditioning.
+        if len(self._selected_vars_target) == 0:
+            conditional_realisations = None
+        else:
+            conditional_realisations = self._selected_vars_target_realisations
+
+        selected_vars = []
+        warm_set = [v for v in warm_vars if v[0] == source]
+        if warm_set:
+            [selected_vars, conditional_realisations] = (
+                self._include_source_vars(list(warm_set), data,
+                                          conditional_realisations))
+        candidate_set = [c for c in candidate_set if c not in selected_vars]
+        evaluated = warm_set + [c for c in candidate_set if c not in warm_set]
+        [source_vars, conditional_realisations] = self._include_source_vars(
+            candidate_set, data, conditional_realisations)
+        selected_vars += source_vars
+        if self.settings['lag_search'] == 'coarse_to_fine' and selected_vars:
+            candidate_set = self._refine_lag_candidates(
+                selected_vars, samples, evaluated)
+            evaluated += candidate_set
+            selected_vars += self._include_source_vars(
+                candidate_set, data, conditional_realisations)[0]
+        return selected_vars, evaluated
+
+    def _include_source_vars(self, candidate_set, data,
+                             conditional_realisations):
+        """Iteratively include candidates of a single source.
+
+        Args:
+            candidate_set : list of tuples
+                candidates to be tested, where each entry is a tuple
+                (process index, sample index)
+            data : Data instance
+                raw data
+            conditional_realisations : numpy array | None
+                realisations of the conditioning set
+
+        Returns:
+            list of tuples
+                selected variables in the order of selection
+            numpy array | None
+                realisations of the conditioning set including the selected
+                variables
+        """
+        selected_vars = []
+        while candidate_set:
+            # Get realisations for all candidates.
+            cand_real = data.get_realisations(self.current_value,
+                                              candidate_set)[0]
+            # Reshape candidates to a 1D-array, where realisations for a
+            # single candidate are treated as one chunk.
+            cand_real = cand_real.T.reshape(cand_real.size, 1)
+
+            # Calculate the (C)MI for each candidate and the target.
+            try:
+                temp_te = self._cmi_estimator.estimate_parallel(
+                            n_chunks=len(candidate_set),
+                            re_use=['var2', 'conditional'],
+                            var1=cand_real,
+                            var2=self._current_value_realisations,
+                            conditional=conditional_realisations)
+            except ex.AlgorithmExhaustedError as aee:
+                # The algorithm cannot continue here, so
+                #  we'll terminate the search for more candidates,
+                #  though those identified already remain valid
+                logger.warning('AlgorithmExhaustedError encountered in '
+                    'estimations: ' + aee.message)
+                logger.warning('Halting current estimation set.')
+                # For now we don't need a stack trace:
+                # traceback.print_tb(aee.__traceback__)
+                break
+
+            # Test max CMI for significance with maximum statistics.
+            te_max_candidate = max(temp_te)
+            max_candidate = candidate_set[np.argmax(temp_te)]
             if self.settings['verbose']:
-                    print('candidate set current source: {0}\n'.format(
-                            self._idx_to_lag(candidate_set)), end='')
-
-            # Initialise conditional realisations. This gets updated if sources
-            # are selected in the iterative conditioning.
-            conditional_realisations = conditional_realisations_target
-
-            while candidate_set:
-                # Get realisations for all candidates.
-                cand_real = data.get_realisations(self.current_value,
-                                                  candidate_set)[0]
-                # Reshape candidates to a 1D-array, where realisations for a
-                # single candidate are treated as one chunk.
-                cand_real = cand_real.T.reshape(cand_real.size, 1)
-
-                # Calculate the (C)MI for each candidate and the target.
-                try:
-                    temp_te = self._cmi_estimator.estimate_parallel(
-                                n_chunks=len(candidate_set),
-                                re_use=['var2', 'conditional'],
-                                var1=cand_real,
-                                var2=self._current_value_realisations,
-                                conditional=conditional_realisations)
-                except ex.AlgorithmExhaustedError as aee:
-                    # The algorithm cannot continue here, so
-                    #  we'll terminate the search for more candidates,
-                    #  though those identified already remain valid
-                    print('AlgorithmExhaustedError encountered in '
-                        'estimations: ' + aee.message)
-                    print('Halting current estimation set.')
-                    # For now we don't need a stack trace:
-                    # traceback.print_tb(aee.__traceback__)
-                    break
+                logger.info('testing candidate: {0}'.format(
+                    self._idx_to_lag([max_candidate])[0]))
+            try:
+                significant = stats.max_statistic(
+                    self, data, candidate_set,
+                    te_max_candidate, conditional_realisations)[0]
+            except ex.AlgorithmExhaustedError as aee:
+                # The algorithm cannot continue here, so
+                #  we'll terminate the significance check for this candidate,
+                #  though those identified already remain valid
+                logger.warning('AlgorithmExhaustedError encountered in '
+                    'estimations: ' + aee.message)
+                logger.warning('Halting candidate max stats test')
+                # For now we don't need a stack trace:
+                # traceback.print_tb(aee.__traceback__)
+                break
 
-                # Test max CMI for significance with maximum statistics.
-                te_max_candidate = max(temp_te)
-                max_candidate = candidate_set[np.argmax(temp_te)]
-                if self.settings['verbose']:
-                    print('testing candidate: {0} '.format(
-                        self._idx_to_lag([max_candidate])[0]), end='')
-                try:
-                    significant = stats.max_statistic(
-                        self, data, candidate_set,
-                        te_max_candidate, conditional_realisations)[0]
-                except ex.AlgorithmExhaustedError as aee:
-                    # The algorithm cannot continue here, so
-                    #  we'll terminate the significance check for this candidate,
-                    #  though those identified already remain valid
-                    print('AlgorithmExhaustedError encountered in '
-                        'estimations: ' + aee.message)
-                    print('Halting candidate max stats test')
-                    # For now we don't need a stack trace:
-                    # traceback.print_tb(aee.__traceback__)
-                    break
-
-                # If the max is significant move it from the candidate set to
-                # the set of selected sources and test the next candidate. If
-                # it is not significant break. There will be no further
-                # significant sources b/c they all have lesser TE.
-                if significant:
-                    success = True
-                    candidate_set.pop(np.argmax(temp_te))
-                    candidate_realisations = data.get_realisations(
-                        self.current_value, [max_candidate])[0]
-                    self._append_selected_vars(
-                            [max_candidate], candidate_realisations)
-                    # Update conditioning set for max. statistics in the next
-                    # round.
-                    if conditional_realisations is None:
-                        conditional_realisations = candidate_realisations
-                    else:
-                        conditional_realisations = np.hstack((
-                            conditional_realisations, candidate_realisations))
+            # If the max is significant move it from the candidate set to
+            # the set of selected sources and test the next candidate. If
+            # it is not significant break. There will be no further
+            # significant sources b/c they all have lesser TE.
+            if significant:
+                candidate_set.pop(np.argmax(temp_te))
+                selected_vars.append(max_candidate)
+                # Update conditioning set for max. statistics in the next
+                # round.
+                candidate_realisations = data.get_realisations(
+                    self.current_value, [max_candidate])[0]
+                if conditional_realisations is None:
+                    conditional_realisations = candidate_realisations
                 else:
-                    if self.settings['verbose']:
-                        print(' -- not significant')
-                    break
-        return success
+                    conditional_realisations = np.hstack((
+                        conditional_realisations, candidate_realisations))
+            else:
+                if self.settings['verbose']:
+                    logger.info(' -- not significant')
+                break
+        return selected_vars, conditional_realisations
 
     def _prune_candidates(self, data):
         """Remove uninformative candidates from the final conditional set.
@@ -580,6 +970,9 @@ class NetworkInferenceBivariate(NetworkInference):
         final set. If a sample is not informative, it is removed from the
         final set.
 
+        Sources are pruned independently of each other, in parallel if
+        settings['n_workers'] > 1 (see _map_sources()).
+
         Args:
             data : Data instance
                 raw data
@@ -587,8 +980,34 @@ class NetworkInferenceBivariate(NetworkInference):
         # FOR LATER we don't need to test the last included in the first round
         if self.settings['verbose']:
             if not self.selected_vars_sources:
-                print('no sources selected, nothing to prune ...')
+                logger.info('no sources selected, nothing to prune ...')
+
+        # Prune all selected sources separately. This way, the conditioning
+        # uses past variables from the current source only (opposed to past
+        # variables from all sources as in multivariate network inference).
+        significant_sources = [
+            int(s) for s in
+            np.unique([s[0] for s in self.selected_vars_sources])]
+        removed_vars = self._map_sources(
+            '_prune_single_source', significant_sources, data)
+        for source_vars in removed_vars:
+            for var in source_vars:
+                self._remove_selected_var(var)
+
+    def _prune_single_source(self, source, data):
+        """Find uninformative variables selected from a single source.
 
+        Args:
+            source : int
+                index of source process
+            data : Data instance
+                raw data
+
+        Returns:
+            list of tuples
+                variables to be removed from the conditioning set, where each
+                variable is described as (idx process, idx sample)
+        """
         # Check if target variables were selected to distinguish between TE
         # and MI analysis.
         if len(self._selected_vars_target) == 0:
@@ -598,141 +1017,260 @@ class NetworkInferenceBivariate(NetworkInference):
             conditional_realisations_target = (
                 self._selected_vars_target_realisations)
             cond_target_dim = conditional_realisations_target.shape[1]
-        # Prune all selected sources separately. This way, the conditioning
-        # uses past variables from the current source only (opposed to past
-        # variables from all sources as in multivariate network inference).
-        significant_sources = np.unique(
-            [s[0] for s in self.selected_vars_sources])
-        for source in significant_sources:
-            # Find selected past variables for current source
-            print('selected vars sources {0}'.format(self.selected_vars_sources))
-            source_vars = [s for s in self.selected_vars_sources if
-                           s[0] == source]
-            print('selected candidates current source: {0}'.format(
-                        self._idx_to_lag(source_vars)))
-            # If only a single variable was selected for the current source, no
-            # pruning is necessary. The minimum statistic would be equal to the
-            # maximum statistic for this variable.
-            if len(source_vars) == 1:
-                if self.settings['verbose']:
-                        print(' -- significant')
-                continue
 
-            # Find the candidate with the minimum TE/MI into the target.
-            while source_vars:
-                # Allocate memory, collect realisations, and calculate TE/MI
-                # in parallel for all selected variables in the current
-                # process.
-                temp_te = np.empty(len(source_vars))
-                cond_dim = cond_target_dim + len(source_vars) - 1
-                candidate_realisations = np.empty(
-                    (data.n_realisations(self.current_value) *
-                     len(source_vars), 1)).astype(data.data_type)
-                conditional_realisations = np.empty(
-                    (data.n_realisations(self.current_value) *
-                     len(source_vars),
-                     cond_dim)).astype(data.data_type)
-
-                i_1 = 0
-                i_2 = data.n_realisations(self.current_value)
-                for candidate in source_vars:
-                    temp_cond = data.get_realisations(
-                        self.current_value,
-                        set(source_vars).difference(set([candidate])))[0]
-                    temp_cand = data.get_realisations(
-                        self.current_value, [candidate])[0]
-
-                    if temp_cond is None:
-                        conditional_realisations = conditional_realisations_target
-                        re_use = ['var2', 'conditional']
+        # Find selected past variables for current source
+        logger.debug('selected vars sources {0}'.format(
+            self.selected_vars_sources))
+        source_vars = [s for s in self.selected_vars_sources if
+                       s[0] == source]
+        logger.debug('selected candidates current source: {0}'.format(
+                    self._idx_to_lag(source_vars)))
+        # If only a single variable was selected for the current source, no
+        # pruning is necessary. The minimum statistic would be equal to the
+        # maximum statistic for this variable.
+        removed_vars = []
+        if len(source_vars) == 1:
+            if self.settings['verbose']:
+                    logger.info(' -- significant')
+            return removed_vars
+
+        # Find the candidate with the minimum TE/MI into the target.
+        while source_vars:
+            # Allocate memory, collect realisations, and calculate TE/MI
+            # in parallel for all selected variables in the current
+            # process.
+            temp_te = np.empty(len(source_vars))
+            cond_dim = cond_target_dim + len(source_vars) - 1
+            candidate_realisations = np.empty(
+                (data.n_realisations(self.current_value) *
+                 len(source_vars), 1)).astype(data.data_type)
+            conditional_realisations = np.empty(
+                (data.n_realisations(self.current_value) *
+                 len(source_vars),
+                 cond_dim)).astype(data.data_type)
+
+            i_1 = 0
+            i_2 = data.n_realisations(self.current_value)
+            for candidate in source_vars:
+                temp_cond = data.get_realisations(
+                    self.current_value,
+                    set(source_vars).difference(set([candidate])))[0]
+                temp_cand = data.get_realisations(
+                    self.current_value, [candidate])[0]
+
+                if temp_cond is None:
+                    conditional_realisations = conditional_realisations_target
+                    re_use = ['var2', 'conditional']
+                else:
+                    re_use = ['var2']
+                    if conditional_realisations_target is None:
+                        conditional_realisations[i_1:i_2, ] = temp_cond
                     else:
-                        re_use = ['var2']
-                        if conditional_realisations_target is None:
-                            conditional_realisations[i_1:i_2, ] = temp_cond
-                        else:
-                            conditional_realisations[i_1:i_2, ] = np.hstack((
-                                temp_cond, conditional_realisations_target))
-                    candidate_realisations[i_1:i_2, ] = temp_cand
-                    i_1 = i_2
-                    i_2 += data.n_realisations(self.current_value)
+                        conditional_realisations[i_1:i_2, ] = np.hstack((
+                            temp_cond, conditional_realisations_target))
+                candidate_realisations[i_1:i_2, ] = temp_cand
+                i_1 = i_2
+                i_2 += data.n_realisations(self.current_value)
 
-                try:
-                    temp_te = self._cmi_estimator.estimate_parallel(
-                                    n_chunks=len(source_vars),
-                                    re_use=re_use,
-                                    var1=candidate_realisations,
-                                    var2=self._current_value_realisations,
-                                    conditional=conditional_realisations)
-                except ex.AlgorithmExhaustedError as aee:
-                    # The algorithm cannot continue here, so
-                    #  we'll terminate the pruning check,
-                    #  assuming that we need not prune any more
-                    print('AlgorithmExhaustedError encountered in '
-                        'estimations: ' + aee.message)
-                    print('Halting current pruning and allowing others to'
-                        ' remain.')
-                    # For now we don't need a stack trace:
-                    # traceback.print_tb(aee.__traceback__)
-                    break
+            try:
+                temp_te = self._cmi_estimator.estimate_parallel(
+                                n_chunks=len(source_vars),
+                                re_use=re_use,
+                                var1=candidate_realisations,
+                                var2=self._current_value_realisations,
+                                conditional=conditional_realisations)
+            except ex.AlgorithmExhaustedError as aee:
+                # The algorithm cannot continue here, so
+                #  we'll terminate the pruning check,
+                #  assuming that we need not prune any more
+                logger.warning('AlgorithmExhaustedError encountered in '
+                    'estimations: ' + aee.message)
+                logger.warning('Halting current pruning and allowing others to'
+                    ' remain.')
+                # For now we don't need a stack trace:
+                # traceback.print_tb(aee.__traceback__)
+                break
+
+            # Find variable with minimum MI/TE. Test min TE/MI for
+            # significance with minimum statistics. Build conditioning set
+            # for minimum statistics by removing the minimum candidate.
+            te_min_candidate = min(temp_te)
+            min_candidate = source_vars[np.argmin(temp_te)]
+            if self.settings['verbose']:
+                logger.info('testing candidate: {0}'.format(
+                    self._idx_to_lag([min_candidate])[0]))
+
+            remaining_candidates = set(source_vars).difference(
+                set([min_candidate]))
+            conditional_realisations_sources = data.get_realisations(
+                    self.current_value, remaining_candidates)[0]
+            if conditional_realisations_target is None:
+                conditional_realisations = conditional_realisations_sources
+            elif conditional_realisations_sources is None:
+                conditional_realisations = conditional_realisations_target
+            else:
+                conditional_realisations = np.hstack((
+                    conditional_realisations_target,
+                    conditional_realisations_sources))
+            try:
+                [significant, p, surr_table] = stats.min_statistic(
+                                            self, data,
+                                            source_vars,
+                                            te_min_candidate,
+                                            conditional_realisations)
+            except ex.AlgorithmExhaustedError as aee:
+                # The algorithm cannot continue here, so
+                #  we'll terminate the pruning check,
+                #  assuming that we need not prune any more
+                logger.warning('AlgorithmExhaustedError encountered in '
+                    'estimations: ' + aee.message)
+                logger.warning('Halting current pruning and allowing others to'
+                    ' remain.')
+                # For now we don't need a stack trace:
+                # traceback.print_tb(aee.__traceback__)
+                break
 
-                # Find variable with minimum MI/TE. Test min TE/MI for
-                # significance with minimum statistics. Build conditioning set
-                # for minimum statistics by removing the minimum candidate.
-                te_min_candidate = min(temp_te)
-                min_candidate = source_vars[np.argmin(temp_te)]
+            # Remove the minimum it is not significant and test the next
+            # min. candidate. If the minimum is significant, break. All
+            # other sources will be significant as well (b/c they have
+            # higher TE/MI).
+            if not significant:
+                removed_vars.append(min_candidate)
+                source_vars.pop(np.argmin(temp_te))
+                if len(source_vars) == 0:
+                    logger.debug('No remaining candidates after pruning.')
+            else:
                 if self.settings['verbose']:
-                    print('testing candidate: {0} '.format(
-                        self._idx_to_lag([min_candidate])[0]), end='')
+                    logger.info(' -- significant')
+                break
+        return removed_vars
+
+    def _map_sources(self, method, sources, data, *args):
+        """Call a method for each source, serially or in parallel.
+
+        Call getattr(self, method)(source, data, *args) for each source in
+        sources. If settings['n_workers'] > 1 and more than one source is
+        given, calls are distributed over a pool of workers. The type of
+        workers is set by settings['worker_type']:
+
+        - 'process': worker processes are started using the 'spawn' method
+          and hold a copy of the analysis and of the data, each worker
+          creates its own estimator
+        - 'thread': worker threads share the data, each thread uses its own
+          copy of the analysis and estimator; threads are only faster if
+          the estimator releases the GIL (e.g., JIDT estimators)
+
+        A seed is drawn from the global random state of numpy for each source
+        and surrogate data for the source are created using a random number
+        generator with this seed (see _call_with_seed()). Results are thus
+        reproducible using np.random.seed() and do not depend on the number
+        or type of workers.
+
+        Methods must not change the state of the analysis. Surrogates
+        computed by worker processes are counted for the progress of the
+        analysis once the workers return. Worker processes return only the
+        entries they added to an estimate cache, which are collected in the
+        analysis together with diagnostics of fitted null distributions.
+        Workers record their estimator calls with worker profilers, whose
+        profiles are added to the profile of the analysis. The profile
+        further holds the JVM record of each worker process if JIDT
+        estimators are used.
 
-                remaining_candidates = set(source_vars).difference(
-                    set([min_candidate]))
-                conditional_realisations_sources = data.get_realisations(
-                        self.current_value, remaining_candidates)[0]
-                if conditional_realisations_target is None:
-                    conditional_realisations = conditional_realisations_sources
-                elif conditional_realisations_sources is None:
-                    conditional_realisations = conditional_realisations_target
-                else:
-                    conditional_realisations = np.hstack((
-                        conditional_realisations_target,
-                        conditional_realisations_sources))
-                try:
-                    [significant, p, surr_table] = stats.min_statistic(
-                                                self, data,
-                                                source_vars,
-                                                te_min_candidate,
-                                                conditional_realisations)
-                except ex.AlgorithmExhaustedError as aee:
-                    # The algorithm cannot continue here, so
-                    #  we'll terminate the pruning check,
-                    #  assuming that we need not prune any more
-                    print('AlgorithmExhaustedError encountered in '
-                        'estimations: ' + aee.message)
-                    print('Halting current pruning and allowing others to'
-                        ' remain.')
-                    # For now we don't need a stack trace:
-                    # traceback.print_tb(aee.__traceback__)
-                    break
-
-                # Remove the minimum it is not significant and test the next
-                # min. candidate. If the minimum is significant, break. All
-                # other sources will be significant as well (b/c they have
-                # higher TE/MI).
-                if not significant:
-                    self._remove_selected_var(min_candidate)
-                    source_vars.pop(np.argmin(temp_te))
-                    if len(source_vars) == 0:
-                        print('No remaining candidates after pruning.')
-                else:
-                    if self.settings['verbose']:
-                        print(' -- significant')
-                    break
+        Returns:
+            list
+                return values in the order of sources
+        """
+        self.settings.setdefault('n_workers', 1)
+        self.settings.setdefault('worker_type', 'process')
+        n_workers = min(self.settings['n_workers'], len(sources))
+        seeds = np.random.randint(0, 2**31, size=len(sources))
+        if n_workers <= 1:
+            return [self._call_with_seed(method, s, data, args, seed)
+                    for (s, seed) in zip(sources, seeds)]
+
+        if self.settings['verbose']:
+            logger.info('using {0} {1} workers for {2} sources'.format(
+                n_workers, self.settings['worker_type'], len(sources)))
+        if self.settings['worker_type'] == 'process':
+            state = {k: v for (k, v) in self.__dict__.items()
+                     if k not in ['_cmi_estimator', '_cmi_estimator_local',
+                                  '_progress', '_warm_start', '_profiler']}
+            with ProcessPoolExecutor(
+                    max_workers=n_workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                    initargs=(type(self), state, data,
+                              self._profiler.get_worker_profiler())) as pool:
+                futures = [pool.submit(_call_worker, method, s, args, seed)
+                           for (s, seed) in zip(sources, seeds)]
+                results = []
+                for f in futures:
+                    (res, settings, n_surrogates, cache, null_fits,
+                     profile, jvm_info) = f.result()
+                    report_surrogates(self, n_surrogates)
+                    self._null_fits += null_fits
+                    self._profiler.add_profile(profile)
+                    self._profiler.add_jvm_info(jvm_info)
+                    if cache is not None:
+                        self._estimate_cache.update(cache)
+                    results.append((res, settings))
+        elif self.settings['worker_type'] == 'thread':
+            local = threading.local()
+            copies = []
+
+            def call(source, seed):
+                if not hasattr(local, 'analysis'):
+                    local.analysis = self._get_worker_copy()
+                    copies.append(local.analysis)
+                return (local.analysis._call_with_seed(
+                            method, source, data, args, seed),
+                        local.analysis.settings)
+
+            with ThreadPoolExecutor(max_workers=n_workers) as pool:
+                results = list(pool.map(call, sources, seeds))
+            for analysis in copies:
+                self._profiler.add_profile(analysis._profiler.get_profile())
+        else:
+            raise RuntimeError('Unknown worker type {0}, use \'process\' or '
+                               '\'thread\'.'.format(
+                                    self.settings['worker_type']))
+        # Keep defaults set by the workers (e.g., by statistical tests) in
+        # the settings of the analysis.
+        for (_, settings) in results:
+            for k in settings:
+                self.settings.setdefault(k, settings[k])
+        return [r for (r, _) in results]
+
+    def _call_with_seed(self, method, source, data, args, seed):
+        """Call method for a single source with its own random generator.
+
+        Surrogate data are created using a random number generator with the
+        given seed instead of the global random state of numpy, which is
+        shared between worker threads (see stats._get_surrogates()).
+        """
+        self._rng = np.random.RandomState(seed)
+        try:
+            return getattr(self, method)(source, data, *args)
+        finally:
+            self._rng = None
+
+    def _get_worker_copy(self):
+        """Return a shallow copy of the analysis with its own estimator.
+
+        The copy records estimator calls with its own worker profiler, such
+        that threads do not share the stack of running phases.
+        """
+        analysis = cp.copy(self)
+        analysis.settings = cp.copy(self.settings)
+        analysis._set_cmi_estimator()
+        analysis._set_profiler(self._profiler.get_worker_profiler())
+        return analysis
 
     def _test_final_conditional(self, data):
         """Perform statistical test on the final conditional set."""
         if not self.selected_vars_sources:
             if self.settings['verbose']:
-                print('no sources selected ...')
+                logger.info('no sources selected ...')
             self.statistic_omnibus = None
             self.sign_omnibus = False
             self.pvalue_omnibus = None
@@ -741,16 +1279,18 @@ class NetworkInferenceBivariate(NetworkInference):
             self.statistic_single_link = None
         else:
             if self.settings['verbose']:
-                print('selected variables: {0}'.format(
+                logger.info('selected variables: {0}'.format(
                     self._idx_to_lag(self.selected_vars_full)))
             try:
-                [s, p, stat] = stats.omnibus_test(self, data)
+                with self._profiler.phase('omnibus_test'):
+                    [s, p, stat] = stats.omnibus_test(self, data)
             except ex.AlgorithmExhaustedError as aee:
                 # The algorithm cannot continue here, so
                 #  we'll set the results to zero
-                print('AlgorithmExhaustedError encountered in '
+                logger.warning('AlgorithmExhaustedError encountered in '
                     'estimations: ' + aee.message)
-                print('Halting omnibus test and setting to not significant.')
+                logger.warning('Halting omnibus test and setting to not '
+                               'significant.')
                 # For now we don't need a stack trace:
                 # traceback.print_tb(aee.__traceback__)
                 stat = 0
@@ -765,8 +1305,9 @@ class NetworkInferenceBivariate(NetworkInference):
                 # If there is an ex.AlgorithmExhaustedError exception inside
                 #  max_stats_sequential, it will catch it and return
                 #  everything as not significant:
-                [s, p, stat] = stats.max_statistic_sequential_bivariate(
-                    self, data)
+                with self._profiler.phase('max_statistic_sequential'):
+                    [s, p, stat] = stats.max_statistic_sequential_bivariate(
+                        self, data)
                 p, stat = self._remove_non_significant(s, p, stat)
                 self.pvalues_sign_sources = p
                 self.statistic_sign_sources = stat
@@ -788,9 +1329,9 @@ class NetworkInferenceBivariate(NetworkInference):
                     #  Since max stats sequential etc all passed up to here,
                     #  it seems ok to let everything through still but
                     #  just write a 0 for final values
-                    print('AlgorithmExhaustedError encountered in '
+                    logger.warning('AlgorithmExhaustedError encountered in '
                         'final_conditional estimations: ' + aee.message)
-                    print('Halting final_conditional estimations')
+                    logger.warning('Halting final_conditional estimations')
                     # For now we don't need a stack trace:
                     # traceback.print_tb(aee.__traceback__)
                     self.statistic_single_link = \
@@ -812,18 +1353,36 @@ class NetworkInferenceMultivariate(NetworkInference):
     def _include_source_candidates(self, data):
         """Test candidates in the source's past."""
         procs = self.source_set
-        if self.settings['max_lag_sources'] == 0:
-            samples = np.zeros(1).astype(int)
-        else:
-            samples = np.arange(
-                self.current_value[1] - self.settings['min_lag_sources'],
-                self.current_value[1] - self.settings['max_lag_sources'] - 1,
-                -self.settings['tau_sources'])
-        candidates = self._define_candidates(procs, samples)
+        [samples, coarse_samples] = self._define_source_samples()
+        selected_before = list(self.selected_vars_full)
+
+        # Test variables selected by a previous analysis first.
+        warm_vars = self._get_warm_start_vars(
+            'selected_vars_sources', self._define_candidates(procs, samples))
+        if warm_vars:
+            self._include_candidates(list(warm_vars), data)
+
+        candidates = [c for c in self._define_candidates(procs, coarse_samples)
+                      if c not in self.selected_vars_full]
+        candidates = self._prescreen_candidates(
+            candidates, data, self._selected_vars_realisations)
+        self._source_candidates_evaluated = warm_vars + [
+            c for c in candidates if c not in warm_vars]
         # Possible extension in the future: include non-selected target
         # candidates as further candidates, # they may get selected due to
         # synergies.
-        self._include_candidates(candidates, data)
+        self._include_candidates(list(candidates), data)
+
+        # Test samples around variables selected from the coarse grid,
+        # conditional on all variables selected so far.
+        if self.settings['lag_search'] == 'coarse_to_fine':
+            selected = [v for v in self.selected_vars_full
+                        if v not in selected_before]
+            candidates = self._refine_lag_candidates(
+                selected, samples, self._source_candidates_evaluated)
+            if candidates:
+                self._source_candidates_evaluated += candidates
+                self._include_candidates(list(candidates), data)
 
     def _prune_candidates(self, data):
         """Remove uninformative candidates from the final conditional set.
@@ -840,16 +1399,16 @@ class NetworkInferenceMultivariate(NetworkInference):
         # FOR LATER we don't need to test the last included in the first round
         if self.settings['verbose']:
             if self.selected_vars_sources:
-                print('selected candidates: {0}'.format(
+                logger.info('selected candidates: {0}'.format(
                         self._idx_to_lag(self.selected_vars_sources)))
             else:
-                print('no sources selected, nothing to prune ...')
+                logger.info('no sources selected, nothing to prune ...')
         # If only a single variable was selected, no pruning is necessary. The
         # minimum statistic would be equal to the maximum statistic for this
         # variable.
         if len(self.selected_vars_sources) == 1:
             if self.settings['verbose']:
-                print(' -- significant')
+                logger.info(' -- significant')
             return
         while self.selected_vars_sources:
             # Find the candidate with the minimum TE into the target.
@@ -893,9 +1452,9 @@ class NetworkInferenceMultivariate(NetworkInference):
                 # The algorithm cannot continue here, so
                 #  we'll terminate the pruning check,
                 #  assuming that we need not prune any more
-                print('AlgorithmExhaustedError encountered in '
+                logger.warning('AlgorithmExhaustedError encountered in '
                     'estimations: ' + aee.message)
-                print('Halting current pruning and allowing others to'
+                logger.warning('Halting current pruning and allowing others to'
                     ' remain.')
                 # For now we don't need a stack trace:
                 # traceback.print_tb(aee.__traceback__)
@@ -907,8 +1466,8 @@ class NetworkInferenceMultivariate(NetworkInference):
             te_min_candidate = min(temp_te)
             min_candidate = self.selected_vars_sources[np.argmin(temp_te)]
             if self.settings['verbose']:
-                print('testing candidate: {0} '.format(
-                    self._idx_to_lag([min_candidate])[0]), end='')
+                logger.info('testing candidate: {0}'.format(
+                    self._idx_to_lag([min_candidate])[0]))
 
             remaining_candidates = set(self.selected_vars_full).difference(
                     set([min_candidate]))
@@ -924,9 +1483,9 @@ class NetworkInferenceMultivariate(NetworkInference):
                 # The algorithm cannot continue here, so
                 #  we'll terminate the pruning check,
                 #  assuming that we need not prune any more
-                print('AlgorithmExhaustedError encountered in '
+                logger.warning('AlgorithmExhaustedError encountered in '
                     'estimations: ' + aee.message)
-                print('Halting current pruning and allowing others to'
+                logger.warning('Halting current pruning and allowing others to'
                     ' remain.')
                 # For now we don't need a stack trace:
                 # traceback.print_tb(aee.__traceback__)
@@ -940,10 +1499,10 @@ class NetworkInferenceMultivariate(NetworkInference):
                 #     print(' -- not significant\n')
                 self._remove_selected_var(min_candidate)
                 if len(self.selected_vars_sources) == 0:
-                        print('No remaining candidates after pruning.')
+                        logger.debug('No remaining candidates after pruning.')
             else:
                 if self.settings['verbose']:
-                    print(' -- significant')
+                    logger.info(' -- significant')
                 self._min_stats_surr_table = surr_table
                 break
 
@@ -951,7 +1510,7 @@ class NetworkInferenceMultivariate(NetworkInference):
         """Perform statistical test on the final conditional set."""
         if not self.selected_vars_sources:
             if self.settings['verbose']:
-                print('no sources selected ...')
+                logger.info('no sources selected ...')
             self.statistic_omnibus = None
             self.sign_omnibus = False
             self.pvalue_omnibus = None
@@ -960,16 +1519,18 @@ class NetworkInferenceMultivariate(NetworkInference):
             self.statistic_single_link = None
         else:
             if self.settings['verbose']:
-                print('selected variables: {0}'.format(
+                logger.info('selected variables: {0}'.format(
                     self._idx_to_lag(self.selected_vars_full)))
             try:
-                [s, p, stat] = stats.omnibus_test(self, data)
+                with self._profiler.phase('omnibus_test'):
+                    [s, p, stat] = stats.omnibus_test(self, data)
             except ex.AlgorithmExhaustedError as aee:
                 # The algorithm cannot continue here, so
                 #  we'll set the results to zero
-                print('AlgorithmExhaustedError encountered in '
+                logger.warning('AlgorithmExhaustedError encountered in '
                     'estimations: ' + aee.message)
-                print('Halting omnibus test and setting to not significant.')
+                logger.warning('Halting omnibus test and setting to not '
+                               'significant.')
                 # For now we don't need a stack trace:
                 # traceback.print_tb(aee.__traceback__)
                 stat = 0
@@ -984,7 +1545,8 @@ class NetworkInferenceMultivariate(NetworkInference):
                 # If there is an ex.AlgorithmExhaustedError exception inside
                 #  max_stats_sequential, it will catch it and return
                 #  everything as not significant:
-                [s, p, stat] = stats.max_statistic_sequential(self, data)
+                with self._profiler.phase('max_statistic_sequential'):
+                    [s, p, stat] = stats.max_statistic_sequential(self, data)
                 p, stat = self._remove_non_significant(s, p, stat)
                 self.pvalues_sign_sources = p
                 self.statistic_sign_sources = stat
@@ -1008,9 +1570,9 @@ class NetworkInferenceMultivariate(NetworkInference):
                     #  Since max stats sequential etc all passed up to here,
                     #  it seems ok to let everything through still but
                     #  just write a 0 for final values
-                    print('AlgorithmExhaustedError encountered in '
+                    logger.warning('AlgorithmExhaustedError encountered in '
                         'final_conditional estimations: ' + aee.message)
-                    print('Halting final_conditional estimations')
+                    logger.warning('Halting final_conditional estimations')
                     # For now we don't need a stack trace:
                     # traceback.print_tb(aee.__traceback__)
                     self.statistic_single_link = \
@@ -1021,3 +1583,51 @@ class NetworkInferenceMultivariate(NetworkInference):
                 self.pvalues_sign_sources = None
                 self.statistic_sign_sources = None
                 self.statistic_single_link = None
+
+
+# Analysis copy used by worker processes, set by _init_worker().
+_worker_analysis = None
+_worker_data = None
+
+
+def _init_worker(analysis_class, state, data, profiler):
+    """Set up analysis copy in a worker process, see _map_sources()."""
+    global _worker_analysis, _worker_data
+    analysis = analysis_class.__new__(analysis_class)
+    analysis.__dict__.update(state)
+    analysis._set_cmi_estimator()
+    analysis._set_profiler(profiler)
+    if analysis._estimate_cache is not None:
+        analysis._estimate_cache.get_new_entries()  # start recording
+    _worker_analysis = analysis
+    _worker_data = data
+
+
+def _call_worker(method, source, args, seed):
+    """Call analysis method for a single source in a worker process."""
+    _worker_analysis._progress = Progress(None, 0)
+    _worker_analysis._null_fits = []
+    # Return only records of this call, records of earlier calls were
+    # returned already.
+    _worker_analysis._profiler.clear()
+    result = _worker_analysis._call_with_seed(method, source, _worker_data,
+                                              args, seed)
+    # Return the JVM record of the worker process if JIDT estimators are in
+    # use, the module is not imported here, which would import jpype.
+    estimators_jidt = sys.modules.get('idtxl.estimators_jidt')
+    if estimators_jidt is not None:
+        jvm_info = estimators_jidt.get_jvm_info()
+    else:
+        jvm_info = None
+    # Return only entries added to the estimate cache during this call.
+    if _worker_analysis._estimate_cache is not None:
+        new_entries = _worker_analysis._estimate_cache.get_new_entries()
+    else:
+        new_entries = None
+    return (result,
+            _worker_analysis.settings,
+            _worker_analysis._progress.surrogates_computed,
+            new_entries,
+            _worker_analysis._null_fits,
+            _worker_analysis._profiler.get_profile(),
+            jvm_info)
@@ -5,11 +5,15 @@ Estimate PID for two source and one target process using different estimators.
 Note:
     Written for Python 3.4+
 """
+import logging
 import numpy as np
 from .single_process_analysis import SingleProcessAnalysis
 from .estimator import find_estimator
+from .progress import Progress
 from .results import ResultsPartialInformationDecomposition
 
+logger = logging.getLogger(__name__)
+
 
 class PartialInformationDecomposition(SingleProcessAnalysis):
     """Perform partial information decomposition for individual processes.
@@ -44,7 +48,8 @@ class PartialInformationDecomposition(SingleProcessAnalysis):
     def __init__(self):
         super().__init__()
 
-    def analyse_network(self, settings, data, targets, sources):
+    def analyse_network(self, settings, data, targets, sources,
+                        progress_callback=None):
         """Estimate partial information decomposition for network nodes.
 
         Estimate partial information decomposition (PID) for multiple nodes in
@@ -95,6 +100,11 @@ class PartialInformationDecomposition(SingleProcessAnalysis):
             sources : list of lists
                 indices of the two source processes for each target, e.g.,
                 [[0, 2], [1, 0]], must have the same length as targets
+            progress_callback : callable [optional]
+                function called with a dict describing the progress of the
+                analysis each time a target was analysed or surrogates were
+                computed, see documentation of the progress module for
+                details (default=None)
 
         Returns:
             ResultsPartialInformationDecomposition instance
@@ -116,14 +126,17 @@ class PartialInformationDecomposition(SingleProcessAnalysis):
             n_nodes=data.n_processes,
             n_realisations=data.n_realisations(),
             normalised=data.normalise)
+        self._progress = Progress(progress_callback, len(targets))
         for t in range(len(targets)):
             if settings['verbose']:
-                print('\n####### analysing target with index {0} from list {1}'
-                      .format(t, targets))
+                logger.info('####### analysing target with index {0} from '
+                            'list {1}'.format(t, targets))
             settings['lags_pid'] = list_of_lags[t]
             res_single = self.analyse_single_target(
                 settings, data, targets[t], sources[t])
             results.combine_results(res_single)
+            self._progress.target_done(targets[t])
+        self._progress = None
         # Get no. realisations actually used for estimation from single target
         # analysis.
         results.data_properties.n_realisations = (
@@ -171,7 +184,8 @@ class PartialInformationDecomposition(SingleProcessAnalysis):
                   estimators_pid modules)
                 - lags_pid : list of ints [optional] - lags in samples between
                   sources and target (default=[1, 1])
-                - verbose : bool [optional] - toggle console output
+                - verbose : bool [optional] - log progress messages at
+                  level INFO, call idtxl.log_to_console() to print them
                   (default=True)
 
             data : Data instance
@@ -274,10 +288,11 @@ class PartialInformationDecomposition(SingleProcessAnalysis):
                                 t=target_realisations)
 
         if self.settings['verbose']:
-            print('\nunq information s1: {0:.8f}, s2: {1:.8f}'.format(
+            logger.info('unq information s1: {0:.8f}, s2: {1:.8f}'.format(
                                                            orig_pid['unq_s1'],
                                                            orig_pid['unq_s2']))
-            print('shd information: {0:.8f}, syn information: {1:.8f}'.format(
+            logger.info('shd information: {0:.8f}, syn information: '
+                        '{1:.8f}'.format(
                                                         orig_pid['shd_s1_s2'],
                                                         orig_pid['syn_s1_s2']))
         self.results = orig_pid
@@ -0,0 +1,326 @@
+"""Record run time and estimator usage of network analysis algorithms.
+
+Network inference and AIS estimation record a profile of each analysis if the
+setting 'profile' is True. The profile holds for each phase of an algorithm
+(e.g., inclusion of target candidates, pruning, omnibus test, FDR-correction)
+and each estimator class:
+
+    - time : float - wall time in seconds, for phases this includes the time
+      spent in nested phases (e.g., the omnibus test is nested in the final
+      statistics)
+    - n_calls : int - number of times a phase was entered (phases only)
+    - n_estimator_calls : int - number of calls to the estimator
+    - n_chunks : int - number of chunks estimated
+    - n_realisations : int - number of realisations passed to the estimator
+    - n_bytes : int - number of bytes passed to the estimator
+
+Calls to the estimator are counted for the innermost running phase. If JIDT
+estimators are used, the profile additionally holds the options, start-up
+time, and warm-up time of the JVM of each process (entry 'jvm', see
+estimators_jidt.get_jvm_info()). Profiles are returned by the get_profile()
+method of the results classes and can be exported as JSON or in the Chrome
+trace event format (open in chrome://tracing or https://ui.perfetto.dev).
+"""
+import os
+import json
+import time
+import threading
+import contextlib
+import numpy as np
+
+COUNTERS = ['n_estimator_calls', 'n_chunks', 'n_realisations', 'n_bytes']
+
+
+class Profiler():
+    """Record wall time and estimator calls of analysis phases.
+
+    Example:
+
+        >>> profiler = Profiler()
+        >>> estimator = profiler.wrap_estimator(JidtKraskovCMI())
+        >>> with profiler.phase('include_target_candidates'):
+        >>>     estimator.estimate(var1, var2)
+        >>> profile = profiler.get_profile()
+
+    Args:
+        enabled : bool [optional]
+            if False, nothing is recorded and estimators are not wrapped
+            (default=True)
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._phases = {}
+        self._estimators = {}
+        self._events = []
+        self._stack = []
+        self._jvm = []
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Record the wall time of an analysis phase.
+
+        Args:
+            name : str
+                name of the phase
+        """
+        if not self.enabled:
+            yield
+            return
+        self._stack.append(name)
+        start = time.time()
+        try:
+            yield
+        finally:
+            duration = time.time() - start
+            self._stack.pop()
+            record = self._get_record(self._phases, name)
+            record['time'] += duration
+            record['n_calls'] = record.get('n_calls', 0) + 1
+            self._events.append({'name': name, 'start': start,
+                                 'duration': duration, 'pid': os.getpid(),
+                                 'tid': threading.get_ident()})
+
+    def add_estimator_call(self, estimator_name, duration, n_chunks,
+                           n_realisations, n_bytes):
+        """Record a call to an estimator for the running phase.
+
+        Args:
+            estimator_name : str
+                name of the estimator class
+            duration : float
+                wall time of the call in seconds
+            n_chunks : int
+                number of chunks estimated
+            n_realisations : int
+                number of realisations passed to the estimator
+            n_bytes : int
+                number of bytes passed to the estimator
+        """
+        if not self.enabled:
+            return
+        if self._stack:
+            phase = self._stack[-1]
+        else:
+            phase = 'other'
+        for record in [self._get_record(self._phases, phase),
+                       self._get_record(self._estimators, estimator_name)]:
+            record['n_estimator_calls'] += 1
+            record['n_chunks'] += n_chunks
+            record['n_realisations'] += n_realisations
+            record['n_bytes'] += n_bytes
+        self._estimators[estimator_name]['time'] += duration
+
+    def add_jvm_info(self, jvm_info):
+        """Record options, start-up time, and warm-up time of a JVM.
+
+        Args:
+            jvm_info : dict | None
+                JVM record returned by estimators_jidt.get_jvm_info(), None
+                is ignored
+        """
+        if not self.enabled or jvm_info is None:
+            return
+        self._jvm = _merge_jvm_info(self._jvm + [jvm_info])
+
+    def get_worker_profiler(self):
+        """Return profiler for a worker copy of an analysis.
+
+        The worker profiler starts with the phases currently running in this
+        profiler, such that estimator calls made by the worker are recorded
+        for the phase that distributed the calls. Add the worker profile back
+        using add_profile().
+        """
+        profiler = Profiler(enabled=self.enabled)
+        profiler._stack = list(self._stack)
+        return profiler
+
+    def add_profile(self, profile):
+        """Add records of a profile, e.g., recorded by a worker profiler.
+
+        Args:
+            profile : dict | None
+                profile returned by get_profile(), None is ignored
+        """
+        if not self.enabled or profile is None:
+            return
+        merged = merge_profiles([self.get_profile(), profile])
+        self._phases = merged['phases']
+        self._estimators = merged['estimators']
+        self._events = merged['events']
+        self._jvm = merged['jvm']
+
+    def clear(self):
+        """Remove all records, phases currently running are kept."""
+        self._phases = {}
+        self._estimators = {}
+        self._events = []
+        self._jvm = []
+
+    def wrap_estimator(self, estimator):
+        """Return estimator that records its calls with this profiler."""
+        if not self.enabled:
+            return estimator
+        return ProfiledEstimator(estimator, self)
+
+    def get_profile(self):
+        """Return recorded profile.
+
+        Returns:
+            dict | None
+                profile with entries 'phases' and 'estimators', holding
+                records for each phase and estimator class, 'events',
+                holding a list of phase start times and durations, and 'jvm',
+                holding a list of JVM records; None if profiling is disabled
+        """
+        if not self.enabled:
+            return None
+        return {'phases': {k: dict(v) for (k, v) in self._phases.items()},
+                'estimators': {k: dict(v) for (k, v) in
+                               self._estimators.items()},
+                'events': [dict(e) for e in self._events],
+                'jvm': [dict(j) for j in self._jvm]}
+
+    def _get_record(self, records, name):
+        if name not in records:
+            records[name] = {'time': 0.0}
+            for c in COUNTERS:
+                records[name][c] = 0
+        return records[name]
+
+
+class ProfiledEstimator():
+    """Wrap an estimator and record its calls with a profiler.
+
+    All attributes and methods of the wrapped estimator are accessible
+    through the wrapper. Calls to estimate(), estimate_parallel(), and
+    estimate_surrogates_analytic() are recorded.
+
+    Args:
+        estimator : Estimator instance
+            estimator to be wrapped
+        profiler : Profiler instance
+            profiler recording estimator calls
+    """
+
+    def __init__(self, estimator, profiler):
+        self._estimator = estimator
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        if name in ['_estimator', '_profiler']:
+            raise AttributeError(name)
+        return getattr(self._estimator, name)
+
+    def estimate(self, *args, **kwargs):
+        """Estimate and record call, see wrapped estimator."""
+        return self._call('estimate', 1, args, kwargs)
+
+    def estimate_parallel(self, n_chunks=1, re_use=None, **data):
+        """Estimate in chunks and record call, see wrapped estimator."""
+        return self._call('estimate_parallel', n_chunks, (),
+                          dict(data, n_chunks=n_chunks, re_use=re_use))
+
+    def estimate_surrogates_analytic(self, n_perm=200, **data):
+        """Estimate analytic surrogates and record call."""
+        return self._call('estimate_surrogates_analytic', n_perm, (),
+                          dict(data, n_perm=n_perm))
+
+    def _call(self, method, n_chunks, args, kwargs):
+        arrays = [a for a in list(args) + list(kwargs.values())
+                  if isinstance(a, np.ndarray)]
+        start = time.time()
+        estimate = getattr(self._estimator, method)(*args, **kwargs)
+        self._profiler.add_estimator_call(
+            estimator_name=type(self._estimator).__name__,
+            duration=time.time() - start,
+            n_chunks=n_chunks,
+            n_realisations=max([a.shape[0] for a in arrays], default=0),
+            n_bytes=sum([a.nbytes for a in arrays]))
+        return estimate
+
+
+def merge_profiles(profiles):
+    """Merge multiple profiles by summing records of phases and estimators.
+
+    Args:
+        profiles : list of dicts
+            profiles returned by Profiler.get_profile(), None entries are
+            ignored
+
+    Returns:
+        dict
+            merged profile
+    """
+    merged = {'phases': {}, 'estimators': {}, 'events': [], 'jvm': []}
+    for p in profiles:
+        if p is None:
+            continue
+        for key in ['phases', 'estimators']:
+            for name, record in p[key].items():
+                if name not in merged[key]:
+                    merged[key][name] = dict(record)
+                else:
+                    for c in record:
+                        merged[key][name][c] = (
+                            merged[key][name].get(c, 0) + record[c])
+        merged['events'] += [dict(e) for e in p['events']]
+        merged['jvm'] = _merge_jvm_info(merged['jvm'] + p.get('jvm', []))
+    return merged
+
+
+def _merge_jvm_info(records):
+    """Keep the most recent JVM record of each process."""
+    by_pid = {}
+    for r in records:
+        by_pid[r['pid']] = dict(r)
+    return list(by_pid.values())
+
+
+def export_json(profile, filename):
+    """Write profile to a JSON file.
+
+    Args:
+        profile : dict
+            profile, e.g., returned by Results.get_profile()
+        filename : str
+            path to output file
+    """
+    with open(filename, 'w') as f:
+        json.dump(profile, f, indent=2, default=_to_builtin)
+
+
+def export_chrome_trace(profile, filename):
+    """Write phases of a profile to a file in the Chrome trace event format.
+
+    Each phase is written as a complete event ('ph': 'X'). Phase records are
+    added as event arguments.
+
+    Args:
+        profile : dict
+            profile, e.g., returned by Results.get_profile()
+        filename : str
+            path to output file
+    """
+    events = []
+    for e in profile['events']:
+        events.append({
+            'name': e['name'],
+            'cat': 'phase',
+            'ph': 'X',
+            'ts': e['start'] * 1e6,
+            'dur': e['duration'] * 1e6,
+            'pid': e['pid'],
+            'tid': e['tid'],
+            'args': profile['phases'].get(e['name'], {})})
+    with open(filename, 'w') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f,
+                  default=_to_builtin)
+
+
+def _to_builtin(value):
+    """Convert numpy types for JSON export."""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError('Object of type {0} is not JSON serializable.'.format(
+        type(value).__name__))
@@ -0,0 +1,110 @@
+"""Report progress of network analyses to a user-defined callback.
+
+The analyse_network() methods of network inference, AIS, and PID algorithms
+accept a callable progress_callback. The callback is called with a single
+dict each time a target (or process) was analysed and each time a set of
+surrogates was computed. The dict contains
+
+    - event : str - 'target' or 'surrogates'
+    - target : int | None - index of the analysed target/process for events
+      of type 'target', None otherwise
+    - targets_done : int - number of targets/processes analysed
+    - n_targets : int - total number of targets/processes
+    - surrogates_computed : int - number of surrogate estimates computed
+      (e.g., for the max-, min-, and omnibus statistics)
+    - elapsed : float - wall time in seconds since analyse_network() was
+      called
+    - eta : float | None - estimated time in seconds until all targets are
+      analysed, extrapolated from the average time per analysed target,
+      None before the first target is done
+
+Example:
+
+    >>> def report(progress):
+    >>>     print('{0}/{1} targets, ETA {2}s'.format(
+    >>>         progress['targets_done'], progress['n_targets'],
+    >>>         progress['eta']))
+    >>> network_analysis = MultivariateTE()
+    >>> results = network_analysis.analyse_network(
+    >>>     settings, data, progress_callback=report)
+"""
+import time
+import threading
+
+
+class Progress():
+    """Count analysed targets and computed surrogates, estimate run time.
+
+    Args:
+        callback : callable | None
+            function called with a dict describing the current progress, if
+            None, progress is counted but not reported
+        n_targets : int
+            total number of targets/processes to be analysed
+    """
+
+    def __init__(self, callback, n_targets):
+        self.callback = callback
+        self.n_targets = n_targets
+        self.targets_done = 0
+        self.surrogates_computed = 0
+        self._start = time.time()
+        self._lock = threading.Lock()
+
+    def add_surrogates(self, n):
+        """Count surrogates computed in a statistical test.
+
+        Args:
+            n : int
+                number of surrogate estimates
+        """
+        with self._lock:
+            self.surrogates_computed += n
+        self._report('surrogates', None)
+
+    def target_done(self, target):
+        """Count a target/process as analysed.
+
+        Args:
+            target : int
+                index of the analysed target/process
+        """
+        with self._lock:
+            self.targets_done += 1
+        self._report('target', target)
+
+    def get_state(self, event=None, target=None):
+        """Return the current progress as dict."""
+        elapsed = time.time() - self._start
+        if self.targets_done > 0:
+            eta = (elapsed / self.targets_done *
+                   (self.n_targets - self.targets_done))
+        else:
+            eta = None
+        return {
+            'event': event,
+            'target': target,
+            'targets_done': self.targets_done,
+            'n_targets': self.n_targets,
+            'surrogates_computed': self.surrogates_computed,
+            'elapsed': elapsed,
+            'eta': eta}
+
+    def _report(self, event, target):
+        if self.callback is not None:
+            self.callback(self.get_state(event, target))
+
+
+def report_surrogates(analysis_setup, n):
+    """Count surrogates for an analysis with an active progress tracker.
+
+    Args:
+        analysis_setup : NetworkAnalysis instance
+            analysis, progress is tracked if the instance has an attribute
+            _progress set by analyse_network()
+        n : int
+            number of surrogate estimates
+    """
+    progress = getattr(analysis_setup, '_progress', None)
+    if progress is not None:
+        progress.add_surrogates(n)
@@ -0,0 +1,186 @@
+"""Allocate CPU cores and memory to workers, JIDT, and BLAS.
+
+Network inference and AIS estimation may use three levels of parallelism:
+worker processes or threads (setting 'n_workers'), threads used by JIDT's
+Kraskov estimators (setting 'num_threads'), and threads used by the BLAS
+library underlying numpy. If all levels use all cores, the machine is
+oversubscribed, e.g., 64 worker processes each starting 64 JIDT threads.
+
+A thread budget divides the available cores between workers, such that each
+worker's JIDT and BLAS threads use cores / workers threads. The budget is
+computed from the analysis settings when an analysis creates its estimator,
+settings entered by the user take precedence over the budget. The budget
+applied is added to the settings as 'thread_budget' and is thus reported in
+the settings of the results.
+
+Example:
+
+    >>> settings = {'cmi_estimator': 'JidtKraskovCMI', 'n_workers': 8,
+    >>>             'n_cores': 32, 'jvm_heap_size': '2g', ...}
+    >>> results = MultivariateTE().analyse_network(settings, data)
+    >>> results.settings.thread_budget
+    >>> # Out: {'n_cores': 32, 'n_workers': 8, 'num_threads': 4,
+    >>> #       'blas_threads': 4, 'jvm_heap_size': '2g', 'blas_limited': True}
+
+BLAS threads are limited using threadpoolctl if it is installed. Otherwise,
+and additionally for worker processes, the limit is set through the
+environment variables read by BLAS libraries on start-up, which only takes
+effect in processes started after the budget was applied. Limits and
+environment variables are restored once the analysis returns (see
+restore_thread_limits()), such that code run after the analysis is not
+affected by the budget.
+"""
+import os
+import logging
+import functools
+try:
+    from threadpoolctl import threadpool_info, threadpool_limits
+except ImportError:  # optional, BLAS threads are limited for new processes
+    threadpool_info = None
+    threadpool_limits = None
+
+logger = logging.getLogger(__name__)
+
+# Environment variables setting the size of thread pools of BLAS libraries.
+BLAS_ENV_VARIABLES = ['OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS',
+                      'MKL_NUM_THREADS', 'VECLIB_MAXIMUM_THREADS',
+                      'NUMEXPR_NUM_THREADS']
+_blas_env_set = set()  # variables set by limit_blas_threads()
+
+
+def get_n_cores():
+    """Return number of cores available to the current process."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on all platforms
+        return os.cpu_count() or 1
+
+
+def get_thread_budget(settings):
+    """Return allocation of cores to workers, JIDT, and BLAS threads.
+
+    Args:
+        settings : dict
+            analysis settings, the following entries are used:
+
+            - n_cores : int [optional] - number of cores available to the
+              analysis (default=all cores available to the process)
+            - n_workers : int [optional] - number of worker processes or
+              threads (default=1)
+            - num_threads : int | str [optional] - number of threads used by
+              JIDT estimators (default=n_cores / n_workers)
+            - blas_threads : int [optional] - number of BLAS threads per
+              worker (default=n_cores / n_workers)
+            - jvm_heap_size : str [optional] - maximum heap size of the JAVA
+              virtual machine started by each worker process, e.g., '4g' or
+              '512m' (default=None, use the JVM's default)
+
+    Returns:
+        dict
+            thread budget with entries n_cores, n_workers, num_threads,
+            blas_threads, and jvm_heap_size
+    """
+    n_cores = settings.get('n_cores', None)
+    if n_cores is None:
+        n_cores = get_n_cores()
+    if type(n_cores) is not int or n_cores < 1:
+        raise RuntimeError('n_cores has to be an integer > 0.')
+    n_workers = settings.get('n_workers', 1)
+    if n_workers > n_cores:
+        logger.warning('Number of workers ({0}) is larger than the number of '
+                       'cores ({1}).'.format(n_workers, n_cores))
+    threads_per_worker = max(1, n_cores // max(1, n_workers))
+    return {
+        'n_cores': n_cores,
+        'n_workers': n_workers,
+        'num_threads': settings.get('num_threads', threads_per_worker),
+        'blas_threads': settings.get('blas_threads', threads_per_worker),
+        'jvm_heap_size': settings.get('jvm_heap_size', None)}
+
+
+def apply_thread_budget(settings):
+    """Apply thread budget to the current process and analysis settings.
+
+    Compute the thread budget (see get_thread_budget()), set the number of
+    JIDT threads and the JVM heap size in the settings, which are passed on
+    to the estimators, and limit the number of BLAS threads. The budget is
+    added to the settings as 'thread_budget'.
+
+    Args:
+        settings : dict
+            analysis settings, see get_thread_budget(), the dictionary is
+            changed in place
+
+    Returns:
+        dict
+            thread budget
+    """
+    budget = get_thread_budget(settings)
+    settings['num_threads'] = budget['num_threads']
+    if budget['jvm_heap_size'] is not None:
+        settings['jvm_heap_size'] = budget['jvm_heap_size']
+    budget['blas_limited'] = limit_blas_threads(budget['blas_threads'])
+    settings['thread_budget'] = budget
+    return budget
+
+
+def limit_blas_threads(n_threads):
+    """Limit number of BLAS threads in the current and new processes.
+
+    Args:
+        n_threads : int
+            maximum number of BLAS threads
+
+    Returns:
+        bool
+            True if threads were limited in the current process (requires
+            threadpoolctl)
+    """
+    # Worker processes inherit the environment and read the variables when
+    # BLAS is loaded. Variables set by the user are not overwritten.
+    for v in BLAS_ENV_VARIABLES:
+        if v not in os.environ or v in _blas_env_set:
+            os.environ[v] = str(n_threads)
+            _blas_env_set.add(v)
+    if threadpool_limits is None:
+        logger.debug('threadpoolctl is not installed, BLAS threads are not '
+                     'limited in the current process.')
+        return False
+    threadpool_limits(limits=n_threads, user_api='blas')
+    return True
+
+
+def restore_thread_limits(method):
+    """Restore BLAS limits and environment variables after a method returns.
+
+    Decorator for analysis methods applying a thread budget. The BLAS
+    thread limits of the current process (requires threadpoolctl) and the
+    environment variables setting the number of BLAS threads are saved
+    before the method is called and restored once it returns or raises an
+    error.
+    """
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        env = {v: os.environ.get(v) for v in BLAS_ENV_VARIABLES}
+        env_set = set(_blas_env_set)
+        limits = _get_blas_limits()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            for (v, value) in env.items():
+                if value is None:
+                    os.environ.pop(v, None)
+                else:
+                    os.environ[v] = value
+            _blas_env_set.intersection_update(env_set)
+            if limits:
+                threadpool_limits(limits=limits)
+    return wrapper
+
+
+def _get_blas_limits():
+    """Return current number of threads of each BLAS library by prefix."""
+    if threadpool_info is None:
+        return None
+    return {lib['prefix']: lib['num_threads'] for lib in threadpool_info()
+            if lib['user_api'] == 'blas'}
@@ -1,9 +1,14 @@
 """Provide results class for IDTxl network analysis."""
 import sys
+import logging
 import warnings
 import copy as cp
+from collections.abc import Mapping
 import numpy as np
 from . import idtxl_utils as utils
+from . import profiling
+
+logger = logging.getLogger(__name__)
 
 warnings.simplefilter(action='ignore', category=FutureWarning)
 MIN_INT = -sys.maxsize - 1  # minimum integer for initializing adj. matrix
@@ -55,26 +60,57 @@ class DotDict(dict):
 
 
 class AdjacencyMatrix():
-    """Adjacency matrix representing inferred networks."""
+    """Adjacency matrix representing inferred networks.
+
+    Edges are stored sparsely as arrays of source indices, target indices,
+    and weights (coordinate format), such that memory scales with the number
+    of edges and not with the squared number of nodes. Adding an existing
+    edge overwrites its weight. Use get_edge_list(), get_sparse_matrix(), or
+    idtxl_io.export_networkx_graph() to access edges.
+    """
     def __init__(self, n_nodes, weight_type):
-        self._edge_matrix = np.zeros((n_nodes, n_nodes), dtype=bool)
-        self._weight_matrix = np.zeros((n_nodes, n_nodes), dtype=weight_type)
         if np.issubdtype(weight_type, np.integer):
             self._weight_type = np.integer
-        elif np.issubdtype(weight_type, np.float):
-            self._weight_type = np.float
+        elif np.issubdtype(weight_type, np.floating):
+            self._weight_type = np.floating
         elif weight_type is bool:
             self._weight_type = weight_type
         else:
             raise RuntimeError('Unknown weight data type {0}.'.format(
                 weight_type))
+        self._n_nodes = n_nodes
+        self._dtype = weight_type
+        self._i = np.zeros(0, dtype=int)
+        self._j = np.zeros(0, dtype=int)
+        self._weights = np.zeros(0, dtype=weight_type)
+        self._dense = None
+
+    @property
+    def _edge_matrix(self):
+        """Dense boolean matrix of edges, created on first access."""
+        return self._get_dense()[0]
+
+    @property
+    def _weight_matrix(self):
+        """Dense matrix of edge weights, created on first access."""
+        return self._get_dense()[1]
+
+    def _get_dense(self):
+        if self._dense is None:
+            edge_matrix = np.zeros((self._n_nodes, self._n_nodes), dtype=bool)
+            weight_matrix = np.zeros((self._n_nodes, self._n_nodes),
+                                     dtype=self._dtype)
+            edge_matrix[self._i, self._j] = True
+            weight_matrix[self._i, self._j] = self._weights
+            self._dense = (edge_matrix, weight_matrix)
+        return self._dense
 
     def n_nodes(self):
         """Return number of nodes."""
-        return self._edge_matrix.shape[0]
+        return self._n_nodes
 
     def n_edges(self):
-        return self._edge_matrix.sum()
+        return len(self._i)
 
     def add_edge(self, i, j, weight):
         """Add weighted edge (i, j) to adjacency matrix."""
@@ -82,8 +118,8 @@ class AdjacencyMatrix():
             raise TypeError(
                 'Can not add weight of type {0} to adjacency matrix of type '
                 '{1}.'.format(type(weight), self._weight_type))
-        self._edge_matrix[i, j] = True
-        self._weight_matrix[i, j] = weight
+        self._add_edges(np.array([i], dtype=int), np.array([j], dtype=int),
+                        np.array([weight], dtype=self._dtype))
 
     def add_edge_list(self, i_list, j_list, weights):
         """Add multiple weighted edges (i, j) to adjacency matrix."""
@@ -93,8 +129,34 @@ class AdjacencyMatrix():
         if len(i_list) != len(weights):
             raise RuntimeError(
                 'Edge weights must have same length as edge indices.')
-        for i, j, weight in zip(i_list, j_list, weights):
-            self.add_edge(i, j, weight)
+        if len(i_list) == 0:
+            return
+        weights = np.asarray(weights)
+        if not np.issubdtype(weights.dtype, self._weight_type):
+            raise TypeError(
+                'Can not add weights of type {0} to adjacency matrix of type '
+                '{1}.'.format(weights.dtype, self._weight_type))
+        self._add_edges(np.asarray(i_list, dtype=int),
+                        np.asarray(j_list, dtype=int),
+                        weights.astype(self._dtype))
+
+    def _add_edges(self, i, j, weights):
+        """Add edges, keep the last weight added for duplicate edges."""
+        if (i.min() < 0 or j.min() < 0 or i.max() >= self._n_nodes or
+                j.max() >= self._n_nodes):
+            raise IndexError('Edge index out of range for {0} nodes.'.format(
+                self._n_nodes))
+        i = np.concatenate((self._i, i))
+        j = np.concatenate((self._j, j))
+        weights = np.concatenate((self._weights, weights))
+        # Find the last occurrence of each edge and sort edges by (i, j).
+        keys = i * self._n_nodes + j
+        keys, last = np.unique(keys[::-1], return_index=True)
+        last = len(i) - 1 - last
+        self._i = i[last]
+        self._j = j[last]
+        self._weights = weights[last]
+        self._dense = None
 
     def print_matrix(self):
         """Print weight and edge matrix."""
@@ -106,17 +168,28 @@ class AdjacencyMatrix():
 
         Returns
             list of tuples
-                each entry represents one edge in the graph: (i, j, weight)
+                each entry represents one edge in the graph: (i, j, weight),
+                edges are sorted by i and j
         """
-        edge_list = np.zeros(self.n_edges(), dtype=object)  # list of tuples
-        ind = 0
-        for i in range(self.n_nodes()):
-            for j in range(self.n_nodes()):
-                if self._edge_matrix[i, j]:
-                    edge_list[ind] = (i, j, self._weight_matrix[i, j])
-                    ind += 1
+        edge_list = np.empty(self.n_edges(), dtype=object)  # list of tuples
+        for ind, edge in enumerate(zip(self._i.tolist(), self._j.tolist(),
+                                       self._weights)):
+            edge_list[ind] = edge
         return edge_list
 
+    def get_sparse_matrix(self):
+        """Return weight matrix as sparse matrix.
+
+        Returns
+            scipy.sparse.csr_matrix
+                matrix with dimensions n_nodes x n_nodes containing edge
+                weights, edges with weight 0 are stored explicitly
+        """
+        from scipy import sparse
+        return sparse.csr_matrix((self._weights, (self._i, self._j)),
+                                 shape=(self._n_nodes, self._n_nodes),
+                                 dtype=self._dtype)
+
 
 class Results():
     """Parent class for results of network analysis algorithms.
@@ -147,6 +220,68 @@ class Results():
             'n_realisations': n_realisations,
             'normalised': normalised
         })
+        self._profile = None
+
+    def get_profile(self):
+        """Return run time and estimator usage of the analysis.
+
+        Return records for each phase of the analysis and each estimator
+        class if the analysis was run with setting 'profile' set to True (see
+        documentation of idtxl.profiling for a description of records).
+        Records are summed over all analysed processes.
+
+        Returns:
+            dict | None
+                profile with entries
+
+                - phases : dict - records for each phase of the analysis
+                - estimators : dict - records for each estimator class
+                - processes : dict - profile of each analysed process
+                - events : list - start and duration of each phase, where
+                  the thread id ('tid') is set to the analysed process
+
+                None if no profile was recorded
+        """
+        try:
+            single_results = self._single_target
+        except AttributeError:
+            single_results = self._single_process
+        profiles = {}
+        for p in single_results:
+            if single_results[p].get('profile') is not None:
+                profiles[p] = cp.deepcopy(single_results[p]['profile'])
+                for e in profiles[p]['events']:
+                    e['tid'] = int(p)
+        network_profile = getattr(self, '_profile', None)
+        if not profiles and network_profile is None:
+            return None
+        profile = profiling.merge_profiles(
+            list(profiles.values()) + [network_profile])
+        profile['processes'] = profiles
+        return profile
+
+    def export_profile(self, filename, file_format='json'):
+        """Write profile of the analysis to file.
+
+        Args:
+            filename : str
+                path to output file
+            file_format : str [optional]
+                'json' to write the profile returned by get_profile() or
+                'chrome' to write phases in the Chrome trace event format,
+                which can be viewed in chrome://tracing (default='json')
+        """
+        profile = self.get_profile()
+        if profile is None:
+            raise RuntimeError('No profile recorded, set \'profile\' to '
+                               'True in the analysis settings.')
+        if file_format == 'json':
+            profiling.export_json(profile, filename)
+        elif file_format == 'chrome':
+            profiling.export_chrome_trace(profile, filename)
+        else:
+            raise RuntimeError('Unknown file format {0}, use \'json\' or '
+                               '\'chrome\'.'.format(file_format))
 
     def _print_edge_list(self, adjacency_matrix, weights):
         """Print edge list to console."""
@@ -211,33 +346,154 @@ class Results():
             dict
                 combined results object
         """
+        processes_analysed = set(self._processes_analysed)
         for r in results:
-            processes = r._processes_analysed
+            # Settings are compared once per partial result and not for each
+            # process in the partial result.
             if utils.conflicting_entries(self.settings, r.settings):
                 raise RuntimeError('Can not combine results - analysis '
                                    'settings are not equal.')
-            for p in processes:
-                # Remove potential partial FDR-corrected results. These are no
-                # longer valid for the combined network.
-                if self._is_duplicate_process(p):
-                    raise RuntimeError('Can not combine results - results for '
-                                       'process {0} already exist.'.format(p))
+            try:
+                single_results = r._single_target
+            except AttributeError:
                 try:
-                    del r.fdr_corrected
-                    print('Removing FDR-corrected results.')
+                    single_results = r._single_process
                 except AttributeError:
-                    pass
+                    raise AttributeError(
+                        'Did not find any method attributes to combine '
+                        '(.single_proces or ._single_target).')
+            for p in r._processes_analysed:
+                if p in processes_analysed:
+                    raise RuntimeError('Can not combine results - results for '
+                                       'process {0} already exist.'.format(p))
+                if p > (self.data_properties.n_nodes - 1):
+                    raise RuntimeError(
+                        'Can not combine results - process {0} is not in no. '
+                        'nodes in the data ({1}).'.format(
+                            p, self.data_properties.n_nodes))
+            # Remove potential partial FDR-corrected results. These are no
+            # longer valid for the combined network.
+            try:
+                del r.fdr_corrected
+                logger.info('Removing FDR-corrected results.')
+            except AttributeError:
+                pass
+
+            self.settings.update(DotDict(r.settings))
+            for p in r._processes_analysed:
+                self._get_single_results()[p] = DotDict(single_results[p])
+                processes_analysed.add(p)
+        self._processes_analysed = list(self._get_single_results().keys())
+
+    def _get_single_results(self):
+        """Return dictionary holding results for single processes."""
+        try:
+            return self._single_target
+        except AttributeError:
+            return self._single_process
+
+    def _shallow_copy(self):
+        """Return a copy that shares results for single processes.
+
+        Containers (settings, dictionaries of single results) are copied,
+        such that processes can be added to the copy without changing the
+        original. Results for individual processes are shared with the
+        original and are treated as read-only, e.g., by FDR-correction.
+        """
+        results = cp.copy(self)
+        results.settings = DotDict(self.settings)
+        results.data_properties = DotDict(self.data_properties)
+        try:
+            results._single_target = dict(self._single_target)
+        except AttributeError:
+            results._single_process = dict(self._single_process)
+        results._processes_analysed = list(self._processes_analysed)
+        return results
+
+
+class _FDRCorrectedResults(Mapping):
+    """FDR-corrected results for single targets or processes.
+
+    Store the result of an FDR-correction as a significance mask over the
+    uncorrected results. Corrected results for a target (process) are created
+    from a shallow copy of the uncorrected results on first access; results
+    not affected by the correction are returned without copying.
+
+    Args:
+        single_results : dict
+            uncorrected results for single targets or processes
+        mask : dict
+            significance after FDR-correction for each tested target or
+            process, either a bool or a bool array with one entry per
+            selected source variable
+        prune : function
+            function returning corrected results from uncorrected results
+            and a mask entry
+    """
 
-                try:
-                    results_to_add = r._single_target[p]
-                except AttributeError:
-                    try:
-                        results_to_add = r._single_process[p]
-                    except AttributeError:
-                        raise AttributeError(
-                            'Did not find any method attributes to combine '
-                            '(.single_proces or ._single_target).')
-                self._add_single_result(p, results_to_add, r.settings)
+    def __init__(self, single_results, mask, prune):
+        self._single_results = single_results
+        self.mask = mask
+        self._prune = prune
+        self._corrected = {}
+
+    def __getitem__(self, key):
+        if key not in self._corrected:
+            results = self._single_results[key]
+            if key in self.mask:
+                results = self._prune(results, self.mask[key])
+            self._corrected[key] = results
+        return self._corrected[key]
+
+    def __iter__(self):
+        return iter(self._single_results)
+
+    def __len__(self):
+        return len(self._single_results)
+
+
+def _prune_process(results, sign):
+    """Remove non-significant AIS from results for a single process."""
+    if sign:
+        return results
+    pruned = DotDict(results)
+    pruned.selected_vars = []
+    pruned.ais_pval = 1
+    pruned.ais_sign = False
+    return pruned
+
+
+def _prune_target(results, sign):
+    """Remove all sources from results for a non-significant target."""
+    if sign:
+        return results
+    pruned = DotDict(results)
+    pruned.selected_vars_full = list(results.selected_vars_target)
+    pruned.selected_sources_te = None
+    pruned.selected_sources_pval = None
+    pruned.selected_vars_sources = []
+    pruned.omnibus_pval = 1
+    pruned.omnibus_sign = False
+    return pruned
+
+
+def _prune_source_variables(results, sign):
+    """Remove non-significant source variables from single target results."""
+    sign = np.asarray(sign, dtype=bool)
+    if sign.all():
+        return results
+    pruned = DotDict(results)
+    removed = [v for (v, s) in zip(results.selected_vars_sources, sign)
+               if not s]
+    pruned.selected_vars_sources = [
+        v for (v, s) in zip(results.selected_vars_sources, sign) if s]
+    pruned.selected_vars_full = [
+        v for v in results.selected_vars_full if v not in removed]
+    for key in ['selected_sources_pval', 'selected_sources_te',
+                'selected_sources_mi']:
+        if results.get(key) is not None:
+            pruned[key] = np.asarray(results[key])[sign]
+    return pruned
 
 
 class ResultsSingleProcessAnalysis(Results):
@@ -298,7 +554,11 @@ class ResultsSingleProcessAnalysis(Results):
         self.processes_analysed = list(self._single_process.keys())
 
     def _add_fdr(self, fdr, alpha=None, constant=None):
-        """Add settings and results of FDR correction."""
+        """Add settings and results of FDR correction.
+
+        Results of the correction are passed as a dict holding the
+        significance of each tested process after correction.
+        """
         # Add settings of FDR-correction
         self.settings['alpha_fdr'] = alpha
         self.settings['fdr_constant'] = constant
@@ -309,7 +569,8 @@ class ResultsSingleProcessAnalysis(Results):
         if fdr is None:
             self._single_process_fdr = DotDict()
         else:
-            self._single_process_fdr = DotDict(fdr)
+            self._single_process_fdr = _FDRCorrectedResults(
+                self._single_process, fdr, _prune_process)
 
     def get_single_process(self, process, fdr=True):
         """Return results for a single process in the network.
@@ -533,7 +794,12 @@ class ResultsNetworkInference(ResultsNetworkAnalysis):
         self._single_target_fdr = DotDict()
 
     def _add_fdr(self, fdr, alpha=None, correct_by_target=None, constant=None):
-        """Add settings and results of FDR correction."""
+        """Add settings and results of FDR correction.
+
+        Results of the correction are passed as a dict holding the
+        significance of each tested target (correct_by_target=True) or of
+        each selected source variable of a tested target after correction.
+        """
         # Add settings of FDR-correction
         self.settings['alpha_fdr'] = alpha
         self.settings['fdr_correct_by_target'] = correct_by_target
@@ -544,8 +810,12 @@ class ResultsNetworkInference(ResultsNetworkAnalysis):
         # to reach the FDR-thresholds. Add empty results in that case.
         if fdr is None:
             self._single_target_fdr = DotDict()
+        elif correct_by_target:
+            self._single_target_fdr = _FDRCorrectedResults(
+                self._single_target, fdr, _prune_target)
         else:
-            self._single_target_fdr = DotDict(fdr)
+            self._single_target_fdr = _FDRCorrectedResults(
+                self._single_target, fdr, _prune_source_variables)
 
     def _get_inference_measure(self, target):
         if 'selected_sources_te' in self._single_target[target]:
@@ -641,48 +911,37 @@ class ResultsNetworkInference(ResultsNetworkAnalysis):
         Returns:
             AdjacencyMatrix instance
         """
-        adjacency_matrix = AdjacencyMatrix(self.data_properties.n_nodes, int)
+        if weights not in ['max_te_lag', 'max_p_lag', 'vars_count',
+                           'binary']:
+            raise RuntimeError('Invalid weights value')
 
-        if weights == 'max_te_lag':
-            for t in self.targets_analysed:
-                sources = self.get_target_sources(target=t, fdr=fdr)
-                delays = self.get_target_delays(target=t,
-                                                criterion='max_te',
-                                                fdr=fdr)
-                adjacency_matrix.add_edge_list(
-                    sources, np.ones(len(sources), dtype=int) * t, delays)
-        elif weights == 'max_p_lag':
-            for t in self.targets_analysed:
+        # Collect edges of all targets and add them at once.
+        i_list = []
+        j_list = []
+        w_list = []
+        for t in self.targets_analysed:
+            if weights in ['max_te_lag', 'max_p_lag']:
                 sources = self.get_target_sources(target=t, fdr=fdr)
-                delays = self.get_target_delays(target=t,
-                                                criterion='max_p',
-                                                fdr=fdr)
-                adjacency_matrix.add_edge_list(
-                    sources, np.ones(len(sources), dtype=int) * t, delays)
-        elif weights == 'vars_count':
-            for t in self.targets_analysed:
-                single_result = self.get_single_target(target=t, fdr=fdr)
-                sources = np.zeros(len(single_result.selected_vars_sources))
-                weights = np.zeros(len(single_result.selected_vars_sources))
-                for i, s in enumerate(single_result.selected_vars_sources):
-                    sources[i] = s[0]
-                    weights[i] += 1
-                adjacency_matrix.add_edge_list(
-                    sources, np.ones(len(sources), dtype=int) * t, weights)
-        elif weights == 'binary':
-            for t in self.targets_analysed:
+                w = self.get_target_delays(
+                    target=t, criterion=weights.replace('_lag', ''), fdr=fdr)
+            else:
                 single_result = self.get_single_target(target=t, fdr=fdr)
-                sources = np.zeros(
-                    len(single_result.selected_vars_sources), dtype=int)
-                weights = np.zeros(
-                    len(single_result.selected_vars_sources), dtype=int)
-                for i, s in enumerate(single_result.selected_vars_sources):
-                    sources[i] = s[0]
-                    weights[i] = 1
-                adjacency_matrix.add_edge_list(
-                    sources, np.ones(len(sources), dtype=int) * t, weights)
-        else:
-            raise RuntimeError('Invalid weights value')
+                sources, w = np.unique(
+                    np.array([s[0] for s in
+                              single_result.selected_vars_sources],
+                             dtype=int),
+                    return_counts=True)
+                if weights == 'binary':
+                    w = np.ones(len(sources), dtype=int)
+            i_list.append(np.asarray(sources, dtype=int))
+            j_list.append(np.full(len(sources), t, dtype=int))
+            w_list.append(np.asarray(w, dtype=int))
+
+        adjacency_matrix = AdjacencyMatrix(self.data_properties.n_nodes, int)
+        if i_list:
+            adjacency_matrix.add_edge_list(np.concatenate(i_list),
+                                           np.concatenate(j_list),
+                                           np.concatenate(w_list))
         return adjacency_matrix
 
     def print_edge_list(self, weights, fdr=True):
@@ -872,39 +1131,43 @@ class ResultsNetworkComparison(ResultsNetworkAnalysis):
         # networks only. This may have to change in the future, in which case
         # the value for 'fdr' when accessing single target results or adjacency
         # matrices has to be taken from the analysis settings.
-        if weights == 'comparison':
+        if weights in ['comparison', 'union']:
             adjacency_matrix = AdjacencyMatrix(
                 self.data_properties.n_nodes, int)
-            for t in self.targets_analysed:
-                sources = self.get_target_sources(t)
-                for i, s in enumerate(sources):
-                    adjacency_matrix.add_edge(s, t, int(self.ab[t][i]))
-        elif weights == 'union':
-            adjacency_matrix = AdjacencyMatrix(
-                self.data_properties.n_nodes, int)
-            for t in self.targets_analysed:
-                sources = self.get_target_sources(t)
-                adjacency_matrix.add_edge_list(
-                    sources, np.ones(len(sources), dtype=int) * t,
-                    np.ones(len(sources), dtype=int))
-        elif weights == 'diff_abs':
-            adjacency_matrix = AdjacencyMatrix(
-                self.data_properties.n_nodes, float)
-            for t in self.targets_analysed:
-                sources = self.get_target_sources(t)
-                for (i, s) in enumerate(sources):
-                    print(self.cmi_diff_abs)
-                    adjacency_matrix.add_edge(s, t, self.cmi_diff_abs[t][i])
-        elif weights == 'pvalue':
+        elif weights in ['diff_abs', 'pvalue']:
             adjacency_matrix = AdjacencyMatrix(
                 self.data_properties.n_nodes, float)
-            for t in self.targets_analysed:
-                sources = self.get_target_sources(t)
-                for (i, s) in enumerate(sources):
-                    adjacency_matrix.add_edge(s, t, self.pval[t][i])
         else:
             raise RuntimeError('Invalid weights value')
 
+        # Collect edges of all targets and add them at once.
+        i_list = []
+        j_list = []
+        w_list = []
+        for t in self.targets_analysed:
+            sources = np.asarray(self.get_target_sources(t), dtype=int)
+            if len(sources) == 0:
+                continue
+            # Values may be stored as 1-element arrays per source (e.g., by
+            # compare_links_within()), flatten them to one value per source.
+            if weights == 'comparison':
+                w = np.asarray(self.ab[t][:len(sources)], dtype=int).ravel()
+            elif weights == 'union':
+                w = np.ones(len(sources), dtype=int)
+            elif weights == 'diff_abs':
+                w = np.asarray(self.cmi_diff_abs[t][:len(sources)],
+                               dtype=float).ravel()
+            else:
+                w = np.asarray(self.pval[t][:len(sources)],
+                               dtype=float).ravel()
+            i_list.append(sources)
+            j_list.append(np.full(len(sources), t, dtype=int))
+            w_list.append(w)
+        if i_list:
+            adjacency_matrix.add_edge_list(np.concatenate(i_list),
+                                           np.concatenate(j_list),
+                                           np.concatenate(w_list))
+
         # self._print_edge_list(adjacency_matrix, weights=weights)
         return adjacency_matrix
 
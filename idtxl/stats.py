@@ -1,8 +1,12 @@
 """Provide statistics functions."""
-import copy as cp
+import logging
 import numpy as np
+from scipy.stats import gamma, genpareto, kstest
 from . import idtxl_utils as utils
 from . import idtxl_exceptions as ex
+from .progress import report_surrogates
+
+logger = logging.getLogger(__name__)
 
 
 def ais_fdr(settings=None, *results):
@@ -47,27 +51,21 @@ def ais_fdr(settings=None, *results):
     alpha = settings.get('alpha_fdr', 0.05)
     constant = settings.get('fdr_constant', 2)
 
-    # Combine results into single results dict.
-    if len(results) > 1:
-        results_comb = cp.deepcopy(results[0])
-        results_comb.combine_results(*results[1:])
-    else:
-        results_comb = cp.deepcopy(results[0])
+    # Combine results into single results object. Results for single
+    # processes are shared with the input, the correction is added as a
+    # significance mask.
+    results_comb = _combine_results(results)
 
     # Collect p-values of whole processes (determined by the omnibus test).
-    pval = np.arange(0)
-    process_idx = np.arange(0).astype(int)
-    n_perm = np.arange(0).astype(int)
-    for process in results_comb.processes_analysed:
-        if results_comb._single_process[process].ais_sign:
-            pval = np.append(
-                pval, results_comb._single_process[process].ais_pval)
-            process_idx = np.append(process_idx, process)
-            n_perm = np.append(
-                    n_perm, results_comb.settings.n_perm_mi)
+    single_results = results_comb._single_process
+    process_idx = [p for p in results_comb.processes_analysed
+                   if single_results[p].ais_sign]
+    pval = np.array([single_results[p].ais_pval for p in process_idx],
+                    dtype=float)
+    n_perm = results_comb.settings.n_perm_mi
 
     if pval.size == 0:
-        print('FDR correction: no links in final results ...\n')
+        logger.debug('FDR correction: no links in final results ...')
         results_comb._add_fdr(fdr=None, alpha=alpha, constant=constant)
         return results_comb
 
@@ -75,25 +73,19 @@ def ais_fdr(settings=None, *results):
 
     # If the number of permutations for calculating p-values for individual
     # variables is too low, return without performing any correction.
-    if (1 / min(n_perm)) > thresh[0]:
-        print('WARNING: Number of permutations (''n_perm_max_seq'') for at '
-              'least one target is too low to allow for FDR correction '
-              '(FDR-threshold: {0:.4f}, min. theoretically possible p-value: '
-              '{1}).'.format(thresh[0], 1 / min(n_perm)))
+    if (1 / n_perm) > thresh[0]:
+        logger.warning('Number of permutations (''n_perm_max_seq'') for at '
+                       'least one target is too low to allow for FDR '
+                       'correction (FDR-threshold: {0:.4f}, min. '
+                       'theoretically possible p-value: {1}).'.format(
+                           thresh[0], 1 / n_perm))
         results_comb._add_fdr(fdr=None, alpha=alpha, constant=constant)
         return results_comb
 
-    # Go over list of all candidates and remove non-significant results from
-    # the results object. Create a copy of the results object to leave the
-    # original intact.
-    fdr = cp.deepcopy(results_comb._single_process)
-    for s in range(sign.shape[0]):
-        if not sign[s]:
-            t = process_idx[s]
-            fdr[t].selected_vars = []
-            fdr[t].ais_pval = 1
-            fdr[t].ais_sign = False
-    results_comb._add_fdr(fdr, alpha, constant)
+    # Add significance of each tested process. Non-significant results are
+    # removed when FDR-corrected results are accessed, leaving the original
+    # results intact.
+    results_comb._add_fdr(dict(zip(process_idx, sign)), alpha, constant)
     return results_comb
 
 
@@ -144,47 +136,33 @@ def network_fdr(settings=None, *results):
     correct_by_target = settings.get('correct_by_target', True)
     constant = settings.get('fdr_constant', 2)
 
-    # Combine results into single results dict.
-    if len(results) > 1:
-        results_comb = cp.deepcopy(results[0])
-        results_comb.combine_results(*results[1:])
-    else:
-        results_comb = cp.deepcopy(results[0])
-
-    # Collect significant source variables for all targets. Either correct
-    # p-value of whole target (all candidates), or correct p-value of
-    # individual source variables. Use targets with significant input only
-    # (determined by the omnibus test).
-    pval = np.arange(0)
-    target_idx = np.arange(0).astype(int)
-    n_perm = np.arange(0).astype(int)
-    cands = []
+    # Combine results into single results object. Results for single targets
+    # are shared with the input, the correction is added as a significance
+    # mask.
+    results_comb = _combine_results(results)
+
+    # Collect p-values of targets with significant input only (determined by
+    # the omnibus test) into a flat table. Either correct p-value of whole
+    # target (all candidates), or correct p-value of individual source
+    # variables.
+    single_results = results_comb._single_target
+    target_idx = [t for t in results_comb.targets_analysed
+                  if single_results[t].omnibus_sign]
     if correct_by_target:  # whole target
-        for target in results_comb.targets_analysed:
-            if results_comb._single_target[target].omnibus_sign:
-                pval = np.append(
-                    pval, results_comb._single_target[target].omnibus_pval)
-                target_idx = np.append(target_idx, target)
-                n_perm = np.append(
-                        n_perm, results_comb.settings.n_perm_omnibus)
+        pval = np.array([single_results[t].omnibus_pval for t in target_idx],
+                        dtype=float)
+        n_perm = results_comb.settings.n_perm_omnibus
     else:  # individual variables
-        for target in results_comb.targets_analysed:
-            if results_comb._single_target[target].omnibus_sign:
-                n_sign = (results_comb._single_target[target].
-                          selected_sources_pval.size)
-                pval = np.append(
-                    pval, (results_comb._single_target[target].
-                           selected_sources_pval))
-                target_idx = np.append(target_idx,
-                                       np.ones(n_sign) * target).astype(int)
-                cands = (cands +
-                         (results_comb._single_target[target].
-                          selected_vars_sources))
-                n_perm = np.append(
-                    n_perm, results_comb.settings.n_perm_max_seq)
+        target_idx = [t for t in target_idx
+                      if single_results[t].selected_sources_pval is not None]
+        pval = [np.asarray(single_results[t].selected_sources_pval,
+                           dtype=float).reshape(-1) for t in target_idx]
+        n_sign = [p.size for p in pval]
+        pval = np.concatenate(pval) if pval else np.arange(0)
+        n_perm = results_comb.settings.n_perm_max_seq
 
     if pval.size == 0:
-        print('No links in final results ...')
+        logger.debug('No links in final results ...')
         results_comb._add_fdr(
             fdr=None, alpha=alpha, correct_by_target=correct_by_target,
             constant=constant)
@@ -194,46 +172,36 @@ def network_fdr(settings=None, *results):
 
     # If the number of permutations for calculating p-values for individual
     # variables is too low, return without performing any correction.
-    if (1 / min(n_perm)) > thresh[0]:
-        print('WARNING: Number of permutations (''n_perm_max_seq'') for at '
-              'least one target is too low to allow for FDR correction '
-              '(FDR-threshold: {0:.4f}, min. theoretically possible p-value: '
-              '{1}).'.format(thresh[0], 1 / min(n_perm)))
+    if (1 / n_perm) > thresh[0]:
+        logger.warning('Number of permutations (''n_perm_max_seq'') for at '
+                       'least one target is too low to allow for FDR '
+                       'correction (FDR-threshold: {0:.4f}, min. '
+                       'theoretically possible p-value: {1}).'.format(
+                           thresh[0], 1 / n_perm))
         results_comb._add_fdr(
             fdr=None, alpha=alpha, correct_by_target=correct_by_target,
             constant=constant)
         return results_comb
 
-    # Go over list of all candidates and remove non-significant results from
-    # the results object. Create a copy of the results object to leave the
-    # original intact.
-    fdr = cp.deepcopy(results_comb._single_target)
-    for s in range(sign.shape[0]):
-        if not sign[s]:
-            if correct_by_target:
-                t = target_idx[s]
-                fdr[t].selected_vars_full = cp.deepcopy(
-                    results_comb._single_target[t].selected_vars_target)
-                fdr[t].selected_sources_te = None
-                fdr[t].selected_sources_pval = None
-                fdr[t].selected_vars_sources = []
-                fdr[t].omnibus_pval = 1
-                fdr[t].omnibus_sign = False
-            else:
-                t = target_idx[s]
-                cand = cands[s]
-                cand_ind = (fdr[t].selected_vars_sources.index(cand))
-                fdr[t].selected_vars_sources.pop(cand_ind)
-                fdr[t].selected_sources_pval = np.delete(
-                    fdr[t].selected_sources_pval, cand_ind)
-                fdr[t].selected_sources_te = np.delete(
-                    fdr[t].selected_sources_te, cand_ind)
-                fdr[t].selected_vars_full.pop(
-                    fdr[t].selected_vars_full.index(cand))
+    # Add significance of each tested target or source variable. Non-
+    # significant results are removed when FDR-corrected results are
+    # accessed, leaving the original results intact.
+    if correct_by_target:
+        fdr = dict(zip(target_idx, sign))
+    else:
+        fdr = dict(zip(target_idx, np.split(sign, np.cumsum(n_sign)[:-1])))
     results_comb._add_fdr(fdr, alpha, correct_by_target, constant)
     return results_comb
 
 
+def _combine_results(results):
+    """Combine partial results without copying results for single targets."""
+    results_comb = results[0]._shallow_copy()
+    if len(results) > 1:
+        results_comb.combine_results(*results[1:])
+    return results_comb
+
+
 def _perform_fdr_corretion(pval, constant, alpha):
     """Calculate sequential threshold for FDR-correction.
 
@@ -266,7 +234,7 @@ def _perform_fdr_corretion(pval, constant, alpha):
     """
     # Sort all p-values in ascending order.
     sort_idx = np.argsort(pval)
-    pval.sort()
+    pval = pval[sort_idx]
 
     # Calculate threshold
     n = pval.size
@@ -288,8 +256,10 @@ def _perform_fdr_corretion(pval, constant, alpha):
     if np.invert(sign).any():
         first_false = np.where(np.invert(sign))[0][0]
         sign[first_false:] = False  # avoids false positives due to equal pvals
-    sign = sign[sort_idx]  # restore original ordering of significance values
-    return sign, thresh
+    # Restore original ordering of significance values.
+    sign_unsorted = np.empty(n, dtype=bool)
+    sign_unsorted[sort_idx] = sign
+    return sign_unsorted, thresh
 
 
 def omnibus_test(analysis_setup, data):
@@ -313,6 +283,9 @@ def omnibus_test(analysis_setup, data):
             - permute_in_time : bool [optional] - generate surrogates by
               shuffling samples in time instead of shuffling whole replications
               (default=False)
+            - null_fit : str [optional] - derive p-value from a null
+              distribution fitted to fewer surrogates, see
+              _find_pvalue_fitted() (default=None)
 
         data : Data instance
             raw data
@@ -359,7 +332,7 @@ def omnibus_test(analysis_setup, data):
 
     # Create the surrogate distribution by permuting the conditional sources.
     if analysis_setup.settings['verbose']:
-        print('omnibus test, n_perm: {0}'.format(n_permutations))
+        logger.info('omnibus test, n_perm: {0}'.format(n_permutations))
     if (analysis_setup._cmi_estimator.is_analytic_null_estimator() and
             permute_in_time):
         # Generate the surrogates analytically
@@ -372,11 +345,14 @@ def omnibus_test(analysis_setup, data):
                                conditional=cond_target_realisations))
     else:
         analysis_setup.settings['analytical_surrogates'] = False
+        n_permutations = _get_n_perm_fitted(analysis_setup.settings,
+                                            n_permutations)
         surr_cond_real = _get_surrogates(data,
                                          analysis_setup.current_value,
                                          analysis_setup.selected_vars_sources,
                                          n_permutations,
-                                         analysis_setup.settings)
+                                         analysis_setup.settings,
+                                         rng=_get_rng(analysis_setup))
 
         surr_distribution = analysis_setup._cmi_estimator.estimate_parallel(
                             n_chunks=n_permutations,
@@ -384,13 +360,15 @@ def omnibus_test(analysis_setup, data):
                             var1=surr_cond_real,
                             var2=analysis_setup._current_value_realisations,
                             conditional=cond_target_realisations)
-    [significance, pvalue] = _find_pvalue(statistic, surr_distribution,
-                                          alpha, 'one_bigger')
+    report_surrogates(analysis_setup, n_permutations)
+    [significance, pvalue] = _find_pvalue_null(analysis_setup, 'omnibus',
+                                               statistic, surr_distribution,
+                                               alpha)
     if analysis_setup.settings['verbose']:
         if significance:
-            print(' -- significant\n')
+            logger.info(' -- significant')
         else:
-            print(' -- not significant\n')
+            logger.info(' -- not significant')
     return significance, pvalue, statistic
 
 
@@ -413,6 +391,9 @@ def max_statistic(analysis_setup, data, candidate_set, te_max_candidate,
             - permute_in_time : bool [optional] - generate surrogates by
               shuffling samples in time instead of shuffling whole replications
               (default=False)
+            - null_fit : str [optional] - derive p-value from a null
+              distribution fitted to fewer surrogates, see
+              _find_pvalue_fitted() (default=None)
 
         data : Data instance
             raw data
@@ -446,16 +427,16 @@ def max_statistic(analysis_setup, data, candidate_set, te_max_candidate,
     _check_permute_in_time(analysis_setup, data, n_perm)
     assert(candidate_set), 'The candidate set is empty.'
     if analysis_setup.settings['verbose']:
-        print('maximum statistic, n_perm: {0}'.format(
+        logger.info('maximum statistic, n_perm: {0}'.format(
                             analysis_setup.settings['n_perm_max_stat']))
 
     surr_table = _create_surrogate_table(analysis_setup, data, candidate_set,
                                          n_perm, conditional)
     max_distribution = _find_table_max(surr_table)
-    [significance, pvalue] = _find_pvalue(statistic=te_max_candidate,
-                                          distribution=max_distribution,
-                                          alpha=alpha,
-                                          tail='one_bigger')
+    [significance, pvalue] = _find_pvalue_null(analysis_setup,
+                                               'max_statistic',
+                                               te_max_candidate,
+                                               max_distribution, alpha)
     return significance, pvalue, surr_table
 
 
@@ -498,6 +479,9 @@ def max_statistic_sequential(analysis_setup, data):
             - permute_in_time : bool [optional] - generate surrogates by
               shuffling samples in time instead of shuffling whole replications
               (default=False)
+            - null_fit : str [optional] - derive p-value from a null
+              distribution fitted to fewer surrogates, see
+              _find_pvalue_fitted() (default=None)
 
         data : Data instance
             raw data
@@ -523,7 +507,7 @@ def max_statistic_sequential(analysis_setup, data):
     alpha = analysis_setup.settings['alpha_max_seq']
     _check_permute_in_time(analysis_setup, data, n_permutations)
     if analysis_setup.settings['verbose']:
-        print('sequential maximum statistic, n_perm: {0}'.format(
+        logger.info('sequential maximum statistic, n_perm: {0}'.format(
             n_permutations))
 
     assert analysis_setup.selected_vars_sources, 'No sources to test.'
@@ -574,9 +558,10 @@ def max_statistic_sequential(analysis_setup, data):
         # The aglorithm cannot continue here, so
         #  we'll terminate the max sequential stats test,
         #  and declare all not significant
-        print('AlgorithmExhaustedError encountered in '
+        logger.warning('AlgorithmExhaustedError encountered in '
             'estimations: ' + aee.message)
-        print('Stopping sequential max stats at candidate with rank 0')
+        logger.warning('Stopping sequential max stats at candidate with '
+                       'rank 0')
         # For now we don't need a stack trace:
         # traceback.print_tb(aee.__traceback__)
         # Return (signficance, pvalue, TEs):
@@ -592,7 +577,8 @@ def max_statistic_sequential(analysis_setup, data):
     # already exists. This saves some time. Otherwise create surrogate table.
     # Sort surrogate table.
     if (analysis_setup._min_stats_surr_table is not None and
-            n_permutations <= analysis_setup._min_stats_surr_table.shape[1]):
+            _get_n_perm_fitted(analysis_setup.settings, n_permutations) <=
+            analysis_setup._min_stats_surr_table.shape[1]):
         surr_table = analysis_setup._min_stats_surr_table[:, :n_permutations]
         assert len(analysis_setup.selected_vars_sources) == surr_table.shape[0]
     else:
@@ -606,9 +592,10 @@ def max_statistic_sequential(analysis_setup, data):
             # The aglorithm cannot continue here, so
             #  we'll terminate the max sequential stats test,
             #  and declare all not significant
-            print('AlgorithmExhaustedError encountered in '
+            logger.warning('AlgorithmExhaustedError encountered in '
                 'estimations: ' + aee.message)
-            print('Stopping sequential max stats at candidate with rank 0')
+            logger.warning('Stopping sequential max stats at candidate with '
+                           'rank 0')
             # For now we don't need a stack trace:
             # traceback.print_tb(aee.__traceback__)
             # Return (signficance, pvalue, TEs):
@@ -623,14 +610,16 @@ def max_statistic_sequential(analysis_setup, data):
     significance = np.zeros(individual_stat.shape[0]).astype(bool)
     pvalue = np.ones(individual_stat.shape[0])
     for c in range(individual_stat.shape[0]):
-        [s, p] = _find_pvalue(individual_stat_sorted[c],
-                              max_distribution[c, ], alpha, tail='one_bigger')
+        [s, p] = _find_pvalue_null(analysis_setup,
+                                   'max_statistic_sequential',
+                                   individual_stat_sorted[c],
+                                   max_distribution[c, ], alpha)
         significance[c] = s
         pvalue[c] = p
         if not s:  # break as soon as a candidate is no longer significant
             if analysis_setup.settings['verbose']:
-                print('\nStopping sequential max stats at candidate with rank '
-                      '{0}.'.format(c))
+                logger.info('Stopping sequential max stats at candidate with '
+                            'rank {0}.'.format(c))
             break
 
     # Get back original order and return results.
@@ -678,6 +667,9 @@ def max_statistic_sequential_bivariate(analysis_setup, data):
             - permute_in_time : bool [optional] - generate surrogates by
               shuffling samples in time instead of shuffling whole replications
               (default=False)
+            - null_fit : str [optional] - derive p-value from a null
+              distribution fitted to fewer surrogates, see
+              _find_pvalue_fitted() (default=None)
 
         data : Data instance
             raw data
@@ -703,7 +695,7 @@ def max_statistic_sequential_bivariate(analysis_setup, data):
     alpha = analysis_setup.settings['alpha_max_seq']
     _check_permute_in_time(analysis_setup, data, n_permutations)
     if analysis_setup.settings['verbose']:
-        print('sequential maximum statistic, n_perm: {0}'.format(
+        logger.info('sequential maximum statistic, n_perm: {0}'.format(
             n_permutations))
 
     assert analysis_setup.selected_vars_sources, 'No sources to test.'
@@ -783,9 +775,10 @@ def max_statistic_sequential_bivariate(analysis_setup, data):
             # The aglorithm cannot continue here, so
             #  we'll terminate the max sequential stats test,
             #  and declare all not significant
-            print('AlgorithmExhaustedError encountered in '
+            logger.warning('AlgorithmExhaustedError encountered in '
                 'estimations: ' + aee.message)
-            print('Stopping sequential max stats at candidate with rank 0')
+            logger.warning('Stopping sequential max stats at candidate with '
+                           'rank 0')
             # For now we don't need a stack trace:
             # traceback.print_tb(aee.__traceback__)
             # Return (signficance, pvalue, TEs):
@@ -820,9 +813,10 @@ def max_statistic_sequential_bivariate(analysis_setup, data):
             # The algorithm cannot continue here, so
             #  we'll terminate the max sequential stats test,
             #  and declare all not significant
-            print('AlgorithmExhaustedError encountered in '
+            logger.warning('AlgorithmExhaustedError encountered in '
                 'estimations: ' + aee.message)
-            print('Stopping sequential max stats at candidate with rank 0')
+            logger.warning('Stopping sequential max stats at candidate with '
+                           'rank 0')
             # For now we don't need a stack trace:
             # traceback.print_tb(aee.__traceback__)
             # Return (signficance, pvalue, TEs):
@@ -835,9 +829,10 @@ def max_statistic_sequential_bivariate(analysis_setup, data):
         # Compare each original value with the distribution of the same rank,
         # starting with the highest value.
         for c in range(individual_stat.shape[0]):
-            [s, p] = _find_pvalue(individual_stat_sorted[c],
-                                  max_distribution[c, ],
-                                  alpha, tail='one_bigger')
+            [s, p] = _find_pvalue_null(analysis_setup,
+                                       'max_statistic_sequential',
+                                       individual_stat_sorted[c],
+                                       max_distribution[c, ], alpha)
             # Write results into an array with the same order as the set of
             # selected sources from all process. Find the currently tested
             # variable and its index in the list of all selected variables.
@@ -850,8 +845,8 @@ def max_statistic_sequential_bivariate(analysis_setup, data):
             stat[ind] = individual_stat_sorted[c]
             if not s:  # break as soon as a candidate is no longer significant
                 if analysis_setup.settings['verbose']:
-                    print('\nStopping sequential max stats at candidate with '
-                          'rank {0}.'.format(c))
+                    logger.info('Stopping sequential max stats at '
+                                'candidate with rank {0}.'.format(c))
                 break
 
     return significance, pvalue, stat
@@ -876,6 +871,9 @@ def min_statistic(analysis_setup, data, candidate_set, te_min_candidate,
             - permute_in_time : bool [optional] - generate surrogates by
               shuffling samples in time instead of shuffling whole replications
               (default=False)
+            - null_fit : str [optional] - derive p-value from a null
+              distribution fitted to fewer surrogates, see
+              _find_pvalue_fitted() (default=None)
 
         data : Data instance
             raw data
@@ -908,7 +906,7 @@ def min_statistic(analysis_setup, data, candidate_set, te_min_candidate,
     alpha = analysis_setup.settings['alpha_min_stat']
     _check_permute_in_time(analysis_setup, data, n_perm)
     if analysis_setup.settings['verbose']:
-        print('minimum statistic, n_perm: {0}'.format(
+        logger.info('minimum statistic, n_perm: {0}'.format(
             analysis_setup.settings['n_perm_min_stat']))
 
     assert(candidate_set), 'The candidate set is empty.'
@@ -916,10 +914,10 @@ def min_statistic(analysis_setup, data, candidate_set, te_min_candidate,
     surr_table = _create_surrogate_table(analysis_setup, data, candidate_set,
                                          n_perm, conditional)
     min_distribution = _find_table_min(surr_table)
-    [significance, pvalue] = _find_pvalue(statistic=te_min_candidate,
-                                          distribution=min_distribution,
-                                          alpha=alpha,
-                                          tail='one_bigger')
+    [significance, pvalue] = _find_pvalue_null(analysis_setup,
+                                               'min_statistic',
+                                               te_min_candidate,
+                                               min_distribution, alpha)
     return significance, pvalue, surr_table
 
 
@@ -943,6 +941,9 @@ def mi_against_surrogates(analysis_setup, data):
             - permute_in_time : bool [optional] - generate surrogates by
               shuffling samples in time instead of shuffling whole replications
               (default=False)
+            - null_fit : str [optional] - derive p-value from a null
+              distribution fitted to fewer surrogates, see
+              _find_pvalue_fitted() (default=None)
 
         data : Data instance
             raw data
@@ -965,8 +966,8 @@ def mi_against_surrogates(analysis_setup, data):
     alpha = analysis_setup.settings['alpha_mi']
     permute_in_time = _check_permute_in_time(analysis_setup, data, n_perm)
     if analysis_setup.settings['verbose']:
-        print('mi permutation test against surrogates, n_perm: {0}'.format(
-            analysis_setup.settings['n_perm_mi']))
+        logger.info('mi permutation test against surrogates, n_perm: '
+                    '{0}'.format(analysis_setup.settings['n_perm_mi']))
     '''
     surr_realisations = np.empty(
                         (data.n_realisations(analysis_setup.current_value) *
@@ -1007,11 +1008,13 @@ def mi_against_surrogates(analysis_setup, data):
                             conditional=None))
     else:
         analysis_setup.settings['analytical_surrogates'] = False
+        n_perm = _get_n_perm_fitted(analysis_setup.settings, n_perm)
         surr_realisations = _get_surrogates(data,
                                             analysis_setup.current_value,
                                             [analysis_setup.current_value],
                                             n_perm,
-                                            analysis_setup.settings)
+                                            analysis_setup.settings,
+                                            rng=_get_rng(analysis_setup))
 
         surr_dist = analysis_setup._cmi_estimator.estimate_parallel(
                             n_chunks=n_perm,
@@ -1019,15 +1022,15 @@ def mi_against_surrogates(analysis_setup, data):
                             var1=surr_realisations,
                             var2=analysis_setup._selected_vars_realisations,
                             conditional=None)
+    report_surrogates(analysis_setup, n_perm)
     orig_mi = analysis_setup._cmi_estimator.estimate(
                             var1=analysis_setup._current_value_realisations,
                             var2=analysis_setup._selected_vars_realisations,
                             conditional=None
                             )
-    [significance, p_value] = _find_pvalue(statistic=orig_mi,
-                                           distribution=surr_dist,
-                                           alpha=alpha,
-                                           tail='one_bigger')
+    [significance, p_value] = _find_pvalue_null(analysis_setup,
+                                                'mi_against_surrogates',
+                                                orig_mi, surr_dist, alpha)
     return [orig_mi, significance, p_value]
 
 
@@ -1093,7 +1096,8 @@ def unq_against_surrogates(analysis_setup, data):
                                         analysis_setup.current_value,
                                         [analysis_setup.sources[0]],
                                         n_perm,
-                                        analysis_setup.settings)
+                                        analysis_setup.settings,
+                                        rng=_get_rng(analysis_setup))
     # Calculate surrogate distribution for unique information of source 1.
     # Note: calling  .estimate_parallel does not work here because the PID
     # estimator returns a dictionary not a single value. We have to get the
@@ -1103,10 +1107,10 @@ def unq_against_surrogates(analysis_setup, data):
     i_1 = 0
     i_2 = chunk_size
     if analysis_setup.settings['verbose']:
-            print('\nTesting unq information in s1')
+            logger.info('Testing unq information in s1')
     for p in range(n_perm):
         if analysis_setup.settings['verbose']:
-            print('\tperm {0} of {1}'.format(p, n_perm))
+            logger.debug('\tperm {0} of {1}'.format(p, n_perm))
         pid_est = analysis_setup._pid_estimator.estimate(
                                 settings=analysis_setup.settings,
                                 s1=surr_realisations[i_1:i_2, :],
@@ -1116,23 +1120,25 @@ def unq_against_surrogates(analysis_setup, data):
         surr_dist_s1[p] = pid_est['unq_s1']
         i_1 = i_2
         i_2 += chunk_size
+    report_surrogates(analysis_setup, n_perm)
 
     # Test unique information from source 2
     surr_realisations = _get_surrogates(data,
                                         analysis_setup.current_value,
                                         [analysis_setup.sources[1]],
                                         n_perm,
-                                        analysis_setup.settings)
+                                        analysis_setup.settings,
+                                        rng=_get_rng(analysis_setup))
     # Calculate surrogate distribution for unique information of source 2.
     surr_dist_s2 = np.empty(n_perm)
     chunk_size = int(surr_realisations.shape[0] / n_perm)
     i_1 = 0
     i_2 = chunk_size
     if analysis_setup.settings['verbose']:
-            print('\nTesting unq information in s2')
+            logger.info('Testing unq information in s2')
     for p in range(n_perm):
         if analysis_setup.settings['verbose']:
-            print('\tperm {0} of {1}'.format(p, n_perm))
+            logger.debug('\tperm {0} of {1}'.format(p, n_perm))
         pid_est = analysis_setup._pid_estimator.estimate(
                                 settings=analysis_setup.settings,
                                 s1=source_1_realisations,
@@ -1141,6 +1147,7 @@ def unq_against_surrogates(analysis_setup, data):
         surr_dist_s2[p] = pid_est['unq_s2']
         i_1 = i_2
         i_2 += chunk_size
+    report_surrogates(analysis_setup, n_perm)
     [sign_1, p_val_1] = _find_pvalue(statistic=orig_pid['unq_s1'],
                                      distribution=surr_dist_s1,
                                      alpha=alpha,
@@ -1214,7 +1221,8 @@ def syn_shd_against_surrogates(analysis_setup, data):
                                         analysis_setup.current_value,
                                         [analysis_setup.current_value],
                                         n_perm,
-                                        analysis_setup.settings)
+                                        analysis_setup.settings,
+                                        rng=_get_rng(analysis_setup))
     # Calculate surrogate distribution for shd/syn information of both sources.
     # Note: calling  .estimate_parallel does not work here because the PID
     # estimator returns a dictionary not a single value. We have to get the
@@ -1225,10 +1233,10 @@ def syn_shd_against_surrogates(analysis_setup, data):
     i_1 = 0
     i_2 = chunk_size
     if analysis_setup.settings['verbose']:
-            print('\nTesting shd and syn information in both sources')
+            logger.info('Testing shd and syn information in both sources')
     for p in range(n_perm):
         if analysis_setup.settings['verbose']:
-            print('\tperm {0} of {1}'.format(p, n_perm))
+            logger.debug('\tperm {0} of {1}'.format(p, n_perm))
         pid_est = analysis_setup._pid_estimator.estimate(
                                 settings=analysis_setup.settings,
                                 s1=source_1_realisations,
@@ -1238,6 +1246,7 @@ def syn_shd_against_surrogates(analysis_setup, data):
         surr_dist_syn[p] = pid_est['syn_s1_s2']
         i_1 = i_2
         i_2 += chunk_size
+    report_surrogates(analysis_setup, n_perm)
     [sign_shd, p_val_shd] = _find_pvalue(statistic=orig_pid['shd_s1_s2'],
                                          distribution=surr_dist_shd,
                                          alpha=alpha,
@@ -1282,7 +1291,9 @@ def _create_surrogate_table(analysis_setup, data, idx_test_set, n_perm,
     Args:
         analysis_setup : instance of NetworkAnalysis or child class
             information on the current analysis, must contain an attribute
-            settings with entry 'permute_in_time'
+            settings with entry 'permute_in_time'; if settings['null_fit'] is
+            set, at most settings['n_perm_null_fit'] surrogates are created
+            (see _find_pvalue_fitted())
         data : Data instance
             raw data
         idx_test_set : list of tuples
@@ -1297,7 +1308,8 @@ def _create_surrogate_table(analysis_setup, data, idx_test_set, n_perm,
     Returns:
         numpy array
             surrogate MI/CMI/TE values, dimensions: (length test set, number of
-            surrogates)
+            surrogates), the number of surrogates is reduced if a null
+            distribution is fitted
 
     Raises:
         ex.AlgorithmExhaustedError
@@ -1310,6 +1322,12 @@ def _create_surrogate_table(analysis_setup, data, idx_test_set, n_perm,
     if conditional is None:
         conditional = analysis_setup._selected_vars_realisations
 
+    # Create fewer surrogates if p-values are derived from a fitted null
+    # distribution (see _find_pvalue_fitted()).
+    if not (analysis_setup._cmi_estimator.is_analytic_null_estimator() and
+            permute_in_time):
+        n_perm = _get_n_perm_fitted(analysis_setup.settings, n_perm)
+
     # Create surrogate table.
     # if analysis_setup.settings['verbose']:
     #     print('\ncreating surrogate table with {0} permutations:'.format(
@@ -1340,7 +1358,8 @@ def _create_surrogate_table(analysis_setup, data, idx_test_set, n_perm,
                                                  analysis_setup.current_value,
                                                  [candidate],
                                                  n_perm,
-                                                 analysis_setup.settings)
+                                                 analysis_setup.settings,
+                                                 rng=_get_rng(analysis_setup))
             surr_table[idx_c, :] = (
                 analysis_setup._cmi_estimator.estimate_parallel(
                     n_chunks=n_perm,
@@ -1348,6 +1367,7 @@ def _create_surrogate_table(analysis_setup, data, idx_test_set, n_perm,
                     var1=surr_candidate_realisations,
                     var2=current_value_realisations,
                     conditional=conditional))
+        report_surrogates(analysis_setup, n_perm)
         idx_c += 1
 
     return surr_table
@@ -1427,6 +1447,180 @@ def _find_pvalue(statistic, distribution, alpha, tail):
     return significance, pvalue
 
 
+def _get_n_perm_fitted(settings, n_perm):
+    """Return number of surrogates to create for a statistical test.
+
+    If p-values are derived from a fitted null distribution
+    (settings['null_fit'] is not None), return at most
+    settings['n_perm_null_fit'] (default=100) surrogates, otherwise return
+    n_perm.
+    """
+    null_fit = settings.get('null_fit', None)
+    if null_fit is None:
+        return n_perm
+    if null_fit not in ['gamma', 'gpd']:
+        raise RuntimeError('Unknown null distribution {0}, use \'gamma\' or '
+                           '\'gpd\'.'.format(null_fit))
+    settings.setdefault('n_perm_null_fit', 100)
+    return min(n_perm, settings['n_perm_null_fit'])
+
+
+def _find_pvalue_null(analysis_setup, test, statistic, distribution, alpha):
+    """Find p-value of a test statistic under a permutation or fitted null.
+
+    If settings['null_fit'] is set and surrogates were not generated
+    analytically, derive the p-value from a distribution fitted to the
+    surrogate values (see _find_pvalue_fitted()) and add fit diagnostics to
+    analysis_setup._null_fits. Otherwise, find the p-value under the
+    permutation distribution (see _find_pvalue()). Tests are one-tailed
+    (H1 > H0).
+
+    Args:
+        analysis_setup : instance of NetworkAnalysis or child class
+            information on the current analysis
+        test : str
+            name of the statistical test, added to fit diagnostics
+        statistic : numeric
+            value to be tested against distribution
+        distribution : numpy array
+            1-dimensional distribution of surrogate values
+        alpha : float
+            critical alpha level for statistical significance
+
+    Returns:
+        bool
+            statistical significance
+        float
+            the test's p-value
+    """
+    null_fit = analysis_setup.settings.get('null_fit', None)
+    if (null_fit is None or
+            analysis_setup.settings.get('analytical_surrogates', False)):
+        return _find_pvalue(statistic, distribution, alpha, 'one_bigger')
+    analysis_setup.settings.setdefault('null_fit_tail', 0.25)
+    [significance, pvalue, diagnostics] = _find_pvalue_fitted(
+        statistic, distribution, alpha, null_fit,
+        analysis_setup.settings['null_fit_tail'])
+    diagnostics['test'] = test
+    analysis_setup._null_fits.append(diagnostics)
+    return significance, pvalue
+
+
+def _find_pvalue_fitted(statistic, distribution, alpha, null_fit,
+                        tail_fraction=0.25):
+    """Find p-value of a test statistic under a fitted null distribution.
+
+    Fit a parametric distribution to surrogate values and derive the p-value
+    from the fitted distribution, such that p-values smaller than 1/n_perm
+    can be resolved from few surrogates. Two distributions are available:
+
+    - 'gamma': fit a gamma distribution (shape, location, and scale) to all
+      surrogate values
+    - 'gpd': fit a generalised Pareto distribution to the largest surrogate
+      values (tail), as proposed for permutation tests by Knijnenburg et al.
+      (2009); for statistics in the body of the surrogate distribution the
+      permutation p-value is used. This is recommended for maximum
+      statistics, whose null distributions are poorly described by a gamma
+      distribution.
+
+    The goodness of fit is assessed by a Kolmogorov-Smirnov test of the
+    fitted surrogate values against the fitted distribution. If the fit
+    fails, e.g., because all surrogate values are equal, the permutation
+    p-value is used.
+
+    References:
+
+    - Knijnenburg, T. A., Wessels, L. F., Reinders, M. J., & Shmulevich, I.
+      (2009). Fewer permutations, more accurate P-values. Bioinformatics,
+      25(12), i161-i168.
+
+    Args:
+        statistic : numeric
+            value to be tested against distribution
+        distribution : numpy array
+            1-dimensional distribution of surrogate values
+        alpha : float
+            critical alpha level for statistical significance
+        null_fit : str
+            fitted distribution, 'gamma' or 'gpd'
+        tail_fraction : float [optional]
+            fraction of largest surrogate values used to fit the generalised
+            Pareto distribution (default=0.25)
+
+    Returns:
+        bool
+            statistical significance (one-tailed, H1 > H0)
+        float
+            the test's p-value
+        dict
+            fit diagnostics with entries null_fit, n_perm, statistic, pvalue,
+            pvalue_permutation (p-value under the permutation distribution),
+            params (parameters of the fitted distribution), ks_statistic and
+            ks_pvalue (Kolmogorov-Smirnov goodness of fit), and fit_failed
+    """
+    assert alpha <= 1.0, 'Critical alpha levels needs to be smaller than 1.'
+    assert distribution.ndim == 1, 'Test distribution must be 1D.'
+    if null_fit not in ['gamma', 'gpd']:
+        raise RuntimeError('Unknown null distribution {0}, use \'gamma\' or '
+                           '\'gpd\'.'.format(null_fit))
+    n_perm = distribution.shape[0]
+    pvalue_perm = max(np.sum(distribution >= statistic), 1) / n_perm
+    diagnostics = {
+        'null_fit': null_fit,
+        'n_perm': n_perm,
+        'statistic': float(statistic),
+        'pvalue_permutation': float(pvalue_perm),
+        'params': None,
+        'ks_statistic': None,
+        'ks_pvalue': None,
+        'fit_failed': False}
+    pvalue = np.nan
+    try:
+        with np.errstate(all='ignore'):
+            if np.ptp(distribution) == 0:
+                raise ValueError('All surrogate values are equal.')
+            if null_fit == 'gamma':
+                # Maximum likelihood fit, started from the method of moments
+                # estimate because the fit of the location is unstable. Keep
+                # the method of moments estimate if the fit does not
+                # converge.
+                params = gamma.fit(distribution, method='MM')
+                try:
+                    params = gamma.fit(distribution, params[0],
+                                       loc=params[1], scale=params[2])
+                except RuntimeError:
+                    pass
+                pvalue = gamma.sf(statistic, *params)
+                ks = kstest(distribution, 'gamma', args=params)
+            elif null_fit == 'gpd':
+                n_tail = int(np.ceil(tail_fraction * n_perm))
+                if not 2 < n_tail < n_perm:
+                    raise ValueError('Too few surrogates in the tail.')
+                distribution_sorted = np.sort(distribution)
+                threshold = distribution_sorted[n_perm - n_tail - 1]
+                exceedances = distribution_sorted[n_perm - n_tail:] - threshold
+                params = genpareto.fit(exceedances, floc=0)
+                ks = kstest(exceedances, 'genpareto', args=params)
+                if statistic <= threshold:
+                    pvalue = pvalue_perm
+                else:
+                    pvalue = (n_tail / n_perm *
+                              genpareto.sf(statistic - threshold, *params))
+        diagnostics['params'] = [float(p) for p in params]
+        diagnostics['ks_statistic'] = float(ks.statistic)
+        diagnostics['ks_pvalue'] = float(ks.pvalue)
+    except (ValueError, RuntimeError, FloatingPointError) as err:
+        # scipy raises a FitError (RuntimeError) if the fit does not converge
+        logger.warning('Fitting the null distribution failed ({0}), using '
+                       'the permutation p-value.'.format(err))
+    if not np.isfinite(pvalue):
+        diagnostics['fit_failed'] = True
+        pvalue = pvalue_perm
+    pvalue = float(pvalue)
+    diagnostics['pvalue'] = pvalue
+    return pvalue < alpha, pvalue, diagnostics
+
+
 def _sufficient_replications(data, n_perm):
     """Test if no. replications is high enough for surrogate creation.
 
@@ -1439,7 +1633,18 @@ def _sufficient_replications(data, n_perm):
         return False
 
 
-def _get_surrogates(data, current_value, idx_list, n_perm, perm_settings):
+def _get_rng(analysis_setup):
+    """Return random number generator of an analysis, None if not set.
+
+    The generator is set for testing single sources by
+    NetworkInference._map_sources(), otherwise surrogates are created using
+    the global random state of numpy.
+    """
+    return getattr(analysis_setup, '_rng', None)
+
+
+def _get_surrogates(data, current_value, idx_list, n_perm, perm_settings,
+                    rng=None):
     """Return surrogate data for statistical testing.
 
     Calls surrogate generation methods of the data instance. The method for
@@ -1466,6 +1671,9 @@ def _get_surrogates(data, current_value, idx_list, n_perm, perm_settings):
             'permute_in_time' to True to create surrogates by shuffling data
             over time. See Data.permute_samples() for settings for surrogate
             creation.
+        rng : numpy RandomState instance [optional]
+            random number generator used for creating surrogates (default=
+            global random state of numpy)
 
     Returns:
         numpy array
@@ -1490,7 +1698,8 @@ def _get_surrogates(data, current_value, idx_list, n_perm, perm_settings):
         for perm in range(n_perm):
             surrogates[i_1:i_2, ] = data.permute_samples(current_value,
                                                          idx_list,
-                                                         perm_settings)[0]
+                                                         perm_settings,
+                                                         rng)[0]
             i_1 = i_2
             i_2 += n_realisations
 
@@ -1499,7 +1708,8 @@ def _get_surrogates(data, current_value, idx_list, n_perm, perm_settings):
                 'Not enough replications for surrogate creation.')
         for perm in range(n_perm):
             surrogates[i_1:i_2, ] = data.permute_replications(current_value,
-                                                              idx_list)[0]
+                                                              idx_list,
+                                                              rng)[0]
             i_1 = i_2
             i_2 += n_realisations
     return surrogates
@@ -1568,9 +1778,9 @@ def _check_permute_in_time(analysis_setup, data, n_perm):
 
     if (not analysis_setup.settings['permute_in_time'] and
             not _sufficient_replications(data, n_perm)):
-        print('\nWARNING: Number of replications is not sufficient to '
-              'generate the desired number of surrogates. Permuting samples '
-              'in time instead.')
+        logger.warning('Number of replications is not sufficient to '
+                       'generate the desired number of surrogates. Permuting '
+                       'samples in time instead.')
         analysis_setup.settings['permute_in_time'] = True
 
     if analysis_setup.settings['permute_in_time']:
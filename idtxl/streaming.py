@@ -0,0 +1,267 @@
+"""Update TE and AIS estimates for continuously arriving data.
+
+Estimate transfer entropy (TE) or active information storage (AIS) on a fixed
+embedding, i.e., on variables selected by a previous network inference or AIS
+analysis, while new samples arrive continuously. Realisations are held in a
+ring buffer of bounded size, such that estimates always refer to the most
+recent realisations.
+
+Example:
+
+    >>> results = MultivariateTE().analyse_network(settings, data)
+    >>> stream = StreamingEstimator(
+    >>>     {'cmi_estimator': 'JidtGaussianCMI', 'buffer_size': 5000},
+    >>>     results, target=1)
+    >>> for block in blocks:  # arrays with dimensions processes x samples
+    >>>     stream.add_samples(block)
+    >>>     print(stream.estimate())
+"""
+import logging
+import numpy as np
+from .estimator import find_estimator
+
+logger = logging.getLogger(__name__)
+
+
+class StreamingEstimator():
+    """Estimate TE or AIS on a fixed embedding from a stream of samples.
+
+    For each new sample, a realisation of the current value of the target
+    and of all variables selected for the target by a previous analysis is
+    added to a ring buffer. If the buffer is full, the oldest realisation is
+    evicted. estimate() returns
+
+    - for network inference results: the (C)MI between all selected source
+      variables and the current value, conditional on the selected target
+      variables, i.e., the collective TE (or MI) from all sources,
+    - for AIS results: the MI between the selected past variables and the
+      current value.
+
+    Estimates are updated incrementally depending on the estimator set in
+    settings['cmi_estimator']:
+
+    - Gaussian estimators (e.g., 'JidtGaussianCMI'): running sums and sums of
+      outer products of all realisations in the buffer (sufficient
+      statistics), estimates are in nats,
+    - discrete estimators (e.g., 'JidtDiscreteCMI'): running counts of joint
+      symbols in the buffer and running sums of c * log(c) over all counts
+      c, estimates are in bits; data have to be integers,
+    - all other estimators (e.g., 'JidtKraskovCMI'): the estimator is called
+      on the buffered realisations when estimate() is called (nearest
+      neighbour searches can not be updated incrementally for the
+      estimators in IDTxl).
+
+    Args:
+        settings : dict
+            settings for estimation
+
+            - cmi_estimator : str [optional] - estimator, see above (default
+              is the estimator used for the analysis in results)
+            - buffer_size : int [optional] - maximum number of realisations
+              used for estimation (default=10000)
+            - further estimator settings, see documentation of the estimator
+
+        results : ResultsNetworkInference | ResultsSingleProcessAnalysis
+            results of network inference or AIS estimation defining the
+            selected variables
+        target : int
+            target process (for network inference results) or process (for
+            AIS results)
+    """
+
+    def __init__(self, settings, results, target):
+        self.settings = settings.copy()
+        self.settings.setdefault('cmi_estimator',
+                                 results.settings['cmi_estimator'])
+        self.settings.setdefault('buffer_size', 10000)
+        if (type(self.settings['buffer_size']) is not int or
+                self.settings['buffer_size'] < 1):
+            raise RuntimeError('buffer_size has to be an integer > 0.')
+        self.target = target
+
+        # Get selected variables as lists of tuples (process, lag).
+        if hasattr(results, 'get_single_process'):
+            res = results.get_single_process(target, fdr=False)
+            self.selected_vars = list(res['selected_vars'])
+            self.conditional_vars = []
+        else:
+            res = results.get_single_target(target, fdr=False)
+            self.selected_vars = list(res['selected_vars_sources'])
+            self.conditional_vars = list(res['selected_vars_target'])
+        if not self.selected_vars:
+            raise RuntimeError('No variables were selected for process '
+                               '{0}.'.format(target))
+        self.max_lag = max([v[1] for v in self.selected_vars +
+                            self.conditional_vars])
+
+        # Columns of a realisation: current value, selected variables,
+        # conditional variables.
+        self._vars = ([(target, 0)] + self.selected_vars +
+                      self.conditional_vars)
+        self._dim = len(self._vars)
+        self._buffer = np.empty((self.settings['buffer_size'], self._dim))
+        self._pointer = 0
+        self.n_realisations = 0
+        self._history = None
+
+        estimator = self.settings['cmi_estimator']
+        if 'Gaussian' in estimator:
+            self._update = self._update_gaussian
+            self._estimate = self._estimate_gaussian
+            self._sum = np.zeros(self._dim)
+            self._sum_squares = np.zeros((self._dim, self._dim))
+        elif 'Discrete' in estimator:
+            self._update = self._update_discrete
+            self._estimate = self._estimate_discrete
+            # Joint variables entering the CMI: (var1, var2, conditional),
+            # (var1, conditional), (var2, conditional), (conditional).
+            var1 = list(range(1, len(self.selected_vars) + 1))
+            cond = list(range(len(self.selected_vars) + 1, self._dim))
+            self._joint_cols = [[0] + var1 + cond, var1 + cond,
+                                [0] + cond, cond]
+            self._counts = [{} for c in self._joint_cols]
+            self._sum_clogc = np.zeros(len(self._joint_cols))
+        else:
+            self._update = None
+            self._estimate = self._estimate_from_buffer
+            self._estimator = find_estimator(estimator)(self.settings)
+
+    def add_samples(self, block):
+        """Add a block of new samples.
+
+        Create realisations for all new samples for which all selected
+        variables are available, and add them to the buffer. The last
+        max_lag samples of each block are kept, such that realisations can
+        be created across block boundaries.
+
+        Args:
+            block : numpy array
+                new samples, 2D array with dimensions processes x samples
+        """
+        block = np.asarray(block)
+        if block.ndim != 2:
+            raise RuntimeError('Samples have to be a 2D array (processes x '
+                               'samples).')
+        if self._update == self._update_discrete and not np.issubdtype(
+                block.dtype, np.integer):
+            raise RuntimeError('Discrete estimation requires integer data.')
+        if self._history is not None:
+            block = np.hstack((self._history, block))
+        self._history = block[:, block.shape[1] - self.max_lag:]
+        n_new = block.shape[1] - self.max_lag
+        if n_new < 1:
+            return
+
+        # Create realisations of all variables for all new current values.
+        realisations = np.empty((n_new, self._dim))
+        for (i, (process, lag)) in enumerate(self._vars):
+            realisations[:, i] = block[
+                process, self.max_lag - lag:block.shape[1] - lag]
+        # Realisations that would be evicted within the same block are not
+        # added.
+        realisations = realisations[-self.settings['buffer_size']:, :]
+        n_new = realisations.shape[0]
+
+        # Write new realisations from the pointer onwards, overwriting the
+        # oldest realisations if the buffer is full. As long as the buffer is
+        # not full, it is filled from index 0 onwards.
+        idx = (self._pointer + np.arange(n_new)) % self.settings['buffer_size']
+        evicted = self._buffer[idx[idx < self.n_realisations], :]
+        if self._update is not None:
+            self._update(realisations, evicted)
+        self._buffer[idx, :] = realisations
+        self._pointer = (self._pointer + n_new) % self.settings['buffer_size']
+        self.n_realisations = min(self.n_realisations + n_new,
+                                  self.settings['buffer_size'])
+
+    def estimate(self):
+        """Return estimate from realisations in the buffer.
+
+        Returns:
+            float
+                (C)MI between selected variables and the current value
+        """
+        if self.n_realisations < 2:
+            raise RuntimeError('Not enough realisations for estimation.')
+        return self._estimate()
+
+    def get_realisations(self):
+        """Return realisations in the buffer, oldest first.
+
+        Returns:
+            numpy array
+                realisations of the current value (first column), selected
+                variables and conditional variables (remaining columns)
+        """
+        if self.n_realisations < self.settings['buffer_size']:
+            return self._buffer[:self.n_realisations, :].copy()
+        return np.roll(self._buffer, -self._pointer, axis=0)
+
+    def _split_realisations(self, realisations):
+        n_sel = len(self.selected_vars)
+        var1 = realisations[:, 1:n_sel + 1]
+        var2 = realisations[:, :1]
+        if self.conditional_vars:
+            conditional = realisations[:, n_sel + 1:]
+        else:
+            conditional = None
+        return var1, var2, conditional
+
+    def _estimate_from_buffer(self):
+        [var1, var2, conditional] = self._split_realisations(
+            self.get_realisations())
+        return self._estimator.estimate(var1=var1, var2=var2,
+                                        conditional=conditional)
+
+    def _update_gaussian(self, new, evicted):
+        self._sum += new.sum(axis=0) - evicted.sum(axis=0)
+        self._sum_squares += np.dot(new.T, new) - np.dot(evicted.T, evicted)
+
+    def _estimate_gaussian(self):
+        n = self.n_realisations
+        cov = ((self._sum_squares - np.outer(self._sum, self._sum) / n) /
+               (n - 1))
+        n_sel = len(self.selected_vars)
+        var1 = list(range(1, n_sel + 1))
+        cond = list(range(n_sel + 1, self._dim))
+
+        def logdet(cols):
+            if not cols:
+                return 0
+            return np.linalg.slogdet(cov[np.ix_(cols, cols)])[1]
+
+        # I(X;Y|Z) = 0.5 * log(|S_XZ| |S_YZ| / (|S_Z| |S_XYZ|))
+        return 0.5 * (logdet(var1 + cond) + logdet([0] + cond) -
+                      logdet(cond) - logdet([0] + var1 + cond))
+
+    def _update_discrete(self, new, evicted):
+        for (i, cols) in enumerate(self._joint_cols):
+            for (realisations, sign) in [(new, 1), (evicted, -1)]:
+                if realisations.shape[0] == 0:
+                    continue
+                if cols:
+                    [symbols, n] = np.unique(realisations[:, cols], axis=0,
+                                             return_counts=True)
+                    symbols = [tuple(s) for s in symbols]
+                else:  # empty conditional, a single symbol
+                    [symbols, n] = [[()], [realisations.shape[0]]]
+                for (s, k) in zip(symbols, n):
+                    c_old = self._counts[i].get(s, 0)
+                    c_new = c_old + sign * k
+                    self._sum_clogc[i] += (_clogc(c_new) - _clogc(c_old))
+                    if c_new == 0:
+                        del self._counts[i][s]
+                    else:
+                        self._counts[i][s] = c_new
+
+    def _estimate_discrete(self):
+        # H = log(N) - sum(c log(c)) / N for each joint variable,
+        # I(X;Y|Z) = H(X,Z) + H(Y,Z) - H(X,Y,Z) - H(Z)
+        n = self.n_realisations
+        h = np.log2(n) - self._sum_clogc / n
+        return h[1] + h[2] - h[0] - h[3]
+
+
+def _clogc(c):
+    """Return c * log2(c), where 0 * log2(0) = 0."""
+    return c * np.log2(c) if c > 0 else 0
@@ -0,0 +1,139 @@
+"""Time-resolved network inference over sliding windows."""
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TimeResolvedNetworkInference():
+    """Infer networks in consecutive windows of a single recording.
+
+    Run a network inference algorithm (e.g., MultivariateTE or BivariateTE)
+    separately on consecutive, possibly overlapping windows of samples. Each
+    window is a view on the original data (see Data.get_window()), i.e., the
+    data are not copied.
+
+    Successive windows are warm-started: variables selected in the previous
+    window are tested first for each target, before the remaining candidates
+    are tested in the usual greedy search (see the setting 'warm_start' in
+    the documentation of the network inference algorithms). If the network
+    is stable over time, this saves iterations of the greedy search, which
+    otherwise has to rediscover the same variables in each window. Note that
+    variables found in the previous window are still subject to all
+    statistical tests in the current window.
+
+    Example:
+
+        >>> data = Data()
+        >>> data.generate_mute_data(10000, 1)
+        >>> settings = {
+        >>>     'cmi_estimator':  'JidtKraskovCMI',
+        >>>     'max_lag_sources': 5,
+        >>>     'min_lag_sources': 1,
+        >>>     'window_length': 2000,
+        >>>     'window_step': 1000}
+        >>> analysis = TimeResolvedNetworkInference(MultivariateTE())
+        >>> results = analysis.analyse_network(settings, data)
+        >>> for r in results:
+        >>>     print(r.data_properties.window)
+        >>>     r.print_edge_list(weights='max_te_lag', fdr=False)
+
+    Args:
+        network_analysis : NetworkInference instance
+            network inference algorithm used to analyse each window, e.g.,
+            MultivariateTE() or BivariateMI()
+    """
+
+    def __init__(self, network_analysis):
+        self.network_analysis = network_analysis
+
+    def get_windows(self, n_samples, window_length, window_step):
+        """Return start and stop indices of all windows.
+
+        Windows start at sample 0 and are shifted by window_step until the
+        end of the data, incomplete windows at the end of the data are
+        discarded.
+
+        Args:
+            n_samples : int
+                number of samples in the data
+            window_length : int
+                number of samples per window
+            window_step : int
+                number of samples between the starts of two windows
+
+        Returns:
+            list of tuples
+                (start, stop) sample index for each window, where stop is
+                excluded
+        """
+        if type(window_length) is not int or window_length < 1:
+            raise RuntimeError('window_length has to be an integer > 0.')
+        if type(window_step) is not int or window_step < 1:
+            raise RuntimeError('window_step has to be an integer > 0.')
+        if window_length > n_samples:
+            raise RuntimeError('window_length ({0}) is larger than the number '
+                               'of samples ({1}).'.format(window_length,
+                                                          n_samples))
+        return [(start, start + window_length) for start in
+                range(0, n_samples - window_length + 1, window_step)]
+
+    def analyse_network(self, settings, data, targets='all', sources='all',
+                        progress_callback=None):
+        """Infer networks in sliding windows over the data.
+
+        Args:
+            settings : dict
+                parameters for network inference, see documentation of
+                analyse_network() of the network inference algorithm,
+                settings must further contain
+
+                - window_length : int - number of samples per window
+                - window_step : int [optional] - number of samples between
+                  the starts of two windows (default=window_length, i.e.,
+                  non-overlapping windows)
+                - warm_start : bool [optional] - test variables selected in
+                  the previous window first (default=True)
+
+            data : Data instance
+                raw data for analysis
+            targets : list of int | 'all' [optional]
+                index of target processes (default='all')
+            sources : list of int | list of list | 'all' [optional]
+                indices of source processes for each target (default='all'),
+                see documentation of analyse_network() of the network
+                inference algorithm
+            progress_callback : callable [optional]
+                function passed to analyse_network() of the network inference
+                algorithm for each window, see documentation of the progress
+                module (default=None)
+
+        Returns:
+            list of ResultsNetworkInference instances
+                results for each window, the start and stop sample of each
+                window is stored in data_properties.window
+        """
+        if 'window_length' not in settings:
+            raise RuntimeError('The window length (''window_length'') needs '
+                               'to be specified.')
+        settings = settings.copy()
+        window_length = settings.pop('window_length')
+        window_step = settings.pop('window_step', window_length)
+        warm_start = settings.pop('warm_start', True)
+        settings.setdefault('verbose', True)
+
+        windows = self.get_windows(data.n_samples, window_length, window_step)
+        results = []
+        previous = None
+        for (start, stop) in windows:
+            if settings['verbose']:
+                logger.info('####### analysing window [{0}, {1})'.format(
+                    start, stop))
+            if warm_start and previous is not None:
+                settings['warm_start'] = previous
+            res = self.network_analysis.analyse_network(
+                settings, data.get_window(start, stop), targets, sources,
+                progress_callback=progress_callback)
+            res.data_properties.window = (start, stop)
+            results.append(res)
+            previous = res
+        return results
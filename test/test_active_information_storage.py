@@ -6,6 +6,7 @@ import pytest
 import random as rn
 import numpy as np
 from idtxl.data import Data
+from idtxl.estimate_cache import EstimateCache
 from idtxl.active_information_storage import ActiveInformationStorage
 from idtxl.estimators_jidt import JidtDiscreteCMI
 from test_estimators_jidt import jpype_missing
@@ -142,6 +143,36 @@ def test_analyse_network():
         ais.analyse_network(settings, data=data, processes=[1.5, 0.7])
 
 
+@jpype_missing
+def test_analyse_network_parallel():
+    """Test AIS estimation in worker processes."""
+    settings = {
+        'cmi_estimator': 'JidtKraskovCMI',
+        'noise_level': 0,
+        'n_perm_max_stat': 21,
+        'n_perm_min_stat': 21,
+        'n_perm_mi': 21,
+        'max_lag': 3,
+        'tau': 1,
+        'n_workers': 2,
+        'estimate_cache': EstimateCache()}
+    data = Data()
+    data.generate_mute_data(100, 5)
+    processes = [1, 2, 3]
+    ais = ActiveInformationStorage()
+    results = ais.analyse_network(settings, data, processes)
+    assert len(settings['estimate_cache']) > 0, (
+        'Entries added by worker processes missing from the cache.')
+    assert results.processes_analysed == processes, (
+        'Processes were not analysed in the requested order.')
+    for p in processes:
+        r = results.get_single_process(p, fdr=False)
+        assert r.current_value == (p, settings['max_lag']), (
+            'Wrong current value for process {0}.'.format(p))
+        for v in r.selected_vars:
+            assert v[0] == p, 'Selected variable not in process past.'
+
+
 @jpype_missing
 def test_single_source_storage_gaussian():
     n = 1000
@@ -283,6 +314,7 @@ if __name__ == '__main__':
     test_return_local_values()
     test_discrete_input()
     test_analyse_network()
+    test_analyse_network_parallel()
     test_ActiveInformationStorage_init()
     test_single_source_storage_gaussian()
     test_compare_jidt_open_cl_estimator()
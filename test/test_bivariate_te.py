@@ -7,6 +7,7 @@ import itertools as it
 import numpy as np
 from idtxl.bivariate_te import BivariateTE
 from idtxl.data import Data
+from idtxl.profiling import Profiler
 from idtxl.estimators_jidt import JidtDiscreteCMI, JidtKraskovCMI, JidtKraskovTE
 from test_estimators_jidt import jpype_missing
 from idtxl.idtxl_utils import calculate_mi
@@ -513,6 +514,179 @@ def test_mute_data():
     te.analyse_network(settings, data, targets=[target])
 
 
+@jpype_missing
+def test_parallel_sources():
+    """Test parallel inclusion and pruning of sources."""
+    expected_mi, source, source_uncorr, target = _get_gauss_data()
+    source = source[1:]
+    source_uncorr = source_uncorr[1:]
+    target = target[:-1]
+    data = Data(np.hstack((source, source_uncorr, target)),
+                dim_order='sp', normalise=False)
+    settings = {
+        'cmi_estimator': 'JidtKraskovCMI',
+        'n_perm_max_stat': 21,
+        'n_perm_min_stat': 21,
+        'n_perm_max_seq': 21,
+        'n_perm_omnibus': 21,
+        'max_lag_sources': 2,
+        'min_lag_sources': 1,
+        'max_lag_target': 1,
+        'noise_level': 0,
+        'profile': True}
+
+    # Results of parallel runs are the same as for serial runs, surrogates
+    # are created from a seed per source (see _map_sources()).
+    np.random.seed(0)
+    results = BivariateTE().analyse_single_target(
+        settings, data, target=2, sources=[0, 1])
+    res_serial = results.get_single_target(2, fdr=False)
+    assert results.get_target_sources(2, fdr=False) == [0], (
+        'Wrong inferred sources.')
+    assert res_serial['selected_vars_sources'] == [(0, 1)], (
+        'Wrong selected source variables.')
+    settings['n_workers'] = 2
+    for worker_type in ['thread', 'process']:
+        settings['worker_type'] = worker_type
+        np.random.seed(0)
+        results = BivariateTE().analyse_single_target(
+            settings, data, target=2, sources=[0, 1])
+        res = results.get_single_target(2, fdr=False)
+        for k in ['selected_vars_sources', 'selected_sources_pval',
+                  'selected_sources_te', 'omnibus_pval']:
+            assert np.array_equal(res[k], res_serial[k]), (
+                'Results for {0} differ between serial runs and runs using '
+                '{1} workers.'.format(k, worker_type))
+        assert 'n_perm_max_stat' in results.settings, (
+            'Defaults set by workers missing from settings.')
+        profile = results.get_profile()
+        assert profile['phases']['include_source_candidates'][
+            'n_estimator_calls'] > 0, (
+                'Estimator calls of {0} workers missing from profile.'.format(
+                    worker_type))
+        if worker_type == 'process':
+            assert len(profile['jvm']) > 1, (
+                'JVM records of worker processes missing from profile.')
+
+    # Test if results are returned in the order of sources.
+    nw = BivariateTE()
+    nw.settings = {'n_workers': 3, 'worker_type': 'thread', 'verbose': False,
+                   'cmi_estimator': 'JidtKraskovCMI', 'local_values': False}
+    nw._profiler = Profiler(enabled=False)
+    nw._test_source = lambda s, d: (s, d)
+    assert nw._map_sources('_test_source', [4, 2, 0], 'x') == [
+        (4, 'x'), (2, 'x'), (0, 'x')], 'Wrong order of worker results.'
+    nw.settings['worker_type'] = 'foo'
+    with pytest.raises(RuntimeError):
+        nw._map_sources('_test_source', [4, 2, 0], 'x')
+
+    # Test if each source uses its own random generator, seeded from the
+    # global random state, for any number and type of workers.
+    nw = _RandomSourceTE()
+    nw.settings = {'verbose': False, 'cmi_estimator': 'JidtKraskovCMI',
+                   'local_values': False}
+    nw._profiler = Profiler(enabled=False)
+    draws = []
+    for (n_workers, worker_type) in [(1, 'thread'), (2, 'thread'),
+                                     (2, 'process'), (3, 'process')]:
+        nw.settings['n_workers'] = n_workers
+        nw.settings['worker_type'] = worker_type
+        np.random.seed(0)
+        draws.append(nw._map_sources('_draw_random', [0, 1, 2], None))
+    for d in draws[1:]:
+        assert d == draws[0], 'Random numbers depend on the workers used.'
+    assert len(set(draws[0])) == 3, 'Sources use the same seed.'
+    assert nw._rng is None
+
+
+class _RandomSourceTE(BivariateTE):
+    """Return a random number per source, see test_parallel_sources()."""
+
+    def _draw_random(self, source, data):
+        return self._rng.rand()
+
+
+@jpype_missing
+def test_prescreen_candidates():
+    """Test pre-screening of source candidates over all sources."""
+    expected_mi, source, source_uncorr, target = _get_gauss_data()
+    source = source[1:]
+    source_uncorr = source_uncorr[1:]
+    target = target[:-1]
+    data = Data(np.hstack((source, source_uncorr, target)),
+                dim_order='sp', normalise=False)
+    settings = {
+        'cmi_estimator': 'JidtKraskovCMI',
+        'n_perm_max_stat': 21,
+        'n_perm_min_stat': 21,
+        'n_perm_max_seq': 21,
+        'n_perm_omnibus': 21,
+        'max_lag_sources': 2,
+        'min_lag_sources': 1,
+        'max_lag_target': 1,
+        'prescreen': 'gaussian',
+        'prescreen_n_keep': 1,
+        'n_workers': 2,
+        'worker_type': 'thread'}
+    nw = BivariateTE()
+    results = nw.analyse_single_target(
+        settings, data, target=2, sources=[0, 1])
+    res = results.get_single_target(2, fdr=False)
+    assert res['sources_tested'] == [0, 1]
+    assert res['selected_vars_sources'] == [(0, 1)], (
+        'Wrong selected source variables after pre-screening.')
+    assert res['prescreening']['n_candidates'] == 4
+    assert res['prescreening']['n_screened_out'] == 3
+    assert sorted(res['prescreening']['screened_out']) == [
+        (0, 2), (1, 1), (1, 2)]
+
+
+def test_coarse_to_fine_lag_search():
+    """Test coarse-to-fine search of source lags."""
+    expected_mi, source, source_uncorr, target = _get_gauss_data(n=3000)
+    source = source[1:]
+    source_uncorr = source_uncorr[1:]
+    target = target[:-1]
+    data = Data(np.hstack((source, source_uncorr, target)),
+                dim_order='sp', normalise=False)
+    settings = {
+        'cmi_estimator': 'JidtKraskovCMI',
+        'n_perm_max_stat': 21,
+        'n_perm_min_stat': 21,
+        'n_perm_max_seq': 21,
+        'n_perm_omnibus': 21,
+        'max_lag_sources': 5,
+        'min_lag_sources': 1,
+        'max_lag_target': 1,
+        'lag_search': 'coarse_to_fine',
+        'lag_search_step': 2,
+        'lag_search_radius': 1,
+        'n_workers': 2,
+        'worker_type': 'thread'}
+    nw = BivariateTE()
+    results = nw.analyse_single_target(
+        settings, data, target=2, sources=[0, 1])
+    res = results.get_single_target(2, fdr=False)
+    assert (0, 1) in res['selected_vars_sources'], (
+        'Source variable not found in coarse-to-fine search.')
+    # Lags 1, 3, 5 are tested for both sources, lag 2 is tested around the
+    # selected variable.
+    evaluated = res['source_lags_evaluated']
+    assert len(evaluated) == len(set(evaluated))
+    assert set([(s, l) for s in [0, 1] for l in [1, 3, 5]]) <= set(evaluated)
+    assert (0, 2) in evaluated, 'No candidates tested around selected lag.'
+
+    settings['lag_search'] = 'full'
+    results = nw.analyse_single_target(
+        settings, data, target=2, sources=[0, 1])
+    res = results.get_single_target(2, fdr=False)
+    assert len(res['source_lags_evaluated']) == 10
+
+    settings['lag_search'] = 'binary'
+    with pytest.raises(RuntimeError):
+        nw.analyse_single_target(settings, data, target=2, sources=[0, 1])
+
+
 def test_include_target_candidates():
     pass
 
@@ -541,6 +715,9 @@ if __name__ == '__main__':
     test_mute_data()
     test_return_local_values()
     test_gauss_data()
+    test_parallel_sources()
+    test_prescreen_candidates()
+    test_coarse_to_fine_lag_search()
     test_discrete_input()
     test_analyse_network()
     test_check_source_set()
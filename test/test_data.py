@@ -396,7 +396,145 @@ def test_data_type():
         'Permuted samples type is not an int.')
 
 
+def test_get_fingerprint():
+    """Test fingerprint of data."""
+    d = np.random.rand(3, 50, 5)
+    data_1 = Data(d.copy(), dim_order='psr', normalise=False)
+    data_2 = Data(d.copy(), dim_order='psr', normalise=False)
+    assert data_1.get_fingerprint() == data_2.get_fingerprint(), (
+        'Fingerprints of equal data differ.')
+    # Change a single sample.
+    d[0, 0, 0] += 1
+    data_2 = Data(d, dim_order='psr', normalise=False)
+    assert data_1.get_fingerprint() != data_2.get_fingerprint(), (
+        'Fingerprints of unequal data are equal.')
+    # Same values in different shape.
+    data_2 = Data(data_1.data.reshape(3, 5, 50), dim_order='psr',
+                  normalise=False)
+    assert data_1.get_fingerprint() != data_2.get_fingerprint(), (
+        'Fingerprints of data with different shapes are equal.')
+
+
+def test_get_window():
+    """Test windows of data returned as views."""
+    d = np.random.rand(3, 50, 5)
+    data = Data(d, dim_order='psr', normalise=True)
+    window = data.get_window(10, 30)
+    assert window.n_processes == 3
+    assert window.n_samples == 20
+    assert window.n_replications == 5
+    assert window.normalise
+    assert np.shares_memory(window.data, data.data), (
+        'Window does not hold a view on the data.')
+    assert np.array_equal(window.data, data.data[:, 10:30, :])
+    with pytest.raises(RuntimeError):
+        data.get_window(10, 51)
+    with pytest.raises(RuntimeError):
+        data.get_window(10, 10)
+
+
+def test_discretise():
+    """Test discretisation of all processes."""
+    d = np.random.rand(3, 50, 4)
+    data = Data(d, dim_order='psr', normalise=False)
+    for (method, discretise) in [('max_ent', utils.discretise_max_ent),
+                                 ('equal', utils.discretise)]:
+        data_dis = data.discretise(5, method)
+        assert data_dis.data.shape == d.shape
+        assert issubclass(data_dis.data.dtype.type, np.integer)
+        assert data_dis.data.min() == 0
+        assert data_dis.data.max() == 4
+        for p in range(3):
+            # Bins are defined over all samples and replications.
+            assert np.array_equal(
+                data_dis.data[p, :, :].ravel(),
+                discretise(data.data[p, :, :].ravel(), 5))
+    assert np.all(np.unique(data.discretise(5).data[0],
+                            return_counts=True)[1] == 40), (
+        'Max. entropy bins are not of equal size.')
+    with pytest.raises(RuntimeError):
+        data.discretise(5, 'quantile')
+
+
+def test_generate_var_data(tmpdir):
+    """Test simulation of VAR processes."""
+    coefficient_matrices = np.array([[[0.5, 0], [0.4, 0.5]],
+                                     [[0, 0], [-0.2, 0]]])
+    data = Data(normalise=False)
+    data.generate_var_data(n_samples=3000, n_replications=3,
+                           coefficient_matrices=coefficient_matrices,
+                           noise_std=1)
+    assert data.data.shape == (2, 3000, 3)
+    # Recover coefficients by least squares over all replications.
+    d = data.data
+    past = np.vstack((d[:, 1:-1, :].reshape(2, -1),
+                      d[:, :-2, :].reshape(2, -1)))
+    coef = np.linalg.lstsq(past.T, d[:, 2:, :].reshape(2, -1).T,
+                           rcond=None)[0].T
+    assert np.allclose(coef, np.hstack(coefficient_matrices), atol=0.05), (
+        'Simulated VAR process does not match coefficients.')
+    assert not np.allclose(d[:, :, 0], d[:, :, 1])
+
+    # Chunked simulation written to a memory-mapped file.
+    f = str(tmpdir.join('var.npy'))
+    data.generate_var_data(n_samples=500, n_replications=2,
+                           coefficient_matrices=coefficient_matrices,
+                           memmap_file=f)
+    assert isinstance(data.data, np.memmap)
+    assert np.array_equal(np.load(f), data.data)
+    data = Data(normalise=False)
+    data.generate_logistic_maps_data(n_samples=500, n_replications=2,
+                                     memmap_file=str(tmpdir.join('log.npy')))
+    assert data.data.shape == (2, 500, 2)
+    assert data.data.min() >= 0 and data.data.max() < 1
+
+
+def test_generate_logistic_maps_data():
+    """Test that logistic maps stay in the [0, 1) range."""
+    for seed in range(30):
+        np.random.seed(seed)
+        data = Data(normalise=False)
+        data.generate_logistic_maps_data(n_samples=1000, n_replications=3)
+        assert np.isfinite(data.data).all(), (
+            'Logistic maps diverged for seed {0}.'.format(seed))
+        assert data.data.min() >= 0 and data.data.max() < 1
+
+
+def test_generate_sparse_var_data():
+    """Test simulation of VAR processes on random sparse networks."""
+    data = Data(normalise=False)
+    ground_truth = data.generate_sparse_var_data(
+        n_processes=20, n_samples=50000, n_parents=2, max_lag=3, noise_std=1)
+    assert data.data.shape == (20, 50000, 1)
+    assert ground_truth.shape == (20, 20)
+    assert np.all(np.count_nonzero(ground_truth, axis=0) == 2)
+    assert np.all(np.diag(ground_truth) == 0)
+    assert ground_truth.max() <= 3
+
+    # Recover coupling by least squares, coefficients of existing links have
+    # an absolute value of at least 0.9 * 0.1 / (0.5 + 2 * 0.5) = 0.06.
+    d = data.data[:, :, 0]
+    past = np.vstack([d[:, 3 - lag:-lag] for lag in range(1, 4)])
+    coef = np.linalg.lstsq(past.T, d[:, 3:].T, rcond=None)[0]
+    for target in range(20):
+        for lag in range(1, 4):
+            c = np.abs(coef[(lag - 1) * 20:lag * 20, target])
+            link = ground_truth[:, target] == lag
+            if lag == 1:
+                link[target] = True
+            assert np.all(c[link] > 0.03), 'Coupling missing in data.'
+            assert np.all(c[~link] < 0.03), 'Spurious coupling in data.'
+
+    with pytest.raises(RuntimeError):
+        data.generate_sparse_var_data(n_processes=2, n_parents=2)
+
+
 if __name__ == '__main__':
+    test_generate_logistic_maps_data()
+    test_generate_sparse_var_data()
+    test_discretise()
+    test_get_window()
+    test_get_fingerprint()
     test_permute_samples()
     test_data_type()
     test_swap_blocks()
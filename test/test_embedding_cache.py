@@ -0,0 +1,114 @@
+"""Test embedding cache.
+
+This module provides unit tests for the cache of embeddings shared between AIS
+and TE analyses.
+"""
+from idtxl.data import Data
+from idtxl.embedding_cache import EmbeddingCache
+from idtxl.active_information_storage import ActiveInformationStorage
+from idtxl.multivariate_te import MultivariateTE
+from test_estimators_jidt import jpype_missing
+
+
+def test_cache_keys():
+    """Test creation of cache keys."""
+    data = Data()
+    data.generate_mute_data(100, 5)
+    cache = EmbeddingCache()
+    settings = {'cmi_estimator': 'JidtKraskovCMI', 'n_perm_max_stat': 200}
+    key = cache.get_key(data, (0, 5), 5, 1, settings)
+
+    # Settings that do not affect the embedding are ignored, defaults of
+    # settings that do are added.
+    settings_2 = {'cmi_estimator': 'JidtKraskovCMI', 'max_lag_sources': 3,
+                  'n_perm_omnibus': 100, 'verbose': False}
+    assert key == cache.get_key(data, (0, 5), 5, 1, settings_2), (
+        'Ignored settings changed the cache key.')
+    settings_2['kraskov_k'] = 3
+    assert key != cache.get_key(data, (0, 5), 5, 1, settings_2), (
+        'Estimator settings did not change the cache key.')
+    assert key != cache.get_key(data, (1, 5), 5, 1, settings), (
+        'Process did not change the cache key.')
+    assert key != cache.get_key(data, (0, 6), 5, 1, settings), (
+        'Current value did not change the cache key.')
+    assert key != cache.get_key(data, (0, 5), 5, 2, settings), (
+        'Tau did not change the cache key.')
+    data_2 = Data()
+    data_2.generate_mute_data(100, 5)
+    assert key != cache.get_key(data_2, (0, 5), 5, 1, settings), (
+        'Data did not change the cache key.')
+
+
+def test_cache_entries(tmpdir):
+    """Test adding and retrieving entries."""
+    cache = EmbeddingCache()
+    assert cache.get('a') is None
+    assert cache.n_misses == 1
+    cache.add('a', [(0, 1), (0, 3)])
+    assert cache.get('a') == [(0, 1), (0, 3)]
+    assert cache.n_hits == 1
+    assert len(cache) == 1
+
+    cache_2 = EmbeddingCache()
+    cache_2.add('b', [])
+    cache.update(cache_2)
+    assert cache.get('b') == [], 'Empty embedding was not returned.'
+    assert len(cache) == 2
+
+    # Test persistent cache on disk.
+    path = str(tmpdir.mkdir('embedding_cache'))
+    cache = EmbeddingCache(path=path)
+    cache.add('a', [(0, 1)])
+    cache_2 = EmbeddingCache(path=path)
+    assert cache_2.get('a') == [(0, 1)], 'Entry was not loaded from disk.'
+
+
+@jpype_missing
+def test_ais_te_cache():
+    """Test re-use of AIS embeddings in TE estimation."""
+    data = Data()
+    data.generate_mute_data(100, 5)
+    cache = EmbeddingCache()
+    settings_ais = {
+        'cmi_estimator': 'JidtKraskovCMI',
+        'n_perm_max_stat': 21,
+        'n_perm_min_stat': 21,
+        'n_perm_mi': 21,
+        'max_lag': 3,
+        'tau': 1,
+        'embedding_cache': cache}
+    processes = [1, 2]
+    ais = ActiveInformationStorage()
+    results_ais = ais.analyse_network(settings_ais, data, processes)
+    assert len(cache) == len(processes), 'Embeddings were not cached.'
+    assert 'embedding_cache' not in results_ais.settings, (
+        'Cache was added to results.')
+
+    # Run AIS again, all embeddings should be taken from the cache.
+    results_ais_2 = ais.analyse_network(settings_ais, data, processes)
+    assert cache.n_hits == len(processes)
+    assert len(cache) == len(processes)
+    for p in processes:
+        assert (results_ais.get_single_process(p, fdr=False).selected_vars ==
+                results_ais_2.get_single_process(p, fdr=False).selected_vars)
+
+    settings_te = {
+        'cmi_estimator': 'JidtKraskovCMI',
+        'n_perm_max_stat': 21,
+        'n_perm_min_stat': 21,
+        'n_perm_omnibus': 21,
+        'n_perm_max_seq': 21,
+        'max_lag_sources': 3,
+        'min_lag_sources': 1,
+        'max_lag_target': 3,
+        'embedding_cache': cache}
+    te = MultivariateTE()
+    te.analyse_network(settings_te, data, targets=processes)
+    assert cache.n_hits == 2 * len(processes), (
+        'AIS embeddings were not used for TE estimation.')
+    assert len(cache) == len(processes)
+
+
+if __name__ == '__main__':
+    test_cache_keys()
+    test_ais_te_cache()
@@ -0,0 +1,177 @@
+"""Test estimate cache.
+
+This module provides unit tests for the cache of estimates shared between
+statistical tests and analyses.
+"""
+import pickle
+import pytest
+import numpy as np
+from idtxl.data import Data
+from idtxl.estimate_cache import EstimateCache
+from idtxl.estimators_jidt import JidtKraskovCMI
+from idtxl.multivariate_te import MultivariateTE
+from idtxl.bivariate_te import BivariateTE
+from test_estimators_jidt import jpype_missing
+
+
+@jpype_missing
+def test_cache_keys():
+    """Test creation of cache keys."""
+    cache = EstimateCache()
+    var1 = np.random.randn(100, 2)
+    var2 = np.random.randn(100, 1)
+    est = JidtKraskovCMI({'n_perm_max_stat': 200})
+    key = cache.get_key(est, {'var1': var1, 'var2': var2})
+
+    # Settings that do not affect the estimate are ignored, the order of
+    # dimensions and None entries are ignored.
+    est_2 = JidtKraskovCMI({'alpha_max_seq': 0.01, 'verbose': False})
+    assert key == cache.get_key(est_2, {'var1': var1, 'var2': var2}), (
+        'Ignored settings changed the cache key.')
+    assert key == cache.get_key(est, {'var1': var1[:, ::-1], 'var2': var2,
+                                      'conditional': None})
+    assert key != cache.get_key(JidtKraskovCMI({'kraskov_k': 3}),
+                                {'var1': var1, 'var2': var2}), (
+        'Estimator settings did not change the cache key.')
+    assert key != cache.get_key(est, {'var1': var1[::-1], 'var2': var2}), (
+        'Realisations did not change the cache key.')
+    assert key != cache.get_key(est, {'var1': var2, 'var2': var1})
+    assert key != cache.get_key(est, {'var1': var1, 'var2': var2},
+                                method='estimate_surrogates_analytic')
+    assert cache.get_key(est, {'var1': var1, 'calc': object()}) is None
+
+
+def test_cache_entries(tmpdir):
+    """Test adding, evicting, and saving entries."""
+    with pytest.raises(RuntimeError):
+        EstimateCache(max_size=0)
+    cache = EstimateCache(max_size=2)
+    assert cache.get('a') is None
+    cache.add('a', 0.1)
+    cache.add('b', np.arange(3))
+    assert cache.get('a') == 0.1
+    cache.add('c', 0.3)  # evicts the least recently used entry 'b'
+    assert len(cache) == 2
+    assert cache.get('b') is None
+    assert cache.n_evicted == 1
+    stats = cache.get_statistics()
+    assert stats['n_hits'] == 1
+    assert stats['n_misses'] == 2
+    assert stats['hit_rate'] == 1 / 3
+    with pytest.raises(RuntimeError):
+        cache.save()
+
+    # Test saving and loading of entries.
+    filename = str(tmpdir.join('estimates.p'))
+    cache = EstimateCache(filename=filename)
+    cache.add('b', np.arange(3))
+    estimate = cache.get('b')
+    estimate[0] = 5
+    assert cache.get('b')[0] == 0, 'Cached array was changed by the caller.'
+    cache.save()
+    cache_2 = EstimateCache(filename=filename)
+    assert (cache_2.get('b') == np.arange(3)).all()
+    cache_3 = EstimateCache()
+    cache_3.update(cache_2)
+    assert len(cache_3) == 1
+
+    # Test recording of new entries, e.g., returned by worker processes.
+    assert cache_3.get_new_entries() == {}
+    cache_3.add('c', 0.3)
+    assert cache_3.get_new_entries() == {'c': 0.3}
+    assert cache_3.get_new_entries() == {}
+    cache_3.add('d', 0.4)
+    cache_4 = pickle.loads(pickle.dumps(cache_3))
+    cache_4.add('e', 0.5)
+    assert cache_4.get_new_entries() == {}, 'Copy inherited recording.'
+    cache_2.update({'c': 0.3, 'd': 0.4})
+    assert len(cache_2) == 3
+
+
+@jpype_missing
+def test_cached_estimator():
+    """Test look-up of estimates and chunks of realisations."""
+    n = 1000
+    var1 = np.random.randn(n, 2)
+    var2 = np.random.randn(n, 1)
+    cond = np.random.randn(n, 1)
+    cache = EstimateCache()
+    est = cache.wrap_estimator(JidtKraskovCMI({}))
+    assert est.is_parallel() is False, 'Attribute access failed.'
+    cmi = est.estimate(var1=var1, var2=var2, conditional=cond)
+    assert est.estimate(var1=var1, var2=var2, conditional=cond) == cmi
+    assert cache.n_hits == 1
+    # Positional arguments are keyed by their names.
+    assert est.estimate(var1, var2, cond) == cmi
+    assert est.estimate(var1, var2=var2, conditional=cond) == cmi
+    assert cache.n_hits == 3
+    assert len(cache) == 1
+
+    # Chunks are looked up individually, the first chunk was estimated
+    # before.
+    chunks = est.estimate_parallel(
+        n_chunks=3, re_use=['var2', 'conditional'],
+        var1=np.vstack((var1, var1[::-1], var1[:, ::-1])), var2=var2,
+        conditional=cond)
+    assert cache.n_hits == 5
+    assert chunks[0] == cmi
+    assert chunks[2] == cmi
+    assert len(cache) == 2
+    chunks_2 = est.estimate_parallel(
+        n_chunks=2, re_use=['var2', 'conditional'],
+        var1=np.vstack((var1[::-1], var1)), var2=var2, conditional=cond)
+    assert (chunks_2 == chunks[:2][::-1]).all()
+    assert cache.n_hits == 7
+
+
+@jpype_missing
+def test_analysis_cache():
+    """Test re-use of estimates when re-running a network analysis."""
+    data = Data()
+    data.generate_mute_data(100, 5)
+    cache = EstimateCache()
+    settings = {
+        'cmi_estimator': 'JidtKraskovCMI',
+        'n_perm_max_stat': 21,
+        'n_perm_min_stat': 21,
+        'n_perm_omnibus': 21,
+        'n_perm_max_seq': 21,
+        'max_lag_sources': 2,
+        'min_lag_sources': 1,
+        'estimate_cache': cache}
+    np.random.seed(0)
+    results = MultivariateTE().analyse_single_target(settings, data, target=1)
+    assert 'estimate_cache' not in results.settings
+    assert settings['estimate_cache'] is cache
+    n_entries = len(cache)
+    assert n_entries > 0
+
+    # Re-running with different critical alpha levels does not add new
+    # estimates if the same surrogates are created.
+    settings['alpha_max_seq'] = 0.049
+    n_misses = cache.n_misses
+    np.random.seed(0)
+    results_2 = MultivariateTE().analyse_single_target(
+        settings, data, target=1)
+    assert len(cache) == n_entries
+    assert cache.n_misses == n_misses
+    assert (results.get_single_target(1, False).selected_vars_full ==
+            results_2.get_single_target(1, False).selected_vars_full)
+
+    # Entries added by worker processes are collected in the cache.
+    cache = EstimateCache()
+    settings = dict(settings, estimate_cache=cache, n_workers=2,
+                    worker_type='process')
+    np.random.seed(0)
+    BivariateTE().analyse_single_target(settings, data, target=1)
+    n_entries = len(cache)
+    assert n_entries > 0
+    np.random.seed(0)
+    BivariateTE().analyse_single_target(settings, data, target=1)
+    assert len(cache) == n_entries, 'Worker estimates were not re-used.'
+
+
+if __name__ == '__main__':
+    test_cache_keys()
+    test_cached_estimator()
+    test_analysis_cache()
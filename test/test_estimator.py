@@ -4,10 +4,14 @@ This module provides unit tests for estimator setting. The user can choose from
 a variety of estimators (depending on data type and measure to be estimated).
 This functionality is handled by the estimator class and tested here.
 """
+import importlib
 import inspect
+import subprocess
+import sys
 import pytest
 import numpy as np
-from idtxl.estimator import find_estimator
+from idtxl import estimator
+from idtxl.estimator import find_estimator, Estimator, ESTIMATOR_REGISTRY
 from idtxl.multivariate_te import MultivariateTE
 from idtxl.estimators_jidt import JidtKraskovMI
 from test_estimators_jidt import jpype_missing, _get_gauss_data
@@ -30,6 +34,52 @@ def test_find_estimator():
         find_estimator(MultivariateTE)
 
 
+def test_estimator_registry():
+    """Test lazy loading of estimators from the registry."""
+    # All estimators implemented in IDTxl are registered.
+    for module_name in set(ESTIMATOR_REGISTRY.values()):
+        try:
+            module = importlib.import_module('idtxl.' + module_name)
+        except ImportError:
+            continue
+        for (name, cls) in inspect.getmembers(module, inspect.isclass):
+            if (cls.__module__ == module.__name__ and
+                    issubclass(cls, Estimator) and
+                    not inspect.isabstract(cls) and
+                    not name.endswith(('Kraskov', 'Discrete', 'Gaussian'))):
+                assert ESTIMATOR_REGISTRY.get(name) == module_name, (
+                    'Estimator {0} is missing from the registry.'.format(name))
+
+    # Finding a non-JIDT estimator does not import JPype or PyOpenCL.
+    code = ('import sys\n'
+            'from idtxl.multivariate_te import MultivariateTE\n'
+            'from idtxl.estimator import find_estimator\n'
+            'find_estimator(\'SydneyPID\')\n'
+            'print(\'jpype\' in sys.modules, \'pyopencl\' in sys.modules, '
+            '\'ecos\' in sys.modules)')
+    out = subprocess.check_output([sys.executable, '-c', code])
+    assert out.split() == [b'False', b'False', b'False'], (
+        'Optional dependencies were imported.')
+
+
+def test_estimator_entry_points(monkeypatch):
+    """Test loading of estimators registered as entry points."""
+    class EntryPoint():
+        name = 'MyEstimator'
+        value = 'idtxl.estimators_pid:SydneyPID'
+
+        def load(self):
+            return find_estimator('SydneyPID')
+
+    monkeypatch.setattr(estimator, '_entry_points',
+                        {'MyEstimator': EntryPoint()})
+    assert find_estimator('MyEstimator') is find_estimator('SydneyPID')
+    estimator.list_estimators()
+    EntryPoint.load = lambda self: MultivariateTE
+    with pytest.raises(RuntimeError):
+        find_estimator('MyEstimator')
+
+
 @jpype_missing
 def test_estimate_parallel():
     """Test estimate_parallel() against estimate()."""
@@ -85,4 +135,5 @@ def test_estimate_parallel():
 
 if __name__ == '__main__':
     test_find_estimator()
+    test_estimator_registry()
     test_estimate_parallel()
@@ -16,6 +16,7 @@ from idtxl.estimators_jidt import (JidtKraskovCMI, JidtKraskovMI,
                                    JidtDiscreteAIS, JidtDiscreteTE,
                                    JidtGaussianCMI, JidtGaussianMI,
                                    JidtGaussianAIS, JidtGaussianTE)
+from idtxl import estimators_jidt
 from idtxl.idtxl_utils import calculate_mi
 import idtxl.idtxl_exceptions as ex
 
@@ -791,6 +792,71 @@ def test_jidt_kraskov_alg1And2():
         assert caughtAssertionError, 'Assertion error not raised for KSG algorithm 3 request'
 
 
+@jpype_missing
+def test_calculator_pool():
+    """Test reuse of JIDT calculators across estimate calls."""
+    estimators_jidt.clear_calculator_pool()
+    n = 1000
+    var1 = np.random.randint(0, 2, size=n)
+    var2 = np.random.randint(0, 2, size=n)
+    cond = np.random.randint(0, 2, size=n)
+
+    # Calculators are reused across calls and estimator instances and are
+    # reset for each estimate.
+    est = JidtDiscreteCMI({})
+    (cmi_1, calc_1) = est.estimate(var1, var2, cond, return_calc=True)
+    (cmi_2, calc_2) = JidtDiscreteCMI({}).estimate(var1, var2, cond,
+                                                   return_calc=True)
+    assert calc_1 is calc_2, 'Calculator was not reused.'
+    assert cmi_1 == cmi_2, 'Estimate changed when reusing the calculator.'
+    (_, calc_3) = est.estimate(var1, var2, return_calc=True)
+    assert est.estimate(var1, var2, return_calc=True)[1] is calc_3
+    (_, calc_4) = est.estimate(np.vstack((var1, var2)).T, var2, cond,
+                               return_calc=True)
+    assert calc_4 is not calc_1, 'Reused calculator for other dimensions.'
+
+    # Kraskov calculators with equal properties are shared, the MI estimator
+    # used without a conditional is created once.
+    estimators_jidt.clear_calculator_pool()
+    est_1 = JidtKraskovCMI({'kraskov_k': 4})
+    JidtKraskovCMI({'kraskov_k': 4})
+    assert len(estimators_jidt._calc_pool.calculators) == 1
+    JidtKraskovCMI({'kraskov_k': 3})
+    assert len(estimators_jidt._calc_pool.calculators) == 2
+    x = np.random.randn(n)
+    est_1.estimate(x, x + np.random.randn(n))
+    mi_estimator = est_1._mi_estimator
+    est_1.estimate(x, x + np.random.randn(n))
+    assert est_1._mi_estimator is mi_estimator
+
+    # The pool holds a bounded number of calculators.
+    for k in range(estimators_jidt.CALC_POOL_SIZE + 2):
+        JidtKraskovMI({'kraskov_k': k + 1})
+    assert (len(estimators_jidt._calc_pool.calculators) ==
+            estimators_jidt.CALC_POOL_SIZE)
+    estimators_jidt.clear_calculator_pool()
+
+
+def test_jvm_warm_up():
+    """Test JVM start-up settings and warm-up of JIDT calculators."""
+    JidtKraskovCMI({})  # make sure the JVM is running
+    with pytest.raises(RuntimeError):
+        estimators_jidt.start_jvm(heap_size='1g')
+
+    jvm_info = dict(estimators_jidt._jvm_info)
+    try:
+        t = estimators_jidt.warm_up_jvm(n_samples=100, n_repeats=1)
+        assert t >= 0
+        info = estimators_jidt.get_jvm_info()
+        assert info['warm_up_time'] == t
+        assert 'pid' in info
+        # The warm-up is run once per process.
+        JidtKraskovCMI({'jvm_warm_up': True})
+        assert estimators_jidt.get_jvm_info()['warm_up_time'] == t
+    finally:
+        estimators_jidt._jvm_info.update(jvm_info)
+
+
 if __name__ == '__main__':
     test_insufficient_no_points()
     test_lagged_mi()
@@ -810,3 +876,5 @@ if __name__ == '__main__':
     test_mi_gauss_data()
     test_discrete_mi_memerror()
     test_jidt_kraskov_alg1And2()
+    test_calculator_pool()
+    test_jvm_warm_up()
@@ -0,0 +1,60 @@
+"""Unit tests for estimators implemented in Python."""
+import numpy as np
+from idtxl.estimators_python import PythonDiscreteCMI
+from idtxl.estimators_jidt import JidtDiscreteCMI
+from test_estimators_jidt import jpype_missing
+
+
+def _get_discrete_data(n=2000, n_cond=3):
+    """Return binary target that depends on source and conditional."""
+    source = np.random.randint(0, 2, size=(n, 1))
+    conditional = np.random.randint(0, 2, size=(n, n_cond))
+    flip = (np.random.rand(n, 1) < 0.1).astype(int)
+    target = (source + conditional[:, :1] + flip) % 2
+    return source, target, conditional
+
+
+@jpype_missing
+def test_discrete_cmi_jidt():
+    """Compare estimates to JIDT's discrete estimator."""
+    source, target, conditional = _get_discrete_data()
+    for local_values in [False, True]:
+        settings = {'local_values': local_values}
+        py_est = PythonDiscreteCMI(settings)
+        jidt_est = JidtDiscreteCMI(settings)
+        assert np.allclose(
+            py_est.estimate(source, target, conditional),
+            jidt_est.estimate(source, target, conditional)), (
+                'CMI estimates differ from JIDT.')
+        assert np.allclose(py_est.estimate(source, target),
+                           jidt_est.estimate(source, target)), (
+                'MI estimates differ from JIDT.')
+
+    # Discretisation of continuous data.
+    settings = {'discretise_method': 'max_ent', 'n_discrete_bins': 3}
+    var1, var2, cond = np.random.randn(3, 500, 2)
+    assert np.isclose(PythonDiscreteCMI(settings).estimate(var1, var2, cond),
+                      JidtDiscreteCMI(settings).estimate(var1, var2, cond))
+
+
+def test_discrete_cmi_large_alphabet():
+    """Test estimation with conditionals with large joint alphabets."""
+    source, target, conditional = _get_discrete_data(n=2000, n_cond=80)
+    est = PythonDiscreteCMI({'local_values': True})
+    local = est.estimate(source, target, conditional)
+    assert local.shape == (2000,)
+    # Almost all joint states of the conditional are observed once, hence
+    # CMI is zero.
+    assert np.isclose(np.mean(local), 0, atol=0.01)
+    est = PythonDiscreteCMI()
+    cmi = est.estimate(source, target, conditional[:, :1])
+    assert np.isclose(cmi, np.mean(PythonDiscreteCMI(
+        {'local_values': True}).estimate(source, target, conditional[:, :1])))
+    assert cmi > 0.4, 'Dependence was not detected.'
+    assert np.isclose(est.estimate(source, target, conditional[:, 1:2]),
+                      0, atol=0.02), 'Spurious dependence.'
+
+
+if __name__ == '__main__':
+    test_discrete_cmi_large_alphabet()
+    test_discrete_cmi_jidt()
@@ -7,6 +7,7 @@ from pkg_resources import resource_filename
 from idtxl import idtxl_io as io
 from idtxl.data import Data
 from idtxl.network_comparison import NetworkComparison
+from idtxl.results import ResultsSingleProcessAnalysis
 
 # Generate data and load network inference results.
 n_nodes = 5
@@ -245,6 +246,158 @@ def test_import_matarray():
             normalise=False)
 
 
+def _write_fieldtrip_file(file_name, trials, labels):
+    """Write FieldTrip structure in MATLAB's v7.3 (HDF5) layout."""
+    import h5py
+    with h5py.File(file_name, 'w') as f:
+        refs = f.create_group('#refs#')
+        ref_type = h5py.special_dtype(ref=h5py.Reference)
+        ft = f.create_group('data')
+        for (name, values) in [
+                ('trial', [t.T for t in trials]),
+                ('time', [np.arange(t.shape[1]).reshape(-1, 1) / 100
+                          for t in trials]),
+                ('label', [np.array([ord(c) for c in l],
+                                    dtype=np.uint16).reshape(-1, 1)
+                           for l in labels])]:
+            cell = ft.create_dataset(name, (len(values), 1), dtype=ref_type)
+            for (i, v) in enumerate(values):
+                cell[i, 0] = refs.create_dataset(
+                    '{0}_{1}'.format(name, i), data=v).ref
+        ft.create_dataset('fsample', data=np.array([100.]))
+
+
+def test_import_fieldtrip_memmap(tmpdir):
+    """Test import of FieldTrip data into a memory-mapped file."""
+    trials = [np.random.randn(3, 50) * 2 + 1 for t in range(4)]
+    labels = ['ch1', 'ch2', 'ch3']
+    file_name = str(tmpdir.join('ft.mat'))
+    _write_fieldtrip_file(file_name, trials, labels)
+    memmap_file = str(tmpdir.join('ft.npy'))
+    for normalise in [False, True]:
+        (data, label, timestamps, fsample) = io.import_fieldtrip(
+            file_name, 'data', 'v7.3', normalise=normalise)
+        assert label == labels
+        assert fsample == 100
+        assert data.n_processes == 3
+        assert data.n_samples == 50
+        assert data.n_replications == 4
+        if not normalise:
+            assert np.array_equal(data.data, np.stack(trials, axis=2))
+        if os.path.isfile(memmap_file):
+            os.remove(memmap_file)
+        for i in range(2):  # create and reuse file
+            (data_mm, label, timestamps, fsample) = io.import_fieldtrip(
+                file_name, 'data', 'v7.3', normalise=normalise,
+                memmap_file=memmap_file)
+            assert isinstance(data_mm.data, np.memmap)
+            assert np.allclose(data_mm.data, data.data)
+            assert data_mm.normalise == normalise
+        del data_mm
+
+
+def test_import_matarray_memmap(tmpdir):
+    """Test import of MATLAB arrays into a memory-mapped file."""
+    file_name = resource_filename(__name__, 'data/three_dim_v7_3.mat')
+    memmap_file = str(tmpdir.join('c.npy'))
+    for normalise in [False, True]:
+        data = io.import_matarray(file_name, 'c', 'v7.3', 'rsp',
+                                  normalise=normalise)
+        if os.path.isfile(memmap_file):
+            os.remove(memmap_file)
+        for i in range(2):
+            data_mm = io.import_matarray(
+                file_name, 'c', 'v7.3', 'rsp', normalise=normalise,
+                memmap_file=memmap_file)
+            assert isinstance(data_mm.data.base, np.memmap)
+            assert np.allclose(data_mm.data, data.data)
+    data = io.import_matarray(
+        resource_filename(__name__, 'data/one_dim_v7_3.mat'), 'a', 'v7.3',
+        's', normalise=False, memmap_file=str(tmpdir.join('a.npy')))
+    assert data.n_samples == 20
+    with pytest.raises(RuntimeError):
+        io.import_matarray(
+            resource_filename(__name__, 'data/two_dim_v7.mat'), 'b', 'v7',
+            'ps', memmap_file=str(tmpdir.join('b.npy')))
+
+
+def _assert_equal_results(res_a, res_b):
+    for (key, value) in res_a.items():
+        if isinstance(value, np.ndarray):
+            assert np.array_equal(res_b[key], value), (
+                'Entry {0} not equal.'.format(key))
+        elif key != 'profile':
+            assert res_b[key] == value, 'Entry {0} not equal.'.format(key)
+            assert type(res_b[key]) == type(value) or np.isscalar(value)
+
+
+def test_save_load_hdf5(tmpdir):
+    """Test saving and lazy loading of results in HDF5 format."""
+    file_name = str(tmpdir.join('results.h5'))
+    io.save_hdf5(res_0, file_name)
+    res = io.load_hdf5(file_name)
+    assert type(res) == type(res_0)
+    assert res.targets_analysed == res_0.targets_analysed
+    assert res.data_properties == res_0.data_properties
+    assert res.settings == res_0.settings
+    assert len(res._single_target._loaded) == 0, 'Results were not lazy.'
+    t = res_0.targets_analysed[0]
+    _assert_equal_results(res_0.get_single_target(t, fdr=False),
+                          res.get_single_target(t, fdr=False))
+    assert list(res._single_target._loaded.keys()) == [t]
+    for t in res_0.targets_analysed:
+        _assert_equal_results(res_0.get_single_target(t, fdr=False),
+                              res.get_single_target(t, fdr=False))
+    assert np.array_equal(
+        res.get_adjacency_matrix('max_te_lag', fdr=False)._weight_matrix,
+        res_0.get_adjacency_matrix('max_te_lag', fdr=False)._weight_matrix)
+    with pytest.raises(RuntimeError):
+        res.get_single_target(n_nodes + 1, fdr=False)
+
+    # Results can be read without IDTxl.
+    import h5py
+    with h5py.File(file_name, 'r') as f:
+        assert np.array_equal(
+            f['_single_target/{0}/selected_vars_sources'.format(t)][()],
+            res_0.get_single_target(t, fdr=False)['selected_vars_sources'])
+
+    # Results of single process analysis, conversion of pickled results.
+    res_0_ais = ResultsSingleProcessAnalysis(3, 100, True)
+    res_0_ais.settings.update({'cmi_estimator': 'JidtGaussianCMI',
+                               'estimator_class': ResultsSingleProcessAnalysis,
+                               'max_lag': 2,
+                               'lags': {0: [1, 2], 2: [], 'all': (1, 2)},
+                               'vars': {(0, 1): 'a'}})
+    for (p, selected) in [(0, [(0, 1)]), (2, [])]:
+        res_0_ais._add_single_result(
+            process=p, settings={},
+            results={'selected_vars': selected, 'ais': 0.5, 'ais_sign': True,
+                     'current_value': (p, 2), 'ais_pval': None,
+                     'profile': None})
+    res_0_ais._add_fdr({0: True, 2: False}, alpha=0.05)
+    pickle_name = str(tmpdir.join('ais'))
+    io.save_pickle(res_0_ais, pickle_name)
+    io.convert_pickle_to_hdf5(pickle_name, file_name)
+    res = io.load_hdf5(file_name)
+    assert res.processes_analysed == [0, 2]
+    assert res.settings['estimator_class'] == str(ResultsSingleProcessAnalysis)
+    # Types of dictionary keys are restored.
+    assert res.settings['lags'] == {0: [1, 2], 2: [], 'all': (1, 2)}
+    assert res.settings['vars'] == {(0, 1): 'a'}
+    for p in [0, 2]:
+        _assert_equal_results(res_0_ais.get_single_process(p, fdr=False),
+                              res.get_single_process(p, fdr=False))
+    for p in [0, 2]:
+        _assert_equal_results(res_0_ais.get_single_process(p, fdr=True),
+                              res.get_single_process(p, fdr=True))
+    assert not res.get_single_process(2, fdr=True)['ais_sign']
+    with pytest.raises(RuntimeError):
+        res.get_single_process(1, fdr=True)
+
+    with pytest.raises(RuntimeError):
+        io.save_hdf5(res_within, file_name)
+
+
 if __name__ == '__main__':
     test_export_brain_net()
     test_export_networkx()
@@ -24,6 +24,23 @@ def test_combine_discrete_dimensions():
     assert combined[1] == 3
 
 
+def test_encode_joint_states():
+    """Test indexing of observed joint states."""
+    a = np.array([[1, 0, 1], [0, 1, 0], [1, 0, 1], [0, 0, 0]])
+    for n_bins in [None, 2, 3]:
+        index, n_states = utils.encode_joint_states(a, n_bins)
+        assert n_states == 3
+        assert index[0] == index[2]
+        assert len(np.unique(index)) == 3
+        assert index.max() == 2
+    # Joint alphabet that does not fit into int64.
+    a = np.random.randint(0, 2, size=(100, 80))
+    a[50:] = a[:50]
+    index, n_states = utils.encode_joint_states(a, 2)
+    assert np.array_equal(index[50:], index[:50])
+    assert n_states == len(np.unique(a, axis=0))
+
+
 def test_discretise():
     # Test 1D discretisation
     discretised = utils.discretise(np.array([1.1, 0.55, 0]), 2)
@@ -101,5 +118,6 @@ def check_all_bools_true_2d(bool_array):
 if __name__ == '__main__':
     test_swap_chars()
     test_combine_discrete_dimensions()
+    test_encode_joint_states()
     test_discretise()
     test_discretise_max_ent()
@@ -512,6 +512,113 @@ def test_discrete_input():
                 expected_mi, res._single_target[1].omnibus_te))
 
 
+@jpype_missing
+def test_prescreen_candidates():
+    """Test pre-screening of source candidates with a fast proxy."""
+    expected_mi, source, source_uncorr, target = _get_gauss_data()
+    source = source[1:]
+    source_uncorr = source_uncorr[1:]
+    target = target[:-1]
+    data = Data(np.hstack((source, source_uncorr, target)),
+                dim_order='sp', normalise=False)
+    settings = {
+        'cmi_estimator': 'JidtKraskovCMI',
+        'n_perm_max_stat': 21,
+        'n_perm_min_stat': 21,
+        'n_perm_max_seq': 21,
+        'n_perm_omnibus': 21,
+        'max_lag_sources': 2,
+        'min_lag_sources': 1,
+        'max_lag_target': 1,
+        'prescreen': 'gaussian',
+        'prescreen_n_keep': 1}
+    nw = MultivariateTE()
+    results = nw.analyse_single_target(
+        settings, data, target=2, sources=[0, 1])
+    res = results.get_single_target(2, fdr=False)
+    assert res['selected_vars_sources'] == [(0, 1)], (
+        'Wrong selected source variables after pre-screening.')
+    assert res['prescreening']['n_candidates'] == 4
+    assert res['prescreening']['n_screened_out'] == 3
+    assert (0, 1) not in res['prescreening']['screened_out']
+
+    # Screen out all candidates by a threshold.
+    settings['prescreen_threshold'] = 1000
+    results = nw.analyse_single_target(
+        settings, data, target=2, sources=[0, 1])
+    res = results.get_single_target(2, fdr=False)
+    assert res['selected_vars_sources'] == []
+    assert res['prescreening']['n_screened_out'] == 4
+
+    # Use KSG estimation on a subsample of realisations as proxy.
+    settings = dict(settings, prescreen='subsample',
+                    prescreen_n_realisations=500, prescreen_n_keep=2)
+    del settings['prescreen_threshold']
+    results = nw.analyse_single_target(
+        settings, data, target=2, sources=[0, 1])
+    res = results.get_single_target(2, fdr=False)
+    assert res['selected_vars_sources'] == [(0, 1)]
+    assert res['prescreening']['n_screened_out'] == 2
+
+    # Test pre-screening without any criterion and unknown proxies.
+    del settings['prescreen_n_keep']
+    with pytest.raises(RuntimeError):
+        nw.analyse_single_target(settings, data, target=2, sources=[0, 1])
+    settings = dict(settings, prescreen='foo', prescreen_n_keep=1)
+    with pytest.raises(RuntimeError):
+        nw.analyse_single_target(settings, data, target=2, sources=[0, 1])
+
+    # Without pre-screening, no information is added to the results.
+    del settings['prescreen']
+    results = nw.analyse_single_target(
+        settings, data, target=2, sources=[0, 1])
+    assert results.get_single_target(2, fdr=False)['prescreening'] is None
+
+
+def test_coarse_to_fine_lag_search():
+    """Test coarse-to-fine search of source lags."""
+    expected_mi, source, source_uncorr, target = _get_gauss_data(n=3000)
+    source = source[1:]
+    source_uncorr = source_uncorr[1:]
+    target = target[:-1]
+    data = Data(np.hstack((source, source_uncorr, target)),
+                dim_order='sp', normalise=False)
+    settings = {
+        'cmi_estimator': 'JidtKraskovCMI',
+        'n_perm_max_stat': 21,
+        'n_perm_min_stat': 21,
+        'n_perm_max_seq': 21,
+        'n_perm_omnibus': 21,
+        'max_lag_sources': 5,
+        'min_lag_sources': 1,
+        'max_lag_target': 1,
+        'lag_search': 'coarse_to_fine',
+        'lag_search_step': 2,
+        'lag_search_radius': 1}
+    nw = MultivariateTE()
+    results = nw.analyse_single_target(
+        settings, data, target=2, sources=[0, 1])
+    res = results.get_single_target(2, fdr=False)
+    assert (0, 1) in res['selected_vars_sources'], (
+        'Source variable not found in coarse-to-fine search.')
+    # Lags 1, 3, 5 are tested for both sources, lag 2 is tested around the
+    # selected variable.
+    evaluated = res['source_lags_evaluated']
+    assert len(evaluated) == len(set(evaluated))
+    assert set([(s, l) for s in [0, 1] for l in [1, 3, 5]]) <= set(evaluated)
+    assert (0, 2) in evaluated, 'No candidates tested around selected lag.'
+
+    settings['lag_search'] = 'full'
+    results = nw.analyse_single_target(
+        settings, data, target=2, sources=[0, 1])
+    res = results.get_single_target(2, fdr=False)
+    assert len(res['source_lags_evaluated']) == 10
+
+    settings['lag_search'] = 'binary'
+    with pytest.raises(RuntimeError):
+        nw.analyse_single_target(settings, data, target=2, sources=[0, 1])
+
+
 def test_include_target_candidates():
     pass
 
@@ -547,3 +654,5 @@ if __name__ == '__main__':
     test_add_conditional_manually()
     test_check_source_set()
     test_define_candidates()
+    test_prescreen_candidates()
+    test_coarse_to_fine_lag_search()
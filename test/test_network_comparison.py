@@ -285,6 +285,186 @@ def test_get_permuted_replications():
         comp._get_permuted_replications(data_a=dat1, data_b=dat2, target=1)
 
 
+@jpype_missing
+def test_create_surrogate_distribution_within():
+    """Test creation of surrogates from permuted replications."""
+    data_a = Data()
+    data_a.generate_mute_data(100, 5)
+    data_b = Data()
+    data_b.generate_mute_data(100, 5)
+    path = os.path.join(os.path.dirname(__file__), 'data/')
+    res_0 = pickle.load(open(path + 'mute_results_0.p', 'rb'))
+    res_1 = pickle.load(open(path + 'mute_results_1.p', 'rb'))
+    comp_settings = {
+        'cmi_estimator': 'JidtKraskovCMI',
+        'noise_level': 0,
+        'n_perm_comp': 4,
+        'alpha_comp': 0.26,
+        'tail_comp': 'two',
+        'stats_type': 'dependent'
+        }
+    comp = NetworkComparison()
+    comp._initialise(comp_settings)
+    comp._create_union(res_0, res_1)
+    np.random.seed(0)
+    comp._create_surrogate_distribution_within(data_a, data_b)
+    cmi_surr_serial = comp.cmi_surr
+    for t in comp.union.targets_analysed:
+        assert cmi_surr_serial[t].shape == (
+            len(comp.union._single_target[t].sources),
+            comp_settings['n_perm_comp']), (
+                'Surrogate distribution for target {0} has wrong '
+                'shape.'.format(t))
+
+    # Estimate surrogates in worker processes, results should not change.
+    comp_settings['n_workers'] = 2
+    comp._initialise(comp_settings)
+    np.random.seed(0)
+    comp._create_surrogate_distribution_within(data_a, data_b)
+    for t in comp.union.targets_analysed:
+        assert np.allclose(comp.cmi_surr[t], cmi_surr_serial[t]), (
+            'Surrogates from worker processes differ from serial '
+            'estimation.')
+
+    # Permuting replications between identical data sets does not change the
+    # data, surrogate differences should be zero.
+    comp_settings['n_workers'] = 1
+    comp._initialise(comp_settings)
+    comp._create_surrogate_distribution_within(data_a, data_a)
+    for t in comp.union.targets_analysed:
+        assert np.allclose(comp.cmi_surr[t], 0), (
+            'Surrogates for identical data sets are not zero.')
+
+
+@jpype_missing
+def test_create_surrogate_distribution_between():
+    """Test creation of surrogates from permuted data sets."""
+    path = os.path.join(os.path.dirname(__file__), 'data/')
+    res_0 = pickle.load(open(path + 'mute_results_0.p', 'rb'))
+    res_1 = pickle.load(open(path + 'mute_results_1.p', 'rb'))
+    comp_settings = {
+        'cmi_estimator': 'JidtKraskovCMI',
+        'n_perm_comp': 20,
+        'alpha_comp': 0.26,
+        'tail_comp': 'two',
+        'stats_type': 'independent'
+        }
+    comp = NetworkComparison()
+    comp._initialise(comp_settings)
+    comp._create_union(res_0, res_1)
+    # Use constant CMI values for each condition, the difference of means in
+    # surrogates is then determined by the number of data sets swapped.
+    comp.cmi_set_a = []
+    comp.cmi_set_b = []
+    for i in range(3):
+        comp.cmi_set_a.append({t: np.zeros(
+            len(comp.union._single_target[t].sources))
+            for t in comp.union.targets_analysed})
+        comp.cmi_set_b.append({t: np.ones(
+            len(comp.union._single_target[t].sources))
+            for t in comp.union.targets_analysed})
+    comp._create_surrogate_distribution_between()
+    for t in comp.union.targets_analysed:
+        n_sources = len(comp.union._single_target[t].sources)
+        assert comp.cmi_surr[t].shape == (
+            n_sources, comp_settings['n_perm_comp']), (
+                'Surrogate distribution has wrong shape.')
+        assert np.isin(np.round(comp.cmi_surr[t], 6),
+                       np.round(np.array([-1, -1/3, 1/3, 1]), 6)).all(), (
+                'Unexpected surrogate values: {0}'.format(comp.cmi_surr[t]))
+
+
+def test_get_permutation_indices():
+    """Test indices of realisations for permuted replications."""
+    n_repl = 5
+    n_per_repl = 10
+    n_perm = 20
+    n_real = n_repl * n_per_repl
+    comp = NetworkComparison()
+    for stats_type in ['dependent', 'independent']:
+        comp.settings = {'stats_type': stats_type}
+        [idx_a, idx_b] = comp._get_permutation_indices(
+            n_repl, n_per_repl, n_perm)
+        assert idx_a.shape == (n_perm, n_real), 'Wrong shape of indices A.'
+        assert idx_b.shape == (n_perm, n_real), 'Wrong shape of indices B.'
+        for p in range(n_perm):
+            # Each realisation from both conditions is used exactly once.
+            assert (np.sort(np.hstack((idx_a[p], idx_b[p]))) ==
+                    np.arange(2 * n_real)).all(), (
+                        'Realisations were not permuted correctly.')
+            # Realisations within a replication are kept together and in
+            # their original order.
+            blocks = idx_a[p].reshape(n_repl, n_per_repl)
+            assert (blocks % n_per_repl == np.arange(n_per_repl)).all(), (
+                'Order of samples within replications was changed.')
+            if stats_type == 'dependent':
+                # Replications keep their rank in the data set.
+                assert (idx_a[p] % n_real == np.arange(n_real)).all(), (
+                    'Dependent permutation changed rank of replications.')
+                assert (idx_b[p] % n_real == np.arange(n_real)).all(), (
+                    'Dependent permutation changed rank of replications.')
+
+    comp.settings = {'stats_type': 'test'}
+    with pytest.raises(ValueError):
+        comp._get_permutation_indices(n_repl, n_per_repl, n_perm)
+
+
+@jpype_missing
+def test_cmi_cache():
+    """Test caching of link CMI estimates."""
+    data_1 = Data()
+    data_1.generate_mute_data(100, 5)
+    data_2 = Data()
+    data_2.generate_mute_data(100, 5)
+    path = os.path.join(os.path.dirname(__file__), 'data/')
+    res_0 = pickle.load(open(path + 'mute_results_0.p', 'rb'))
+    res_1 = pickle.load(open(path + 'mute_results_1.p', 'rb'))
+    comp_settings = {
+        'cmi_estimator': 'JidtKraskovCMI',
+        'n_perm_comp': 6,
+        'alpha_comp': 0.26,
+        'tail_comp': 'two',
+        'stats_type': 'independent'
+        }
+    comp = NetworkComparison()
+    comp.compare_between(comp_settings,
+                         network_set_a=np.array((res_0, res_1)),
+                         network_set_b=np.array((res_0, res_1)),
+                         data_set_a=np.array((data_1, data_1)),
+                         data_set_b=np.array((data_2, data_2)))
+    n_targets = len(np.unique(res_0.targets_analysed + res_1.targets_analysed))
+    # Cache survives reset of the instance and holds one entry per target and
+    # data set.
+    assert len(comp._cmi_cache) == 2 * n_targets, (
+        'Unexpected number of cache entries: {0}.'.format(
+            len(comp._cmi_cache)))
+
+    # Cached estimates are returned for the same data and union network.
+    comp._initialise(comp_settings)
+    comp._create_union(res_0, res_1)
+    cmi_1 = comp._calculate_cmi_all_links_cached(data_1)
+    cmi_2 = comp._calculate_cmi_all_links_cached(data_1)
+    for t in comp.union.targets_analysed:
+        assert cmi_1[t] is cmi_2[t], 'CMI estimate was not taken from cache.'
+
+    # Changing settings of the statistical comparison does not change the
+    # key, changing estimation settings does.
+    comp_settings['alpha_comp'] = 0.2
+    comp._initialise(comp_settings)
+    comp._create_union(res_0, res_1)
+    cmi_2 = comp._calculate_cmi_all_links_cached(data_1)
+    assert cmi_1[1] is cmi_2[1], 'CMI estimate was not taken from cache.'
+    comp_settings['kraskov_k'] = 3
+    comp._initialise(comp_settings)
+    comp._create_union(res_0, res_1)
+    comp._calculate_cmi_all_links_cached(data_1)
+    assert len(comp._cmi_cache) == 3 * n_targets, (
+        'Estimates for new estimator settings were not added to the cache.')
+
+    comp.clear_cache()
+    assert not comp._cmi_cache, 'Cache was not cleared.'
+
+
 @jpype_missing
 def test_calculate_cmi_all_links():
     """Test if the CMI is estimated correctly."""
@@ -458,6 +638,16 @@ def test_compare_links_within():
                     'P-value for link comparison not equal.')
         assert (r.targets_analysed == [link_a[1], link_b[1]]).all(), (
                 'Analysed targets are not correct.')
+        # Comparison results are stored as 1-element arrays per link, test
+        # if all weights can be used to build adjacency matrices.
+        for weights in ['comparison', 'union', 'diff_abs', 'pvalue']:
+            adj_mat = r.get_adjacency_matrix(weights)
+            assert adj_mat._edge_matrix[link_a[0], link_a[1]], (
+                'Link A missing from {0} adjacency matrix.'.format(weights))
+            assert adj_mat._edge_matrix[link_b[0], link_b[1]], (
+                'Link B missing from {0} adjacency matrix.'.format(weights))
+        assert r.get_adjacency_matrix('union')._weight_matrix[
+            link_a[0], link_a[1]] == 1
 
     with pytest.raises(RuntimeError):
         comp.compare_links_within(settings=comp_settings,
@@ -508,6 +698,8 @@ def test_tails():
 
 
 if __name__ == '__main__':
+    test_create_surrogate_distribution_within()
+    test_create_surrogate_distribution_between()
     test_calculate_cmi_all_links()
     test_tails()
     test_compare_links_within()
@@ -517,3 +709,5 @@ if __name__ == '__main__':
     test_assertions()
     test_calculate_mean()
     test_get_permuted_replications()
+    test_get_permutation_indices()
+    test_cmi_cache()
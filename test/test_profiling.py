@@ -0,0 +1,155 @@
+"""Unit tests for profiling of network analysis algorithms."""
+import json
+import pytest
+import numpy as np
+from idtxl.profiling import Profiler, merge_profiles
+from idtxl.estimators_jidt import JidtKraskovCMI
+from idtxl.multivariate_te import MultivariateTE
+from idtxl.active_information_storage import ActiveInformationStorage
+from idtxl.data import Data
+from test_estimators_jidt import jpype_missing
+
+
+@jpype_missing
+def test_profiler():
+    """Test recording of phases and estimator calls."""
+    n = 1000
+    var1 = np.random.randn(n, 1)
+    var2 = np.random.randn(n, 1)
+    profiler = Profiler()
+    est = profiler.wrap_estimator(JidtKraskovCMI({}))
+    assert est.is_parallel() is False, 'Attribute access failed.'
+    with profiler.phase('outer'):
+        est.estimate(var1, var2)
+        with profiler.phase('inner'):
+            est.estimate_parallel(n_chunks=2, re_use=['var2'],
+                                  var1=np.vstack((var1, var1)), var2=var2)
+        with profiler.phase('inner'):
+            pass
+    est.estimate(var1=var1, var2=var2)
+    profile = profiler.get_profile()
+
+    assert profile['phases']['outer']['n_calls'] == 1
+    assert profile['phases']['inner']['n_calls'] == 2
+    assert profile['phases']['outer']['time'] >= (
+        profile['phases']['inner']['time']), (
+            'Outer phase shorter than nested phase.')
+    # Estimator calls are counted for the innermost phase only.
+    assert profile['phases']['outer']['n_estimator_calls'] == 1
+    assert profile['phases']['outer']['n_chunks'] == 1
+    assert profile['phases']['outer']['n_realisations'] == n
+    assert profile['phases']['outer']['n_bytes'] == 2 * var1.nbytes
+    assert profile['phases']['inner']['n_estimator_calls'] == 1
+    assert profile['phases']['inner']['n_chunks'] == 2
+    assert profile['phases']['inner']['n_realisations'] == 2 * n
+    assert profile['phases']['other']['n_estimator_calls'] == 1
+    assert profile['estimators']['JidtKraskovCMI']['n_estimator_calls'] == 3
+    assert profile['estimators']['JidtKraskovCMI']['n_chunks'] == 4
+    assert len(profile['events']) == 3
+    assert profile['jvm'] == []
+
+    # JVM records are kept once per process.
+    profiler.add_jvm_info(None)
+    profiler.add_jvm_info({'pid': 1, 'startup_time': 0.5})
+    profile = profiler.get_profile()
+    assert len(profile['jvm']) == 1
+
+    merged = merge_profiles([profile, None, profile])
+    assert merged['phases']['inner']['n_calls'] == 4
+    assert merged['estimators']['JidtKraskovCMI']['n_chunks'] == 8
+    assert len(merged['events']) == 6
+    assert len(merged['jvm']) == 1
+
+    # Worker profilers record calls for the phases running in the parent
+    # profiler, worker profiles are added to the parent profile.
+    profiler = Profiler()
+    with profiler.phase('outer'):
+        worker_profiler = profiler.get_worker_profiler()
+        worker_est = worker_profiler.wrap_estimator(JidtKraskovCMI({}))
+        worker_est.estimate(var1, var2)
+        profiler.add_profile(worker_profiler.get_profile())
+        profiler.add_profile(None)
+    profile = profiler.get_profile()
+    assert profile['phases']['outer']['n_calls'] == 1
+    assert profile['phases']['outer']['n_estimator_calls'] == 1
+    assert profile['estimators']['JidtKraskovCMI']['n_estimator_calls'] == 1
+    assert worker_profiler._stack is not profiler._stack
+    worker_profiler.clear()
+    assert worker_profiler.get_profile()['estimators'] == {}
+
+    # Test disabled profiler.
+    profiler = Profiler(enabled=False)
+    est = JidtKraskovCMI({})
+    assert profiler.wrap_estimator(est) is est
+    with profiler.phase('outer'):
+        pass
+    assert profiler.get_profile() is None
+
+
+@jpype_missing
+def test_results_profile(tmpdir):
+    """Test profiles returned by network inference and AIS estimation."""
+    data = Data()
+    data.generate_mute_data(100, 2)
+    settings = {
+        'cmi_estimator': 'JidtKraskovCMI',
+        'n_perm_max_stat': 21,
+        'n_perm_min_stat': 21,
+        'n_perm_omnibus': 21,
+        'n_perm_max_seq': 21,
+        'max_lag_sources': 2,
+        'min_lag_sources': 1,
+        'profile': True}
+    results = MultivariateTE().analyse_network(
+        settings, data, targets=[0, 1])
+    profile = results.get_profile()
+    for phase in ['include_target_candidates', 'include_source_candidates',
+                  'prune_candidates', 'test_final_conditional', 'fdr']:
+        assert phase in profile['phases'], 'Missing phase {0}.'.format(phase)
+    assert profile['phases']['include_target_candidates']['n_calls'] == 2
+    assert profile['estimators']['JidtKraskovCMI']['n_estimator_calls'] > 0
+    assert sorted(profile['processes'].keys()) == [0, 1]
+    assert set([e['tid'] for e in profile['events']
+                if e['name'] != 'fdr']) == set([0, 1])
+    assert results.get_single_target(0, fdr=False).profile is not None
+
+    filename = str(tmpdir.join('profile.json'))
+    results.export_profile(filename)
+    with open(filename) as f:
+        profile_json = json.load(f)
+    assert profile_json['phases'].keys() == profile['phases'].keys()
+    filename = str(tmpdir.join('trace.json'))
+    results.export_profile(filename, file_format='chrome')
+    with open(filename) as f:
+        trace = json.load(f)
+    assert len(trace['traceEvents']) == len(profile['events'])
+    assert trace['traceEvents'][0]['ph'] == 'X'
+    with pytest.raises(RuntimeError):
+        results.export_profile(filename, file_format='foo')
+
+    settings = {
+        'cmi_estimator': 'JidtKraskovCMI',
+        'n_perm_max_stat': 21,
+        'n_perm_min_stat': 21,
+        'n_perm_mi': 21,
+        'max_lag': 2,
+        'profile': True}
+    results = ActiveInformationStorage().analyse_network(
+        settings, data, processes=[0])
+    profile = results.get_profile()
+    for phase in ['include_process_candidates', 'prune_candidates',
+                  'test_final_conditional', 'fdr']:
+        assert phase in profile['phases'], 'Missing phase {0}.'.format(phase)
+
+    # Test analysis without profiling.
+    settings['profile'] = False
+    results = ActiveInformationStorage().analyse_network(
+        settings, data, processes=[0])
+    assert results.get_profile() is None
+    with pytest.raises(RuntimeError):
+        results.export_profile(filename)
+
+
+if __name__ == '__main__':
+    test_profiler()
+    test_results_profile()
@@ -0,0 +1,134 @@
+"""Unit tests for logging and progress reporting of network analyses."""
+import logging
+import idtxl
+from idtxl.progress import Progress, report_surrogates
+from idtxl.multivariate_te import MultivariateTE
+from idtxl.bivariate_mi import BivariateMI
+from idtxl.active_information_storage import ActiveInformationStorage
+from idtxl.data import Data
+from test_estimators_jidt import jpype_missing
+
+SETTINGS = {
+    'cmi_estimator': 'JidtKraskovCMI',
+    'n_perm_max_stat': 21,
+    'n_perm_min_stat': 21,
+    'n_perm_omnibus': 21,
+    'n_perm_max_seq': 21,
+    'n_perm_mi': 21,
+    'max_lag_sources': 2,
+    'min_lag_sources': 1,
+    'max_lag': 2}
+
+
+def test_progress():
+    """Test counting of targets and surrogates and ETA."""
+    reports = []
+    progress = Progress(reports.append, n_targets=4)
+    state = progress.get_state()
+    assert state['targets_done'] == 0
+    assert state['eta'] is None, 'ETA before first target should be None.'
+
+    progress.add_surrogates(21)
+    progress.add_surrogates(10)
+    progress.target_done(3)
+    assert len(reports) == 3
+    assert reports[0]['event'] == 'surrogates'
+    assert reports[0]['target'] is None
+    assert reports[1]['surrogates_computed'] == 31
+    assert reports[2]['event'] == 'target'
+    assert reports[2]['target'] == 3
+    assert reports[2]['targets_done'] == 1
+    assert reports[2]['n_targets'] == 4
+    assert reports[2]['eta'] >= 0
+    assert reports[2]['eta'] >= 2 * reports[2]['elapsed'], (
+        'ETA should be extrapolated from time per target.')
+
+    # Progress is only counted for analyses with a tracker.
+    class Analysis():
+        pass
+    analysis = Analysis()
+    report_surrogates(analysis, 10)
+    analysis._progress = Progress(None, 1)
+    report_surrogates(analysis, 10)
+    assert analysis._progress.surrogates_computed == 10
+
+
+@jpype_missing
+def test_progress_callback():
+    """Test progress reported by analyse_network()."""
+    data = Data()
+    data.generate_mute_data(100, 2)
+
+    reports = []
+    settings = dict(SETTINGS, verbose=False)
+    MultivariateTE().analyse_network(
+        settings, data, targets=[0, 1], progress_callback=reports.append)
+    targets = [r for r in reports if r['event'] == 'target']
+    assert [r['target'] for r in targets] == [0, 1]
+    assert targets[-1]['targets_done'] == 2
+    assert targets[-1]['eta'] == 0
+    assert targets[-1]['surrogates_computed'] > 0
+    surrogates = [r['surrogates_computed'] for r in reports]
+    assert surrogates == sorted(surrogates), (
+        'Number of surrogates is not increasing.')
+
+    # Surrogates computed in worker processes are counted as well.
+    reports = []
+    settings = dict(SETTINGS, verbose=False, n_workers=2)
+    BivariateMI().analyse_network(
+        settings, data, targets=[0], progress_callback=reports.append)
+    assert reports[-1]['event'] == 'target'
+    assert reports[-1]['surrogates_computed'] > 0
+
+    reports = []
+    settings = dict(SETTINGS, verbose=False)
+    ActiveInformationStorage().analyse_network(
+        settings, data, processes=[0, 1], progress_callback=reports.append)
+    assert reports[-1]['targets_done'] == 2
+    assert reports[-1]['surrogates_computed'] > 0
+
+
+@jpype_missing
+def test_logging(caplog):
+    """Test routing of console output through the logging module."""
+    data = Data()
+    data.generate_mute_data(100, 2)
+    with caplog.at_level(logging.INFO, logger='idtxl'):
+        MultivariateTE().analyse_single_target(
+            dict(SETTINGS, verbose=True), data, target=0)
+    loggers = set([r.name for r in caplog.records])
+    assert 'idtxl.multivariate_te' in loggers
+    assert 'idtxl.network_inference' in loggers
+    assert 'idtxl.stats' in loggers
+
+    caplog.clear()
+    with caplog.at_level(logging.INFO, logger='idtxl'):
+        MultivariateTE().analyse_single_target(
+            dict(SETTINGS, verbose=False), data, target=0)
+    assert not [r for r in caplog.records
+                if r.name.startswith('idtxl.multivariate_te')], (
+        'Output despite verbose=False.')
+
+
+def test_log_to_console(capsys):
+    """Test opt-in console output."""
+    logger = logging.getLogger('idtxl')
+    assert [type(h) for h in logger.handlers] == [logging.NullHandler], (
+        'Handlers other than the NullHandler added at import.')
+    level = logger.level
+    handler = idtxl.log_to_console()
+    try:
+        assert idtxl.log_to_console(logging.DEBUG) is handler
+        assert len(logger.handlers) == 2
+        assert logger.level == logging.DEBUG
+        logging.getLogger('idtxl.stats').info('test message')
+        assert capsys.readouterr().out == 'test message\n'
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(level)
+
+
+if __name__ == '__main__':
+    test_progress()
+    test_progress_callback()
+    test_logging()
@@ -0,0 +1,95 @@
+"""Unit tests for the allocation of cores to workers, JIDT, and BLAS."""
+import os
+import pytest
+from idtxl import resources
+from idtxl.active_information_storage import ActiveInformationStorage
+from idtxl.data import Data
+from test_estimators_jidt import jpype_missing
+
+
+def test_thread_budget(monkeypatch):
+    """Test division of cores between workers, JIDT, and BLAS threads."""
+    for v in resources.BLAS_ENV_VARIABLES:
+        monkeypatch.delenv(v, raising=False)
+    monkeypatch.setattr(resources, '_blas_env_set', set())
+
+    budget = resources.get_thread_budget({'n_cores': 16, 'n_workers': 4})
+    assert budget['num_threads'] == 4
+    assert budget['blas_threads'] == 4
+    assert budget['jvm_heap_size'] is None
+    budget = resources.get_thread_budget({'n_cores': 4, 'n_workers': 8})
+    assert budget['num_threads'] == 1, 'Less than one thread per worker.'
+    budget = resources.get_thread_budget({})
+    assert budget['n_cores'] == resources.get_n_cores()
+    assert budget['num_threads'] == budget['n_cores']
+    with pytest.raises(RuntimeError):
+        resources.get_thread_budget({'n_cores': 0})
+
+    # Settings entered by the user take precedence.
+    settings = {'n_cores': 16, 'n_workers': 2, 'num_threads': 3,
+                'jvm_heap_size': '1g'}
+    budget = resources.apply_thread_budget(settings)
+    assert settings['num_threads'] == 3
+    assert settings['thread_budget'] == budget
+    assert budget['blas_threads'] == 8
+    assert budget['jvm_heap_size'] == '1g'
+    assert os.environ['OMP_NUM_THREADS'] == '8'
+    assert budget['blas_limited'] == (resources.threadpool_limits is not None)
+
+    # Variables set by the budget are updated, variables set by the user
+    # are kept.
+    resources.apply_thread_budget({'n_cores': 16, 'n_workers': 4})
+    assert os.environ['OMP_NUM_THREADS'] == '4'
+    monkeypatch.setattr(resources, '_blas_env_set', set())
+    monkeypatch.setenv('MKL_NUM_THREADS', '1')
+    resources.apply_thread_budget({'n_cores': 16, 'n_workers': 8})
+    assert os.environ['MKL_NUM_THREADS'] == '1'
+
+
+def test_restore_thread_limits(monkeypatch):
+    """Test restoring of BLAS limits after an analysis method returns."""
+    for v in resources.BLAS_ENV_VARIABLES:
+        monkeypatch.delenv(v, raising=False)
+    monkeypatch.setattr(resources, '_blas_env_set', set())
+    monkeypatch.setenv('MKL_NUM_THREADS', '3')
+    limits = resources._get_blas_limits()
+
+    @resources.restore_thread_limits
+    def analyse(settings):
+        resources.apply_thread_budget(settings)
+        assert os.environ['OMP_NUM_THREADS'] == '1'
+        raise RuntimeError('Analysis failed.')
+
+    with pytest.raises(RuntimeError):
+        analyse({'n_cores': 8, 'n_workers': 8})
+    assert 'OMP_NUM_THREADS' not in os.environ
+    assert os.environ['MKL_NUM_THREADS'] == '3'
+    assert resources._blas_env_set == set()
+    assert resources._get_blas_limits() == limits
+
+
+@jpype_missing
+def test_thread_budget_analysis(monkeypatch):
+    """Test reporting of the thread budget in analysis results."""
+    for v in resources.BLAS_ENV_VARIABLES:
+        monkeypatch.delenv(v, raising=False)
+    monkeypatch.setattr(resources, '_blas_env_set', set())
+    data = Data()
+    data.generate_mute_data(n_samples=100, n_replications=2)
+    settings = {
+        'cmi_estimator': 'JidtKraskovCMI',
+        'n_perm_mi': 21,
+        'max_lag': 2,
+        'tau': 1,
+        'n_cores': 2}
+    limits = resources._get_blas_limits()
+    ais = ActiveInformationStorage()
+    results = ais.analyse_single_process(settings, data, process=0)
+    # The budget only applies while the analysis runs.
+    assert resources._get_blas_limits() == limits
+    for v in resources.BLAS_ENV_VARIABLES:
+        assert v not in os.environ, 'BLAS limit {0} was not restored.'.format(
+            v)
+    assert results.settings['thread_budget']['num_threads'] == 2
+    assert results.settings['thread_budget']['n_workers'] == 1
+    assert results.settings['num_threads'] == 2
@@ -6,7 +6,7 @@ from tempfile import TemporaryFile
 import itertools as it
 import copy as cp
 import numpy as np
-from idtxl.results import AdjacencyMatrix
+from idtxl.results import AdjacencyMatrix, ResultsNetworkInference
 from idtxl.multivariate_te import MultivariateTE
 from idtxl.bivariate_te import BivariateTE
 from idtxl.multivariate_mi import MultivariateMI
@@ -427,7 +427,63 @@ def test_adjacency_matrix():
         AdjacencyMatrix(n_nodes, weight_type=(2, 3))
 
 
+def test_adjacency_matrix_sparse():
+    """Test sparse storage of edges for large networks."""
+    n_nodes = 20000
+    adj_mat = AdjacencyMatrix(n_nodes, float)
+    i_list = np.random.randint(0, n_nodes, size=5000)
+    j_list = np.random.randint(0, n_nodes, size=5000)
+    weights = np.random.rand(5000)
+    adj_mat.add_edge_list(i_list, j_list, weights)
+    adj_mat.add_edge(i_list[0], j_list[0], 2.0)
+    assert adj_mat._dense is None, 'Dense matrices were created.'
+
+    # Edges are unique and sorted, the last weight added is kept.
+    edges = {}
+    for (i, j, w) in zip(i_list, j_list, weights):
+        edges[(i, j)] = w
+    edges[(i_list[0], j_list[0])] = 2.0
+    edge_list = adj_mat.get_edge_list()
+    assert adj_mat.n_edges() == len(edges)
+    assert [e[:2] for e in edge_list] == sorted(edges.keys())
+    assert all([edges[e[:2]] == e[2] for e in edge_list])
+
+    sparse_matrix = adj_mat.get_sparse_matrix()
+    assert sparse_matrix.shape == (n_nodes, n_nodes)
+    assert sparse_matrix.nnz == len(edges)
+    assert sparse_matrix[i_list[0], j_list[0]] == 2.0
+
+    # Dense matrices for small networks.
+    adj_mat = AdjacencyMatrix(3, int)
+    adj_mat.add_edge_list([0, 2], [1, 0], [3, 0])
+    assert np.array_equal(adj_mat._edge_matrix, [[0, 1, 0], [0, 0, 0],
+                                                 [1, 0, 0]])
+    assert np.array_equal(adj_mat._weight_matrix, [[0, 3, 0], [0, 0, 0],
+                                                   [0, 0, 0]])
+    adj_mat.add_edge_list([], [], [])
+    assert adj_mat.n_edges() == 2
+    with pytest.raises(TypeError):
+        adj_mat.add_edge_list([0], [1], [0.5])
+    with pytest.raises(IndexError):
+        adj_mat.add_edge(0, 3, 1)
+
+    # Adjacency matrix from network inference results.
+    res = ResultsNetworkInference(n_nodes=4, n_realisations=100,
+                                  normalised=False)
+    for (t, sources) in [(0, [(1, 1), (1, 2), (2, 1)]), (3, [(0, 2)]),
+                         (1, [])]:
+        res._add_single_result(
+            target=t, settings={},
+            results={'selected_vars_sources': sources,
+                     'selected_vars_target': [(t, 1)]})
+    adj_mat = res.get_adjacency_matrix('vars_count', fdr=False)
+    assert list(adj_mat.get_edge_list()) == [(0, 3, 1), (1, 0, 2), (2, 0, 1)]
+    adj_mat = res.get_adjacency_matrix('binary', fdr=False)
+    assert list(adj_mat.get_edge_list()) == [(0, 3, 1), (1, 0, 1), (2, 0, 1)]
+
+
 if __name__ == '__main__':
+    test_adjacency_matrix_sparse()
     test_adjacency_matrix()
     test_console_output()
     test_results_network_inference()
@@ -188,6 +188,58 @@ def test_ais_fdr():
         res_pruned.get_significant_processes(fdr=True)
 
 
+def test_fdr_correction_mask():
+    """Test FDR-correction as a mask over uncorrected results."""
+    # Significance is returned in the original order of p-values.
+    pval = np.array([0.04, 0.001, 0.5, 0.002, 0.03])
+    [sign, thresh] = stats._perform_fdr_corretion(pval.copy(), 1, 0.05)
+    assert np.array_equal(sign, [True, True, False, True, True]), (
+        'Wrong significance after FDR-correction.')
+    assert np.all(np.diff(thresh) > 0)
+
+    settings = {'n_perm_max_seq': 1000, 'n_perm_omnibus': 1000}
+    res_1 = ResultsNetworkInference(
+        n_nodes=3, n_realisations=1000, normalised=True)
+    res_1._add_single_result(target=0, settings=settings, results={
+        'selected_vars_sources': [(1, 1), (2, 3)],
+        'selected_vars_target': [(0, 1)],
+        'selected_vars_full': [(0, 1), (1, 1), (2, 3)],
+        'omnibus_pval': 0.001,
+        'omnibus_sign': True,
+        'selected_sources_pval': np.array([0.001, 0.4]),
+        'selected_sources_te': np.array([1.1, 0.1])})
+    res_2 = ResultsNetworkInference(
+        n_nodes=3, n_realisations=1000, normalised=True)
+    res_2._add_single_result(target=1, settings=settings, results={
+        'selected_vars_sources': [(0, 2)],
+        'selected_vars_target': [(1, 1)],
+        'selected_vars_full': [(1, 1), (0, 2)],
+        'omnibus_pval': 0.001,
+        'omnibus_sign': True,
+        'selected_sources_pval': np.array([0.001]),
+        'selected_sources_te': np.array([1.3])})
+
+    res = stats.network_fdr({'correct_by_target': False}, res_1, res_2)
+    assert res_1.targets_analysed == [0], 'Input results were changed.'
+    assert res.targets_analysed == [0, 1]
+    # Unaffected results are not copied, pruned results are copies.
+    assert res.get_single_target(1, fdr=True) is res._single_target[1]
+    pruned = res.get_single_target(0, fdr=True)
+    assert pruned.selected_vars_sources == [(1, 1)]
+    assert pruned.selected_vars_full == [(0, 1), (1, 1)]
+    assert np.array_equal(pruned.selected_sources_te, [1.1])
+    assert res_1._single_target[0].selected_vars_sources == [(1, 1), (2, 3)]
+    assert np.array_equal(
+        res.get_adjacency_matrix('binary', fdr=True)._weight_matrix,
+        [[0, 1, 0], [1, 0, 0], [0, 0, 0]])
+
+    res_1._single_target[0]['omnibus_pval'] = 0.3
+    res = stats.network_fdr({'correct_by_target': True}, res_1, res_2)
+    assert not res.get_single_target(0, fdr=True).omnibus_sign
+    assert res.get_single_target(0, fdr=True).selected_vars_sources == []
+    assert res_1._single_target[0].omnibus_sign
+
+
 def test_find_pvalue():
     test_val = 1
     distribution = np.random.rand(500)  # normally distributed floats in [0,1)
@@ -217,6 +269,68 @@ def test_find_pvalue():
         stats._find_pvalue(test_val, distribution, alpha, tail='foo')
 
 
+def test_find_pvalue_fitted():
+    """Test p-values derived from fitted null distributions."""
+    rng = np.random.default_rng(0)
+    distribution = rng.gamma(shape=2, scale=0.01, size=100)
+    alpha = 0.05
+    for null_fit in ['gamma', 'gpd']:
+        # p-values can be smaller than 1/n_perm, the fit is documented.
+        [s, p, diagnostics] = stats._find_pvalue_fitted(
+            0.2, distribution, alpha, null_fit)
+        assert s
+        assert p < 1 / distribution.shape[0]
+        assert diagnostics['pvalue_permutation'] == 1 / distribution.shape[0]
+        assert not diagnostics['fit_failed']
+        assert 0 <= diagnostics['ks_pvalue'] <= 1
+        [s, p, _] = stats._find_pvalue_fitted(
+            np.median(distribution), distribution, alpha, null_fit)
+        assert not s
+        assert 0.3 < p < 0.7, 'Wrong p-value for the median: {0}'.format(p)
+
+    # Fall back to the permutation p-value if the fit fails.
+    [s, p, diagnostics] = stats._find_pvalue_fitted(
+        1, np.zeros(100), alpha, 'gamma')
+    assert diagnostics['fit_failed']
+    assert p == 0.01
+    with pytest.raises(RuntimeError):
+        stats._find_pvalue_fitted(1, distribution, alpha, 'foo')
+
+
+def test_null_fit_analysis():
+    """Test network inference using fitted null distributions."""
+    data = Data()
+    data.generate_mute_data(100, 5)
+    settings = {
+        'cmi_estimator': 'JidtKraskovCMI',
+        'n_perm_max_stat': 200,
+        'n_perm_min_stat': 200,
+        'n_perm_omnibus': 500,
+        'n_perm_max_seq': 500,
+        'null_fit': 'gpd',
+        'n_perm_null_fit': 30,
+        'max_lag_sources': 2,
+        'min_lag_sources': 1}
+    nw = MultivariateTE()
+    res = nw.analyse_single_target(settings, data, target=1)
+    null_fits = res.get_single_target(1, False)['null_fit']
+    assert len(null_fits) > 0
+    assert all([d['n_perm'] == 30 for d in null_fits])
+    assert 'max_statistic' in [d['test'] for d in null_fits]
+    settings['null_fit'] = 'foo'
+    with pytest.raises(RuntimeError):
+        nw.analyse_single_target(settings, data, target=1)
+
+    # Fits are not reported if the null distribution is not fitted.
+    settings['null_fit'] = None
+    settings['n_perm_max_stat'] = 21
+    settings['n_perm_min_stat'] = 21
+    settings['n_perm_omnibus'] = 21
+    settings['n_perm_max_seq'] = 21
+    res = nw.analyse_single_target(settings, data, target=1)
+    assert res.get_single_target(1, False)['null_fit'] is None
+
+
 def test_find_table_max():
     tab = np.array([[0, 2, 1], [3, 4, 5], [10, 8, 1]])
     results = stats._find_table_max(tab)
@@ -330,7 +444,10 @@ if __name__ == '__main__':
     test_analytical_surrogates()
     test_data_type()
     test_network_fdr()
+    test_fdr_correction_mask()
     test_find_pvalue()
+    test_find_pvalue_fitted()
+    test_null_fit_analysis()
     test_find_table_max()
     test_find_table_min()
     test_sort_table_max()
@@ -0,0 +1,145 @@
+"""Unit tests for streaming estimation of TE and AIS."""
+import pytest
+import numpy as np
+from idtxl.streaming import StreamingEstimator
+from idtxl.results import ResultsNetworkInference, ResultsSingleProcessAnalysis
+from idtxl.estimators_jidt import JidtKraskovCMI, JidtGaussianCMI
+from test_estimators_jidt import jpype_missing
+
+
+def _get_results(estimator):
+    """Return network inference results with a fixed embedding."""
+    results = ResultsNetworkInference(n_nodes=3, n_realisations=1000,
+                                      normalised=False)
+    results._add_single_result(
+        target=2,
+        settings={'cmi_estimator': estimator},
+        results={'selected_vars_sources': [(0, 1), (1, 2)],
+                 'selected_vars_target': [(2, 1)]})
+    return results
+
+
+def _get_data(n=3000):
+    """Return coupled AR processes, process 2 is driven by 0 and 1."""
+    d = np.random.randn(3, n)
+    for t in range(2, n):
+        d[2, t] += 0.4 * d[2, t - 1] + 0.5 * d[0, t - 1] + 0.3 * d[1, t - 2]
+    return d
+
+
+def _gaussian_cmi(realisations):
+    """Return Gaussian CMI between columns 1, 2 and 0 given column 3."""
+    cov = np.cov(realisations.T)
+
+    def logdet(c):
+        return np.linalg.slogdet(cov[np.ix_(c, c)])[1]
+    return 0.5 * (logdet([1, 2, 3]) + logdet([0, 3]) - logdet([3]) -
+                  logdet([0, 1, 2, 3]))
+
+
+def _plugin_cmi(realisations):
+    """Return plug-in CMI in bits between columns 1, 2 and 0 given 3."""
+    def h(c):
+        p = np.unique(realisations[:, c], axis=0, return_counts=True)[1]
+        p = p / np.sum(p)
+        return -np.sum(p * np.log2(p))
+    return h([1, 2, 3]) + h([0, 3]) - h([0, 1, 2, 3]) - h([3])
+
+
+def test_ring_buffer():
+    """Test creation of realisations and eviction from the buffer."""
+    data = _get_data(500)
+    stream = StreamingEstimator({'buffer_size': 100},
+                                _get_results('JidtGaussianCMI'), target=2)
+    # Realisations of all variables for current values 2, ..., 499.
+    expected = np.vstack((data[2, 2:], data[0, 1:-1], data[1, :-2],
+                          data[2, 1:-1])).T
+    n_added = 0
+    for block in [data[:, :1], data[:, 1:51], data[:, 51:170],
+                  data[:, 170:180], data[:, 180:500]]:
+        stream.add_samples(block)
+        n_added = block.shape[1] + n_added
+        n_real = min(max(n_added - 2, 0), 100)
+        assert stream.n_realisations == n_real
+        assert np.array_equal(stream.get_realisations(),
+                              expected[n_added - 2 - n_real:n_added - 2]), (
+            'Wrong realisations in buffer after adding {0} samples.'.format(
+                n_added))
+
+    with pytest.raises(RuntimeError):
+        stream.add_samples(data[0, :])
+    with pytest.raises(RuntimeError):
+        StreamingEstimator({'buffer_size': 0},
+                           _get_results('JidtGaussianCMI'), target=2)
+    with pytest.raises(RuntimeError):
+        StreamingEstimator({}, _get_results('JidtGaussianCMI'),
+                           target=2).estimate()
+
+
+def test_gaussian():
+    """Test running sufficient statistics for Gaussian estimation."""
+    data = _get_data()
+    stream = StreamingEstimator({'buffer_size': 1000},
+                                _get_results('JidtGaussianCMI'), target=2)
+    for i in range(0, data.shape[1], 250):
+        stream.add_samples(data[:, i:i + 250])
+        assert np.isclose(stream.estimate(),
+                          _gaussian_cmi(stream.get_realisations())), (
+            'Incremental estimate differs from estimate on buffer.')
+    assert stream.estimate() > 0.1
+
+
+def test_discrete():
+    """Test running counts for discrete estimation."""
+    data = (_get_data() > 0).astype(int)
+    stream = StreamingEstimator({'buffer_size': 1000},
+                                _get_results('JidtDiscreteCMI'), target=2)
+    for i in range(0, data.shape[1], 300):
+        stream.add_samples(data[:, i:i + 300])
+        assert np.isclose(stream.estimate(),
+                          _plugin_cmi(stream.get_realisations())), (
+            'Incremental estimate differs from estimate on buffer.')
+
+    with pytest.raises(RuntimeError):
+        stream.add_samples(data.astype(float))
+
+    # AIS results, no conditional.
+    results = ResultsSingleProcessAnalysis(n_nodes=3, n_realisations=1000,
+                                           normalised=False)
+    results._add_single_result(
+        process=2, settings={'cmi_estimator': 'JidtDiscreteCMI'},
+        results={'selected_vars': [(2, 1), (2, 2)]})
+    stream = StreamingEstimator({'buffer_size': 1000}, results, 2)
+    stream.add_samples(data)
+    real = np.hstack((stream.get_realisations(),
+                      np.zeros((stream.n_realisations, 1))))
+    assert np.isclose(stream.estimate(), _plugin_cmi(real))
+
+
+@jpype_missing
+def test_estimators_jidt():
+    """Test streaming estimation against JIDT estimators."""
+    data = _get_data()
+    stream = StreamingEstimator({'buffer_size': 1000},
+                                _get_results('JidtGaussianCMI'), target=2)
+    stream.add_samples(data)
+    real = stream.get_realisations()
+    est = JidtGaussianCMI({})
+    cmi = est.estimate(var1=real[:, 1:3], var2=real[:, :1],
+                       conditional=real[:, 3:])
+    assert np.isclose(stream.estimate(), cmi, rtol=1e-4)
+
+    stream = StreamingEstimator({'buffer_size': 1000, 'noise_level': 0},
+                                _get_results('JidtKraskovCMI'), target=2)
+    stream.add_samples(data)
+    est = JidtKraskovCMI({'noise_level': 0})
+    cmi = est.estimate(var1=real[:, 1:3], var2=real[:, :1],
+                       conditional=real[:, 3:])
+    assert np.isclose(stream.estimate(), cmi)
+
+
+if __name__ == '__main__':
+    test_ring_buffer()
+    test_gaussian()
+    test_discrete()
+    test_estimators_jidt()
@@ -0,0 +1,99 @@
+"""Unit tests for time-resolved network inference."""
+import pytest
+import numpy as np
+from idtxl.time_resolved import TimeResolvedNetworkInference
+from idtxl.multivariate_te import MultivariateTE
+from idtxl.bivariate_te import BivariateTE
+from idtxl.data import Data
+from test_estimators_jidt import jpype_missing
+from test_estimators_jidt import _get_gauss_data
+
+SETTINGS = {
+    'cmi_estimator': 'JidtKraskovCMI',
+    'n_perm_max_stat': 21,
+    'n_perm_min_stat': 21,
+    'n_perm_max_seq': 21,
+    'n_perm_omnibus': 21,
+    'max_lag_sources': 2,
+    'min_lag_sources': 1,
+    'max_lag_target': 1,
+    'verbose': False}
+
+
+def _get_data(n):
+    expected_mi, source, source_uncorr, target = _get_gauss_data(n=n + 1)
+    return Data(np.hstack((source[1:], source_uncorr[1:], target[:-1])),
+                dim_order='sp', normalise=False)
+
+
+def test_get_windows():
+    """Test definition of sliding windows."""
+    analysis = TimeResolvedNetworkInference(MultivariateTE())
+    assert analysis.get_windows(10, 4, 2) == [(0, 4), (2, 6), (4, 8), (6, 10)]
+    assert analysis.get_windows(10, 4, 4) == [(0, 4), (4, 8)]
+    assert analysis.get_windows(10, 10, 1) == [(0, 10)]
+    with pytest.raises(RuntimeError):
+        analysis.get_windows(10, 11, 1)
+    with pytest.raises(RuntimeError):
+        analysis.get_windows(10, 4, 0)
+
+
+@jpype_missing
+def test_analyse_network():
+    """Test network inference in sliding windows."""
+    data = _get_data(3000)
+    for network_analysis in [MultivariateTE(), BivariateTE()]:
+        analysis = TimeResolvedNetworkInference(network_analysis)
+        settings = dict(SETTINGS, window_length=1500, window_step=750)
+        results = analysis.analyse_network(settings, data, targets=[2],
+                                           sources=[0, 1])
+        assert [r.data_properties.window for r in results] == [
+            (0, 1500), (750, 2250), (1500, 3000)]
+        for r in results:
+            assert (0, 1) in r.get_single_target(
+                2, fdr=False)['selected_vars_sources'], (
+                    'Source variable not found in window.')
+            assert 'warm_start' not in r.settings
+        assert 'window_length' in settings, 'Input settings were changed.'
+
+    with pytest.raises(RuntimeError):
+        analysis.analyse_network(SETTINGS, data)
+
+
+@jpype_missing
+def test_warm_start():
+    """Test testing of previously selected variables first."""
+    data = _get_data(1500)
+    nw = MultivariateTE()
+    previous = nw.analyse_single_target(SETTINGS, data, target=2,
+                                        sources=[0, 1])
+    selected = previous.get_single_target(2, fdr=False)
+    results = nw.analyse_single_target(
+        dict(SETTINGS, warm_start=previous), data, target=2, sources=[0, 1])
+    res = results.get_single_target(2, fdr=False)
+    assert res['source_lags_evaluated'][0] == (0, 1), (
+        'Previously selected variable was not tested first.')
+    assert (0, 1) in selected['selected_vars_sources']
+    assert (0, 1) in res['selected_vars_sources']
+    assert res['selected_vars_target'] == selected['selected_vars_target']
+
+    # Previous results without the current target are ignored.
+    results = nw.analyse_single_target(
+        dict(SETTINGS, warm_start=previous), data, target=1, sources=[0])
+    res = results.get_single_target(1, fdr=False)
+    assert res['source_lags_evaluated'] == [(0, 1), (0, 2)]
+
+    # Bivariate inference.
+    nw = BivariateTE()
+    results = nw.analyse_single_target(
+        dict(SETTINGS, warm_start=previous, n_workers=2), data, target=2,
+        sources=[0, 1])
+    res = results.get_single_target(2, fdr=False)
+    assert res['source_lags_evaluated'][0] == (0, 1)
+    assert (0, 1) in res['selected_vars_sources']
+
+
+if __name__ == '__main__':
+    test_get_windows()
+    test_analyse_network()
+    test_warm_start()